@@ -1485,6 +1485,19 @@ PHI_DEFINE_EXPORTED_bool(enable_pir_in_executor,
                          false,
                          "Enable PIR in executor");
 
+/**
+ * Executor related FLAG
+ * Name: FLAGS_executor_cache_capacity
+ * Since Version: 3.0.0
+ * Value Range: int32, default=8
+ * Example: FLAGS_executor_cache_capacity=16 keeps the 16 most recently run
+ * programs and their executors in the cache of a static graph Executor.
+ * Note: It is read when an Executor is created.
+ */
+PHI_DEFINE_EXPORTED_int32(executor_cache_capacity,
+                          8,
+                          "The number of programs cached by an Executor.");
+
 /**
  * Using PIR by translating legacy program to pir program
  * for dy2st mode  FLAG
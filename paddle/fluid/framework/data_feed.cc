@@ -1120,6 +1120,7 @@ void MultiSlotInMemoryDataFeed::Init(
   so_parser_name_ = data_feed_desc.so_parser_name();
   finish_init_ = true;
   input_type_ = data_feed_desc.input_type();
+  binary_slots_ = data_feed_desc.binary_slots();
 }
 
 void MultiSlotInMemoryDataFeed::GetMsgFromLogKey(const std::string& log_key,
@@ -1145,8 +1146,123 @@ int MultiSlotInMemoryDataFeed::ParseInstanceFromSo(
   return parser->ParseInstance(len, str, instances);
 }
 
+bool MultiSlotInMemoryDataFeed::ParseOneBinaryInstanceFromPipe(
+    Record* instance) {
+#ifdef _LINUX
+  // a sample is its payload size as uint32, followed by the slots, each of
+  // them a type char, 'u' or 'f', the number of feasigns as uint32, and the
+  // feasigns as uint64 or float, all in little endian
+  PADDLE_ENFORCE_EQ(
+      parse_ins_id_ || parse_content_ || parse_logkey_,
+      false,
+      common::errors::Unimplemented(
+          "The binary slots of MultiSlotInMemoryDataFeed do not support "
+          "parsing ins_id, content or logkey."));
+  thread_local std::vector<char> buffer;
+  uint32_t size = 0;
+  if (fread(&size, sizeof(size), 1, fp_.get()) != 1) {
+    return false;
+  }
+  buffer.resize(size);
+  PADDLE_ENFORCE_EQ(
+      fread(buffer.data(), 1, size, fp_.get()),
+      size,
+      common::errors::InvalidArgument(
+          "The binary sample is truncated, it should have %d bytes.", size));
+  const char* pos = buffer.data();
+  const char* end = pos + size;
+  const size_t header_size = sizeof(char) + sizeof(uint32_t);
+  for (size_t i = 0; i < use_slots_index_.size(); ++i) {
+    PADDLE_ENFORCE_GE(
+        static_cast<size_t>(end - pos),
+        header_size,
+        common::errors::InvalidArgument(
+            "The binary sample has %d slots, but the data feed has %d slots.",
+            i,
+            use_slots_index_.size()));
+    char type = *pos;
+    uint32_t num = 0;
+    memcpy(&num, pos + sizeof(char), sizeof(num));
+    pos += header_size;
+    PADDLE_ENFORCE_NE(
+        num,
+        0,
+        common::errors::InvalidArgument(
+            "The number of ids can not be zero, you need padding it in data "
+            "generator. The %d th slot of the binary sample is empty.",
+            i));
+    PADDLE_ENFORCE_EQ(
+        type == 'u' || type == 'f',
+        true,
+        common::errors::InvalidArgument(
+            "The type of the %d th slot of the binary sample should be 'u' "
+            "or 'f', but received %d.",
+            i,
+            static_cast<int>(type)));
+    const size_t width = type == 'f' ? sizeof(float) : sizeof(uint64_t);
+    PADDLE_ENFORCE_GE(static_cast<size_t>(end - pos),
+                      num * width,
+                      common::errors::InvalidArgument(
+                          "The %d th slot of the binary sample is truncated.",
+                          i));
+    int idx = use_slots_index_[i];
+    if (idx != -1) {
+      // feasigns are converted to the type of the slot, as the text format
+      // is parsed by the type of the slot
+      const bool is_float = all_slots_type_[i][0] == 'f';
+      for (uint32_t j = 0; j < num; ++j) {
+        float float_feasign = 0;
+        uint64_t uint64_feasign = 0;
+        if (type == 'f') {
+          memcpy(&float_feasign, pos + j * width, sizeof(float));
+          uint64_feasign = static_cast<uint64_t>(float_feasign);
+        } else {
+          memcpy(&uint64_feasign, pos + j * width, sizeof(uint64_t));
+          float_feasign = static_cast<float>(uint64_feasign);
+        }
+        FeatureFeasign f;
+        if (is_float) {
+          // if float feasign is equal to zero, ignore it
+          // except when slot is dense
+          if (fabs(float_feasign) < 1e-6 && !use_slots_is_dense_[i]) {
+            continue;
+          }
+          f.float_feasign_ = float_feasign;
+          instance->float_feasigns_.emplace_back(f, idx);
+        } else {
+          // if uint64 feasign is equal to zero, ignore it
+          // except when slot is dense
+          if (uint64_feasign == 0 && !use_slots_is_dense_[i]) {
+            continue;
+          }
+          f.uint64_feasign_ = uint64_feasign;
+          instance->uint64_feasigns_.emplace_back(f, idx);
+        }
+      }
+    }
+    pos += num * width;
+  }
+  PADDLE_ENFORCE_EQ(
+      pos == end,
+      true,
+      common::errors::InvalidArgument(
+          "The binary sample has more slots than the %d slots of the data "
+          "feed.",
+          use_slots_index_.size()));
+  instance->float_feasigns_.shrink_to_fit();
+  instance->uint64_feasigns_.shrink_to_fit();
+  fea_num_ += instance->uint64_feasigns_.size();
+  return true;
+#else
+  return false;
+#endif
+}
+
 bool MultiSlotInMemoryDataFeed::ParseOneInstanceFromPipe(Record* instance) {
 #ifdef _LINUX
+  if (binary_slots_) {
+    return ParseOneBinaryInstanceFromPipe(instance);
+  }
   thread_local string::LineFileReader reader;
 
   if (!reader.getline(&*(fp_.get()))) {
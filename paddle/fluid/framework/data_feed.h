@@ -1950,6 +1950,9 @@ class MultiSlotInMemoryDataFeed : public InMemoryDataFeed<Record> {
  protected:
   virtual bool ParseOneInstance(Record* instance);
   virtual bool ParseOneInstanceFromPipe(Record* instance);
+  // parse a sample in the binary format of the data generator, see
+  // DataFeedDesc.binary_slots
+  virtual bool ParseOneBinaryInstanceFromPipe(Record* instance);
   virtual void ParseOneInstanceFromSo(const char* str UNUSED,
                                       Record* instance UNUSED,
                                       CustomParser* parser UNUSED) {}
@@ -1963,6 +1966,8 @@ class MultiSlotInMemoryDataFeed : public InMemoryDataFeed<Record> {
                                 uint32_t* cmatch,
                                 uint32_t* rank);
   virtual void PutToFeedVec(const Record* ins_vec, int num);
+
+  bool binary_slots_ = false;
 };
 
 class SlotRecordInMemoryDataFeed : public InMemoryDataFeed<SlotRecord> {
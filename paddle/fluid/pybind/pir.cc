@@ -529,6 +529,7 @@ void BindProgram(py::module *m) {
              return name_analysis::GetParameterValueByName(self, name);
            })
       .def("num_ops", [](Program &self) { return self.num_ops(); })
+      .def("fingerprint", [](Program &self) { return self.Fingerprint(); })
       .def(
           "state_dict",
           [](std::shared_ptr<Program> self,
@@ -0,0 +1,44 @@
+// Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#pragma once
+#include <cstdint>
+#include <vector>
+
+namespace phi {
+
+// Whether the index is in ascending order, as the dst index of the edges of a
+// graph in CSC order, in which the edges of each node are contiguous.
+template <typename IndexT>
+bool IsSortedIndex(const IndexT* index, int64_t size) {
+  for (int64_t i = 1; i < size; ++i) {
+    if (index[i] < index[i - 1]) return false;
+  }
+  return true;
+}
+
+// The positions where the runs of equal values of a sorted index start,
+// followed by the size of the index, so that run i is [starts[i],
+// starts[i + 1]).
+template <typename IndexT>
+std::vector<int64_t> SortedSegmentStarts(const IndexT* index, int64_t size) {
+  std::vector<int64_t> starts;
+  for (int64_t i = 0; i < size; ++i) {
+    if (i == 0 || index[i] != index[i - 1]) starts.push_back(i);
+  }
+  starts.push_back(size);
+  return starts;
+}
+
+}  // namespace phi
@@ -15,13 +15,13 @@
 #include "paddle/phi/kernels/send_u_recv_kernel.h"
 
 #include <algorithm>
-#include <set>
 #include <vector>
 
 #include "paddle/common/hostdevice.h"
 #include "paddle/phi/backends/cpu/cpu_context.h"
 #include "paddle/phi/core/kernel_registry.h"
 #include "paddle/phi/kernels/cpu/graph_send_recv_funcs.h"
+#include "paddle/phi/kernels/cpu/graph_sorted_segments.h"
 
 namespace phi {
 
@@ -35,20 +35,38 @@ void GraphSendRecvCpuLoop(const int& input_size,
                           const std::string& reduce_op,
                           int* dst_count = nullptr) {
   Functor functor;
-  if (reduce_op == "SUM") {
+  if (IsSortedIndex(d_index, index_size)) {
+    // The edges of each dst are contiguous, so each row of dst is reduced by
+    // one thread without atomics, starting from its first edge.
+    std::vector<int64_t> starts = SortedSegmentStarts(d_index, index_size);
+    int64_t num_segments = static_cast<int64_t>(starts.size()) - 1;
+#ifdef PADDLE_WITH_MKLML
+#pragma omp parallel for
+#endif
+    for (int64_t s = 0; s < num_segments; ++s) {
+      for (int64_t i = starts[s]; i < starts[s + 1]; ++i) {
+        ElementwiseInnerOperation<T, IndexT, Functor>(
+            src, dst, s_index[i], d_index[i], i == starts[s], functor);
+      }
+    }
+  } else if (reduce_op == "SUM" || reduce_op == "MEAN") {
     for (int i = 0; i < index_size; ++i) {
       const IndexT& src_idx = s_index[i];
       const IndexT& dst_idx = d_index[i];
       ElementwiseInnerOperation<T, IndexT, Functor>(
           src, dst, src_idx, dst_idx, false, functor);
     }
-  } else if (reduce_op == "MEAN") {
+  } else if (reduce_op == "MIN" || reduce_op == "MAX") {
+    std::vector<bool> existed_dst(dst->dims()[0], false);
     for (int i = 0; i < index_size; ++i) {
       const IndexT& src_idx = s_index[i];
       const IndexT& dst_idx = d_index[i];
       ElementwiseInnerOperation<T, IndexT, Functor>(
-          src, dst, src_idx, dst_idx, false, functor);
+          src, dst, src_idx, dst_idx, !existed_dst[dst_idx], functor);
+      existed_dst[dst_idx] = true;
     }
+  }
+  if (reduce_op == "MEAN") {
     for (int i = 0; i < index_size; ++i) {
       IndexT dst_idx = d_index[i];
       *(dst_count + dst_idx) += 1;
@@ -59,21 +77,6 @@ void GraphSendRecvCpuLoop(const int& input_size,
       auto eigen_dst = phi::EigenVector<T>::Flatten(dst_slice);
       eigen_dst = eigen_dst / static_cast<T>(*(dst_count + i));
     }
-  } else if (reduce_op == "MIN" || reduce_op == "MAX") {
-    std::set<IndexT> existed_dst;
-    for (int i = 0; i < index_size; ++i) {
-      const IndexT& src_idx = s_index[i];
-      const IndexT& dst_idx = d_index[i];
-      bool in_set = existed_dst.find(dst_idx) != existed_dst.end();
-      if (!in_set) {
-        ElementwiseInnerOperation<T, IndexT, Functor>(
-            src, dst, src_idx, dst_idx, true, functor);
-        existed_dst.emplace(dst_idx);
-      } else {
-        ElementwiseInnerOperation<T, IndexT, Functor>(
-            src, dst, src_idx, dst_idx, false, functor);
-      }
-    }
   }
 }
 
@@ -15,17 +15,52 @@
 #include "paddle/phi/kernels/send_ue_recv_kernel.h"
 
 #include <algorithm>
-#include <set>
 #include <vector>
 
 #include "paddle/common/hostdevice.h"
 #include "paddle/phi/backends/cpu/cpu_context.h"
 #include "paddle/phi/core/kernel_registry.h"
 #include "paddle/phi/kernels/cpu/graph_send_ue_recv_funcs.h"
+#include "paddle/phi/kernels/cpu/graph_sorted_segments.h"
 #include "paddle/phi/kernels/impl/graph_message_passing_impl.h"
 
 namespace phi {
 
+template <typename T,
+          typename IndexT,
+          typename ComputeFunctor,
+          typename ReduceFunctor>
+void GraphSendUERecvSortedCpuKernel(const BroadCastInfo& bcast,
+                                    const T* x_data,
+                                    const T* y_data,
+                                    const IndexT* src_indices,
+                                    const IndexT* dst_indices,
+                                    T* output,
+                                    int64_t index_size,
+                                    ComputeFunctor cfunctor,
+                                    ReduceFunctor rfunctor) {
+  // The edges of each dst are contiguous, so each row of output is reduced by
+  // one thread without atomics, starting from the message of its first edge.
+  std::vector<int64_t> starts = SortedSegmentStarts(dst_indices, index_size);
+  int64_t num_segments = static_cast<int64_t>(starts.size()) - 1;
+#ifdef PADDLE_WITH_MKLML
+#pragma omp parallel for
+#endif
+  for (int64_t s = 0; s < num_segments; s++) {
+    T* out_off = output + dst_indices[starts[s]] * bcast.out_len;
+    for (int64_t i = starts[s]; i < starts[s + 1]; i++) {
+      const T* x_off = x_data + src_indices[i] * bcast.l_len;
+      const T* y_off = y_data + i * bcast.r_len;
+      for (int64_t j = 0; j < bcast.out_len; j++) {
+        int64_t x_add = bcast.use_bcast ? bcast.l_offset[j] : j;
+        int64_t y_add = bcast.use_bcast ? bcast.r_offset[j] : j;
+        T val = cfunctor(x_off[x_add], y_off[y_add]);
+        out_off[j] = i == starts[s] ? val : rfunctor(out_off[j], val);
+      }
+    }
+  }
+}
+
 template <typename T, typename IndexT, typename ComputeFunctor>
 void GraphSendUERecvSumCpuKernel(const BroadCastInfo& bcast,
                                  const T* x_data,
@@ -35,6 +70,18 @@ void GraphSendUERecvSumCpuKernel(const BroadCastInfo& bcast,
                                  T* output,
                                  int64_t index_size,
                                  ComputeFunctor cfunctor) {
+  if (IsSortedIndex(dst_indices, index_size)) {
+    GraphSendUERecvSortedCpuKernel<T, IndexT>(bcast,
+                                              x_data,
+                                              y_data,
+                                              src_indices,
+                                              dst_indices,
+                                              output,
+                                              index_size,
+                                              cfunctor,
+                                              GraphAddFunctor<T>());
+    return;
+  }
 #ifdef PADDLE_WITH_MKLML
 #pragma omp parallel for
 #endif
@@ -69,38 +116,42 @@ void GraphSendUERecvMinMaxCpuKernel(const BroadCastInfo& bcast,
                                     const IndexT* dst_indices,
                                     T* output,
                                     int64_t index_size,
+                                    int64_t num_dst,
                                     ComputeFunctor cfunctor,
                                     CmpFunctor pfunctor) {
-  std::set<IndexT> existed_dst;
-#ifdef PADDLE_WITH_MKLML
-#pragma omp parallel for
-#endif
+  if (IsSortedIndex(dst_indices, index_size)) {
+    GraphSendUERecvSortedCpuKernel<T, IndexT>(bcast,
+                                              x_data,
+                                              y_data,
+                                              src_indices,
+                                              dst_indices,
+                                              output,
+                                              index_size,
+                                              cfunctor,
+                                              pfunctor);
+    return;
+  }
+  // The first message to each dst is assigned instead of reduced, which
+  // depends on the order of the edges, so they are visited in order.
+  std::vector<bool> existed_dst(num_dst, false);
   for (int64_t i = 0; i < index_size; i++) {
     IndexT src = src_indices[i];
     IndexT dst = dst_indices[i];
     T* out_off = output + dst * bcast.out_len;
     const T* x_off = x_data + src * bcast.l_len;
     const T* y_off = y_data + i * bcast.r_len;
-    bool in_set = existed_dst.find(dst) != existed_dst.end();
+    bool in_set = existed_dst[dst];
     for (int64_t j = 0; j < bcast.out_len; j++) {
       int64_t x_add = bcast.use_bcast ? bcast.l_offset[j] : j;
       int64_t y_add = bcast.use_bcast ? bcast.r_offset[j] : j;
       T val = cfunctor(x_off[x_add], y_off[y_add]);
-#ifdef PADDLE_WITH_MKLML
-#pragma omp critical
-#endif
       if (!in_set) {
         out_off[j] = val;
       } else {
         out_off[j] = pfunctor(out_off[j], val);
       }
     }
-#ifdef PADDLE_WITH_MKLML
-#pragma omp critical
-#endif
-    if (!in_set) {
-      existed_dst.emplace(dst);
-    }
+    existed_dst[dst] = true;
   }
 }
 
@@ -192,6 +243,7 @@ void GraphSendUERecvOpKernelLaunchHelper(const Context& ctx,
                                                          d_index,
                                                          out_data,
                                                          index_size,
+                                                         dims_[0],
                                                          add_functor,
                                                          min_functor);
     } else if (message_op == "MUL") {
@@ -206,6 +258,7 @@ void GraphSendUERecvOpKernelLaunchHelper(const Context& ctx,
                                                          d_index,
                                                          out_data,
                                                          index_size,
+                                                         dims_[0],
                                                          mul_functor,
                                                          min_functor);
     }
@@ -223,6 +276,7 @@ void GraphSendUERecvOpKernelLaunchHelper(const Context& ctx,
                                                          d_index,
                                                          out_data,
                                                          index_size,
+                                                         dims_[0],
                                                          add_functor,
                                                          max_functor);
     } else if (message_op == "MUL") {
@@ -237,6 +291,7 @@ void GraphSendUERecvOpKernelLaunchHelper(const Context& ctx,
                                                          d_index,
                                                          out_data,
                                                          index_size,
+                                                         dims_[0],
                                                          mul_functor,
                                                          max_functor);
     }
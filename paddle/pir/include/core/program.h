@@ -73,6 +73,14 @@ class IR_API Program {
 
   uint64_t id() const { return id_; }
 
+  ///
+  /// \brief Structural hash of the program: op identities, operands, result
+  /// types and attributes of every (nested) op, plus the module attributes.
+  /// Any change that alters the printed program changes the fingerprint, but
+  /// computing it only combines hashes of uniqued pointers, without printing.
+  ///
+  size_t Fingerprint() const;
+
  private:
   // computation graph
   ModuleOp module_;
@@ -19,6 +19,7 @@
 #include <unordered_set>
 #include "glog/logging.h"
 #include "paddle/pir/include/core/ir_context.h"
+#include "paddle/pir/include/core/utils.h"
 
 namespace pir {
 
@@ -50,6 +51,56 @@ int64_t GetUniqueRandomId() {
   LOG(FATAL) << "Fatal bug occured in GetUniqueRandomId().";
 }
 
+// AttributeMap is unordered, so entries are folded in an order-independent
+// way to keep the hash stable for equal maps.
+size_t HashAttributeMap(const AttributeMap& attributes) {
+  size_t hash_value = attributes.size();
+  for (const auto& [name, attr] : attributes) {
+    hash_value += detail::hash_combine(std::hash<std::string>()(name),
+                                       std::hash<Attribute>()(attr));
+  }
+  return hash_value;
+}
+
+size_t HashBlock(const Block& block, size_t hash_value);
+
+size_t HashOperation(const Operation& op, size_t hash_value) {
+  hash_value = detail::hash_combine(hash_value, op.id());
+  hash_value =
+      detail::hash_combine(hash_value, HashAttributeMap(op.attributes()));
+  for (uint32_t i = 0; i < op.num_operands(); ++i) {
+    hash_value = detail::hash_combine(
+        hash_value, std::hash<Value>()(op.operand_source(i)));
+  }
+  for (uint32_t i = 0; i < op.num_results(); ++i) {
+    hash_value = detail::hash_combine(hash_value,
+                                      std::hash<Type>()(op.result(i).type()));
+  }
+  for (uint32_t i = 0; i < op.num_regions(); ++i) {
+    for (const auto& block : op.region(i)) {
+      hash_value = HashBlock(block, hash_value);
+    }
+  }
+  return hash_value;
+}
+
+size_t HashBlock(const Block& block, size_t hash_value) {
+  for (uint32_t i = 0; i < block.args_size(); ++i) {
+    hash_value =
+        detail::hash_combine(hash_value, std::hash<Type>()(block.arg_type(i)));
+  }
+  size_t kwargs_hash = block.kwargs_size();
+  for (const auto& [name, value] : block.kwargs()) {
+    kwargs_hash += detail::hash_combine(std::hash<std::string>()(name),
+                                        std::hash<Type>()(value.type()));
+  }
+  hash_value = detail::hash_combine(hash_value, kwargs_hash);
+  for (const auto& op : block) {
+    hash_value = HashOperation(op, hash_value);
+  }
+  return hash_value;
+}
+
 }  // namespace
 
 Program::Program(IrContext* context) {
@@ -85,6 +136,14 @@ std::shared_ptr<Program> Program::Clone(IrMapping& ir_mapping) const {
   return new_program;
 }
 
+size_t Program::Fingerprint() const {
+  size_t hash_value = std::hash<uint64_t>()(id_);
+  hash_value = detail::hash_combine(hash_value, parameters_.size());
+  hash_value = detail::hash_combine(
+      hash_value, HashAttributeMap(module_op()->attributes()));
+  return HashBlock(*block(), hash_value);
+}
+
 void Program::CopyToBlock(IrMapping& ir_mapping, Block* insert_block) const {
   auto clone_options = CloneOptions::All();
   for (const auto& op : *block()) {
@@ -85,17 +85,12 @@ else:
     Tensor.__qualname__ = 'Tensor'
 
 import paddle.distributed.fleet
-import paddle.text
-import paddle.vision
 from paddle import (  # noqa: F401
     amp,
-    audio,
     autograd,
-    dataset,
     decomposition,
     device,
     distributed,
-    distribution,
     geometric,
     incubate,
     inference,
@@ -103,27 +98,40 @@ from paddle import (  # noqa: F401
     jit,
     metric,
     nn,
-    onnx,
     optimizer,
-    quantization,
-    reader,
     regularizer,
-    sparse,
     static,
     sysconfig,
-    vision,
 )
 
 # high-level api
 from . import (  # noqa: F401
     _pir_ops,
     _typing as _typing,
-    callbacks,
     fft,
-    hub,
     linalg,
     signal,
 )
+
+# Subpackages below are not needed by the core framework and are only
+# imported on first attribute access (``paddle.vision``, ``paddle.text``...),
+# see ``_LAZY_SUBMODULES`` at the end of this file. The remaining
+# subpackages above are pulled in by core modules anyway, so deferring them
+# would not save any import time.
+if typing.TYPE_CHECKING:
+    from . import (  # noqa: F401
+        audio,
+        callbacks,
+        dataset,
+        distribution,
+        hub,
+        onnx,
+        quantization,
+        reader,
+        sparse,
+        text,
+        vision,
+    )
 from .autograd import (
     enable_grad,
     grad,
@@ -216,7 +224,7 @@ from .tensor.creation import (
     zeros,
     zeros_like,
 )
-from .tensor.einsum import einsum
+from .tensor.einsum import einsum, einsum_expression
 from .tensor.linalg import (  # noqa: F401
     bincount,
     bmm,
@@ -740,6 +748,7 @@ if __is_metainfo_generated and is_compiled_with_cuda():
 disable_static()
 
 from .pir_utils import IrGuard
+from .utils.lazy_import import lazy_submodules
 
 ir_guard = IrGuard()
 ir_guard._switch_to_pir()
@@ -1096,6 +1105,7 @@ __all__ = [
     'diagonal',
     'broadcast_tensors',
     'einsum',
+    'einsum_expression',
     'set_flags',
     'get_flags',
     'asinh',
@@ -1167,3 +1177,19 @@ __all__ = [
     'combinations',
     'signbit',
 ]
+
+_LAZY_SUBMODULES = [
+    'audio',
+    'callbacks',
+    'dataset',
+    'distribution',
+    'hub',
+    'onnx',
+    'quantization',
+    'reader',
+    'sparse',
+    'text',
+    'vision',
+]
+
+__getattr__, __dir__ = lazy_submodules(__name__, globals(), _LAZY_SUBMODULES)
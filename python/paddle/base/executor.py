@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import copy
 import logging
 import os
@@ -658,10 +659,12 @@ def _prepare_fleet_executor():
 
 def _get_strong_program_cache_key_for_new_exe(program, scope, feed, fetch_list):
     if isinstance(program, PirProgram):
+        # NOTE: str(program) pretty-prints the whole program on every run, the
+        # fingerprint hashes the same structure without formatting any text.
         return (
-            str(program)
-            + str(scope.raw_address())
-            + _get_program_cache_key(feed, fetch_list)
+            program.fingerprint(),
+            scope.raw_address(),
+            _get_feed_fetch_signature(feed, fetch_list),
         )
     else:
         return (
@@ -706,6 +709,28 @@ def _get_program_cache_key(feed, fetch_list):
     return str(_get_feed_fetch_var_names(feed, fetch_list))
 
 
+def _get_feed_fetch_signature(feed, fetch_list):
+    # Same information as _get_program_cache_key, but pir.Value is identified
+    # by its hash instead of str(value), which prints the defining op.
+    def _fetch_signature(var):
+        if isinstance(var, tuple):
+            var = var[0]
+        if isinstance(var, list):
+            return tuple(_fetch_signature(item) for item in var)
+        if isinstance(var, Value):
+            return var.hash()
+        return _to_name_str(var)
+
+    if isinstance(feed, dict):
+        feed_var_names = tuple(feed.keys())
+    elif isinstance(feed, (list, tuple)):
+        feed_var_names = tuple(name for each in feed for name in each.keys())
+    else:
+        feed_var_names = ()
+    fetch_signature = tuple(_fetch_signature(var) for var in fetch_list or [])
+    return feed_var_names, fetch_signature
+
+
 def _as_lodtensor(data, place, dtype=None):
     """
     Convert numpy.ndarray to Tensor, its only support Tensor without LoD information.
@@ -859,6 +884,71 @@ class _StandaloneExecutor:
         return new_exe
 
 
+_ExecutorCacheInfo = collections.namedtuple(
+    "_ExecutorCacheInfo", ["hits", "misses", "maxsize", "currsize"]
+)
+
+
+class _LRUCache:
+    """
+    A memoizer like ``functools.lru_cache`` for single argument functions,
+    whose capacity can be changed after construction.
+    """
+
+    def __init__(self, func, maxsize):
+        self._func = func
+        self._maxsize = maxsize
+        self._cache = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, key):
+        value = self._cache.get(key)
+        if value is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = self._func(key)
+        self._cache[key] = value
+        self._evict()
+        return value
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize):
+        self._maxsize = maxsize
+        self._evict()
+
+    def _evict(self):
+        while len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+
+    def cache_info(self):
+        return _ExecutorCacheInfo(
+            self.hits, self.misses, self._maxsize, len(self._cache)
+        )
+
+    def cache_clear(self):
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def _get_executor_cache_capacity():
+    capacity = get_flags('FLAGS_executor_cache_capacity')[
+        'FLAGS_executor_cache_capacity'
+    ]
+    if capacity < 1:
+        raise ValueError(
+            f"FLAGS_executor_cache_capacity should be positive, but got {capacity}"
+        )
+    return capacity
+
+
 class _ExecutorCache:
     class _CachedData:
         def __init__(
@@ -914,19 +1004,40 @@ class _ExecutorCache:
         def __hash__(self):
             return self.key
 
-    def __init__(self):
+    def __init__(self, capacity=None):
         # NOTE(Ruibiao): Wrap the lru_cache in constructor so that the cache is local to
         # the _ExecutorCache instance, otherwise a global cache may not be released after
         # the Executor instance deleted
-        self._get_cached_program_and_executor = lru_cache(maxsize=8)(
-            self._get_program_and_executor
+        if capacity is None:
+            capacity = _get_executor_cache_capacity()
+        self._get_cached_program_and_executor = _LRUCache(
+            self._get_program_and_executor, capacity
         )
-        self._get_cached_program_and_executor_pir_mode = lru_cache(maxsize=8)(
-            self._get_pir_program_and_executor
+        self._get_cached_program_and_executor_pir_mode = _LRUCache(
+            self._get_pir_program_and_executor, capacity
         )
 
+    @property
+    def capacity(self):
+        return self._get_cached_program_and_executor.maxsize
+
+    @capacity.setter
+    def capacity(self, capacity):
+        if capacity < 1:
+            raise ValueError(
+                f"The capacity of executor cache should be positive, but got {capacity}"
+            )
+        self._get_cached_program_and_executor.maxsize = capacity
+        self._get_cached_program_and_executor_pir_mode.maxsize = capacity
+
+    def cache_info(self, pir_mode=False):
+        if pir_mode:
+            return self._get_cached_program_and_executor_pir_mode.cache_info()
+        return self._get_cached_program_and_executor.cache_info()
+
     def clear(self):
         self._get_cached_program_and_executor.cache_clear()
+        self._get_cached_program_and_executor_pir_mode.cache_clear()
 
     def get_program_and_executor(
         self,
@@ -12,6 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import math
+
+import numpy as np
+
 
 def all_params(mp, pp, sharding, h, l, V):
     # TODO: TBD - add some fixed structure models.
@@ -141,3 +145,140 @@ def get_not_oom_cfgs(cfgs, tuner_cfg):
         valid_cfgs.append(cfg)
     assert valid_cfgs
     return valid_cfgs
+
+
+_SURROGATE_FEATURE_KEYS = [
+    "dp_degree",
+    "mp_degree",
+    "pp_degree",
+    "vpp_degree",
+    "sharding_degree",
+    "sharding_stage",
+    "micro_batch_size",
+    "use_recompute",
+    "recompute_granularity",
+]
+
+_RECOMPUTE_GRANULARITY_LEVEL = {
+    None: 0,
+    "None": 0,
+    "core_attn": 1,
+    "full_attn": 2,
+    "full": 3,
+}
+
+
+def cfg_to_feature(cfg):
+    """Encode a parallel config as a numeric feature vector for surrogates."""
+    feature = []
+    for key in _SURROGATE_FEATURE_KEYS:
+        val = cfg.get(key, None)
+        if key == "use_recompute":
+            feature.append(1.0 if val else 0.0)
+        elif key == "recompute_granularity":
+            level = (
+                _RECOMPUTE_GRANULARITY_LEVEL.get(val, 0)
+                if cfg.get("use_recompute", False)
+                else 0
+            )
+            feature.append(float(level))
+        else:
+            val = 1 if val in [None, ""] else val
+            feature.append(math.log2(max(float(val), 1.0)))
+    return feature
+
+
+def analytic_mem_proxy(cfg):
+    """
+    A relative (unitless) estimate of the per card memory of a parallel config.
+
+    The proxy follows the usual decomposition of model states and activations:
+    parameters, gradients and optimizer states are split by mp/pp and by the
+    sharding stage, and activations grow with the micro batch size and shrink
+    with mp and recompute. It is only meaningful up to a scale factor, which
+    is fitted from the recorded memory usage of finished trials.
+    """
+    mp = cfg.get("mp_degree", 1) or 1
+    pp = cfg.get("pp_degree", 1) or 1
+    vpp = cfg.get("vpp_degree", 1) or 1
+    sharding = cfg.get("sharding_degree", 1) or 1
+    stage = cfg.get("sharding_stage", 1) or 1
+    mbs = cfg.get("micro_batch_size", 1) or 1
+
+    # 2 bytes params + 2 bytes grads + 12 bytes fp32 optimizer states
+    params, grads, opt_states = 2.0, 2.0, 12.0
+    opt_states /= sharding
+    if stage >= 2:
+        grads /= sharding
+    if stage >= 3:
+        params /= sharding
+    model_states = (params + grads + opt_states) / (mp * pp)
+
+    acts = float(mbs) / mp
+    if cfg.get("use_recompute", False):
+        acts *= {
+            "core_attn": 0.6,
+            "full_attn": 0.4,
+            "full": 0.1,
+        }.get(cfg.get("recompute_granularity", "full"), 0.1)
+    if vpp > 1:
+        acts *= 1 + (pp - 1) / (pp * vpp)
+    # activations of the in-flight micro batches of the first pp stage
+    acts *= min(pp, 4)
+    return model_states + acts
+
+
+class GaussianProcessSurrogate:
+    """
+    A small Gaussian process regressor with an RBF kernel.
+
+    It is used to model the metric and the memory usage of parallel configs
+    from the trials in history. The number of trials is small (tens to a few
+    hundreds), so the exact solution in numpy is cheap.
+
+    Args:
+        length_scale (float): The length scale of the RBF kernel in feature space.
+        noise (float): The observation noise added to the diagonal.
+    """
+
+    def __init__(self, length_scale=1.0, noise=1e-2):
+        self.length_scale = length_scale
+        self.noise = noise
+        self._x = None
+        self._alpha = None
+        self._chol = None
+        self._mean = 0.0
+        self._std = 1.0
+
+    def _kernel(self, x1, x2):
+        dist = (
+            np.sum(x1**2, axis=1)[:, None]
+            + np.sum(x2**2, axis=1)[None, :]
+            - 2 * x1 @ x2.T
+        )
+        return np.exp(-0.5 * np.maximum(dist, 0) / self.length_scale**2)
+
+    def fit(self, x, y):
+        x = np.asarray(x, dtype="float64")
+        y = np.asarray(y, dtype="float64")
+        self._mean = float(y.mean())
+        self._std = float(y.std()) or 1.0
+        y = (y - self._mean) / self._std
+        k = self._kernel(x, x) + self.noise * np.eye(len(x))
+        self._chol = np.linalg.cholesky(k)
+        self._alpha = np.linalg.solve(
+            self._chol.T, np.linalg.solve(self._chol, y)
+        )
+        self._x = x
+        return self
+
+    def predict(self, x):
+        """Return the predictive mean and standard deviation."""
+        x = np.asarray(x, dtype="float64")
+        if self._x is None:
+            return np.zeros(len(x)), np.ones(len(x))
+        k_star = self._kernel(x, self._x)
+        mean = k_star @ self._alpha
+        v = np.linalg.solve(self._chol, k_star.T)
+        var = np.maximum(1.0 - np.sum(v**2, axis=0), 1e-12)
+        return mean * self._std + self._mean, np.sqrt(var) * self._std
@@ -13,14 +13,25 @@
 # limitations under the License.
 
 
+import copy
+import csv
 import logging
 import os
 from abc import ABC, abstractmethod
 
+import numpy as np
+
+from .cost_model import (
+    _SURROGATE_FEATURE_KEYS,
+    GaussianProcessSurrogate,
+    analytic_mem_proxy,
+    cfg_to_feature,
+)
 from .prune import _PRUNE_HISTORY_FUNC
 from .utils import (
     gbs_search_all,
     load_configs_from_csv,
+    parse_history_rows,
     search_all,
     search_by_dp_estimation,
 )
@@ -46,10 +57,12 @@ class SearchAlgo(ABC):
 
 
 class GridSearch(SearchAlgo):
-    def __init__(self, tuner_cfg):
+    def __init__(self, tuner_cfg, all_tasks=None):
         super().__init__(tuner_cfg)
         self.idx = 0
-        self.all_tasks = search_all(tuner_cfg)
+        self.all_tasks = (
+            search_all(tuner_cfg) if all_tasks is None else all_tasks
+        )
         need_baseline = self.tuner_cfg.get("need_baseline", False)
         self.baseline = None
         if need_baseline:
@@ -155,3 +168,188 @@ class CustomizeSearch(SearchAlgo):
         new_cfg = self.all_tasks[self.idx]
         self.idx += 1
         return new_cfg
+
+
+class CostModelSearch(SearchAlgo):
+    """
+    Search guided by surrogate models fitted on the finished trials.
+
+    A Gaussian process models the target metric, and the memory usage is
+    modelled by the analytic estimate in ``cost_model`` scaled to the recorded
+    memory plus a Gaussian process on the residual. The next trial is the
+    candidate with the best upper confidence bound among those predicted to
+    fit in ``max_mem_usage``. Rule-based prunes are still applied to every
+    proposal.
+
+    The options are read from ``tuner_cfg["search_algo"]``:
+        num_initial (int): The number of space-filling trials before the surrogates are used. Default: 3.
+        kappa (float): The exploration weight of the upper confidence bound. Default: 1.0.
+        length_scale (float): The length scale of the kernels on log2 features. Default: 1.0.
+        mem_margin (float): The ratio of ``max_mem_usage`` the predicted memory should stay below. Default: 1.0.
+    """
+
+    def __init__(self, tuner_cfg, all_tasks=None):
+        super().__init__(tuner_cfg)
+        algo_cfg = tuner_cfg.get("search_algo", {})
+        self.num_initial = algo_cfg.get("num_initial", 3)
+        self.kappa = algo_cfg.get("kappa", 1.0)
+        self.length_scale = algo_cfg.get("length_scale", 1.0)
+        self.mem_margin = algo_cfg.get("mem_margin", 1.0)
+        self.metric_name = tuner_cfg["metric_cfg"]["name"]
+        self.maximize = (
+            tuner_cfg["metric_cfg"].get("OptimizationDirection", "Maximize")
+            == "Maximize"
+        )
+        self.max_mem_usage = tuner_cfg.get("max_mem_usage", None)
+        self.all_tasks = (
+            search_all(tuner_cfg) if all_tasks is None else all_tasks
+        )
+        self.visited = set()
+
+    def _observations(self, history_cfgs):
+        metric_obs, mem_obs = [], []
+        for cfg in history_cfgs:
+            metric = cfg.get(self.metric_name, None)
+            if isinstance(metric, (int, float)) and cfg.get("time", 0) != -1:
+                metric_obs.append(
+                    (cfg_to_feature(cfg), metric if self.maximize else -metric)
+                )
+            mem = cfg.get("max_mem_usage", None)
+            if isinstance(mem, (int, float)) and mem > 0:
+                mem_obs.append((cfg, mem))
+            elif mem == "OOM" and self.max_mem_usage:
+                # an OOM trial is known to exceed the limit by some margin
+                mem_obs.append((cfg, self.max_mem_usage * 1.1))
+        return metric_obs, mem_obs
+
+    def _predict_mem(self, candidates, mem_obs):
+        proxy = np.array([analytic_mem_proxy(cfg) for cfg in candidates])
+        if not mem_obs:
+            return None
+        obs_proxy = np.array([analytic_mem_proxy(cfg) for cfg, _ in mem_obs])
+        obs_mem = np.array([mem for _, mem in mem_obs], dtype="float64")
+        scale = float(obs_proxy @ obs_mem / (obs_proxy @ obs_proxy))
+        residual = GaussianProcessSurrogate(self.length_scale).fit(
+            [cfg_to_feature(cfg) for cfg, _ in mem_obs],
+            obs_mem - scale * obs_proxy,
+        )
+        mean, _ = residual.predict([cfg_to_feature(cfg) for cfg in candidates])
+        return scale * proxy + mean
+
+    def _initial_order(self, candidates, history_cfgs):
+        """Farthest point sampling, starting from the most memory friendly."""
+        feats = np.array([cfg_to_feature(cfg) for cfg in candidates])
+        tried = [cfg_to_feature(cfg) for cfg in history_cfgs if cfg]
+        if not tried:
+            proxy = [analytic_mem_proxy(cfg) for cfg in candidates]
+            return list(np.argsort(proxy, kind="stable"))
+        tried = np.array(tried)
+        dist = np.min(
+            np.sum((feats[:, None, :] - tried[None, :, :]) ** 2, axis=-1),
+            axis=1,
+        )
+        return list(np.argsort(-dist, kind="stable"))
+
+    def rank_candidates(self, history_cfgs):
+        """Return the unvisited candidate indices ordered by preference."""
+        remaining = [
+            idx for idx in range(len(self.all_tasks)) if idx not in self.visited
+        ]
+        if not remaining:
+            return []
+        candidates = [self.all_tasks[idx] for idx in remaining]
+        metric_obs, mem_obs = self._observations(history_cfgs)
+
+        feasible = np.ones(len(candidates), dtype=bool)
+        if self.max_mem_usage:
+            pred_mem = self._predict_mem(candidates, mem_obs)
+            if pred_mem is not None:
+                feasible = pred_mem < self.max_mem_usage * self.mem_margin
+
+        if len(metric_obs) < self.num_initial:
+            order = self._initial_order(candidates, history_cfgs)
+        else:
+            surrogate = GaussianProcessSurrogate(self.length_scale).fit(
+                [x for x, _ in metric_obs], [y for _, y in metric_obs]
+            )
+            mean, std = surrogate.predict(
+                [cfg_to_feature(cfg) for cfg in candidates]
+            )
+            order = list(np.argsort(-(mean + self.kappa * std), kind="stable"))
+        # predicted OOM candidates are only tried after all the others
+        order = [i for i in order if feasible[i]] + [
+            i for i in order if not feasible[i]
+        ]
+        return [remaining[i] for i in order]
+
+    def search_once(self, history_cfgs):
+        for idx in self.rank_candidates(history_cfgs):
+            self.visited.add(idx)
+            new_cfg = self.all_tasks[idx]
+            pruned = self.prune(
+                self.tuner_cfg, new_cfg, history_cfgs, self.pruned_cfgs
+            )
+            self.pruned_cfgs.append(new_cfg)
+            if not pruned:
+                return new_cfg
+        return None
+
+
+def replay_search(tuner_cfg, history_csv_path, algo_cls=CostModelSearch):
+    """
+    Replay a search algorithm offline against a recorded history csv.
+
+    Every config recorded in the csv is a candidate, and running a trial
+    means looking up its recorded metric and memory usage. It is used to
+    compare how many trials different algorithms need to reach the best
+    recorded config without launching any job.
+
+    Args:
+        tuner_cfg (dict): The configuration of auto tuner, ``metric_cfg`` is required.
+        history_csv_path (str): The path of the csv stored by ``HistoryRecorder``.
+        algo_cls (type): The search algorithm to replay, which accepts the
+            candidates through ``all_tasks``. Default: CostModelSearch.
+
+    Returns:
+        list: The trials in the order they were proposed, with recorded results.
+    """
+    with open(history_csv_path, "r") as f:
+        records = parse_history_rows(
+            list(csv.reader(f)), tuner_cfg["metric_cfg"]["name"]
+        )
+    defaults = {
+        "vpp_degree": 1,
+        "sharding_stage": 1,
+        "use_recompute": False,
+        "recompute_granularity": None,
+    }
+
+    def _key(cfg):
+        return tuple(str(cfg[key]) for key in _SURROGATE_FEATURE_KEYS)
+
+    tasks, results = [], {}
+    for record in records:
+        task = {
+            key: record.get(key, defaults.get(key, 1))
+            for key in _SURROGATE_FEATURE_KEYS
+        }
+        if task["use_recompute"] and task["recompute_granularity"] is None:
+            task["recompute_granularity"] = "full"
+        tasks.append(task)
+        results[_key(task)] = record
+
+    algo = algo_cls(copy.deepcopy(tuner_cfg), all_tasks=tasks)
+
+    metric_name = tuner_cfg["metric_cfg"]["name"]
+    history = []
+    while len(history) < len(tasks):
+        new_cfg = algo.search_once(history)
+        if new_cfg is None:
+            break
+        trial = copy.deepcopy(new_cfg)
+        record = results[_key(new_cfg)]
+        trial[metric_name] = record.get(metric_name, None)
+        trial["max_mem_usage"] = record.get("max_mem_usage", None)
+        trial["time"] = -1 if trial[metric_name] is None else trial[metric_name]
+        history.append(trial)
+    return history
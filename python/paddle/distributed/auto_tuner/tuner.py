@@ -15,7 +15,11 @@
 import csv
 import os
 
-from .utils import default_candidates, gbs_default_candidates
+from .utils import (
+    default_candidates,
+    gbs_default_candidates,
+    parse_history_rows,
+)
 
 
 class AutoTuner:
@@ -38,6 +42,11 @@ class AutoTuner:
 
             tuner_cfg["candidates"] = default_candidates(tuner_cfg)
             self.algo = GridSearch(tuner_cfg)
+        elif search_algo == "cost_model":
+            from .search import CostModelSearch
+
+            tuner_cfg["candidates"] = default_candidates(tuner_cfg)
+            self.algo = CostModelSearch(tuner_cfg)
         elif search_algo == "dp_estimation":
             from .search import DpEstimationSearch
 
@@ -88,32 +97,9 @@ class AutoTuner:
                 writer = csv.writer(fwrite)
                 for row in data_list:
                     writer.writerow(row)
-        # chang str type to real type
-        for row in data_list:
-            for i, value in enumerate(row):
-                try:
-                    row[i] = int(value)
-                except ValueError:
-                    try:
-                        row[i] = float(value)
-                    except ValueError:
-                        pass
-
-        data_dict = []
-        keys = data_list[0]
-        values = data_list[1:]
-        for val in values:
-            val = [x if x != '' else None for x in val]
-            val = [True if x == 'True' else x for x in val]
-            val = [False if x == 'False' else x for x in val]
-            dictionary = dict(zip(keys, val))
-            time_val = -1
-            target_key = self.tuner_cfg["metric_cfg"]["name"]
-            if dictionary[target_key]:
-                time_val = dictionary[target_key]
-            dictionary["time"] = time_val
-            data_dict.append(dictionary)
-        self.resume_cfgs = data_dict
+        self.resume_cfgs = parse_history_rows(
+            data_list, self.tuner_cfg["metric_cfg"]["name"]
+        )
 
     def get_cfg_from_resume(self, cur_cfg):
         """Get cfg from resume cfgs"""
@@ -1781,6 +1781,39 @@ def gbs_search_all(tuner_cfg):
     return new_all_cfgs
 
 
+def parse_history_rows(data_list, metric_name):
+    """
+    Change the rows read from a history csv, the keys being the first row,
+    to configs of real types, with the metric of a trial as ``time`` and -1
+    for a trial without metric.
+    """
+    # chang str type to real type
+    for row in data_list:
+        for i, value in enumerate(row):
+            try:
+                row[i] = int(value)
+            except ValueError:
+                try:
+                    row[i] = float(value)
+                except ValueError:
+                    pass
+
+    data_dict = []
+    keys = data_list[0]
+    values = data_list[1:]
+    for val in values:
+        val = [x if x != '' else None for x in val]
+        val = [True if x == 'True' else x for x in val]
+        val = [False if x == 'False' else x for x in val]
+        dictionary = dict(zip(keys, val))
+        time_val = -1
+        if dictionary[metric_name]:
+            time_val = dictionary[metric_name]
+        dictionary["time"] = time_val
+        data_dict.append(dictionary)
+    return data_dict
+
+
 def load_configs_from_csv(configs_csv):
     """Load the configs from csv file."""
     all_configs = []
@@ -12,10 +12,83 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import struct
 import sys
 
+import numpy as np
+
 __all__ = []
 
+# A sample in the binary format is its payload size in bytes as uint32,
+# followed by its slots. A slot is its type, b"u" for uint64 or b"f" for
+# float32, its number of feasigns as uint32, and its feasigns, all in little
+# endian. The slots are in the order of the slots of the data feed.
+_UINT64_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def _pack_slot(elements, is_float):
+    if isinstance(elements, np.ndarray):
+        data = elements.ravel().astype("<f4" if is_float else "<u8")
+        header = struct.pack("<cI", b"f" if is_float else b"u", data.size)
+        return header + data.tobytes()
+    num = len(elements)
+    if is_float:
+        return struct.pack(f"<cI{num}f", b"f", num, *elements)
+    try:
+        return struct.pack(f"<cI{num}Q", b"u", num, *elements)
+    except struct.error:
+        # negative ids wrap around as they are parsed by strtoull
+        return struct.pack(
+            f"<cI{num}Q", b"u", num, *[e & _UINT64_MASK for e in elements]
+        )
+
+
+def _pack_sample(slots):
+    payload = b"".join(
+        _pack_slot(elements, is_float) for elements, is_float in slots
+    )
+    return struct.pack("<I", len(payload)) + payload
+
+
+def _pack_numpy_batch(columns, is_float):
+    """
+    Encode a batch of samples whose feasigns are all numpy arrays at once.
+    columns[i][j] is the feasigns of slot i of sample j.
+    """
+    num_samples = len(columns[0])
+    counts = np.array(
+        [[elements.size for elements in column] for column in columns],
+        dtype=np.int64,
+    ).T
+    widths = np.where(is_float, 4, 8)
+    slot_bytes = 5 + counts * widths
+    payload_bytes = slot_bytes.sum(axis=1)
+    record_bytes = 4 + payload_bytes
+    record_start = np.cumsum(record_bytes) - record_bytes
+    slot_start = (
+        record_start[:, None] + 4 + np.cumsum(slot_bytes, axis=1) - slot_bytes
+    )
+    out = np.empty(int(record_bytes.sum()), dtype=np.uint8)
+
+    def put(start, values, dtype):
+        values = np.asarray(values).astype(dtype).view(np.uint8)
+        values = values.reshape([num_samples, -1])
+        out[start[:, None] + np.arange(values.shape[1])] = values
+
+    put(record_start, payload_bytes, "<u4")
+    for i, column in enumerate(columns):
+        start = slot_start[:, i]
+        out[start] = ord("f") if is_float[i] else ord("u")
+        put(start + 1, counts[:, i], "<u4")
+        data = np.concatenate([elements.ravel() for elements in column])
+        data = data.astype("<f4" if is_float[i] else "<u8").view(np.uint8)
+        data_bytes = counts[:, i] * widths[i]
+        data_start = np.cumsum(data_bytes) - data_bytes
+        out[
+            np.repeat(start + 5 - data_start, data_bytes) + np.arange(data.size)
+        ] = data
+    return out.tobytes()
+
 
 class DataGenerator:
     """
@@ -28,6 +101,7 @@ class DataGenerator:
     def __init__(self):
         self._proto_info = None
         self.batch_size_ = 32
+        self._output_format = "text"
 
     def set_batch(self, batch_size):
         '''
@@ -56,6 +130,43 @@ class DataGenerator:
         '''
         self.batch_size_ = batch_size
 
+    def set_output_format(self, output_format):
+        '''
+        Set the format of the data written to stdout, "text" or "binary".
+        The text format is a line of whitespace separated feasigns for each
+        sample. The binary format is a length prefixed record of the
+        feasigns for each sample, which is read by InMemoryDataset with
+        ``binary_slots=True`` without parsing any text, and which encodes the
+        samples of numpy arrays a batch at a time. Default is "text".
+
+        Example:
+
+            .. code-block:: python
+
+                >>> import paddle.distributed.fleet.data_generator as dg
+                >>> class MyData(dg.MultiSlotDataGenerator):
+                ...     def generate_sample(self, line):
+                ...         def local_iter():
+                ...             int_words = [int(x) for x in line.split()]
+                ...             yield ("words", int_words)
+                ...         return local_iter
+                >>> mydata = MyData()
+                >>> mydata.set_output_format("binary")
+
+        '''
+        if output_format not in ["text", "binary"]:
+            raise ValueError(
+                f"output_format must be 'text' or 'binary', but got {output_format}."
+            )
+        self._output_format = output_format
+
+    def _write_batch(self, batch_samples):
+        batch_iter = self.generate_batch(batch_samples)
+        if self._output_format == "binary":
+            sys.stdout.buffer.write(self._gen_batch_bytes(list(batch_iter())))
+        else:
+            sys.stdout.write("".join(map(self._gen_str, batch_iter())))
+
     def run_from_memory(self):
         '''
         This function generator data from memory, it is usually used for
@@ -81,14 +192,11 @@ class DataGenerator:
                 continue
             batch_samples.append(user_parsed_line)
             if len(batch_samples) == self.batch_size_:
-                batch_iter = self.generate_batch(batch_samples)
-                for sample in batch_iter():
-                    sys.stdout.write(self._gen_str(sample))
+                self._write_batch(batch_samples)
                 batch_samples = []
         if len(batch_samples) > 0:
-            batch_iter = self.generate_batch(batch_samples)
-            for sample in batch_iter():
-                sys.stdout.write(self._gen_str(sample))
+            self._write_batch(batch_samples)
+        sys.stdout.flush()
 
     def run_from_stdin(self):
         '''
@@ -121,14 +229,11 @@ class DataGenerator:
                     continue
                 batch_samples.append(user_parsed_line)
                 if len(batch_samples) == self.batch_size_:
-                    batch_iter = self.generate_batch(batch_samples)
-                    for sample in batch_iter():
-                        sys.stdout.write(self._gen_str(sample))
+                    self._write_batch(batch_samples)
                     batch_samples = []
         if len(batch_samples) > 0:
-            batch_iter = self.generate_batch(batch_samples)
-            for sample in batch_iter():
-                sys.stdout.write(self._gen_str(sample))
+            self._write_batch(batch_samples)
+        sys.stdout.flush()
 
     def _gen_str(self, line):
         '''
@@ -146,6 +251,23 @@ class DataGenerator:
             "pls use MultiSlotDataGenerator or PairWiseDataGenerator"
         )
 
+    def _gen_bytes(self, line):
+        '''
+        The binary counterpart of _gen_str, see set_output_format.
+
+        Args:
+            line(str): the output of the process() function rewritten by user.
+
+        Returns:
+            Return a bytes data that can be read directly by the datafeed.
+        '''
+        raise NotImplementedError(
+            "pls use MultiSlotDataGenerator or MultiSlotStringDataGenerator"
+        )
+
+    def _gen_batch_bytes(self, samples):
+        return b"".join(map(self._gen_bytes, samples))
+
     def generate_sample(self, line):
         '''
         This function needs to be overridden by the user to process the
@@ -254,6 +376,14 @@ class MultiSlotStringDataGenerator(DataGenerator):
         Returns:
             Return a string data that can be read directly by the MultiSlotDataFeed.
         '''
+        line = self._check_line(line)
+        output = []
+        for name, elements in line:
+            output.append(str(len(elements)))
+            output.extend(elements)
+        return " ".join(output) + "\n"
+
+    def _check_line(self, line):
         if isinstance(line, zip):
             line = list(line)
 
@@ -262,16 +392,26 @@ class MultiSlotStringDataGenerator(DataGenerator):
                 "the output of process() must be in list or tuple type"
                 "Examples: [('words', ['1926', '08', '17']), ('label', ['1'])]"
             )
-        output = ""
-        for index, item in enumerate(line):
-            name, elements = item
-            if output:
-                output += " "
-            out_str = []
-            out_str.append(str(len(elements)))
-            out_str.extend(elements)
-            output += " ".join(out_str)
-        return output + "\n"
+        return line
+
+    def _gen_bytes(self, line):
+        '''
+        The binary counterpart of _gen_str. The feasigns of a slot are
+        written as uint64 if all of them are integers, as float32 otherwise.
+
+        Args:
+            line(str): the output of the process() function rewritten by user.
+
+        Returns:
+            Return a bytes data that can be read directly by the MultiSlotInMemoryDataFeed.
+        '''
+        slots = []
+        for name, elements in self._check_line(line):
+            try:
+                slots.append(([int(elem) for elem in elements], False))
+            except ValueError:
+                slots.append(([float(elem) for elem in elements], True))
+        return _pack_sample(slots)
 
 
 class MultiSlotDataGenerator(DataGenerator):
@@ -303,6 +443,80 @@ class MultiSlotDataGenerator(DataGenerator):
         Returns:
             Return a string data that can be read directly by the MultiSlotDataFeed.
         '''
+        output = []
+        for elements in self._check_line(line):
+            output.append(str(len(elements)))
+            output.extend(map(str, elements))
+        return " ".join(output) + "\n"
+
+    def _gen_bytes(self, line):
+        '''
+        The binary counterpart of _gen_str. The feasigns of a slot are written
+        as float32 if the slot is of float type in proto_info, as uint64
+        otherwise.
+
+        Args:
+            line(str): the output of the process() function rewritten by user.
+
+        Returns:
+            Return a bytes data that can be read directly by the MultiSlotInMemoryDataFeed.
+        '''
+        slots = self._check_line(line)
+        return _pack_sample(zip(slots, self._float_slots()))
+
+    def _gen_batch_bytes(self, samples):
+        samples = [self._check_line(sample) for sample in samples]
+        is_float = self._float_slots()
+        if samples and all(
+            isinstance(elements, np.ndarray)
+            for sample in samples
+            for elements in sample
+        ):
+            return _pack_numpy_batch(list(zip(*samples)), is_float)
+        return b"".join(
+            _pack_sample(zip(sample, is_float)) for sample in samples
+        )
+
+    def _float_slots(self):
+        return [slot_type == "float" for _, slot_type in self._proto_info]
+
+    def _check_elements(self, elements):
+        if not isinstance(elements, (list, np.ndarray)):
+            raise ValueError(f"elements{type(elements)} must be in list type")
+        if len(elements) == 0:
+            raise ValueError(
+                "the elements of each field can not be empty, you need padding it in process()."
+            )
+
+    def _element_type(self, elements, check_all):
+        """
+        The type of a slot with the elements, "float" if any of them is a
+        float, "uint64" otherwise. The elements after the first float are
+        not checked unless check_all.
+        """
+        if isinstance(elements, np.ndarray):
+            if elements.dtype.kind not in "iubf":
+                raise ValueError(
+                    f"the type of element{elements.dtype} must be in int or float"
+                )
+            return "float" if elements.dtype.kind == "f" else "uint64"
+        slot_type = "uint64"
+        for elem in elements:
+            if isinstance(elem, float):
+                slot_type = "float"
+                if not check_all:
+                    break
+            elif not isinstance(elem, int):
+                raise ValueError(
+                    f"the type of element{type(elem)} must be in int or float"
+                )
+        return slot_type
+
+    def _check_line(self, line):
+        """
+        Check the output of process() and update proto_info, return the
+        feasigns of each slot.
+        """
         if isinstance(line, zip):
             line = list(line)
 
@@ -311,7 +525,6 @@ class MultiSlotDataGenerator(DataGenerator):
                 "the output of process() must be in list or tuple type"
                 "Example: [('words', [1926, 08, 17]), ('label', [1])]"
             )
-        output = ""
 
         if self._proto_info is None:
             self._proto_info = []
@@ -319,26 +532,10 @@ class MultiSlotDataGenerator(DataGenerator):
                 name, elements = item
                 if not isinstance(name, str):
                     raise ValueError(f"name{type(name)} must be in str type")
-                if not isinstance(elements, list):
-                    raise ValueError(
-                        f"elements{type(elements)} must be in list type"
-                    )
-                if not elements:
-                    raise ValueError(
-                        "the elements of each field can not be empty, you need padding it in process()."
-                    )
-                self._proto_info.append((name, "uint64"))
-                if output:
-                    output += " "
-                output += str(len(elements))
-                for elem in elements:
-                    if isinstance(elem, float):
-                        self._proto_info[-1] = (name, "float")
-                    elif not isinstance(elem, int):
-                        raise ValueError(
-                            f"the type of element{type(elem)} must be in int or float"
-                        )
-                    output += " " + str(elem)
+                self._check_elements(elements)
+                self._proto_info.append(
+                    (name, self._element_type(elements, True))
+                )
         else:
             if len(line) != len(self._proto_info):
                 raise ValueError(
@@ -348,28 +545,14 @@ class MultiSlotDataGenerator(DataGenerator):
                 name, elements = item
                 if not isinstance(name, str):
                     raise ValueError(f"name{type(name)} must be in str type")
-                if not isinstance(elements, list):
-                    raise ValueError(
-                        f"elements{type(elements)} must be in list type"
-                    )
-                if not elements:
-                    raise ValueError(
-                        "the elements of each field can not be empty, you need padding it in process()."
-                    )
+                self._check_elements(elements)
                 if name != self._proto_info[index][0]:
                     raise ValueError(
                         f"the field name of two given line are not match: require<{self._proto_info[index][0]}>, get<{name}>."
                     )
-                if output:
-                    output += " "
-                output += str(len(elements))
-                for elem in elements:
-                    if self._proto_info[index][1] != "float":
-                        if isinstance(elem, float):
-                            self._proto_info[index] = (name, "float")
-                        elif not isinstance(elem, int):
-                            raise ValueError(
-                                f"the type of element{type(elem)} must be in int or float"
-                            )
-                    output += " " + str(elem)
-        return output + "\n"
+                if self._proto_info[index][1] != "float":
+                    self._proto_info[index] = (
+                        name,
+                        self._element_type(elements, False),
+                    )
+        return [elements for _, elements in line]
@@ -458,6 +458,7 @@ class InMemoryDataset(DatasetBase):
             download_cmd(str): customized download command. default is "cat"
             data_feed_type(str): data feed type used in c++ code. default is "MultiSlotInMemoryDataFeed".
             queue_num(int): Dataset output queue num, training threads get data from queues. default is-1, which is set same as thread number in c++.
+            binary_slots(bool): Set if the pipe command writes the binary format of MultiSlotDataGenerator instead of text. default is False.
 
             merge_size(int): ins size to merge, if merge_size > 0, set merge by line id,
                              instances of same line id will be merged after shuffle,
@@ -508,6 +509,8 @@ class InMemoryDataset(DatasetBase):
                 self._set_download_cmd(kwargs[key])
             elif key == "merge_size" and kwargs.get("merge_size", -1) > 0:
                 self._set_merge_by_lineid(kwargs[key])
+            elif key == "binary_slots":
+                self._set_binary_slots(kwargs[key])
             elif key == "parse_ins_id":
                 self._set_parse_ins_id(kwargs[key])
             elif key == "parse_content":
@@ -539,6 +542,7 @@ class InMemoryDataset(DatasetBase):
             download_cmd(str): customized download command. default is "cat"
             data_feed_type(str): data feed type used in c++ code. default is "MultiSlotInMemoryDataFeed".
             queue_num(int): Dataset output queue num, training threads get data from queues. default is -1, which is set same as thread number in c++.
+            binary_slots(bool): Set if the pipe command writes the binary format of MultiSlotDataGenerator instead of text. default is False.
 
         Examples:
             .. code-block:: python
@@ -613,6 +617,9 @@ class InMemoryDataset(DatasetBase):
             queue_num = kwargs.get("queue_num", -1)
             self._set_queue_num(queue_num)
 
+        binary_slots = kwargs.get("binary_slots", False)
+        self._set_binary_slots(binary_slots)
+
     def _set_feed_type(self, data_feed_type):
         """
         Set data_feed_desc
@@ -676,6 +683,27 @@ class InMemoryDataset(DatasetBase):
         self.is_user_set_queue_num = True
         self.queue_num = queue_num
 
+    def _set_binary_slots(self, binary_slots):
+        """
+        Set if the pipe command writes the binary format of
+        MultiSlotDataGenerator, see its set_output_format, instead of text.
+        Only supported by MultiSlotInMemoryDataFeed, without parsing ins_id,
+        content or logkey.
+
+        Args:
+            binary_slots(bool): if read binary samples or not
+
+        Examples:
+            .. code-block:: python
+
+                >>> import paddle
+                >>> paddle.enable_static()
+                >>> dataset = paddle.distributed.InMemoryDataset()
+                >>> dataset._set_binary_slots(True)
+
+        """
+        self.proto_desc.binary_slots = binary_slots
+
     def _set_parse_ins_id(self, parse_ins_id):
         """
         Set if Dataset need to parse insid
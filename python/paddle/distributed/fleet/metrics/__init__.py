@@ -12,6 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .metric import acc, auc, mae, max, min, mse, rmse, sum  # noqa: F401
+from .metric import (  # noqa: F401
+    MetricAggregator,
+    acc,
+    auc,
+    mae,
+    max,
+    min,
+    mse,
+    rmse,
+    sum,
+)
 
 __all__ = []
@@ -22,6 +22,141 @@ from paddle.common_ops_import import Variable
 
 __all__ = []
 
+# the windows of buckets of the bucket error, see FleetUtil.get_global_metrics
+_BUCKET_ERROR_MAX_SPAN = 0.01
+_BUCKET_ERROR_RELATIVE_BOUND = 0.05
+
+
+def _get_value(input, scope):
+    if isinstance(input, Variable):
+        return np.array(scope.find_var(input.name).get_tensor())
+    elif isinstance(input, str):
+        return np.array(scope.find_var(input).get_tensor())
+    return np.asarray(input)
+
+
+def _all_reduce_packed(util, arrays, mode="sum"):
+    """
+    All reduce the arrays by a single all_reduce of a buffer packing all of
+    them, return the reduced arrays in their own shapes and dtypes.
+    """
+    arrays = [np.asarray(array) for array in arrays]
+    buffer = np.concatenate(
+        [array.reshape(-1).astype(np.float64) for array in arrays]
+    )
+    buffer = np.asarray(util.all_reduce(buffer, mode)).reshape(-1)
+    outputs = []
+    offset = 0
+    for array in arrays:
+        output = buffer[offset : offset + array.size]
+        outputs.append(output.reshape(array.shape).astype(array.dtype))
+        offset += array.size
+    return outputs
+
+
+def _first(array):
+    return float(np.asarray(array).reshape(-1)[0])
+
+
+def _auc_from_buckets(global_pos, global_neg):
+    """
+    The area under the ROC of the pos and neg counts of the buckets, from
+    the highest bucket down.
+    """
+    pos = np.asarray(global_pos, dtype=np.float64)[::-1]
+    neg = np.asarray(global_neg, dtype=np.float64)[::-1]
+    cum_pos = np.cumsum(pos)
+    # the trapezoid between each bucket and the next one
+    area = np.sum(neg * (2 * cum_pos - pos)) / 2
+    total_pos = pos.sum()
+    total_neg = neg.sum()
+    if total_pos * total_neg == 0 or total_pos + total_neg == 0:
+        return 0.5
+    return float(area / (total_pos * total_neg))
+
+
+def _bucket_error(global_pos, global_neg):
+    """
+    The relative error of the actual ctr to the predicted ctr of the buckets.
+    From the lowest bucket up, the buckets are merged into a window until the
+    relative error of its predicted ctr is small enough, then its error
+    counts, or until it spans too wide a ctr, then it is dropped.
+
+    The sums of a window are differences of the cumulative sums of the
+    buckets, so that each window is found by a few vectorized operations,
+    and the runs of buckets which are counted alone are skipped at once.
+    """
+    click = np.asarray(global_pos, dtype=np.float64)
+    show = click + np.asarray(global_neg, dtype=np.float64)
+    num_bucket = len(click)
+    ctr = np.arange(num_bucket, dtype=np.float64) / num_bucket
+
+    def counted(impression, ctr_sum, click_sum):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            adjust_ctr = ctr_sum / impression
+            relative_error = np.sqrt(
+                (1 - adjust_ctr) / (adjust_ctr * impression)
+            )
+            error = np.abs(click_sum / impression / adjust_ctr - 1) * impression
+        valid = (
+            (impression != 0)
+            & (adjust_ctr != 0)
+            & (relative_error < _BUCKET_ERROR_RELATIVE_BOUND)
+        )
+        return valid, error
+
+    def cumsum(values):
+        return np.concatenate([[0.0], np.cumsum(values)])
+
+    cum_show = cumsum(show)
+    cum_ctr = cumsum(ctr * show)
+    cum_click = cumsum(click)
+    alone, alone_error = counted(show, ctr * show, click)
+    cum_alone_error = cumsum(np.where(alone, alone_error, 0.0))
+    not_alone = np.flatnonzero(~alone)
+
+    error_sum = 0.0
+    error_count = 0.0
+    start = 0
+    while start < num_bucket:
+        if alone[start]:
+            index = np.searchsorted(not_alone, start)
+            stop = not_alone[index] if index < len(not_alone) else num_bucket
+            error_sum += cum_alone_error[stop] - cum_alone_error[start]
+            error_count += cum_show[stop] - cum_show[start]
+            start = stop
+            continue
+        # the window is searched in chunks of doubling length, as most of
+        # the windows are much narrower than the max span
+        lo = start
+        stop = num_bucket
+        chunk = 16
+        while lo < stop:
+            hi = lo + chunk if lo + chunk < stop else stop
+            wide = np.flatnonzero(
+                np.abs(ctr[lo:hi] - ctr[start]) > _BUCKET_ERROR_MAX_SPAN
+            )
+            if len(wide) > 0:
+                hi = stop = lo + wide[0]
+            end = slice(lo + 1, hi + 1)
+            valid, error = counted(
+                cum_show[end] - cum_show[start],
+                cum_ctr[end] - cum_ctr[start],
+                cum_click[end] - cum_click[start],
+            )
+            valid = np.flatnonzero(valid)
+            if len(valid) > 0:
+                index = lo + valid[0]
+                error_sum += error[valid[0]]
+                error_count += cum_show[index + 1] - cum_show[start]
+                stop = index + 1
+                break
+            lo = hi
+            chunk *= 2
+        start = stop
+
+    return float(error_sum / error_count) if error_count > 0 else 0.0
+
 
 def sum(input, scope=None, util=None):
     """
@@ -187,47 +322,8 @@ def auc(stat_pos, stat_neg, scope=None, util=None):
         stat_neg = np.array(scope.find_var(stat_neg.name).get_tensor())
     elif isinstance(stat_neg, str):
         stat_neg = np.array(scope.find_var(stat_neg).get_tensor())
-    # auc pos bucket shape
-    old_pos_shape = np.array(stat_pos.shape)
-    # reshape to one dim
-    stat_pos = stat_pos.reshape(-1)
-    global_pos = np.copy(stat_pos) * 0
-    # mpi allreduce
-    global_pos = util.all_reduce(stat_pos, "sum")
-    global_pos = global_pos.reshape(old_pos_shape)
-
-    # auc neg bucket
-    old_neg_shape = np.array(stat_neg.shape)
-    stat_neg = stat_neg.reshape(-1)
-    global_neg = np.copy(stat_neg) * 0
-    global_neg = util.all_reduce(stat_neg, "sum")
-    global_neg = global_neg.reshape(old_neg_shape)
-
-    # calculate auc
-    num_bucket = len(global_pos[0])
-    area = 0.0
-    pos = 0.0
-    neg = 0.0
-    new_pos = 0.0
-    new_neg = 0.0
-    total_ins_num = 0
-    for i in range(num_bucket):
-        index = num_bucket - 1 - i
-        new_pos = pos + global_pos[0][index]
-        total_ins_num += global_pos[0][index]
-        new_neg = neg + global_neg[0][index]
-        total_ins_num += global_neg[0][index]
-        area += (new_neg - neg) * (pos + new_pos) / 2
-        pos = new_pos
-        neg = new_neg
-
-    auc_value = None
-    if pos * neg == 0 or total_ins_num == 0:
-        auc_value = 0.5
-    else:
-        auc_value = area / (pos * neg)
-
-    return auc_value
+    global_pos, global_neg = _all_reduce_packed(util, [stat_pos, stat_neg])
+    return _auc_from_buckets(global_pos[0], global_neg[0])
 
 
 def mae(abserr, total_ins_num, scope=None, util=None):
@@ -269,15 +365,11 @@ def mae(abserr, total_ins_num, scope=None, util=None):
     elif isinstance(total_ins_num, str):
         total_ins_num = np.array(scope.find_var(total_ins_num).get_tensor())
 
-    old_metric_shape = np.array(abserr.shape)
-    abserr = abserr.reshape(-1)
-    global_metric = np.copy(abserr) * 0
+    global_metric, global_total_num = _all_reduce_packed(
+        util, [abserr, total_ins_num]
+    )
 
-    global_metric = util.all_reduce(abserr, "sum")
-    global_metric = global_metric.reshape(old_metric_shape)
-    global_total_num = util.all_reduce(total_ins_num, "sum")
-
-    mae_value = float(global_metric[0]) / float(global_total_num[0])
+    mae_value = _first(global_metric) / _first(global_total_num)
     return mae_value
 
 
@@ -319,15 +411,11 @@ def rmse(sqrerr, total_ins_num, scope=None, util=None):
         )
     elif isinstance(total_ins_num, str):
         total_ins_num = np.array(scope.find_var(total_ins_num).get_tensor())
-    old_metric_shape = np.array(sqrerr.shape)
-    sqrerr = sqrerr.reshape(-1)
-    global_metric = np.copy(sqrerr) * 0
-
-    global_metric = util.all_reduce(sqrerr, "sum")
-    global_metric = global_metric.reshape(old_metric_shape)
-    global_total_num = util.all_reduce(total_ins_num, "sum")
+    global_metric, global_total_num = _all_reduce_packed(
+        util, [sqrerr, total_ins_num]
+    )
 
-    rmse_value = math.sqrt(float(global_metric[0]) / float(global_total_num[0]))
+    rmse_value = math.sqrt(_first(global_metric) / _first(global_total_num))
 
     return rmse_value
 
@@ -370,15 +458,11 @@ def mse(sqrerr, total_ins_num, scope=None, util=None):
         )
     elif isinstance(total_ins_num, str):
         total_ins_num = np.array(scope.find_var(total_ins_num).get_tensor())
-    old_metric_shape = np.array(sqrerr.shape)
-    sqrerr = sqrerr.reshape(-1)
-    global_metric = np.copy(sqrerr) * 0
-
-    global_metric = util.all_reduce(sqrerr, "sum")
-    global_metric = global_metric.reshape(old_metric_shape)
-    global_total_num = util.all_reduce(total_ins_num, "sum")
+    global_metric, global_total_num = _all_reduce_packed(
+        util, [sqrerr, total_ins_num]
+    )
 
-    mse_value = float(global_metric[0]) / float(global_total_num[0])
+    mse_value = _first(global_metric) / _first(global_total_num)
     return mse_value
 
 
@@ -430,10 +514,192 @@ def acc(correct, total, scope=None, util=None):
     elif isinstance(total, str):
         total = np.array(scope.find_var(total).get_tensor())
 
-    global_correct_num = np.copy(correct) * 0
-    global_total_num = np.copy(total) * 0
+    global_correct_num, global_total_num = _all_reduce_packed(
+        util, [correct, total]
+    )
+
+    return _first(global_correct_num) / _first(global_total_num)
+
+
+class MetricAggregator:
+    """
+    Compute many distributed metrics in fleet together. The states of all
+    the metrics added are packed into a single buffer, which is reduced by
+    a single all_reduce for all the metrics reduced by sum, instead of one
+    or two blocking all_reduce for each of them, and the metrics are
+    computed from the reduced states vectorized in numpy.
+
+    The states are read when the metrics are computed, so the aggregator
+    can be built once and computed every few steps.
+
+    Args:
+        scope(Scope): specific scope, default is the global scope
+        util(UtilBase): the util to all_reduce with, default is fleet.util
+
+    Example:
+        .. code-block:: python
+
+            >>> # doctest: +REQUIRES(env:DISTRIBUTED)
+            >>> # in model.py
+            >>> auc, batch_auc, [batch_stat_pos, batch_stat_neg, stat_pos, stat_neg] = paddle.static.auc(
+            ...     input=binary_predict, label=label, curve='ROC', num_thresholds=4096)
+            >>> sqrerr, abserr, prob, q, pos, total = paddle.static.ctr_metric_bundle(
+            ...     similarity_norm, paddle.cast(x=label, dtype='float32'))
+
+            >>> # in train.py, after train or infer
+            >>> aggregator = paddle.distributed.fleet.metrics.MetricAggregator()
+            >>> aggregator.add_auc("auc", stat_pos, stat_neg)
+            >>> aggregator.add_bucket_error("bucket_error", stat_pos, stat_neg)
+            >>> aggregator.add_mae("mae", abserr, total)
+            >>> aggregator.add_rmse("rmse", sqrerr, total)
+            >>> aggregator.add_copc("copc", pos, prob)
+            >>> print(aggregator.compute())
+    """
+
+    def __init__(self, scope=None, util=None):
+        self._scope = scope
+        self._util = util
+        # (name, mode, compute, states)
+        self._metrics = []
+
+    def _add(self, name, mode, compute, states):
+        if any(name == metric[0] for metric in self._metrics):
+            raise ValueError(f"The metric {name} has already been added.")
+        self._metrics.append((name, mode, compute, states))
+
+    def add_sum(self, name, input):
+        """
+        Add the sum of input, see :func:`sum`.
+        """
+        self._add(name, "sum", lambda x: x, [input])
+
+    def add_max(self, name, input):
+        """
+        Add the max of input, see :func:`max`.
+        """
+        self._add(name, "max", lambda x: x, [input])
+
+    def add_min(self, name, input):
+        """
+        Add the min of input, see :func:`min`.
+        """
+        self._add(name, "min", lambda x: x, [input])
+
+    def add_auc(self, name, stat_pos, stat_neg):
+        """
+        Add the auc of the buckets of paddle.static.auc, see :func:`auc`.
+        """
+        self._add(
+            name,
+            "sum",
+            lambda pos, neg: _auc_from_buckets(pos[0], neg[0]),
+            [stat_pos, stat_neg],
+        )
+
+    def add_bucket_error(self, name, stat_pos, stat_neg):
+        """
+        Add the bucket error of the buckets of paddle.static.auc, the
+        relative error of the actual ctr to the predicted ctr of the buckets.
+        """
+        self._add(
+            name,
+            "sum",
+            lambda pos, neg: _bucket_error(pos[0], neg[0]),
+            [stat_pos, stat_neg],
+        )
+
+    def add_mae(self, name, abserr, total_ins_num):
+        """
+        Add the mae, see :func:`mae`.
+        """
+        self._add(
+            name,
+            "sum",
+            lambda abserr, total: _first(abserr) / _first(total),
+            [abserr, total_ins_num],
+        )
+
+    def add_rmse(self, name, sqrerr, total_ins_num):
+        """
+        Add the rmse, see :func:`rmse`.
+        """
+        self._add(
+            name,
+            "sum",
+            lambda sqrerr, total: math.sqrt(_first(sqrerr) / _first(total)),
+            [sqrerr, total_ins_num],
+        )
 
-    global_correct_num = util.all_reduce(correct, "sum")
-    global_total_num = util.all_reduce(total, "sum")
+    def add_mse(self, name, sqrerr, total_ins_num):
+        """
+        Add the mse, see :func:`mse`.
+        """
+        self._add(
+            name,
+            "sum",
+            lambda sqrerr, total: _first(sqrerr) / _first(total),
+            [sqrerr, total_ins_num],
+        )
+
+    def add_acc(self, name, correct, total):
+        """
+        Add the accuracy, see :func:`acc`.
+        """
+        self._add(
+            name,
+            "sum",
+            lambda correct, total: _first(correct) / _first(total),
+            [correct, total],
+        )
 
-    return float(global_correct_num[0]) / float(global_total_num[0])
+    def add_copc(self, name, pos_ins_num, prob):
+        """
+        Add the copc, the actual ctr over the predicted ctr, of pos and prob
+        in output of paddle.static.ctr_metric_bundle. It is 0 if the sum of
+        the predicted ctr is 0.
+        """
+
+        def copc(pos, prob):
+            prob = _first(prob)
+            return _first(pos) / prob if prob != 0 else 0.0
+
+        self._add(name, "sum", copc, [pos_ins_num, prob])
+
+    def compute(self):
+        """
+        All reduce the states of all the metrics and compute them.
+
+        Returns:
+            dict: the value of each metric by its name, a float, or a
+            numpy.array for sum, max and min.
+        """
+        scope = self._scope
+        if scope is None:
+            scope = paddle.static.global_scope()
+        util = self._util
+        if util is None:
+            util = paddle.distributed.fleet.util
+
+        states = [
+            [_get_value(state, scope) for state in metric[3]]
+            for metric in self._metrics
+        ]
+        for mode in ["sum", "max", "min"]:
+            indices = [
+                i for i, metric in enumerate(self._metrics) if metric[1] == mode
+            ]
+            if not indices:
+                continue
+            reduced = _all_reduce_packed(
+                util, [state for i in indices for state in states[i]], mode
+            )
+            for i in indices:
+                num_states = len(states[i])
+                states[i], reduced = reduced[:num_states], reduced[num_states:]
+
+        return {
+            name: compute(*metric_states)
+            for (name, _, compute, _), metric_states in zip(
+                self._metrics, states
+            )
+        }
@@ -25,6 +25,10 @@ from paddle.distributed.launch.utils.kv_server import KVServer
 
 ETCD_PROTOCAL = 'etcd://'
 
+# the seconds for which sync_peers waits on the server at a time, so that it
+# still checks the status of the job
+SYNC_WAIT_TIMEOUT = 5
+
 
 def _cmp_by_ip(x):
     x = json.loads(x)
@@ -155,12 +159,18 @@ class HTTPMaster(Master):
         k = f"{prefix}/{ky}/{rank}"
 
         while not self.ctx.status.is_done():
-            if not self.client.put(k, value):
+            # put the value and wait on the server for all the peers, in one
+            # request, instead of polling
+            rjson = self.client.wait(
+                prefix, size, timeout=SYNC_WAIT_TIMEOUT, put={k: value}
+            )
+            if rjson is None and not self.client.put(k, value):
                 self.ctx.logger.warning("put value failed")
                 time.sleep(0.1)
                 continue
-
-            rjson = self.client.get_prefix(prefix)
+            if rjson is None:
+                # timeout, or a server without wait
+                rjson = self.client.get_prefix(prefix)
             self.ctx.logger.debug(f"sync peers {rjson}")
             if rjson and len(rjson) == size:
                 if self.ctx.args.sort_ip:
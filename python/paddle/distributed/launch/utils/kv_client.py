@@ -16,18 +16,25 @@ import time
 
 import httpx
 
+from .kv_server import MGET_PATH, MPUT_PATH, WAIT_PATH
+
 
 class KVClient:
     def __init__(self, endpoint='localhost:2379'):
         self.endpoint = (
             endpoint if endpoint.startswith("http://") else f"http://{endpoint}"
         )
+        # reuse the connection to the server across requests
+        self.session = httpx.Client(timeout=None, follow_redirects=True)
+
+    def _key(self, key):
+        return key if key.startswith('/') else f"/{key}"
 
     def put(self, key, value):
-        key = key if key.startswith('/') else f"/{key}"
+        key = self._key(key)
         u = f"{self.endpoint}{key}"
         try:
-            r = httpx.post(u, data=value, timeout=None, follow_redirects=True)
+            r = self.session.post(u, data=value)
             if r.status_code == 200:
                 return True
             else:
@@ -35,11 +42,24 @@ class KVClient:
         except:
             return False
 
+    def put_many(self, kvs):
+        """
+        Put the str values of the keys of the dict kvs in one request.
+        """
+        u = f"{self.endpoint}{MPUT_PATH}"
+        try:
+            r = self.session.post(
+                u, json={self._key(k): v for k, v in kvs.items()}
+            )
+            return r.status_code == 200
+        except:
+            return False
+
     def get(self, key):
-        key = key if key.startswith('/') else f"/{key}"
+        key = self._key(key)
         u = f"{self.endpoint}{key}"
         try:
-            r = httpx.get(u, timeout=None, follow_redirects=True)
+            r = self.session.get(u)
             if r.status_code == 200:
                 ret = r.json()
                 return ret.get(key, '')
@@ -48,21 +68,57 @@ class KVClient:
         except:
             return ""
 
+    def get_many(self, keys):
+        """
+        The values of the keys which exist, by key, in one request, or None
+        if the request fails.
+        """
+        u = f"{self.endpoint}{MGET_PATH}"
+        try:
+            r = self.session.post(u, json=[self._key(k) for k in keys])
+            if r.status_code == 200:
+                return r.json()
+        except:
+            pass
+        return None
+
     def get_prefix(self, key):
-        key = key if key.startswith('/') else f"/{key}"
+        key = self._key(key)
         u = f"{self.endpoint}{key}"
         try:
-            r = httpx.get(u, timeout=None, follow_redirects=True)
+            r = self.session.get(u)
             if r.status_code == 200:
                 return r.json()
         except:
             return ""
 
+    def wait(self, prefix, count, timeout=None, put=None):
+        """
+        Put the str values of the keys of the dict put if any, then wait on
+        the server until there are count keys under prefix, for at most
+        timeout seconds, in one request. Return the values of the keys under
+        prefix by key, or None if timeout or the request fails.
+        """
+        u = f"{self.endpoint}{WAIT_PATH}"
+        request = {
+            "prefix": self._key(prefix),
+            "count": count,
+            "timeout": timeout,
+            "put": {self._key(k): v for k, v in (put or {}).items()},
+        }
+        try:
+            r = self.session.post(u, json=request)
+            if r.status_code == 200:
+                return r.json()
+        except:
+            pass
+        return None
+
     def delete(self, key):
-        key = key if key.startswith('/') else f"/{key}"
+        key = self._key(key)
         u = f"{self.endpoint}{key}"
         try:
-            r = httpx.delete(u, timeout=None, follow_redirects=True)
+            r = self.session.delete(u)
             if r.status_code == 200:
                 return True
             else:
@@ -76,6 +132,9 @@ class KVClient:
             if self.get("/healthy") == "ok":
                 return True
 
+    def close(self):
+        self.session.close()
+
 
 if __name__ == '__main__':
     cli = KVClient("http://localhost:8090")
@@ -15,23 +15,28 @@
 import http.server as SimpleHTTPServer
 import json
 import threading
-from http.server import HTTPServer
+from http.server import ThreadingHTTPServer
 from multiprocessing import Process
 
 from .topology import SingleNodeTopology
 
+# the paths of the batched operations, which are not keys
+MPUT_PATH = '/_mput'
+MGET_PATH = '/_mget'
+WAIT_PATH = '/_wait'
+
 
 class KVHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
+    # keep the connection of a client alive across its requests
+    protocol_version = "HTTP/1.1"
+
     def do_GET(self):
         with self.server.kv_lock:
-            ret = {}
-            for k, v in self.server.kv.items():
-                if k.startswith(self.path):
-                    ret[k] = v.decode(encoding="utf-8")
-            if ret:
-                self.output(200, json.dumps(ret).encode("utf-8"))
-            else:
-                self.output(404)
+            ret = self.server.get_prefix(self.path)
+        if ret:
+            self.output(200, json.dumps(ret).encode("utf-8"))
+        else:
+            self.output(404)
 
     def do_PUT(self):
         self.do_POST()
@@ -40,20 +45,38 @@ class KVHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
         content_length = int(self.headers['Content-Length'] or 0)
         try:
             value = self.rfile.read(content_length)
-            with self.server.kv_lock:
-                self.server.kv[self.path] = value
+            if self.path == MPUT_PATH:
+                self.server.put_many(json.loads(value))
+                self.output(200)
+            elif self.path == MGET_PATH:
+                ret = self.server.get_many(json.loads(value))
+                self.output(200, json.dumps(ret).encode("utf-8"))
+            elif self.path == WAIT_PATH:
+                self.do_wait(json.loads(value))
+            else:
+                self.server.put_many({self.path: value})
                 self.output(200)
-                return
         except:
             self.output(500)
 
+    def do_wait(self, request):
+        """
+        Put the key values of request["put"] if any, then wait until there
+        are request["count"] keys under request["prefix"], for at most
+        request["timeout"] seconds, and return them.
+        """
+        if request.get("put"):
+            self.server.put_many(request["put"])
+        ok, ret = self.server.wait_prefix(
+            request["prefix"], request["count"], request.get("timeout")
+        )
+        self.output(200 if ok else 408, json.dumps(ret).encode("utf-8"))
+
     def do_DELETE(self):
-        with self.server.kv_lock:
-            if self.path in self.server.kv:
-                del self.server.kv[self.path]
-                self.output(200)
-            else:
-                self.output(404)
+        if self.server.delete(self.path):
+            self.output(200)
+        else:
+            self.output(404)
 
     def output(self, code, value=''):
         self.send_response(code)
@@ -67,16 +90,98 @@ class KVHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
         return
 
 
-class KVServer(HTTPServer):
+class _Watch:
+    """
+    The number of the keys under a prefix, kept while clients wait for it.
+    """
+
+    def __init__(self, lock, count):
+        self.cond = threading.Condition(lock)
+        self.count = count
+        self.targets = []
+
+
+class KVServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # the backlog of the connections of all the pods starting at once
+    request_queue_size = 1024
+
     def __init__(self, port):
         super().__init__(('', port), KVHandler)
         self.kv_lock = threading.Lock()
         self.kv = {'/healthy': b'ok'}
+        # the watches by prefix, updated with kv
+        self.watches = {}
         self.port = port
         self.stopped = False
         self.started = False
         self.node_topo = None
 
+    def _update_watches(self, key, delta):
+        for prefix, watch in self.watches.items():
+            if key.startswith(prefix):
+                watch.count += delta
+                # wake the waiters only when some of them are done
+                if watch.count >= min(watch.targets):
+                    watch.cond.notify_all()
+
+    def get_prefix(self, prefix):
+        """
+        The values of the keys under prefix, with kv_lock held.
+        """
+        return {
+            k: v.decode(encoding="utf-8")
+            for k, v in self.kv.items()
+            if k.startswith(prefix)
+        }
+
+    def put_many(self, kvs):
+        with self.kv_lock:
+            for key, value in kvs.items():
+                if isinstance(value, str):
+                    value = value.encode("utf-8")
+                if key not in self.kv:
+                    self._update_watches(key, 1)
+                self.kv[key] = value
+
+    def get_many(self, keys):
+        with self.kv_lock:
+            return {
+                k: self.kv[k].decode(encoding="utf-8")
+                for k in keys
+                if k in self.kv
+            }
+
+    def delete(self, key):
+        with self.kv_lock:
+            if key not in self.kv:
+                return False
+            del self.kv[key]
+            self._update_watches(key, -1)
+            return True
+
+    def wait_prefix(self, prefix, count, timeout=None):
+        """
+        Wait until there are at least count keys under prefix, or timeout.
+        Return whether there are, and the values of the keys.
+        """
+        with self.kv_lock:
+            watch = self.watches.get(prefix)
+            if watch is None:
+                watch = _Watch(
+                    self.kv_lock,
+                    sum(1 for k in self.kv if k.startswith(prefix)),
+                )
+                self.watches[prefix] = watch
+            watch.targets.append(count)
+            try:
+                ok = watch.cond.wait_for(lambda: watch.count >= count, timeout)
+            finally:
+                watch.targets.remove(count)
+                if not watch.targets:
+                    del self.watches[prefix]
+            return ok, self.get_prefix(prefix)
+
     def start(self):
         self.listen_thread = threading.Thread(target=self.serve_forever)
         self.listen_thread.start()
@@ -49,6 +49,7 @@ from .io_utils import (
     _legacy_static_save,
     _open_file_buffer,
     _pack_loaded_dict,
+    _pickle_load_mmap,
     _pickle_loads_mac,
     _unpack_saved_dict,
 )
@@ -71,6 +72,7 @@ if TYPE_CHECKING:
         params_filename: NotRequired[str]
         keep_name_table: NotRequired[bool]
         return_numpy: NotRequired[bool]
+        mmap: NotRequired[bool]
 
     class _SaveOptions(TypedDict):
         use_binary_format: NotRequired[bool]
@@ -365,6 +367,7 @@ def _parse_load_config(configs):
         'params_filename',
         'keep_name_table',
         'return_numpy',
+        'mmap',
     ]
 
     # input check
@@ -384,6 +387,7 @@ def _parse_load_config(configs):
     inner_config.params_filename = configs.get('params_filename', None)
     inner_config.keep_name_table = configs.get('keep_name_table', None)
     inner_config.return_numpy = configs.get('return_numpy', False)
+    inner_config.mmap = configs.get('mmap', False)
 
     return inner_config
 
@@ -574,11 +578,28 @@ def _to_LodTensor(ndarray):
     return t
 
 
-def _tuple_to_tensor(obj, return_numpy):
+def _mapped_ndarray_to_tensor(ndarray):
+    # Share the pages of the mapped file with the tensor. Pickle does not align
+    # the data of arrays, the ones not aligned to their element size are copied.
+    if ndarray.flags.aligned and ndarray.flags.c_contiguous:
+        return core.eager.Tensor(
+            value=ndarray,
+            place=core.CPUPlace(),
+            persistable=False,
+            zero_copy=True,
+            stop_gradient=True,
+        )
+    return paddle.to_tensor(ndarray, place=paddle.CPUPlace())
+
+
+def _tuple_to_tensor(obj, return_numpy, mmap=False):
     if return_numpy:
         return obj[1]
     if in_dygraph_mode():
-        t = paddle.to_tensor(obj[1])
+        if mmap:
+            t = _mapped_ndarray_to_tensor(obj[1])
+        else:
+            t = paddle.to_tensor(obj[1])
         # This function does modify the name of return value.
         # Loading the same variable multiple times may cause the same name.
         t.name = obj[0]
@@ -587,10 +608,12 @@ def _tuple_to_tensor(obj, return_numpy):
         return _to_LodTensor(obj[1])
 
 
-def _ndarray_to_tensor(obj, return_numpy):
+def _ndarray_to_tensor(obj, return_numpy, mmap=False):
     if return_numpy:
         return obj
     if in_dygraph_mode():
+        if mmap:
+            return _mapped_ndarray_to_tensor(obj)
         return paddle.to_tensor(obj)
     else:
         return _to_LodTensor(obj)
@@ -635,7 +658,7 @@ def _parse_every_object(obj, condition_func, convert_func):
         return obj
 
 
-def _parse_load_result(obj, return_numpy):
+def _parse_load_result(obj, return_numpy, mmap=False):
     def is_layer(obj):
         return isinstance(obj, paddle.nn.Layer)
 
@@ -653,10 +676,10 @@ def _parse_load_result(obj, return_numpy):
         _parse_every_object(obj, is_layer, parse_layer)
 
     def tuple_to_tensor(obj):
-        return _tuple_to_tensor(obj, return_numpy=return_numpy)
+        return _tuple_to_tensor(obj, return_numpy=return_numpy, mmap=mmap)
 
     def ndarray_to_tensor(obj):
-        return _ndarray_to_tensor(obj, return_numpy=return_numpy)
+        return _ndarray_to_tensor(obj, return_numpy=return_numpy, mmap=mmap)
 
     # tuple(name, ndarray) was converted from varbase of paddle2.1,
     # and all tuple(name, ndarray) are converted to tensor.
@@ -1062,6 +1085,10 @@ def load(path: str | BytesIO, **configs: Unpack[_LoadOptions]) -> Any:
             by default.
             (3) return_numpy(bool): If specified as True, return tensor as numpy.ndarray, otherwise return tensor as paddle.Tensor.
             Default False.
+            (4) mmap(bool): If specified as True, map the file saved by ``paddle.save`` into memory instead of
+            reading it. The data of the loaded tensors stays in the file until it is accessed, and the tensors
+            are placed on CPU, sharing the mapped pages when possible. Writes to the tensors are private to the
+            process and never reach the file. Only supported when ``path`` is a file path. Default False.
 
     Returns:
         Object(Object): a target object can be used in paddle
@@ -1184,11 +1211,17 @@ def load(path: str | BytesIO, **configs: Unpack[_LoadOptions]) -> Any:
 
     if _is_memory_buffer(path) or os.path.isfile(path):
         config = _parse_load_config(configs)
+        if config.mmap and not _is_file_path(path):
+            raise ValueError(
+                "`mmap` of `paddle.load` is only supported when `path` is a file path."
+            )
         exception_type = pickle.UnpicklingError
         try:
             with _open_file_buffer(path, 'rb') as f:
+                if config.mmap:
+                    load_result = _pickle_load_mmap(f)
                 # When value of dict is lager than 4GB ,there is a Bug on 'MAC python3'
-                if (
+                elif (
                     _is_file_path(path)
                     and sys.platform == 'darwin'
                     and sys.version_info.major == 3
@@ -1207,7 +1240,9 @@ def load(path: str | BytesIO, **configs: Unpack[_LoadOptions]) -> Any:
                         ].items():
                             if isinstance(load_result[key], np.ndarray):
                                 load_result[key] = _ndarray_to_tensor(
-                                    load_result[key], config.return_numpy
+                                    load_result[key],
+                                    config.return_numpy,
+                                    config.mmap,
                                 )
                                 # default name is "generatedxxx" which is set in Tensor init, if not set
                                 if not config.return_numpy and getattr(
@@ -1223,12 +1258,12 @@ def load(path: str | BytesIO, **configs: Unpack[_LoadOptions]) -> Any:
                     else:
                         # paddle2.1 static.save/load
                         load_result = _parse_load_result(
-                            load_result, config.return_numpy
+                            load_result, config.return_numpy, config.mmap
                         )
 
                 else:
                     load_result = _parse_load_result(
-                        load_result, config.return_numpy
+                        load_result, config.return_numpy, config.mmap
                     )
 
         except exception_type as msg_pickle:
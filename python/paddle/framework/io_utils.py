@@ -14,9 +14,12 @@
 
 import logging
 import math
+import mmap
 import os
 import pickle
+import struct
 import sys
+from functools import partial
 from io import BytesIO
 from types import FunctionType, MethodType
 
@@ -213,6 +216,200 @@ def _pickle_loads_mac(path, f):
     return load_result
 
 
+# Payloads smaller than this are read into memory as usual, they are mostly
+# inside pickle frames anyway.
+_MMAP_MIN_PAYLOAD_BYTES = 64 * 1024
+
+_NUMPY_MULTIARRAY_MODULES = ("numpy.core.multiarray", "numpy._core.multiarray")
+
+
+def _skip_memo_put(opcodes):
+    if opcodes[:1] == pickle.MEMOIZE:
+        return opcodes[1:]
+    if opcodes[:1] == pickle.BINPUT:
+        return opcodes[2:]
+    if opcodes[:1] == pickle.LONG_BINPUT:
+        return opcodes[5:]
+    return opcodes
+
+
+class _MappedBytes:
+    """
+    A bytes payload of the pickle stream left in the mapped file.
+    """
+
+    __slots__ = ("offset", "size")
+
+    def __init__(self, offset, size):
+        self.offset = offset
+        self.size = size
+
+    def materialize(self, buffer):
+        return bytes(buffer[self.offset : self.offset + self.size])
+
+
+class _MappedArray:
+    """
+    Stands in for the result of `numpy.core.multiarray._reconstruct` until
+    the state of the array is set, which turns it into an ndarray viewing the
+    mapped file.
+    """
+
+    __slots__ = ("args", "array", "reconstruct")
+
+    def __init__(self, reconstruct, *args):
+        self.reconstruct = reconstruct
+        self.args = args
+        self.array = None
+
+    def build(self, state, buffer):
+        _, shape, dtype, is_fortran, rawdata = state
+        if isinstance(rawdata, _MappedBytes) and not dtype.hasobject:
+            self.array = np.ndarray(
+                shape,
+                dtype=dtype,
+                buffer=buffer,
+                offset=rawdata.offset,
+                order='F' if is_fortran else 'C',
+            )
+        else:
+            if isinstance(rawdata, _MappedBytes):
+                state = (*state[:4], rawdata.materialize(buffer))
+            self.array = self.reconstruct(*self.args)
+            self.array.__setstate__(state)
+        return self.array
+
+
+class _MmapUnpickler(pickle._Unpickler):
+    """
+    Unpickler for the files written by `paddle.save` that leaves the data of
+    numpy arrays in the memory-mapped file instead of reading it, so that
+    loading a checkpoint costs no memory until the arrays are touched.
+
+    Only the array data is mapped: a bytes payload is left in the file when it
+    is the last item of a tuple directly used as the state of an object, which
+    is how numpy pickles the raw data of arrays.
+    """
+
+    dispatch = pickle._Unpickler.dispatch.copy()
+
+    def __init__(self, file, buffer):
+        super().__init__(file, encoding='latin1')
+        self._file = file
+        self._buffer = buffer
+
+    def find_class(self, module, name):
+        cls = super().find_class(module, name)
+        if name == "_reconstruct" and module in _NUMPY_MULTIARRAY_MODULES:
+            return partial(_MappedArray, cls)
+        return cls
+
+    def _in_frame(self):
+        frame = self._unframer.current_frame
+        return frame is not None and frame.tell() < len(frame.getbuffer())
+
+    def _is_state_tail(self):
+        # Peek the opcodes following the payload: an optional new frame, then
+        # TUPLE and BUILD, each of the payload and the tuple possibly put in
+        # the memo.
+        tail = self._file.read(32)
+        self._file.seek(-len(tail), os.SEEK_CUR)
+        if tail[:1] == pickle.FRAME:
+            tail = tail[9:]
+        tail = _skip_memo_put(tail)
+        if tail[:1] != pickle.TUPLE:
+            return False
+        return _skip_memo_put(tail[1:])[:1] == pickle.BUILD
+
+    def _load_payload(self, size):
+        if size < _MMAP_MIN_PAYLOAD_BYTES or self._in_frame():
+            self.append(self.read(size))
+            return
+        offset = self._file.tell()
+        self._file.seek(size, os.SEEK_CUR)
+        if self._is_state_tail():
+            self.append(_MappedBytes(offset, size))
+        else:
+            self.append(bytes(self._buffer[offset : offset + size]))
+
+    def load_binbytes(self):
+        (size,) = struct.unpack('<I', self.read(4))
+        self._load_payload(size)
+
+    dispatch[pickle.BINBYTES[0]] = load_binbytes
+
+    def load_binbytes8(self):
+        (size,) = struct.unpack('<Q', self.read(8))
+        if size > sys.maxsize:
+            raise pickle.UnpicklingError(
+                f"BINBYTES8 exceeds system's maximum size of {sys.maxsize} bytes"
+            )
+        self._load_payload(size)
+
+    dispatch[pickle.BINBYTES8[0]] = load_binbytes8
+
+    def load_build(self):
+        state = self.stack[-1]
+        inst = self.stack[-2]
+        if isinstance(inst, _MappedArray):
+            self.stack.pop()
+            self.stack[-1] = inst.build(state, self._buffer)
+            return
+        if isinstance(state, tuple) and any(
+            isinstance(item, _MappedBytes) for item in state
+        ):
+            self.stack[-1] = tuple(
+                (
+                    item.materialize(self._buffer)
+                    if isinstance(item, _MappedBytes)
+                    else item
+                )
+                for item in state
+            )
+        super().load_build()
+
+    dispatch[pickle.BUILD[0]] = load_build
+
+    def _resolve_top(self):
+        # arrays are memoized before their state is set
+        top = self.stack[-1]
+        if isinstance(top, _MappedArray) and top.array is not None:
+            self.stack[-1] = top.array
+
+    def load_get(self):
+        super().load_get()
+        self._resolve_top()
+
+    dispatch[pickle.GET[0]] = load_get
+
+    def load_binget(self):
+        super().load_binget()
+        self._resolve_top()
+
+    dispatch[pickle.BINGET[0]] = load_binget
+
+    def load_long_binget(self):
+        super().load_long_binget()
+        self._resolve_top()
+
+    dispatch[pickle.LONG_BINGET[0]] = load_long_binget
+
+
+def _pickle_load_mmap(f):
+    """
+    Load the object pickled in file `f` with the data of numpy arrays mapped
+    from the file rather than read. The mapping is copy-on-write, writes to
+    the arrays are private to the process and never reach the file.
+    """
+    # paddle.save pickles with protocol 2 at least, anything else is left to
+    # the other formats supported by paddle.load
+    if f.read(1) != pickle.PROTO:
+        raise pickle.UnpicklingError("Not pickled with protocol 2 or newer.")
+    f.seek(0)
+    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    return _MmapUnpickler(f, buffer).load()
+
+
 def _pack_loaded_dict(load_obj):
     if isinstance(load_obj, dict):
         unpack_info = 'UnpackBigParamInfor@@'
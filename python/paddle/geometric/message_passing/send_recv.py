@@ -71,7 +71,8 @@ def send_u_recv(
                     And we support float16 in gpu version.
         src_index (Tensor): An 1-D tensor, and the available data type is int32, int64.
         dst_index (Tensor): An 1-D tensor, and should have the same shape as `src_index`.
-                            The available data type is int32, int64.
+                            The available data type is int32, int64. On CPU, it is faster
+                            sorted in ascending order, as in CSC order.
         reduce_op (str): Different reduce ops, including `sum`, `mean`, `max`, `min`.
                          Default value is `sum`.
         out_size (int|Tensor|None): We can set `out_size` to get necessary output shape. If not set or
@@ -236,7 +237,8 @@ def send_ue_recv(
                     And we support float16 in gpu version.
         src_index (Tensor): An 1-D tensor, and the available data type is int32, int64.
         dst_index (Tensor): An 1-D tensor, and should have the same shape as `src_index`.
-                            The available data type is int32, int64.
+                            The available data type is int32, int64. On CPU, it is faster
+                            sorted in ascending order, as in CSC order.
         message_op (str, optional): Different message ops for x and e, including `add`, `sub`, `mul`, `div`.
         reduce_op (str, optional): Different reduce ops, including `sum`, `mean`, `max`, `min`.
                          Default value is `sum`.
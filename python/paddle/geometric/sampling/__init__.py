@@ -12,6 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from .multi_hop import (  # noqa: F401
+    NeighborSampler,
+    NeighborSamplerDataset,
+    SampledBlock,
+)
 from .neighbors import sample_neighbors, weighted_sample_neighbors  # noqa: F401
 
 __all__ = []
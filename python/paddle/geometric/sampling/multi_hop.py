@@ -0,0 +1,341 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+import paddle
+from paddle.io import Dataset
+
+__all__ = []
+
+
+class SampledBlock(NamedTuple):
+    """
+    The sampled edges of one hop, reindexed to the sampled nodes. The edges
+    go from ``src_index`` to ``dst_index``, and the dst nodes are the first
+    ``num_dst_nodes`` sampled nodes.
+    """
+
+    src_index: np.ndarray
+    dst_index: np.ndarray
+    num_dst_nodes: int
+    eids: Optional[np.ndarray] = None
+
+
+def _to_numpy(x):
+    if isinstance(x, paddle.Tensor):
+        x = x.numpy()
+    return np.asarray(x).reshape([-1])
+
+
+def _ranges(starts, lengths):
+    """
+    The concatenation of np.arange(start, start + length) for each of them.
+    """
+    total = int(lengths.sum())
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(total)
+
+
+class NeighborSampler:
+    """
+    Multi-hop neighbor sampler, which samples the neighbors of a batch of
+    nodes for several hops and reindexes them at once on the CPU.
+
+    It gives the same nodes and edges as calling
+    `paddle.geometric.sample_neighbors` and `paddle.geometric.reindex_graph`
+    for each hop, where the nodes of a hop are the input nodes and all the
+    nodes sampled before. But the CSC of the graph is kept on the host, and
+    a sampled node keeps its index from the hop it is first sampled at, so
+    that the nodes are reindexed once instead of at every hop.
+
+    Args:
+        row (Tensor|numpy.ndarray): One of the components of the CSC format of the
+                    input graph, with the shape [num_edges] or [num_edges, 1].
+        colptr (Tensor|numpy.ndarray): One of the components of the CSC format of
+                    the input graph, with the shape [num_nodes + 1] or [num_nodes + 1, 1].
+        sample_sizes (list[int]): The number of neighbors sampled for each node at
+                    each hop, from the input nodes out. -1 means all the neighbors.
+        eids (Tensor|numpy.ndarray, optional): The eid of each edge of the CSC. If it
+                    is not None, the blocks carry the eids of their edges. Default is None.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import paddle
+            >>> from paddle.geometric import NeighborSampler
+
+            >>> # edges: (3, 0), (7, 0), (0, 1), (9, 1), (1, 2), (4, 3), (2, 4),
+            >>> #        (9, 5), (3, 5), (9, 6), (1, 6), (9, 8), (7, 8)
+            >>> row = [3, 7, 0, 9, 1, 4, 2, 9, 3, 9, 1, 9, 7]
+            >>> colptr = [0, 2, 4, 5, 6, 7, 9, 11, 11, 13, 13]
+            >>> sampler = NeighborSampler(row, colptr, sample_sizes=[2, 2])
+            >>> nodes, blocks = sampler.sample([0, 8, 1, 2])
+
+            >>> x = paddle.rand([len(nodes), 16])
+            >>> for block in blocks:
+            ...     x = paddle.geometric.send_u_recv(
+            ...         x,
+            ...         paddle.to_tensor(block.src_index),
+            ...         paddle.to_tensor(block.dst_index),
+            ...         out_size=block.num_dst_nodes,
+            ...     )
+            >>> print(x.shape)
+            [4, 16]
+    """
+
+    def __init__(self, row, colptr, sample_sizes, eids=None):
+        self.row = _to_numpy(row)
+        self.colptr = _to_numpy(colptr).astype(np.int64)
+        if self.row.dtype not in [np.int32, np.int64]:
+            raise TypeError(
+                f"The dtype of row should be int32 or int64, but got {self.row.dtype}."
+            )
+        self.eids = None if eids is None else _to_numpy(eids)
+        if self.eids is not None and len(self.eids) != len(self.row):
+            raise ValueError(
+                "The length of eids should be the same with row, "
+                f"but got {len(self.eids)} and {len(self.row)}."
+            )
+        self.sample_sizes = list(sample_sizes)
+        self.num_nodes = len(self.colptr) - 1
+        # the index of each node among the sampled ones, -1 if not sampled,
+        # reset after each call of sample
+        self._index = np.full([self.num_nodes], -1, dtype=np.int64)
+
+    @classmethod
+    def from_edges(cls, src, dst, num_nodes, sample_sizes, eids=None):
+        """
+        Build the sampler from the edges from ``src`` to ``dst``. The CSC of
+        the graph is built once here, and the eids default to the indices of
+        the edges.
+
+        Args:
+            src (Tensor|numpy.ndarray): The source node of each edge.
+            dst (Tensor|numpy.ndarray): The destination node of each edge.
+            num_nodes (int): The number of the nodes of the graph.
+            sample_sizes (list[int]): See :class:`NeighborSampler`.
+            eids (Tensor|numpy.ndarray, optional): The eid of each edge. Default is None,
+                        which means the index of each edge.
+
+        Returns:
+            NeighborSampler: The sampler of the graph.
+        """
+        src = _to_numpy(src)
+        dst = _to_numpy(dst).astype(np.int64)
+        order = np.argsort(dst, kind="stable")
+        colptr = np.zeros([num_nodes + 1], dtype=np.int64)
+        np.cumsum(np.bincount(dst, minlength=num_nodes), out=colptr[1:])
+        eids = order if eids is None else _to_numpy(eids)[order]
+        return cls(src[order], colptr, sample_sizes, eids=eids)
+
+    def _sample_positions(self, nodes, sample_size, rng):
+        """
+        The positions in the CSC of the sampled edges of the nodes, grouped
+        by node, and the number of the sampled edges of each node.
+        """
+        starts = self.colptr[nodes]
+        degrees = self.colptr[nodes + 1] - starts
+        if sample_size < 0:
+            return _ranges(starts, degrees), degrees
+
+        counts = np.minimum(degrees, sample_size)
+        offsets = np.cumsum(counts) - counts
+        positions = np.empty([int(counts.sum())], dtype=np.int64)
+
+        # all the edges of the nodes with at most sample_size edges
+        full = degrees <= sample_size
+        positions[_ranges(offsets[full], degrees[full])] = _ranges(
+            starts[full], degrees[full]
+        )
+
+        # Floyd's algorithm over the other nodes at once, which samples each
+        # subset of sample_size edges of a node with the same probability
+        partial = ~full
+        degrees = degrees[partial]
+        chosen = np.empty([len(degrees), sample_size], dtype=np.int64)
+        for i in range(sample_size):
+            upper = degrees - sample_size + i
+            picked = (rng.random(len(degrees)) * (upper + 1)).astype(np.int64)
+            # rounding may give upper + 1
+            np.minimum(picked, upper, out=picked)
+            seen = (chosen[:, :i] == picked[:, None]).any(axis=1)
+            chosen[:, i] = np.where(seen, upper, picked)
+        positions[offsets[partial][:, None] + np.arange(sample_size)] = (
+            starts[partial][:, None] + chosen
+        )
+        return positions, counts
+
+    def sample(self, input_nodes, rng=None):
+        """
+        Sample the neighbors of the input nodes for all the hops.
+
+        Args:
+            input_nodes (Tensor|numpy.ndarray|list): The unique nodes to sample from.
+            rng (numpy.random.Generator, optional): The random generator of the
+                        sampling. Default is None, which means a new one.
+
+        Returns:
+            - nodes (numpy.ndarray), all the sampled nodes, starting with the
+              input nodes, in the order they are sampled.
+
+            - blocks (list[SampledBlock]), the sampled edges of each hop from
+              the last hop in, in the order of the layers of a GNN. The dst
+              nodes of a block are the src nodes of the next one, and the dst
+              nodes of the last block are the input nodes.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        nodes = _to_numpy(input_nodes).astype(np.int64)
+        index = self._index
+        index[nodes] = np.arange(len(nodes))
+        sampled = [nodes]
+        num_sampled = len(nodes)
+        blocks = []
+        try:
+            for sample_size in self.sample_sizes:
+                num_dst_nodes = num_sampled
+                dst_nodes = (
+                    np.concatenate(sampled) if len(sampled) > 1 else nodes
+                )
+                positions, counts = self._sample_positions(
+                    dst_nodes, sample_size, rng
+                )
+                neighbors = self.row[positions].astype(np.int64)
+
+                # the new nodes in the order they first appear
+                new_nodes = neighbors[index[neighbors] < 0]
+                new_nodes, first = np.unique(new_nodes, return_index=True)
+                new_nodes = new_nodes[np.argsort(first)]
+                index[new_nodes] = np.arange(
+                    num_sampled, num_sampled + len(new_nodes)
+                )
+                sampled.append(new_nodes)
+                num_sampled += len(new_nodes)
+
+                blocks.append(
+                    SampledBlock(
+                        src_index=index[neighbors],
+                        dst_index=np.repeat(np.arange(num_dst_nodes), counts),
+                        num_dst_nodes=num_dst_nodes,
+                        eids=(
+                            None if self.eids is None else self.eids[positions]
+                        ),
+                    )
+                )
+            nodes = np.concatenate(sampled)
+        finally:
+            for sampled_nodes in sampled:
+                index[sampled_nodes] = -1
+        return nodes, blocks[::-1]
+
+
+class NeighborSamplerDataset(Dataset):
+    """
+    A dataset of the batches of nodes sampled by a :class:`NeighborSampler`,
+    so that the batches are sampled in the background workers of
+    `paddle.io.DataLoader`. It should be loaded with ``batch_size=None``, as
+    each item is a whole batch.
+
+    Each item is ``[nodes, blocks]``, where each block is ``[src_index,
+    dst_index, num_dst_nodes]``, with ``eids`` at last if the sampler has
+    eids, see :meth:`NeighborSampler.sample`.
+
+    Args:
+        sampler (NeighborSampler): The sampler of the graph.
+        input_nodes (Tensor|numpy.ndarray|list): All the nodes to sample from.
+        batch_size (int): The number of the input nodes of each batch.
+        shuffle (bool, optional): Whether to shuffle the input nodes at each
+                    epoch, see :meth:`set_epoch`. Default is False.
+        drop_last (bool, optional): Whether to drop the last batch if it is
+                    smaller than batch_size. Default is False.
+        seed (int, optional): The seed of the shuffle and the sampling, which
+                    makes the batches the same for any number of workers. Default
+                    is None, which means random.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import paddle
+            >>> from paddle.geometric import NeighborSampler, NeighborSamplerDataset
+
+            >>> row = [3, 7, 0, 9, 1, 4, 2, 9, 3, 9, 1, 9, 7]
+            >>> colptr = [0, 2, 4, 5, 6, 7, 9, 11, 11, 13, 13]
+            >>> sampler = NeighborSampler(row, colptr, sample_sizes=[2, 2])
+            >>> dataset = NeighborSamplerDataset(sampler, list(range(10)), batch_size=4)
+            >>> loader = paddle.io.DataLoader(dataset, batch_size=None)
+            >>> for nodes, blocks in loader:
+            ...     src_index, dst_index, num_dst_nodes = blocks[-1]
+    """
+
+    def __init__(
+        self,
+        sampler,
+        input_nodes,
+        batch_size,
+        shuffle=False,
+        drop_last=False,
+        seed=None,
+    ):
+        self.sampler = sampler
+        self.input_nodes = _to_numpy(input_nodes).astype(np.int64)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.seed = np.random.SeedSequence().entropy if seed is None else seed
+        self.epoch = 0
+        # the input nodes shuffled for the epoch
+        self._shuffled = None
+
+    def set_epoch(self, epoch):
+        """
+        Set the epoch, which shuffles the input nodes and the sampling again.
+
+        Args:
+            epoch (int): The epoch number.
+        """
+        self.epoch = epoch
+
+    def __len__(self):
+        if self.drop_last:
+            return len(self.input_nodes) // self.batch_size
+        return -(-len(self.input_nodes) // self.batch_size)
+
+    def __getitem__(self, idx):
+        if not 0 <= idx < len(self):
+            raise IndexError(f"index {idx} is out of range")
+        input_nodes = self.input_nodes
+        if self.shuffle:
+            if self._shuffled is None or self._shuffled[0] != self.epoch:
+                rng = np.random.default_rng([self.seed, self.epoch])
+                self._shuffled = (self.epoch, rng.permutation(input_nodes))
+            input_nodes = self._shuffled[1]
+        batch = input_nodes[idx * self.batch_size : (idx + 1) * self.batch_size]
+        nodes, blocks = self.sampler.sample(
+            batch, rng=np.random.default_rng([self.seed, self.epoch, idx + 1])
+        )
+        return [
+            nodes,
+            [
+                [
+                    block.src_index,
+                    block.dst_index,
+                    np.array(block.num_dst_nodes, dtype=np.int64),
+                ]
+                + ([] if block.eids is None else [block.eids])
+                for block in blocks
+            ],
+        ]
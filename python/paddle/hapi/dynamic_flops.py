@@ -20,12 +20,13 @@ import paddle
 from paddle import nn
 from paddle.jit.dy2static.program_translator import unwrap_decorators
 
+from .meta_flops import meta_flops
 from .static_flops import Table, static_flops
 
 __all__ = []
 
 
-def flops(net, input_size, custom_ops=None, print_detail=False):
+def flops(net, input_size, custom_ops=None, print_detail=False, meta=False):
     """Print a table about the FLOPs of network.
 
     Args:
@@ -38,6 +39,12 @@ def flops(net, input_size, custom_ops=None, print_detail=False):
                     in following example code. Default is None.
         print_detail (bool, optional): Whether to print the detail information, like FLOPs per layer, about the net FLOPs.
                     Default is False.
+        meta (bool, optional): Whether to estimate the FLOPs by shape inference only, without allocating any input
+                    or running any kernel, which also reports the parameter, activation and peak memory of the net.
+                    The net may then be created under ``paddle.LazyGuard`` and ``input_size`` may also be a list of
+                    ``paddle.static.InputSpec``. In this mode, the functions in ``custom_ops`` take the layer, the
+                    input shapes and the output shapes, and return the FLOPs of the layer. This argument only work
+                    when argument ``net`` is an instance of paddle.nn.Layer. Default is False.
 
     Returns:
         Int: A number about the FLOPs of total network.
@@ -105,7 +112,25 @@ def flops(net, input_size, custom_ops=None, print_detail=False):
             +--------------+-----------------+-----------------+--------+--------+
             Total Flops: 347560     Total Params: 61610
             347560
+
+            >>> # estimate without running the net, the params are not allocated either
+            >>> with paddle.LazyGuard():
+            ...     lenet = LeNet()
+            >>> FLOPs = paddle.flops(lenet, [1, 1, 28, 28], meta=True)
+            Cannot find suitable count function for <class 'paddle.nn.layer.pooling.MaxPool2D'>. Treat it as zero FLOPs.
+            Total Flops: 347560     Total Params: 61610     Param Memory: 240.66 KB     Activation Memory: 56.24 KB     Peak Memory: 277.41 KB
     """
+    if isinstance(net, nn.Layer) and meta:
+        if isinstance(input_size, paddle.static.InputSpec) or (
+            input_size and isinstance(input_size[0], int)
+        ):
+            input_size = [input_size]
+        return meta_flops(
+            net,
+            input_spec=input_size,
+            custom_ops=custom_ops,
+            print_detail=print_detail,
+        )["flops"]
     if isinstance(net, nn.Layer):
         # If net is a dy2stat model, net.forward is StaticFunction instance,
         # we set net.forward to original forward function.
@@ -0,0 +1,249 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+import paddle
+from paddle import nn
+from paddle.base import core
+from paddle.base.framework import Variable, convert_to_proto_type
+from paddle.jit.dy2static.program_translator import unwrap_decorators
+from paddle.static import InputSpec
+
+from .static_flops import Table
+
+__all__ = []
+
+# The counters below get the layer and the shapes of its inputs and outputs,
+# only known after shape inference, and return the FLOPs of the layer.
+
+
+def _numel(shape):
+    # dims unknown after shape inference count as 1
+    return int(np.prod([max(dim, 1) for dim in shape], dtype=np.int64))
+
+
+def _channels(m, shape):
+    channel_last = getattr(m, "_data_format", "NCHW")[-1] == "C"
+    return shape[-1] if channel_last else shape[1]
+
+
+def count_convNd(m, input_shapes, output_shapes):
+    kernel_ops = _numel(m.weight.shape[2:])
+    bias_ops = 1 if m.bias is not None else 0
+    in_channels = _channels(m, input_shapes[0])
+    return _numel(output_shapes[0]) * (
+        in_channels // m._groups * kernel_ops + bias_ops
+    )
+
+
+def count_leaky_relu(m, input_shapes, output_shapes):
+    return _numel(input_shapes[0])
+
+
+def count_bn(m, input_shapes, output_shapes):
+    return 2 * _numel(input_shapes[0])
+
+
+def count_linear(m, input_shapes, output_shapes):
+    return m.weight.shape[0] * _numel(output_shapes[0])
+
+
+def count_avgpool(m, input_shapes, output_shapes):
+    return _numel(output_shapes[0])
+
+
+def count_adap_avgpool(m, input_shapes, output_shapes):
+    kernel = np.array(input_shapes[0][2:]) // np.array(output_shapes[0][2:])
+    kernel_ops = _numel(kernel) + 1
+    return kernel_ops * _numel(output_shapes[0])
+
+
+def count_zero_ops(m, input_shapes, output_shapes):
+    return 0
+
+
+register_counters = {
+    nn.Conv1D: count_convNd,
+    nn.Conv2D: count_convNd,
+    nn.Conv3D: count_convNd,
+    nn.Conv1DTranspose: count_convNd,
+    nn.Conv2DTranspose: count_convNd,
+    nn.Conv3DTranspose: count_convNd,
+    nn.layer.norm.BatchNorm2D: count_bn,
+    nn.BatchNorm: count_bn,
+    nn.ReLU: count_zero_ops,
+    nn.ReLU6: count_zero_ops,
+    nn.LeakyReLU: count_leaky_relu,
+    nn.Linear: count_linear,
+    nn.Dropout: count_zero_ops,
+    nn.AvgPool1D: count_avgpool,
+    nn.AvgPool2D: count_avgpool,
+    nn.AvgPool3D: count_avgpool,
+    nn.AdaptiveAvgPool1D: count_adap_avgpool,
+    nn.AdaptiveAvgPool2D: count_adap_avgpool,
+    nn.AdaptiveAvgPool3D: count_adap_avgpool,
+}
+
+
+def _nbytes(var):
+    size = core.size_of_dtype(convert_to_proto_type(var.dtype))
+    return _numel(var.shape) * size
+
+
+def _static_vars(obj):
+    return [
+        var
+        for var in paddle.utils.flatten(obj)
+        if isinstance(var, (Variable, paddle.pir.Value))
+    ]
+
+
+def _format_bytes(num_bytes):
+    for unit in ["B", "KB", "MB", "GB"]:
+        if num_bytes < 1024:
+            return f"{num_bytes:.2f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.2f} TB"
+
+
+def meta_flops(model, input_spec, custom_ops=None, print_detail=False):
+    """
+    Estimate FLOPs and memory of `model` by shape inference only. The forward
+    of `model` is traced into a static program for `input_spec`, which infers
+    the shapes of all the intermediate results without allocating them or
+    running any kernel, so the parameters of `model` may also be left
+    uninitialized by creating it under ``paddle.LazyGuard``.
+
+    Returns a dict with the totals of the model, "flops", "params",
+    "param_bytes", "activation_bytes" (all the outputs of the leaf layers,
+    what training keeps for backward) and "peak_bytes" (parameters and
+    buffers plus the largest inputs and outputs of a leaf layer, the peak of
+    inference), and "layers", the same numbers for each call of a leaf layer.
+    """
+    if custom_ops is None:
+        custom_ops = {}
+    input_spec = [
+        spec if isinstance(spec, InputSpec) else InputSpec(spec)
+        for spec in input_spec
+    ]
+
+    layers = []
+    missing_types = set()
+
+    def count(m, inputs, outputs):
+        inputs = _static_vars(inputs)
+        outputs = _static_vars(outputs)
+        input_shapes = [list(var.shape) for var in inputs]
+        output_shapes = [list(var.shape) for var in outputs]
+        counter = custom_ops.get(type(m), register_counters.get(type(m)))
+        if counter is None:
+            missing_types.add(type(m))
+        params = m.parameters()
+        layers.append(
+            {
+                "name": m.full_name(),
+                "input_shape": input_shapes[0] if input_shapes else [],
+                "output_shape": output_shapes[0] if output_shapes else [],
+                "params": sum(_numel(p.shape) for p in params),
+                "param_bytes": sum(_nbytes(p) for p in params),
+                "flops": (
+                    int(counter(m, input_shapes, output_shapes))
+                    if counter is not None
+                    else 0
+                ),
+                "input_bytes": sum(_nbytes(var) for var in inputs),
+                "activation_bytes": sum(_nbytes(var) for var in outputs),
+            }
+        )
+
+    handles = [
+        m.register_forward_post_hook(count)
+        for m in model.sublayers(include_self=True)
+        if len(list(m.children())) == 0
+    ]
+    training = model.training
+    model.eval()
+    # the forward of the traced layer is called directly, which runs no post
+    # hook, so a model with no sublayer is traced inside a container
+    is_leaf = len(list(model.children())) == 0
+    traced = nn.Sequential(model) if is_leaf else model
+    try:
+        _, forward = unwrap_decorators(traced.forward)
+        static_forward = paddle.jit.to_static(
+            forward, input_spec=input_spec, full_graph=True
+        )
+        static_forward.get_concrete_program(
+            *input_spec, with_hook=True, is_train=False
+        )
+    finally:
+        for handle in handles:
+            handle.remove()
+        if training:
+            model.train()
+
+    for m_type in missing_types:
+        print(
+            f"Cannot find suitable count function for {m_type}. Treat it as zero FLOPs."
+        )
+
+    params = model.parameters()
+    weight_bytes = sum(_nbytes(p) for p in params) + sum(
+        _nbytes(b) for b in model.buffers() if b.persistable
+    )
+    peak_activation_bytes = max(
+        (layer["input_bytes"] + layer["activation_bytes"] for layer in layers),
+        default=0,
+    )
+    report = {
+        "flops": sum(layer["flops"] for layer in layers),
+        "params": sum(_numel(p.shape) for p in params),
+        "param_bytes": sum(_nbytes(p) for p in params),
+        "activation_bytes": sum(layer["activation_bytes"] for layer in layers),
+        "peak_bytes": weight_bytes + peak_activation_bytes,
+        "layers": layers,
+    }
+
+    if print_detail:
+        table = Table(
+            [
+                "Layer Name",
+                "Input Shape",
+                "Output Shape",
+                "Params",
+                "Param Memory",
+                "Flops",
+                "Activation Memory",
+            ]
+        )
+        for layer in layers:
+            table.add_row(
+                [
+                    layer["name"],
+                    layer["input_shape"],
+                    layer["output_shape"],
+                    layer["params"],
+                    _format_bytes(layer["param_bytes"]),
+                    layer["flops"],
+                    _format_bytes(layer["activation_bytes"]),
+                ]
+            )
+        table.print_table()
+    print(
+        f"Total Flops: {report['flops']}     Total Params: {report['params']}     "
+        f"Param Memory: {_format_bytes(report['param_bytes'])}     "
+        f"Activation Memory: {_format_bytes(report['activation_bytes'])}     "
+        f"Peak Memory: {_format_bytes(report['peak_bytes'])}"
+    )
+    return report
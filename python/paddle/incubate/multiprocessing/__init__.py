@@ -13,6 +13,10 @@
 # limitations under the License.
 
 from .reductions import init_reductions
+from .shm_pool import (  # noqa: F401
+    disable_shared_memory_pool,
+    enable_shared_memory_pool,
+)
 
 __all__ = []
 
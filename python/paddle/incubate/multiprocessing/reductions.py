@@ -26,6 +26,8 @@ from multiprocessing.util import register_after_fork
 
 import paddle
 
+from . import shm_pool
+
 
 def _supported_check():
     if sys.platform != "linux":
@@ -168,6 +170,16 @@ def _rebuild_lodtensor_filedescriptor(
     return lodtensor
 
 
+def _rebuild_lodtensor_pooled(
+    cls, ipc_name, arena_size, offset, dtype, dims, lod
+):
+    array = shm_pool.rebuild(ipc_name, arena_size, offset, dtype, dims)
+    lodtensor = cls()
+    lodtensor.set(array, paddle.CPUPlace(), True)
+    lodtensor.set_lod(lod)
+    return lodtensor
+
+
 def _rebuild_cuda_tensor(
     cls, handle, offset_bytes, size, type_idx, dims, lod, device_idx
 ):
@@ -206,6 +218,13 @@ def _reduce_lodtensor(lodtensor):
             if dim == 0:
                 # Empty tensors have nothing be mapped.
                 return (_rebuild_lodtensor_empty, (type(lodtensor),))
+        # Use a block of a shared memory arena if the pool is enabled
+        metadata = shm_pool.share(lodtensor)
+        if metadata is not None:
+            return (
+                _rebuild_lodtensor_pooled,
+                (type(lodtensor), *metadata, lodtensor.lod()),
+            )
         dataloader_use_file_descriptor = paddle.base.core.globals()[
             "FLAGS_dataloader_use_file_descriptor"
         ]
@@ -0,0 +1,375 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A pool of shared memory arenas for passing CPU tensors between processes.
+
+Without the pool, every CPU tensor sent to another process gets a shared
+memory file of its own, created and unlinked once per tensor. With it, the
+tensor is copied into a block of a large arena file instead, and its storage
+is replaced by the block, so the sender and the receivers share it as
+before. Arenas stay mapped and their free blocks are reused by later sends.
+
+The first int64 of an arena counts the pool allocating in it and the blocks
+alive in it, and the first int64 of each block counts the references to the
+block from all processes. They are updated with the arena file locked. An
+arena file is unlinked when its count drops to zero.
+"""
+
+from __future__ import annotations
+
+import atexit
+import fcntl
+import mmap
+import os
+import threading
+import uuid
+import weakref
+from multiprocessing.util import register_after_fork
+
+import numpy as np
+
+import paddle
+
+__all__ = []
+
+_SHM_DIR = '/dev/shm'
+# the refcount of an arena or a block has a cache line of its own, before the
+# data of the block
+_HEADER = 64
+_ALIGN = 64
+
+DEFAULT_ARENA_SIZE = 64 << 20
+
+# the dtypes of which a numpy array is shared by a tensor without a copy
+_POOLED_DTYPES = {
+    np.dtype(dtype)
+    for dtype in [
+        'bool',
+        'uint8',
+        'int8',
+        'int16',
+        'int32',
+        'int64',
+        'float16',
+        'float32',
+        'float64',
+        'complex64',
+        'complex128',
+    ]
+}
+
+
+def _align(nbytes):
+    return (nbytes + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class _Arena:
+    """
+    An arena file mapped in this process.
+    """
+
+    def __init__(self, name, size, create=False):
+        self.name = name
+        self.size = size
+        self.path = os.path.join(_SHM_DIR, name)
+        if create:
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_EXCL)
+            os.ftruncate(self.fd, size)
+        else:
+            self.fd = os.open(self.path, os.O_RDWR)
+        self.buffer = mmap.mmap(self.fd, size)
+        self.lock = threading.Lock()
+        # whether the pool of this process allocates in it
+        self.owned = create
+        # the arrays of its blocks alive in this process
+        self.local_refs = 0
+
+    def refcount(self, offset):
+        return int(np.ndarray([], np.int64, self.buffer, offset))
+
+    def update(self, offset, delta, reset=False):
+        """
+        Add delta to the refcount at offset, or set it to delta if reset,
+        return the new refcount.
+        """
+        with self.lock:
+            # flock but not lockf, which is released by closing any file
+            # descriptor of the file in the process
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                count = np.ndarray([], np.int64, self.buffer, offset)
+                if reset:
+                    count[...] = delta
+                else:
+                    count += delta
+                return int(count)
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    def init_block(self, offset):
+        # the header of a new block may hold the data of a released one
+        self.update(offset, 1, reset=True)
+
+    def incref_block(self, offset):
+        self.update(offset, 1)
+
+    def decref_block(self, offset):
+        if self.update(offset, -1) == 0:
+            self.decref()
+
+    def decref(self):
+        if self.update(0, -1) == 0:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    def close(self):
+        os.close(self.fd)
+        self.fd = -1
+
+
+class _Registry:
+    """
+    The arenas mapped in this process, and the blocks of them alive in it by
+    the address of their data.
+    """
+
+    def __init__(self):
+        self.arenas = {}
+        self.blocks = {}
+        self._after_fork()
+        register_after_fork(self, _Registry._after_fork)
+
+    def _after_fork(self):
+        # the child neither owns nor counts the arenas of the parent, and
+        # maps them again if it receives their blocks
+        for arena in self.arenas.values():
+            arena.close()
+        self.arenas = {}
+        self.blocks = {}
+        self.lock = threading.Lock()
+
+    def map_block(self, name, size, offset, dtype, shape, arena=None):
+        """
+        The array of the block at offset of arena name, which releases a
+        reference to the block when it is freed.
+        """
+        with self.lock:
+            if arena is None:
+                arena = self.arenas.get(name)
+            if arena is None:
+                arena = _Arena(name, size)
+            self.arenas[name] = arena
+            array = np.ndarray(shape, dtype, arena.buffer, offset + _HEADER)
+            address = array.ctypes.data
+            arena.local_refs += 1
+            self.blocks.setdefault(address, [arena, offset, 0])[2] += 1
+        weakref.finalize(
+            array, self.release, arena, offset, address, os.getpid()
+        )
+        return array
+
+    def find_block(self, address):
+        """
+        The arena and the offset of the block of which the data is at
+        address, or None if it is not a block alive in this process.
+        """
+        with self.lock:
+            entry = self.blocks.get(address)
+            return None if entry is None else entry[:2]
+
+    def release(self, arena, offset, address, pid):
+        if os.getpid() != pid:
+            # inherited by a forked process, which did not count it
+            return
+        with self.lock:
+            entry = self.blocks[address]
+            entry[2] -= 1
+            if entry[2] == 0:
+                del self.blocks[address]
+            arena.local_refs -= 1
+            close = arena.local_refs == 0 and not arena.owned
+            if close and self.arenas.get(arena.name) is arena:
+                del self.arenas[arena.name]
+        arena.decref_block(offset)
+        if close:
+            arena.close()
+
+    def drop_owned(self, arena):
+        with self.lock:
+            arena.owned = False
+            close = arena.local_refs == 0
+            if close and self.arenas.get(arena.name) is arena:
+                del self.arenas[arena.name]
+        arena.decref()
+        if close:
+            arena.close()
+
+
+_registry = _Registry()
+
+
+class SharedMemoryPool:
+    """
+    The arenas in which this process allocates the blocks of the tensors it
+    sends.
+    """
+
+    def __init__(self, arena_size=DEFAULT_ARENA_SIZE, max_block_size=None):
+        if max_block_size is None:
+            max_block_size = arena_size // 4
+        if _align(max_block_size) > arena_size - 2 * _HEADER:
+            raise ValueError(
+                f"max_block_size {max_block_size} does not fit in an arena "
+                f"of {arena_size} bytes"
+            )
+        self.arena_size = arena_size
+        self.max_block_size = max_block_size
+        self._after_fork()
+        register_after_fork(self, SharedMemoryPool._after_fork)
+
+    def _after_fork(self):
+        self.lock = threading.Lock()
+        # the arenas, with the sizes of their blocks not known to be free by
+        # their offsets
+        self.arenas = []
+        self.allocated = {}
+
+    def _new_arena(self):
+        name = f"paddle_{os.getpid()}_pool_{uuid.uuid4().hex[:16]}"
+        arena = _Arena(name, self.arena_size, create=True)
+        # the reference of the pool
+        arena.update(0, 1)
+        self.arenas.append(arena)
+        self.allocated[name] = {}
+        return arena
+
+    def _find_space(self, arena, size):
+        blocks = self.allocated[arena.name]
+        # only this pool sets the refcount of a free block, so that it does
+        # not need a lock to see that a block is free
+        for offset in [o for o in blocks if arena.refcount(o) == 0]:
+            del blocks[offset]
+        start = _HEADER
+        for offset in sorted(blocks):
+            if offset - start >= size:
+                return start
+            start = offset + blocks[offset]
+        if arena.size - start >= size:
+            return start
+        return None
+
+    def _allocate(self, nbytes):
+        size = _HEADER + _align(nbytes)
+        with self.lock:
+            for arena in self.arenas:
+                offset = self._find_space(arena, size)
+                if offset is not None:
+                    break
+            else:
+                arena = self._new_arena()
+                offset = self._find_space(arena, size)
+            self.allocated[arena.name][offset] = size
+            arena.update(0, 1)
+            arena.init_block(offset)
+        return arena, offset
+
+    def share(self, lodtensor):
+        """
+        Move lodtensor into a block if it is not in one yet, and add a
+        reference to the block for a receiver. Return the metadata to
+        rebuild it, or None if it does not fit in the pool.
+        """
+        block = _registry.find_block(lodtensor._ptr())
+        array = np.asarray(lodtensor)
+        if block is None:
+            if (
+                array.dtype not in _POOLED_DTYPES
+                or array.nbytes > self.max_block_size
+            ):
+                return None
+            arena, offset = self._allocate(array.nbytes)
+            # the reference of lodtensor
+            shared = _registry.map_block(
+                arena.name,
+                arena.size,
+                offset,
+                array.dtype,
+                array.shape,
+                arena=arena,
+            )
+            shared[...] = array
+            lodtensor.set(shared, paddle.CPUPlace(), True)
+        else:
+            arena, offset = block
+        arena.incref_block(offset)
+        return (
+            arena.name,
+            arena.size,
+            offset,
+            array.dtype.str,
+            list(array.shape),
+        )
+
+    def close(self):
+        """
+        Drop the arenas, each of which is unlinked once the blocks alive in
+        it are released.
+        """
+        with self.lock:
+            arenas, self.arenas, self.allocated = self.arenas, [], {}
+        for arena in arenas:
+            _registry.drop_owned(arena)
+
+
+_pool = None
+
+
+def enable_shared_memory_pool(
+    arena_size: int = DEFAULT_ARENA_SIZE, max_block_size: int | None = None
+) -> None:
+    """
+    Pass the CPU tensors of at most max_block_size bytes, arena_size // 4 by
+    default, to other processes through blocks of shared memory arenas of
+    arena_size bytes, which are reused across sends, instead of a shared
+    memory file for each tensor.
+    """
+    global _pool
+    disable_shared_memory_pool()
+    _pool = SharedMemoryPool(arena_size, max_block_size)
+
+
+def disable_shared_memory_pool() -> None:
+    """
+    Pass each CPU tensor through a shared memory file of its own again. The
+    arenas of the pool are unlinked once the tensors in them are released.
+    """
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
+
+
+atexit.register(disable_shared_memory_pool)
+
+
+def share(lodtensor):
+    if _pool is None:
+        return None
+    return _pool.share(lodtensor)
+
+
+def rebuild(name, size, offset, dtype, dims):
+    return _registry.map_block(name, size, offset, np.dtype(dtype), dims)
@@ -24,6 +24,7 @@ from paddle.base.core import (
     get_version,
 )
 
+from .batching import BatchingServer
 from .wrapper import (
     Config,
     DataType,
@@ -50,4 +51,5 @@ __all__ = [
     'get_num_bytes_of_data_type',
     'PredictorPool',
     'XpuConfig',
+    'BatchingServer',
 ]
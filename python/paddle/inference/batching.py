@@ -0,0 +1,365 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bisect
+import collections
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+__all__ = []
+
+
+class _Request:
+    def __init__(self, inputs, rows):
+        self.inputs = inputs
+        self.rows = rows
+        self.future = Future()
+        self.arrival = time.perf_counter()
+
+
+class BatchingServer:
+    """
+    Serve a Predictor in process with dynamic batching.
+
+    Requests submitted from any thread are queued, and requests with the same
+    input shapes are concatenated along the batch axis into a batch of at most
+    ``max_batch_size`` rows, which is run as soon as it is full or its oldest
+    request has waited ``max_delay_ms``. Batches are run by ``num_workers``
+    threads, each owning the predictor or a clone of it.
+
+    For inputs of variable length, ``buckets`` pads the inputs along
+    ``pad_axis`` to the smallest bucket not shorter than them, so that
+    requests of different lengths can share a batch. The outputs keep the
+    padding of the bucket.
+
+    Args:
+        predictor (Predictor): The predictor to run the batches, created by
+            ``paddle.inference.create_predictor``.
+        num_workers (int, optional): The number of batches run concurrently,
+            by ``predictor`` and ``num_workers - 1`` clones of it. Default: 1.
+        max_batch_size (int, optional): The max number of rows of a batch,
+            a request may not have more rows than this. Default: 32.
+        max_delay_ms (float, optional): The max time in milliseconds a request
+            waits for the batch it is in to fill up. Default: 5.
+        buckets (list[int]|None, optional): The lengths inputs are padded to
+            along ``pad_axis``. Inputs longer than all the buckets are left as
+            they are. Default: None, no input is padded.
+        pad_axis (int, optional): The axis inputs are padded along. Default: 1.
+        pad_value (int|float, optional): The value to pad with. Default: 0.
+        pad_inputs (list[str]|None, optional): The names of the inputs padded,
+            None for all of them. Default: None.
+        stats_window (int, optional): The number of latest requests the
+            latency stats are computed over. Default: 10000.
+
+    Examples:
+        .. code-block:: python
+
+            >>> # doctest: +SKIP('Save an inference model first')
+            >>> import numpy as np
+            >>> from paddle.inference import BatchingServer, Config, create_predictor
+
+            >>> config = Config("./model.pdmodel", "./model.pdiparams")
+            >>> config.disable_gpu()
+            >>> with BatchingServer(
+            ...     create_predictor(config), num_workers=2, max_batch_size=16
+            ... ) as server:
+            ...     future = server.submit([np.random.rand(1, 4).astype("float32")])
+            ...     outputs = future.result()
+            ...     print(server.stats()["latency_ms"]["p99"])
+    """
+
+    def __init__(
+        self,
+        predictor,
+        num_workers=1,
+        max_batch_size=32,
+        max_delay_ms=5.0,
+        buckets=None,
+        pad_axis=1,
+        pad_value=0,
+        pad_inputs=None,
+        stats_window=10000,
+    ):
+        if num_workers < 1:
+            raise ValueError(
+                f"num_workers should be at least 1, but got {num_workers}."
+            )
+        if max_batch_size < 1:
+            raise ValueError(
+                f"max_batch_size should be at least 1, but got {max_batch_size}."
+            )
+        if pad_axis < 1:
+            raise ValueError(
+                f"pad_axis should not be the batch axis, but got {pad_axis}."
+            )
+        self._input_names = predictor.get_input_names()
+        self._output_names = predictor.get_output_names()
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay_ms / 1000.0
+        self._buckets = sorted(buckets) if buckets else None
+        self._pad_axis = pad_axis
+        self._pad_value = pad_value
+        self._pad_inputs = set(
+            self._input_names if pad_inputs is None else pad_inputs
+        )
+
+        self._cond = threading.Condition()
+        # requests of the same input shapes, in the order they arrived
+        self._pending = {}
+        self._num_pending = 0
+        self._closed = False
+
+        self._stats_lock = threading.Lock()
+        self._num_requests = 0
+        self._num_batches = 0
+        self._num_rows = 0
+        self._num_errors = 0
+        self._latencies = collections.deque(maxlen=stats_window)
+        self._queue_times = collections.deque(maxlen=stats_window)
+
+        predictors = [predictor] + [
+            predictor.clone() for _ in range(num_workers - 1)
+        ]
+        self._workers = [
+            threading.Thread(
+                target=self._work,
+                args=(p,),
+                name=f"BatchingServer-{i}",
+                daemon=True,
+            )
+            for i, p in enumerate(predictors)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _pad(self, data):
+        length = data.shape[self._pad_axis]
+        index = bisect.bisect_left(self._buckets, length)
+        if index == len(self._buckets) or self._buckets[index] == length:
+            return data
+        pad_width = [(0, 0)] * data.ndim
+        pad_width[self._pad_axis] = (0, self._buckets[index] - length)
+        return np.pad(data, pad_width, constant_values=self._pad_value)
+
+    def submit(self, inputs):
+        """
+        Queue a request.
+
+        Args:
+            inputs (list[numpy.ndarray]|dict[str, numpy.ndarray]): The inputs
+                of the request, in the order of the input names of the
+                predictor or by name. All of them have the same number of
+                rows along axis 0.
+
+        Returns:
+            concurrent.futures.Future: The future of the request, whose result
+            is the list of the outputs of the request.
+        """
+        if isinstance(inputs, dict):
+            inputs = [inputs[name] for name in self._input_names]
+        if len(inputs) != len(self._input_names):
+            raise ValueError(
+                f"The predictor has {len(self._input_names)} inputs, but got {len(inputs)}."
+            )
+        inputs = [np.asarray(data) for data in inputs]
+        rows = inputs[0].shape[0] if inputs[0].ndim > 0 else 0
+        if any(data.ndim == 0 or data.shape[0] != rows for data in inputs):
+            raise ValueError(
+                "All the inputs should have the same number of rows along axis 0."
+            )
+        if rows > self._max_batch_size:
+            raise ValueError(
+                f"The request has {rows} rows, more than max_batch_size {self._max_batch_size}."
+            )
+        if self._buckets is not None:
+            inputs = [
+                (
+                    self._pad(data)
+                    if name in self._pad_inputs and data.ndim > self._pad_axis
+                    else data
+                )
+                for name, data in zip(self._input_names, inputs)
+            ]
+        key = tuple((data.shape[1:], data.dtype.str) for data in inputs)
+        request = _Request(inputs, rows)
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Cannot submit to a closed BatchingServer.")
+            self._pending.setdefault(key, collections.deque()).append(request)
+            self._num_pending += 1
+            self._cond.notify()
+        return request.future
+
+    def predict(self, inputs):
+        """
+        Run a request and wait for its outputs, see :meth:`submit`.
+        """
+        return self.submit(inputs).result()
+
+    def _next_batch(self):
+        with self._cond:
+            while True:
+                if not self._pending:
+                    if self._closed:
+                        return None
+                    self._cond.wait()
+                    continue
+                # serve the shapes whose oldest request has waited the longest
+                key, queue = min(
+                    self._pending.items(), key=lambda item: item[1][0].arrival
+                )
+                rows = sum(request.rows for request in queue)
+                deadline = queue[0].arrival + self._max_delay
+                timeout = deadline - time.perf_counter()
+                if rows >= self._max_batch_size or timeout <= 0 or self._closed:
+                    break
+                self._cond.wait(timeout)
+
+            batch, rows = [], 0
+            while queue and rows + queue[0].rows <= self._max_batch_size:
+                request = queue.popleft()
+                self._num_pending -= 1
+                if request.future.set_running_or_notify_cancel():
+                    batch.append(request)
+                    rows += request.rows
+            if not queue:
+                del self._pending[key]
+            if self._pending:
+                self._cond.notify()
+            return batch
+
+    def _run(self, predictor, batch):
+        start = time.perf_counter()
+        rows = sum(request.rows for request in batch)
+        try:
+            for i, name in enumerate(self._input_names):
+                data = np.ascontiguousarray(
+                    np.concatenate([request.inputs[i] for request in batch])
+                    if len(batch) > 1
+                    else batch[0].inputs[i]
+                )
+                handle = predictor.get_input_handle(name)
+                handle.reshape(data.shape)
+                handle.copy_from_cpu(data)
+            predictor.run()
+            outputs = [
+                predictor.get_output_handle(name).copy_to_cpu()
+                for name in self._output_names
+            ]
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            with self._stats_lock:
+                self._num_errors += len(batch)
+            return
+
+        end = time.perf_counter()
+        offset = 0
+        for request in batch:
+            # outputs not batched, e.g. reduced over the batch, go to all
+            request.future.set_result(
+                [
+                    (
+                        output[offset : offset + request.rows]
+                        if output.ndim > 0 and output.shape[0] == rows
+                        else output
+                    )
+                    for output in outputs
+                ]
+            )
+            offset += request.rows
+
+        with self._stats_lock:
+            self._num_requests += len(batch)
+            self._num_batches += 1
+            self._num_rows += rows
+            for request in batch:
+                self._latencies.append((end - request.arrival) * 1000.0)
+                self._queue_times.append((start - request.arrival) * 1000.0)
+
+    def _work(self, predictor):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            if batch:
+                self._run(predictor, batch)
+
+    def stats(self):
+        """
+        Get the stats of the server.
+
+        Returns:
+            dict: The number of "requests" served, of "batches" run, of
+            "errors" (requests failed), the "queue_size" (requests waiting),
+            the "avg_batch_size" in rows, and the "latency_ms" (from submit
+            to outputs ready) and "queue_ms" (from submit to the batch start)
+            of the latest requests, each a dict of "mean", "p50", "p95",
+            "p99" and "max".
+        """
+
+        def summary(values):
+            if len(values) == 0:
+                return dict.fromkeys(["mean", "p50", "p95", "p99", "max"], 0.0)
+            values = np.asarray(values)
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            return {
+                "mean": float(values.mean()),
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+                "max": float(values.max()),
+            }
+
+        with self._cond:
+            queue_size = self._num_pending
+        with self._stats_lock:
+            return {
+                "requests": self._num_requests,
+                "batches": self._num_batches,
+                "errors": self._num_errors,
+                "queue_size": queue_size,
+                "avg_batch_size": (
+                    self._num_rows / self._num_batches
+                    if self._num_batches
+                    else 0.0
+                ),
+                "latency_ms": summary(list(self._latencies)),
+                "queue_ms": summary(list(self._queue_times)),
+            }
+
+    def close(self, wait=True):
+        """
+        Stop accepting requests. The requests queued are still served.
+
+        Args:
+            wait (bool, optional): Whether to wait for the queued requests to
+                be served. Default: True.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
@@ -29,7 +29,9 @@ from .dataloader import (
     SubsetRandomSampler,
     TensorDataset,
     WeightedRandomSampler,
+    WorkerPool,
     get_worker_info,
+    get_worker_pool,
     random_split,
 )
 from .reader import DataLoader
@@ -44,6 +46,8 @@ __all__ = [
     'DistributedBatchSampler',
     'DataLoader',
     'get_worker_info',
+    'WorkerPool',
+    'get_worker_pool',
     'Sampler',
     'SequenceSampler',
     'RandomSampler',
@@ -34,3 +34,4 @@ from .sampler import (  # noqa: F401
     WeightedRandomSampler,
 )
 from .worker import get_worker_info  # noqa: F401
+from .worker_pool import WorkerPool, get_worker_pool  # noqa: F401
@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import itertools
 import logging
+import math
 import os
 import queue
 import sys
@@ -367,6 +369,144 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
         self._try_shutdown_all()
 
 
+class _AdaptivePrefetchController:
+    """
+    Decide the prefetch window and the number of active workers of a
+    multi-process DataLoader iterator from the measured timings.
+
+    Every ``interval`` output batches, the time the consumer waited for data
+    is compared with the time between two output batches. If the consumer
+    waited for more than ``grow_ratio`` of the time, the prefetch factor is
+    increased, and if it almost never waited the prefetch factor is decreased
+    to save memory. The number of active workers follows the ratio of the
+    time a worker takes to produce a batch to the time the consumer takes to
+    use one.
+    """
+
+    def __init__(
+        self,
+        prefetch_factor,
+        num_workers,
+        scale_workers=True,
+        min_prefetch_factor=1,
+        max_prefetch_factor=None,
+        min_workers=1,
+        interval=20,
+        grow_ratio=0.05,
+        shrink_ratio=0.01,
+        headroom=1.25,
+    ):
+        self.prefetch_factor = prefetch_factor
+        self.min_prefetch_factor = min_prefetch_factor
+        self.max_prefetch_factor = max_prefetch_factor or max(
+            2 * prefetch_factor, 4
+        )
+        self.num_workers = num_workers
+        self.active_workers = num_workers
+        self.min_workers = min(min_workers, num_workers)
+        self.scale_workers = scale_workers
+        self.interval = interval
+        self.grow_ratio = grow_ratio
+        self.shrink_ratio = shrink_ratio
+        self.headroom = headroom
+
+        self._lock = threading.Lock()
+        self._waits = []
+        self._intervals = []
+        self._produces = []
+        self._steps = 0
+        self._total_wait = 0.0
+        self._last_output = None
+        self.decisions = collections.deque(maxlen=100)
+
+    def record_output(self, wait):
+        now = time.perf_counter()
+        with self._lock:
+            self._waits.append(wait)
+            self._total_wait += wait
+            if self._last_output is not None:
+                self._intervals.append(now - self._last_output)
+            self._last_output = now
+            self._steps += 1
+
+    def record_produce(self, cost):
+        with self._lock:
+            self._produces.append(cost)
+
+    def reset_epoch(self):
+        with self._lock:
+            self._last_output = None
+
+    def adjust(self):
+        """Return True if the prefetch factor or active workers changed."""
+        with self._lock:
+            if self._steps % self.interval != 0 or not self._intervals:
+                return False
+            avg_wait = sum(self._waits) / len(self._waits)
+            avg_interval = sum(self._intervals) / len(self._intervals)
+            avg_produce = (
+                sum(self._produces) / len(self._produces)
+                if self._produces
+                else None
+            )
+            self._waits, self._intervals, self._produces = [], [], []
+
+        prefetch_factor = self.prefetch_factor
+        active_workers = self.active_workers
+        reasons = []
+        starving = avg_wait > self.grow_ratio * avg_interval
+        idle = avg_wait < self.shrink_ratio * avg_interval
+        if starving and prefetch_factor < self.max_prefetch_factor:
+            prefetch_factor += 1
+            reasons.append("consumer starving, grow prefetch")
+        elif idle and prefetch_factor > self.min_prefetch_factor:
+            prefetch_factor -= 1
+            reasons.append("consumer never waits, shrink prefetch")
+
+        if self.scale_workers and avg_produce is not None:
+            # workers needed to produce one batch per consumer step
+            compute = max(avg_interval - avg_wait, 1e-6)
+            needed = math.ceil(self.headroom * avg_produce / compute)
+            needed = min(max(needed, self.min_workers), self.num_workers)
+            if starving and needed > active_workers:
+                active_workers = needed
+                reasons.append("grow active workers")
+            elif idle and needed < active_workers:
+                active_workers -= 1
+                reasons.append("shrink active workers")
+
+        if (
+            prefetch_factor == self.prefetch_factor
+            and active_workers == self.active_workers
+        ):
+            return False
+        self.prefetch_factor = prefetch_factor
+        self.active_workers = active_workers
+        self.decisions.append(
+            {
+                "step": self._steps,
+                "prefetch_factor": prefetch_factor,
+                "active_workers": active_workers,
+                "avg_wait": avg_wait,
+                "avg_interval": avg_interval,
+                "avg_produce": avg_produce,
+                "reason": ", ".join(reasons),
+            }
+        )
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                "prefetch_factor": self.prefetch_factor,
+                "active_workers": self.active_workers,
+                "num_workers": self.num_workers,
+                "steps": self._steps,
+                "total_wait": self._total_wait,
+                "decisions": list(self.decisions),
+            }
+
+
 class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
     def __init__(self, loader):
         super().__init__(loader)
@@ -400,6 +540,25 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         self._outstanding_capacity = self._prefetch_factor * max(
             self._num_workers, len(self._places)
         )
+        self._blocking_queue_capacity = self._outstanding_capacity
+
+        # adaptive prefetch: the window of outstanding indices and the
+        # number of workers to put indices to are adjusted on the fly,
+        # see _AdaptivePrefetchController
+        self._active_workers = self._num_workers
+        self._prefetch_controller = None
+        if loader._adaptive_prefetch:
+            self._prefetch_controller = _AdaptivePrefetchController(
+                self._prefetch_factor,
+                self._num_workers,
+                scale_workers=self._dataset_kind == _DatasetKind.MAP,
+            )
+            self._blocking_queue_capacity = (
+                self._prefetch_controller.max_prefetch_factor
+                * max(self._num_workers, len(self._places))
+            )
+        self._worker_outstanding = [0] * self._num_workers
+        self._send_times = {}
 
         # see _try_put_indices
         self._thread_lock = threading.Lock()
@@ -508,7 +667,9 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             self._dtypes = [v.dtype for v in self._feed_list]
         # if only 1 place, do not need to keep order
         self._blocking_queue = core.init_lod_tensor_blocking_queue(
-            core.Variable(), self._outstanding_capacity, len(self._places) > 1
+            core.Variable(),
+            self._blocking_queue_capacity,
+            len(self._places) > 1,
         )
         core._set_max_memory_map_allocation_pool_size(
             self._main_thread_shm_buffer_size
@@ -570,6 +731,10 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
 
         # set all worker status available
         self._worker_status = [True] * self._num_workers
+        self._worker_outstanding = [0] * self._num_workers
+        self._send_times = {}
+        if self._prefetch_controller is not None:
+            self._prefetch_controller.reset_epoch()
 
         # 4. reset _sampler_iter and put prefetch indices to start next epoch
         # init workers and indices queues and put 2 indices in each indices queue
@@ -766,6 +931,9 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     self._exit_thread_unexpectedly()
                     batch.reraise()
 
+                if self._prefetch_controller is not None:
+                    self._on_batch_produced(idx)
+
                 if idx == self._rcvd_idx:
                     if idx in self._task_infos:
                         del self._task_infos[idx]
@@ -776,6 +944,13 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     continue
 
     def _try_put_indices(self):
+        # the window may have been shrunk by adaptive prefetch, let the
+        # outstanding batches drain below it
+        if (
+            self._prefetch_controller is not None
+            and self._batches_outstanding >= self._outstanding_capacity
+        ):
+            return
         assert (
             self._batches_outstanding <= self._outstanding_capacity
         ), "too many indices have been put to queue"
@@ -796,16 +971,61 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
 
             for i in range(self._num_workers):
                 worker_idx = next(self._workers_idx_cycle)
-                if self._worker_status[worker_idx]:
+                if (
+                    self._worker_status[worker_idx]
+                    and worker_idx < self._active_workers
+                ):
                     break
             else:
                 return
 
+            if self._prefetch_controller is not None:
+                self._worker_outstanding[worker_idx] += 1
+                self._send_times[self._send_idx] = (
+                    time.perf_counter(),
+                    self._worker_outstanding[worker_idx],
+                )
             self._indices_queues[worker_idx].put((self._send_idx, indices))
             self._task_infos[self._send_idx] = (worker_idx,)
             self._batches_outstanding += 1
             self._send_idx += 1
 
+    def _on_batch_produced(self, idx):
+        # a worker handles its indices in order, so the latency of a batch
+        # covers the batches queued before it on the same worker
+        send_info = self._send_times.pop(idx, None)
+        worker_idx = self._task_infos.get(idx, (None,))[0]
+        if send_info is None or worker_idx is None:
+            return
+        send_time, position = send_info
+        with self._thread_lock:
+            self._worker_outstanding[worker_idx] -= 1
+        self._prefetch_controller.record_produce(
+            (time.perf_counter() - send_time) / position
+        )
+
+    def _adjust_prefetch(self):
+        controller = self._prefetch_controller
+        if not controller.adjust():
+            return
+        self._active_workers = controller.active_workers
+        self._outstanding_capacity = controller.prefetch_factor * max(
+            self._active_workers, len(self._places)
+        )
+        while self._batches_outstanding < self._outstanding_capacity:
+            send_idx = self._send_idx
+            self._try_put_indices()
+            if self._send_idx == send_idx:
+                break
+
+    def _prefetch_stats(self):
+        if self._prefetch_controller is None:
+            return None
+        stats = self._prefetch_controller.stats()
+        stats["outstanding_capacity"] = self._outstanding_capacity
+        stats["batches_outstanding"] = self._batches_outstanding
+        return stats
+
     def __del__(self):
         self._try_shutdown_all()
 
@@ -829,6 +1049,8 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             # no enough data to generate next output, close blocking_queue and
             # set _thread_done_event here, py_reader will raise StopIteration,
             # end workers and indices_queues in StopIteration handling
+            if self._prefetch_controller is not None:
+                wait_start = time.perf_counter()
             if self._batches_outstanding < len(self._places):
                 if self._persistent_workers:
                     raise StopIteration
@@ -859,6 +1081,10 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                         data = data[0]
                 else:
                     data = self._reader.read_next()
+            if self._prefetch_controller is not None:
+                self._prefetch_controller.record_output(
+                    time.perf_counter() - wait_start
+                )
             self._on_output_batch()
             benchmark().after_reader()
             return data
@@ -875,3 +1101,82 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         for _ in range(len(self._places)):
             self._batches_outstanding -= 1
             self._try_put_indices()
+        if self._prefetch_controller is not None:
+            self._adjust_prefetch()
+
+
+class _DataLoaderIterWorkerPool(_DataLoaderIterMultiProcess):
+    """
+    Multi-process implement of DataLoaderIter, loading data with the workers
+    of a shared :code:`paddle.io.WorkerPool` instead of starting its own.
+    """
+
+    def __init__(self, loader):
+        # keep the loader alive while iterating, its dataset is unregistered
+        # from the pool when it is garbage collected
+        self._loader = loader
+        self._worker_pool = loader._worker_pool
+        self._pool_dataset_key = loader._get_pool_dataset_key()
+        super().__init__(loader)
+
+    def _init_workers(self):
+        # workers are owned by the pool, this iterator only attaches to it
+        # and gets the batches of its own from a client queue
+        self._workers = self._worker_pool._workers
+        self._worker_status = [True] * self._num_workers
+        self._indices_queues = []
+        self._pool_client = self._worker_pool._attach(
+            self._pool_dataset_key, name=type(self._dataset).__name__
+        )
+        self._data_queue = self._pool_client.result_queue
+        self._thread_done_event = threading.Event()
+
+    def _clear_and_remove_data_queue(self):
+        if self._data_queue is not None:
+            while True:
+                try:
+                    self._data_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+    def _reset(self):
+        raise RuntimeError(
+            "DataLoader iterator with WorkerPool can not be reset, create "
+            "a new iterator for each epoch instead."
+        )
+
+    def _shutdown_worker(self, worker_id, shutdown=False):
+        self._worker_status[worker_id] = False
+
+    def _try_shutdown_all(self, timeout=None):
+        if not self._shutdown:
+            try:
+                self._exit_thread_expectedly()
+                self._worker_pool._detach(self._pool_client)
+                self._clear_and_remove_data_queue()
+            finally:
+                self._shutdown = True
+
+    def _try_put_indices(self):
+        if (
+            self._prefetch_controller is not None
+            and self._batches_outstanding >= self._outstanding_capacity
+        ):
+            return
+        assert (
+            self._batches_outstanding <= self._outstanding_capacity
+        ), "too many indices have been put to queue"
+        with self._thread_lock:
+            try:
+                indices = next(self._sampler_iter)
+            except StopIteration:
+                return
+
+            # the pool picks the worker, worker id in _task_infos is
+            # only used for IterableDataset, which is not supported
+            self._task_infos[self._send_idx] = (0,)
+            self._batches_outstanding += 1
+            self._worker_pool._submit(
+                self._pool_client, self._send_idx, indices
+            )
+            self._send_idx += 1
@@ -0,0 +1,524 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import collections
+import itertools
+import pickle
+import queue
+import sys
+import threading
+import time
+from multiprocessing.reduction import ForkingPickler
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+import paddle
+from paddle.incubate import multiprocessing
+
+from ...framework import core
+from ..multiprocess_utils import (
+    MP_STATUS_CHECK_INTERVAL,
+    CleanupFuncRegistrar,
+    _cleanup_mmap,
+    _set_SIGCHLD_handler,
+)
+from . import worker as _worker
+from .flat import _flatten_batch
+from .worker import (
+    ParentWatchDog,
+    WorkerInfo,
+    _DatasetKind,
+    _generate_states,
+    _WorkerException,
+)
+
+if TYPE_CHECKING:
+    from paddle.io import DataLoader
+
+__all__ = []
+
+# name -> WorkerPool, see get_worker_pool
+_worker_pools = {}
+
+
+def _clear_worker_pools():
+    for pool in list(_worker_pools.values()):
+        try:
+            pool.shutdown()
+        except:
+            pass
+
+
+CleanupFuncRegistrar.register(_clear_worker_pools)
+
+
+def _pool_worker_loop(
+    task_queue, out_queue, done_event, worker_id, num_workers, base_seed
+):
+    try:
+        # NOTE: see [ mmap files clear ] in _worker_loop
+        CleanupFuncRegistrar.register(_cleanup_mmap)
+        core._set_process_signal_handler()
+
+        import random
+
+        seed = base_seed + worker_id
+        random.seed(seed)
+        paddle.seed(seed)
+        np.random.seed(_generate_states(base_seed, worker_id))
+
+        # dataset key -> (dataset, fetcher, use_shared_memory) or the
+        # _WorkerException raised when registering the dataset
+        registry = {}
+        parent_watch_dog = ParentWatchDog()
+
+        while parent_watch_dog.is_alive():
+            try:
+                task = task_queue.get(MP_STATUS_CHECK_INTERVAL)
+            except queue.Empty:
+                continue
+
+            # None as poison pill
+            if task is None:
+                assert done_event.is_set(), "get None when pool is working"
+                break
+
+            if task[0] == "register":
+                _, key, payload = task
+                try:
+                    (
+                        dataset,
+                        dataset_kind,
+                        auto_collate_batch,
+                        collate_fn,
+                        drop_last,
+                        init_fn,
+                        use_shared_memory,
+                    ) = pickle.loads(payload)
+                    _worker._worker_info = WorkerInfo(
+                        id=worker_id,
+                        num_workers=num_workers,
+                        dataset=dataset,
+                        seed=base_seed,
+                    )
+                    if init_fn is not None:
+                        init_fn(worker_id)
+                    fetcher = _DatasetKind.create_fetcher(
+                        dataset_kind,
+                        dataset,
+                        auto_collate_batch,
+                        collate_fn,
+                        drop_last,
+                    )
+                    registry[key] = (dataset, fetcher, use_shared_memory)
+                except:
+                    registry[key] = _WorkerException(worker_id)
+                continue
+
+            if task[0] == "unregister":
+                registry.pop(task[1], None)
+                continue
+
+            _, key, client_id, idx, indices = task
+            entry = registry.get(key)
+            if isinstance(entry, _WorkerException):
+                out_queue.put((client_id, worker_id, idx, entry, None))
+                continue
+
+            try:
+                if entry is None:
+                    raise RuntimeError(
+                        f"dataset {key} is not registered in the WorkerPool, "
+                        "its DataLoader may have been released"
+                    )
+                dataset, fetcher, use_shared_memory = entry
+                _worker._worker_info = WorkerInfo(
+                    id=worker_id,
+                    num_workers=num_workers,
+                    dataset=dataset,
+                    seed=base_seed,
+                )
+                with paddle.base.dygraph.guard(place=paddle.CPUPlace()):
+                    batch = fetcher.fetch(indices)
+            except Exception:
+                out_queue.put(
+                    (
+                        client_id,
+                        worker_id,
+                        idx,
+                        _WorkerException(worker_id),
+                        None,
+                    )
+                )
+                continue
+
+            batch, structure = _flatten_batch(batch)
+            if use_shared_memory:
+
+                def numpy2lodtensor(arr):
+                    lodtensor = core.Tensor()
+                    lodtensor.set(arr, core.CPUPlace())
+                    return lodtensor
+
+                batch = [
+                    (
+                        numpy2lodtensor(b)
+                        if isinstance(b, np.ndarray)
+                        else b.get_tensor()
+                    )
+                    for b in batch
+                ]
+            out_queue.put((client_id, worker_id, idx, batch, structure))
+    except KeyboardInterrupt:
+        # NOTE: Main process will raise KeyboardInterrupt anyways, ignore it in child process
+        pass
+    finally:
+        _cleanup_mmap()
+    if done_event.is_set():
+        out_queue.cancel_join_thread()
+        out_queue.close()
+
+
+class _PoolClient:
+    """An iterator of a DataLoader attached to a WorkerPool."""
+
+    def __init__(self, client_id, dataset_key, name):
+        self.id = client_id
+        self.dataset_key = dataset_key
+        self.name = name
+        self.result_queue = queue.Queue()
+        self.pending = collections.deque()
+        self.submitted = 0
+        self.completed = 0
+        self.inflight = 0
+        self.attach_time = time.time()
+
+
+class WorkerPool:
+    """
+    A pool of data loading worker processes which can be shared by several
+    :code:`paddle.io.DataLoader` and reused across epochs.
+
+    Every DataLoader iterator normally starts its own worker processes, so the
+    workers re-import paddle and rebuild the dataset at every epoch boundary,
+    and train and eval loaders each keep a separate set of processes. The
+    workers of a ``WorkerPool`` are started once. The dataset, ``collate_fn``
+    and ``worker_init_fn`` of a DataLoader are pickled and sent to each worker
+    once, when the DataLoader is first iterated, and are cached in the workers
+    until the DataLoader is garbage collected. Batches requested by the
+    attached DataLoaders are scheduled round-robin across loaders, so a
+    loader with a large prefetch window does not starve the others.
+
+    Only map-style datasets are supported, and the dataset, ``collate_fn``
+    and ``worker_init_fn`` must be picklable.
+
+    Args:
+        num_workers (int): The number of worker processes.
+        name (str|None, optional): The name to register the pool with, see
+            :code:`paddle.io.get_worker_pool`. Default None.
+        max_inflight_per_worker (int, optional): The max number of batches
+            dispatched to a worker at the same time. Default 2.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> # doctest: +SOLO('can not use multiprocessing testing `paddle.io.DataLoader`')
+            >>> import numpy as np
+            >>> import paddle
+            >>> from paddle.io import Dataset, DataLoader, WorkerPool
+
+            >>> class RandomDataset(Dataset):  # type: ignore[type-arg]
+            ...     def __init__(self, num_samples):
+            ...         self.num_samples = num_samples
+            ...
+            ...     def __getitem__(self, idx):
+            ...         image = np.random.random([784]).astype('float32')
+            ...         label = np.random.randint(0, 9, (1, )).astype('int64')
+            ...         return image, label
+            ...
+            ...     def __len__(self):
+            ...         return self.num_samples
+            ...
+            >>> pool = WorkerPool(num_workers=2, name="shared")
+            >>> train_loader = DataLoader(RandomDataset(64), batch_size=16, worker_pool=pool)
+            >>> eval_loader = DataLoader(RandomDataset(32), batch_size=16, worker_pool="shared")
+            >>> for epoch in range(2):
+            ...     for image, label in train_loader():
+            ...         pass
+            ...     for image, label in eval_loader():
+            ...         pass
+            >>> print(pool.stats()["num_workers"])
+            2
+            >>> pool.shutdown()
+    """
+
+    def __init__(
+        self,
+        num_workers: int,
+        name: str | None = None,
+        max_inflight_per_worker: int = 2,
+    ) -> None:
+        if sys.platform == 'darwin' or sys.platform == 'win32':
+            raise NotImplementedError(
+                "WorkerPool is not supported on MacOs and Windows currently."
+            )
+        assert num_workers > 0, "num_workers should be a positive value"
+        assert (
+            max_inflight_per_worker > 0
+        ), "max_inflight_per_worker should be a positive value"
+        if name is not None and name in _worker_pools:
+            raise ValueError(f"WorkerPool named '{name}' already exists.")
+
+        self.name = name
+        self.num_workers = num_workers
+        self._max_inflight_per_worker = max_inflight_per_worker
+        self._base_seed = np.random.randint(low=0, high=sys.maxsize)
+
+        self._lock = threading.Lock()
+        self._clients = collections.OrderedDict()
+        self._client_ids = itertools.count()
+        self._dataset_keys = itertools.count()
+        # dataset key -> the objects sent, referenced to keep ids valid
+        self._datasets = {}
+        self._worker_inflight = [0] * num_workers
+        self._worker_completed = [0] * num_workers
+        self._rr_offset = 0
+        self._submitted = 0
+        self._completed = 0
+        self._registered = 0
+        self._start_time = time.time()
+
+        self._out_queue = multiprocessing.Queue()
+        self._done_event = multiprocessing.Event()
+        self._task_queues = []
+        self._workers = []
+        for i in range(num_workers):
+            task_queue = multiprocessing.Queue()
+            task_queue.cancel_join_thread()
+            worker = multiprocessing.Process(
+                target=_pool_worker_loop,
+                args=(
+                    task_queue,
+                    self._out_queue,
+                    self._done_event,
+                    i,
+                    num_workers,
+                    self._base_seed,
+                ),
+            )
+            worker.daemon = True
+            worker.start()
+            self._task_queues.append(task_queue)
+            self._workers.append(worker)
+
+        core._set_process_pids(id(self), tuple(w.pid for w in self._workers))
+        _set_SIGCHLD_handler()
+
+        self._shutdown = False
+        self._router_done_event = threading.Event()
+        self._router = threading.Thread(target=self._route_loop)
+        self._router.daemon = True
+        self._router.start()
+
+        if name is not None:
+            _worker_pools[name] = self
+
+    def _register_dataset(self, loader: DataLoader) -> int:
+        """Send the dataset of loader to all workers, return its key."""
+        objs = (
+            loader.dataset,
+            loader.dataset_kind,
+            loader.auto_collate_batch,
+            loader.collate_fn,
+            loader.drop_last,
+            loader.worker_init_fn,
+            loader.use_shared_memory,
+        )
+        # pickle once in main process, which raises unpicklable errors
+        # here instead of in the queue feeder thread
+        payload = bytes(ForkingPickler.dumps(objs))
+        with self._lock:
+            key = next(self._dataset_keys)
+            self._datasets[key] = objs
+            self._registered += 1
+            for task_queue in self._task_queues:
+                task_queue.put(("register", key, payload))
+        return key
+
+    def _unregister_dataset(self, key: int) -> None:
+        with self._lock:
+            if self._shutdown or self._datasets.pop(key, None) is None:
+                return
+            for task_queue in self._task_queues:
+                task_queue.put(("unregister", key))
+
+    def _attach(self, dataset_key: int, name: str | None = None) -> _PoolClient:
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("WorkerPool has been shut down.")
+            client = _PoolClient(next(self._client_ids), dataset_key, name)
+            self._clients[client.id] = client
+            return client
+
+    def _detach(self, client: _PoolClient) -> None:
+        with self._lock:
+            self._clients.pop(client.id, None)
+            client.pending.clear()
+
+    def _submit(self, client: _PoolClient, idx: int, indices: Any) -> None:
+        with self._lock:
+            client.pending.append((idx, indices))
+            client.submitted += 1
+            self._submitted += 1
+            self._dispatch_locked()
+
+    def _dispatch_locked(self):
+        while not self._shutdown:
+            worker_id = int(np.argmin(self._worker_inflight))
+            if (
+                self._worker_inflight[worker_id]
+                >= self._max_inflight_per_worker
+            ):
+                return
+            # round-robin over the attached clients with pending batches
+            clients = list(self._clients.values())
+            for i in range(len(clients)):
+                client = clients[(self._rr_offset + i) % len(clients)]
+                if client.pending:
+                    self._rr_offset = (self._rr_offset + i + 1) % len(clients)
+                    break
+            else:
+                return
+            idx, indices = client.pending.popleft()
+            self._task_queues[worker_id].put(
+                ("fetch", client.dataset_key, client.id, idx, indices)
+            )
+            self._worker_inflight[worker_id] += 1
+            client.inflight += 1
+
+    def _route_loop(self):
+        core.set_current_thread_name("WorkerPool_" + str(id(self)))
+        while not self._router_done_event.is_set():
+            try:
+                data = self._out_queue.get(timeout=MP_STATUS_CHECK_INTERVAL)
+            except (OSError, queue.Empty):
+                continue
+            except Exception:
+                if self._router_done_event.is_set():
+                    break
+                raise
+            client_id, worker_id, idx, batch, structure = data
+            with self._lock:
+                self._worker_inflight[worker_id] -= 1
+                self._worker_completed[worker_id] += 1
+                self._completed += 1
+                client = self._clients.get(client_id)
+                if client is not None:
+                    client.inflight -= 1
+                    client.completed += 1
+                    client.result_queue.put((idx, batch, structure))
+                self._dispatch_locked()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get the statistics of the pool.
+
+        Returns:
+            dict: ``num_workers``, ``alive_workers``, ``registered_datasets``,
+            ``submitted`` and ``completed`` batch numbers, the ``completed``
+            and ``inflight`` batch numbers of each worker, and the
+            ``submitted``, ``completed``, ``pending`` and ``inflight`` batch
+            numbers of each attached loader iterator.
+        """
+        with self._lock:
+            return {
+                "name": self.name,
+                "num_workers": self.num_workers,
+                "alive_workers": sum(w.is_alive() for w in self._workers),
+                "uptime": time.time() - self._start_time,
+                "registered_datasets": len(self._datasets),
+                "total_registrations": self._registered,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "workers": [
+                    {"completed": completed, "inflight": inflight}
+                    for completed, inflight in zip(
+                        self._worker_completed, self._worker_inflight
+                    )
+                ],
+                "loaders": [
+                    {
+                        "id": client.id,
+                        "name": client.name,
+                        "submitted": client.submitted,
+                        "completed": client.completed,
+                        "pending": len(client.pending),
+                        "inflight": client.inflight,
+                    }
+                    for client in self._clients.values()
+                ],
+            }
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        """Stop all worker processes of the pool."""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            self._clients.clear()
+            self._datasets.clear()
+        try:
+            self._router_done_event.set()
+            self._done_event.set()
+            for task_queue in self._task_queues:
+                task_queue.put(None)
+            for w in self._workers:
+                w.join(timeout)
+            for task_queue in self._task_queues:
+                task_queue.cancel_join_thread()
+                task_queue.close()
+            self._out_queue.cancel_join_thread()
+            self._out_queue.close()
+        finally:
+            core._erase_process_pids(id(self))
+            if _worker_pools.get(self.name) is self:
+                del _worker_pools[self.name]
+
+
+def get_worker_pool(name: str) -> WorkerPool | None:
+    """
+    Get the :code:`paddle.io.WorkerPool` registered with ``name``.
+
+    Args:
+        name (str): The name of the pool.
+
+    Returns:
+        WorkerPool|None: The pool, or None if no pool is registered with ``name``.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> # doctest: +SOLO('can not use multiprocessing testing `paddle.io.WorkerPool`')
+            >>> import paddle
+            >>> pool = paddle.io.WorkerPool(num_workers=2, name="shared")
+            >>> print(paddle.io.get_worker_pool("shared") is pool)
+            True
+            >>> pool.shutdown()
+    """
+    return _worker_pools.get(name)
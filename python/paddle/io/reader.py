@@ -19,6 +19,7 @@ import multiprocessing
 import sys
 import time
 import warnings
+import weakref
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -44,8 +45,10 @@ from .dataloader.batch_sampler import _InfiniteIterableSampler
 from .dataloader.dataloader_iter import (
     _DataLoaderIterMultiProcess,
     _DataLoaderIterSingleProcess,
+    _DataLoaderIterWorkerPool,
     _DatasetKind,
 )
+from .dataloader.worker_pool import WorkerPool, get_worker_pool
 
 if TYPE_CHECKING:
     import numbers
@@ -362,6 +365,15 @@ class DataLoader:
             worker id on each subprocess starting if not set as None. Default
             None.
         persistent_workers(bool, optional): whether to keep the workers in the DataLoader. Default False.
+        adaptive_prefetch(bool, optional): whether to adjust the prefetch window and the number of
+            active workers during iterating, according to the time the main process waits for
+            data and the time workers take to produce a batch. :attr:`prefetch_factor` is the
+            initial value, the decisions can be got by :code:`prefetch_stats`. Only works in
+            multi-process mode. Default False.
+        worker_pool(WorkerPool|str|None, optional): the :code:`paddle.io.WorkerPool`, or the name of
+            it, whose workers are used to load data instead of starting workers for this DataLoader.
+            If a name is given and no pool is registered with it, a pool of :attr:`num_workers`
+            workers is created. Only map-style dataset is supported. Default None.
 
     Returns:
         DataLoader: an iterable object for data iterating, each element of the generated data is a Tensor.
@@ -463,6 +475,8 @@ class DataLoader:
         timeout: int = 0,
         worker_init_fn: Callable[[int], None] | None = None,
         persistent_workers: bool = False,
+        adaptive_prefetch: bool = False,
+        worker_pool: WorkerPool | str | None = None,
     ) -> None:
         self.return_list = return_list
         self.collate_fn = collate_fn
@@ -558,7 +572,30 @@ class DataLoader:
 
         self._persistent_workers = persistent_workers
         self._iterator = None
-        self.num_workers = AuToTune(self).__call__()
+        self._adaptive_prefetch = adaptive_prefetch
+        self._last_iterator = None
+        self._last_prefetch_controller = None
+
+        self._worker_pool = None
+        self._pool_dataset_key = None
+        if worker_pool is not None:
+            if self.dataset_kind == _DatasetKind.ITER:
+                raise ValueError(
+                    "worker_pool only supports map-style dataset, but got IterableDataset"
+                )
+            if isinstance(worker_pool, str):
+                pool = get_worker_pool(worker_pool)
+                if pool is None:
+                    assert (
+                        num_workers > 0
+                    ), "num_workers should be a positive value to create a WorkerPool"
+                    pool = WorkerPool(num_workers, name=worker_pool)
+                worker_pool = pool
+            self._worker_pool = worker_pool
+            self.num_workers = worker_pool.num_workers
+            self.use_shared_memory = use_shared_memory
+        else:
+            self.num_workers = AuToTune(self).__call__()
 
     def __len__(self) -> int:
         if self.dataset_kind == _DatasetKind.ITER:
@@ -569,17 +606,76 @@ class DataLoader:
             else:
                 return len(self.dataset)
 
+    def _get_pool_dataset_key(self) -> int:
+        # the dataset is sent to the pool workers once and released from
+        # them when this DataLoader is garbage collected
+        if self._pool_dataset_key is None:
+            self._pool_dataset_key = self._worker_pool._register_dataset(self)
+            weakref.finalize(
+                self,
+                self._worker_pool._unregister_dataset,
+                self._pool_dataset_key,
+            )
+        return self._pool_dataset_key
+
     def __iter__(self) -> _DataLoaderIterBase:
-        if self.num_workers == 0:
+        if self._worker_pool is not None:
+            iterator = _DataLoaderIterWorkerPool(self)
+        elif self.num_workers == 0:
             return _DataLoaderIterSingleProcess(self)
         elif self._persistent_workers:
             if self._iterator is None:
                 self._iterator = _DataLoaderIterMultiProcess(self)
             else:
                 self._iterator._reset()
-            return self._iterator
+            iterator = self._iterator
         else:
-            return _DataLoaderIterMultiProcess(self)
+            iterator = _DataLoaderIterMultiProcess(self)
+        self._last_iterator = weakref.ref(iterator)
+        # kept after the iterator is released, for prefetch_stats
+        self._last_prefetch_controller = iterator._prefetch_controller
+        return iterator
+
+    def prefetch_stats(self) -> dict[str, Any] | None:
+        """
+        Get the adaptive prefetch statistics of the latest iterator of this
+        DataLoader, see :attr:`adaptive_prefetch`.
+
+        Returns:
+            dict|None: The current ``prefetch_factor``, ``active_workers`` and
+            ``outstanding_capacity``, the number of output ``steps``, the
+            ``total_wait`` seconds the main process waited for data, and the
+            recent ``decisions`` with the timings they were made on. None if
+            adaptive prefetch is not enabled or no iterator has been created.
+
+        Examples:
+
+            .. code-block:: python
+
+                >>> # doctest: +SOLO('can not use multiprocessing testing `paddle.io.DataLoader`')
+                >>> import numpy as np
+                >>> import paddle
+                >>> from paddle.io import DataLoader, TensorDataset
+
+                >>> dataset = TensorDataset([paddle.rand([64, 8])])
+                >>> loader = DataLoader(dataset, batch_size=4, num_workers=2, adaptive_prefetch=True)
+                >>> for data in loader:
+                ...     pass
+                >>> stats = loader.prefetch_stats()
+        """
+        controller = self._last_prefetch_controller
+        if controller is None:
+            return None
+        iterator = self._last_iterator()
+        if iterator is not None:
+            return iterator._prefetch_stats()
+        # the iterator is released, with no batch outstanding
+        stats = controller.stats()
+        stats["outstanding_capacity"] = controller.prefetch_factor * max(
+            controller.active_workers, len(self.places)
+        )
+        stats["batches_outstanding"] = 0
+        return stats
 
     def __call__(self) -> _DataLoaderIterBase:
         return self.__iter__()
@@ -15,10 +15,11 @@
 from __future__ import annotations
 
 import gc
+import time
 import traceback
 from typing import TYPE_CHECKING, List, Tuple
 
-from ...profiler import EventGuard, event_register
+from ...profiler import EventGuard, event_register, get_telemetry
 from ...psdb import NO_FALLBACK_CODES
 from ...utils import (
     ENV_SOT_ALLOW_DYNAMIC_SHAPE,
@@ -102,14 +103,25 @@ class OpcodeExecutorCache(metaclass=Singleton):
             CustomCode | None: The custom code object if a matching guard function is found, otherwise None.
         """
 
+        telemetry = get_telemetry()
         if len(guarded_fns) >= self.MAX_CACHE_SIZE:
             log(2, "[Cache]: Exceed max cache size, skip it\n")
+            if telemetry is not None:
+                telemetry.record_fallback(frame.f_code, "Exceed max cache size")
             return CustomCode(None, False)
 
         for custom_code, guard_fn in guarded_fns:
             try:
+                if telemetry is not None:
+                    start = time.perf_counter()
                 with EventGuard("try guard"):
                     guard_result = guard_fn(frame)
+                if telemetry is not None:
+                    telemetry.record_guard(
+                        frame.f_code,
+                        bool(guard_result),
+                        time.perf_counter() - start,
+                    )
                 if guard_result:
                     log(
                         2,
@@ -131,6 +143,10 @@ class OpcodeExecutorCache(metaclass=Singleton):
                     )
             except Exception as e:
                 log(2, f"[Cache]: Guard function error: {e}\n")
+                if telemetry is not None:
+                    telemetry.record_guard(
+                        frame.f_code, False, time.perf_counter() - start
+                    )
                 continue
 
         log(2, "[Cache]: all guards missed\n")
@@ -156,8 +172,16 @@ class OpcodeExecutorCache(metaclass=Singleton):
         """
         self.before_translate_hook(frame)
         self.translate_count += 1
-        custom_new_code, guard_fn = start_translate(frame, **kwargs)
-        return custom_new_code, guard_fn
+        telemetry = get_telemetry()
+        if telemetry is None:
+            return start_translate(frame, **kwargs)
+        start = time.perf_counter()
+        try:
+            return start_translate(frame, **kwargs)
+        finally:
+            telemetry.record_translate(
+                frame.f_code, time.perf_counter() - start
+            )
 
     def analyse_guard_global_object(self, guard_fn):
         def inner():
@@ -224,6 +248,9 @@ def start_translate(
         # if disable_eval_frame is True, it means we want fallback to speedup rather than error occurred
         if is_strict_mode() and e.disable_eval_frame is False:
             raise
+        telemetry = get_telemetry()
+        if telemetry is not None:
+            telemetry.record_fallback(frame.f_code, str(e))
         log(
             2,
             f"Unsupport Frame is {frame.f_code}, error message is: \n"
@@ -28,7 +28,7 @@ from typing import Any, Callable
 
 from paddle.jit.utils import OrderedSet
 
-from ...profiler import EventGuard, event_register
+from ...profiler import EventGuard, event_register, get_telemetry
 from ...psdb import NO_BREAKGRAPH_CODES
 from ...utils import (
     ENV_MIN_GRAPH_SIZE,
@@ -218,6 +218,12 @@ def pop_jump_if_op_wrapper(fns: list[Callable[[Any], Any]]):
     return inner
 
 
+def record_break_graph(code: types.CodeType, reason: str):
+    telemetry = get_telemetry()
+    if telemetry is not None:
+        telemetry.record_break_graph(code, reason)
+
+
 def if_break_graph_decorator(normal_jump: Callable):
     """
     A decorator function that breaks off the graph when a JUMP-related instruction is encountered.
@@ -269,6 +275,7 @@ def call_break_graph_decorator(push_n: int | Callable[[int | None], int]):
                     )
                 if isinstance(self, OpcodeExecutor):
                     log(3, f"[BreakGraph] call function Break graph: {e}\n")
+                    record_break_graph(self._code, f"call: {e}")
                     self._break_graph_when_call(origin_stack, instr, push_n)
                     return Stop(state="BreakGraph")
                 else:
@@ -1721,6 +1728,7 @@ class OpcodeExecutor(OpcodeExecutorBase):
                 raise FallbackError(
                     "Comprehensive for loop break graph is not supported."
                 )
+            record_break_graph(self._code, f"for loop: {e}")
             self._break_graph_when_for_loop(iterator, instr)
             return Stop(state="BreakGraph")
 
@@ -1797,6 +1805,7 @@ class OpcodeExecutor(OpcodeExecutorBase):
             instr: The jump instruction.
 
         """
+        record_break_graph(self._code, "if jump tensor")
         self._graph.add_global_guarded_variable(result)
 
         # 1. analyse info
@@ -12,12 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from __future__ import annotations
+
+import atexit
+import json
 import os
+import sys
+from collections import Counter
 from contextlib import contextmanager
 from functools import wraps
+from typing import TYPE_CHECKING
 
 from paddle.framework import core
 
+from .utils.envs import ENV_SOT_TELEMETRY
+
+if TYPE_CHECKING:
+    import types
+
 _event_level = int(os.environ.get("EVENT_LEVEL", "0"))
 
 
@@ -67,3 +79,185 @@ def event_register(event_name, event_level=1):
         return event_wrapper
     else:
         return do_nothing
+
+
+class CodeTelemetry:
+    """
+    The counts and the costs of SOT for a code object.
+    """
+
+    def __init__(self, code: types.CodeType):
+        self.name = f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+        self.translate_count = 0
+        self.translate_time = 0.0
+        self.guard_hit = 0
+        self.guard_miss = 0
+        self.guard_time = 0.0
+        self.break_reasons = Counter()
+        self.fallback_reasons = Counter()
+
+    @property
+    def total_time(self) -> float:
+        return self.translate_time + self.guard_time
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "translate_count": self.translate_count,
+            "translate_time": self.translate_time,
+            "guard_hit": self.guard_hit,
+            "guard_miss": self.guard_miss,
+            "guard_time": self.guard_time,
+            "break_count": sum(self.break_reasons.values()),
+            "break_reasons": dict(self.break_reasons),
+            "fallback_count": sum(self.fallback_reasons.values()),
+            "fallback_reasons": dict(self.fallback_reasons),
+        }
+
+
+class SotTelemetry:
+    """
+    Aggregate the translations, the guard hits and misses, the guard time,
+    the graph breaks and the fallbacks of SOT by code object, to tell where
+    the time of SOT goes.
+
+    It is enabled by ``enable_telemetry`` or by the environment variable
+    ``SOT_TELEMETRY``, which is ``table`` or ``json`` to print the report to
+    stderr at exit, or a file to write it to, in JSON if it ends with
+    ``.json``. When it is disabled, the translator only checks that
+    ``get_telemetry()`` is None.
+    """
+
+    def __init__(self):
+        self.codes: dict[types.CodeType, CodeTelemetry] = {}
+
+    def __getitem__(self, code: types.CodeType) -> CodeTelemetry:
+        stats = self.codes.get(code)
+        if stats is None:
+            stats = self.codes[code] = CodeTelemetry(code)
+        return stats
+
+    def record_translate(self, code: types.CodeType, seconds: float):
+        stats = self[code]
+        stats.translate_count += 1
+        stats.translate_time += seconds
+
+    def record_guard(self, code: types.CodeType, hit: bool, seconds: float):
+        stats = self[code]
+        if hit:
+            stats.guard_hit += 1
+        else:
+            stats.guard_miss += 1
+        stats.guard_time += seconds
+
+    def record_break_graph(self, code: types.CodeType, reason: str):
+        self[code].break_reasons[_first_line(reason)] += 1
+
+    def record_fallback(self, code: types.CodeType, reason: str):
+        self[code].fallback_reasons[_first_line(reason)] += 1
+
+    def clear(self):
+        self.codes.clear()
+
+    def to_dict(self) -> list[dict]:
+        """
+        The telemetry of each code object, from the most costly one.
+        """
+        return [
+            stats.to_dict()
+            for stats in sorted(
+                self.codes.values(), key=lambda s: s.total_time, reverse=True
+            )
+        ]
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_table(self) -> str:
+        header = (
+            f"{'translate':>9} {'time(ms)':>9} {'hit':>7} {'miss':>5} "
+            f"{'guard(ms)':>9} {'break':>5} {'fallback':>8}  code"
+        )
+        lines = ["SOT telemetry", header, "-" * len(header)]
+        for stats in self.to_dict():
+            lines.append(
+                f"{stats['translate_count']:>9} "
+                f"{stats['translate_time'] * 1000:>9.2f} "
+                f"{stats['guard_hit']:>7} "
+                f"{stats['guard_miss']:>5} "
+                f"{stats['guard_time'] * 1000:>9.2f} "
+                f"{stats['break_count']:>5} "
+                f"{stats['fallback_count']:>8}  "
+                f"{stats['name']}"
+            )
+            for kind in ["break", "fallback"]:
+                for reason, count in stats[f"{kind}_reasons"].items():
+                    lines.append(f"    {kind} x{count}: {reason}")
+        return "\n".join(lines)
+
+    def export(self, output: str):
+        """
+        Print the report to stderr if output is ``table`` or ``json``, or
+        write it to the file output, in JSON if it ends with ``.json``.
+        """
+        if output in ["table", "json"]:
+            as_json = output == "json"
+        else:
+            as_json = output.endswith(".json")
+        report = self.to_json() if as_json else self.to_table()
+        if output in ["table", "json"]:
+            print(report, file=sys.stderr)
+        else:
+            with open(output, "w") as f:
+                f.write(report)
+
+
+def _first_line(reason: str, max_length: int = 120) -> str:
+    lines = str(reason).strip().splitlines()
+    return lines[0][:max_length] if lines else ""
+
+
+_telemetry: SotTelemetry | None = None
+
+
+def get_telemetry() -> SotTelemetry | None:
+    """
+    The telemetry being recorded, or None if it is disabled.
+    """
+    return _telemetry
+
+
+def enable_telemetry(output: str | None = None) -> SotTelemetry:
+    """
+    Start to record the telemetry, and export it to output at exit if it is
+    given, see ``SotTelemetry.export``.
+    """
+    global _telemetry
+    if _telemetry is None:
+        _telemetry = SotTelemetry()
+    if output:
+        atexit.register(_telemetry.export, output)
+    return _telemetry
+
+
+def disable_telemetry():
+    global _telemetry
+    _telemetry = None
+
+
+@contextmanager
+def telemetry_guard():
+    """
+    Record the telemetry in the context only, and yield it.
+    """
+    global _telemetry
+    old_telemetry = _telemetry
+    _telemetry = SotTelemetry()
+    try:
+        yield _telemetry
+    finally:
+        _telemetry = old_telemetry
+
+
+if ENV_SOT_TELEMETRY.get():
+    enable_telemetry(ENV_SOT_TELEMETRY.get())
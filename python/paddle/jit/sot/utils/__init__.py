@@ -20,6 +20,7 @@ from .envs import (  # noqa: F401
     ENV_SOT_ALLOW_DYNAMIC_SHAPE,
     ENV_SOT_EXPORT,
     ENV_SOT_LOG_LEVEL,
+    ENV_SOT_TELEMETRY,
     ENV_SOT_WITH_CONTROL_FLOW,
     ENV_STRICT_MODE,
     cost_model_guard,
@@ -35,6 +35,7 @@ ENV_SOT_EXPORT = StringEnvironmentVariable("SOT_EXPORT", "")
 ENV_SOT_ALLOW_DYNAMIC_SHAPE = BooleanEnvironmentVariable(
     "SOT_ALLOW_DYNAMIC_SHAPE", False
 )
+ENV_SOT_TELEMETRY = StringEnvironmentVariable("SOT_TELEMETRY", "")
 
 
 @contextmanager
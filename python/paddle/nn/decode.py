@@ -27,6 +27,13 @@ from ..base.data_feeder import convert_dtype
 __all__ = []
 
 
+def _is_reorderable_cache(x):
+    # Caches updated in place, such as `MultiHeadAttention.PreallocatedCache`,
+    # hold all `batch_size * beam_size` rows themselves and are reordered by
+    # `reorder(index)` rather than gathered into new tensors.
+    return hasattr(x, "reorder") and hasattr(x, "tile_batch")
+
+
 class ArrayWrapper:
     def __init__(self, x):
         self.array = [x]
@@ -285,6 +292,8 @@ class BeamSearchDecoder(Decoder):
             Tensor: A tensor with shape `[batch_size, beam_size, ...]`, whose \
                 data type is same as `x`.
         """
+        if _is_reorderable_cache(x):
+            return x
         # TODO: avoid fake shape in compile-time like tile_beam_merge_with_batch
         return paddle.reshape(x, shape=[-1, self.beam_size] + list(x.shape[1:]))
 
@@ -301,6 +310,8 @@ class BeamSearchDecoder(Decoder):
             Tensor: A tensor with shape `[batch_size * beam_size, ...]`, whose \
                 data type is same as `x`.
         """
+        if _is_reorderable_cache(x):
+            return x
         # TODO: avoid fake shape in compile-time like tile_beam_merge_with_batch
         return paddle.reshape(x, shape=[-1] + list(x.shape[2:]))
 
@@ -320,6 +331,8 @@ class BeamSearchDecoder(Decoder):
             Tensor: A tensor with shape `[batch_size, beam_size, ...]`, whose \
                 data type is same as `x`.
         """
+        if _is_reorderable_cache(x):
+            return x.tile_batch(self.beam_size)
         x = paddle.unsqueeze(x, [1])
         expand_times = [1] * len(x.shape)
         expand_times[1] = self.beam_size
@@ -383,6 +396,9 @@ class BeamSearchDecoder(Decoder):
             ),
             [1, self.beam_size],
         )
+        if _is_reorderable_cache(x):
+            x.reorder((batch_pos * self.beam_size + indices).flatten())
+            return x
         topk_coordinates = paddle.stack([batch_pos, indices], axis=2)
         topk_coordinates.stop_gradient = True
         return paddle.gather_nd(x, topk_coordinates)
@@ -433,8 +449,17 @@ class BeamSearchDecoder(Decoder):
                 `finished` is a `bool` tensor filled by False with shape `[batch_size, beam_size]`.
         """
         self.kinf = 1e9
-        state = paddle.utils.flatten(initial_cell_states)[0]
-        self.batch_size = paddle.shape(state)[0]
+        states = [
+            x
+            for x in paddle.utils.flatten(initial_cell_states)
+            if not _is_reorderable_cache(x)
+        ]
+        if states:
+            state = states[0]
+            self.batch_size = paddle.shape(state)[0]
+        else:
+            state = paddle.utils.flatten(initial_cell_states)[0]
+            self.batch_size = paddle.full([], state.batch_size, 'int64')
 
         self.start_token_tensor = paddle.full(
             shape=[1], dtype="int64", fill_value=self.start_token
@@ -464,7 +489,7 @@ class BeamSearchDecoder(Decoder):
             log_probs = paddle.cast(log_probs, "float64")
 
         init_finished = paddle.full(
-            shape=[paddle.shape(state)[0], self.beam_size],
+            shape=[self.batch_size, self.beam_size],
             fill_value=False,
             dtype="bool",
         )
@@ -657,6 +682,31 @@ class BeamSearchDecoder(Decoder):
         # TODO: use FinalBeamSearchDecoderOutput as output
         return predicted_ids, final_states
 
+    def _finished_outputs(self, log_probs):
+        r"""
+        The step outputs of batch entries all the beams of which are finished,
+        used for the entries removed by `dynamic_decode` with
+        `compact_finished`. Every beam keeps its score and parent, and emits
+        the end token, as the decoding step does for finished beams.
+
+        Parameters:
+            log_probs(Tensor): A tensor with shape `[batch_size, beam_size]`,
+                the `log_probs` of the beam search state of the entries.
+
+        Returns:
+            OutputWrapper: The `scores, predicted_ids, parent_ids` of a step, \
+                each shaped `[batch_size, beam_size]`.
+        """
+        batch_size = log_probs.shape[0]
+        predicted_ids = paddle.full(
+            [batch_size, self.beam_size], self.end_token, dtype="int64"
+        )
+        parent_ids = paddle.tile(
+            paddle.arange(self.beam_size, dtype="int64").unsqueeze([0]),
+            [batch_size, 1],
+        )
+        return self.OutputWrapper(log_probs, predicted_ids, parent_ids)
+
     @property
     def tracks_own_finished(self):
         """
@@ -679,7 +729,7 @@ def _dynamic_decode_imperative(
     impute_finished=False,
     is_test=False,
     return_length=False,
-    **kwargs
+    **kwargs,
 ):
     def _maybe_copy(state, new_state, step_mask):
         # TODO: use where_op
@@ -793,6 +843,265 @@ def _dynamic_decode_imperative(
     )
 
 
+def _dynamic_decode_imperative_sync_free(
+    decoder,
+    inits=None,
+    max_step_num=None,
+    output_time_major=False,
+    impute_finished=False,
+    is_test=False,
+    return_length=False,
+    check_interval=1,
+    compact_finished=False,
+    **kwargs,
+):
+    # Unlike `_dynamic_decode_imperative`, the finished status is only read
+    # back to host every `check_interval` steps. The number of steps actually
+    # needed is counted on device, step outputs are written into buffers
+    # preallocated for `max_step_num + 1` steps and trimmed once at the end.
+    if max_step_num is None:
+        raise ValueError(
+            "max_step_num is required by dynamic_decode when check_interval "
+            "is set, to preallocate the outputs."
+        )
+    if check_interval < 1:
+        raise ValueError(
+            f"check_interval should be positive, but got {check_interval}."
+        )
+    # a batch entry of BeamSearchDecoder is `beam_size` rows, it is removed
+    # once all of its beams are finished
+    beam_search = compact_finished and decoder.tracks_own_finished
+    if beam_search and not isinstance(decoder, BeamSearchDecoder):
+        raise ValueError(
+            "compact_finished is only supported by BeamSearchDecoder and "
+            "decoders which do not track their own finished status, since "
+            "the others may reorder their batch entries."
+        )
+    beam_size = decoder.beam_size if beam_search else 1
+
+    def _maybe_copy(state, new_state, step_mask):
+        step_mask = paddle.unsqueeze(
+            step_mask, list(range(1, len(state.shape)))
+        )
+        return paddle.where(step_mask, state, new_state)
+
+    def _write(x, buffer):
+        # `step_idx` and `active_idx` are those of the current step
+        if active_idx is not None:
+            x = _scatter_rows(buffer[step_idx], active_idx, x)
+        buffer[step_idx] = x
+
+    def _gather_rows(x, index):
+        # gather and scatter have no bool kernels
+        if x.dtype == paddle.bool:
+            return paddle.cast(
+                paddle.gather(paddle.cast(x, "int32"), index), x.dtype
+            )
+        return paddle.gather(x, index)
+
+    def _scatter_rows(x, index, updates):
+        if x.dtype == paddle.bool:
+            return paddle.cast(
+                paddle.scatter(
+                    paddle.cast(x, "int32"),
+                    index,
+                    paddle.cast(updates, "int32"),
+                ),
+                x.dtype,
+            )
+        return paddle.scatter(x, index, updates)
+
+    def _compact(x, index, row_index, batch_size):
+        # `row_index` selects the rows of the kept entries from tensors and
+        # caches with `batch_size * beam_size` rows
+        if _is_reorderable_cache(x):
+            return x.select_batch(row_index)
+        if isinstance(x, paddle.Tensor) and x.shape:
+            if x.shape[0] == batch_size:
+                return _gather_rows(x, index)
+            if x.shape[0] == batch_size * beam_size:
+                return _gather_rows(x, row_index)
+        return x
+
+    def _restore(full, index, x):
+        # caches updated in place only keep the rows of the active entries
+        if _is_reorderable_cache(x):
+            return x
+        return _scatter_rows(full, index, x)
+
+    def _fill_rows(x, start, index, value):
+        # write `value` to the rows at `index` of the steps from `start`
+        perm = [1, 0] + list(range(2, len(x.shape)))
+        tail = paddle.transpose(x[start:], perm)
+        value = paddle.expand(
+            paddle.unsqueeze(value, [1]),
+            [value.shape[0], tail.shape[1]] + value.shape[1:],
+        )
+        tail = paddle.transpose(_scatter_rows(tail, index, value), perm)
+        return paddle.concat([x[:start], tail]) if start > 0 else tail
+
+    inputs, states, finished = decoder.initialize(inits)
+    batch_size = finished.shape[0]
+    sequence_lengths = paddle.cast(paddle.zeros_like(finished), "int64")
+    num_steps = paddle.zeros([], dtype="int64")
+    # rows of the whole batch kept in the active batch, None for all of them
+    active_idx = None
+    full_states, full_lengths = states, sequence_lengths
+    # (step, rows, outputs) of the entries of BeamSearchDecoder removed at
+    # step, of which the outputs of the later steps are filled in at the end
+    removed = []
+    outputs = None
+
+    step_idx_tensor = paddle.full(shape=[1], fill_value=0, dtype="int64")
+    for step_idx in range(max_step_num + 1):
+        if step_idx % check_interval == 0:
+            if paddle.all(finished).item():
+                break
+            if compact_finished:
+                entry_finished = (
+                    paddle.all(finished, axis=1) if beam_search else finished
+                )
+                keep = paddle.nonzero(
+                    paddle.logical_not(entry_finished)
+                ).flatten()
+                cur_batch_size = entry_finished.shape[0]
+                if keep.shape[0] < cur_batch_size:
+                    cur_idx = (
+                        paddle.arange(cur_batch_size, dtype="int64")
+                        if active_idx is None
+                        else active_idx
+                    )
+                    full_states = paddle.utils.map_structure(
+                        lambda full, x: _restore(full, cur_idx, x),
+                        full_states,
+                        states,
+                    )
+                    full_lengths = _scatter_rows(
+                        full_lengths, cur_idx, sequence_lengths
+                    )
+                    if beam_search:
+                        drop = paddle.nonzero(entry_finished).flatten()
+                        removed.append(
+                            (
+                                step_idx,
+                                paddle.gather(cur_idx, drop),
+                                decoder._finished_outputs(
+                                    paddle.gather(states.log_probs, drop)
+                                ),
+                            )
+                        )
+                    row_keep = (
+                        paddle.unsqueeze(keep, [1]) * beam_size
+                        + paddle.arange(beam_size, dtype="int64")
+                    ).flatten()
+                    (
+                        inputs,
+                        states,
+                        finished,
+                        sequence_lengths,
+                    ) = paddle.utils.map_structure(
+                        lambda x: _compact(x, keep, row_keep, cur_batch_size),
+                        (inputs, states, finished, sequence_lengths),
+                    )
+                    kwargs = {
+                        key: _compact(value, keep, row_keep, cur_batch_size)
+                        for key, value in kwargs.items()
+                    }
+                    if beam_search:
+                        decoder.batch_size = paddle.full(
+                            [], keep.shape[0], "int64"
+                        )
+                    active_idx = paddle.gather(cur_idx, keep)
+
+        num_steps += paddle.cast(
+            paddle.logical_not(paddle.all(finished)), "int64"
+        )
+        (step_outputs, next_states, next_inputs, next_finished) = decoder.step(
+            step_idx_tensor, inputs, states, **kwargs
+        )
+        if not decoder.tracks_own_finished:
+            next_finished = paddle.logical_or(next_finished, finished)
+            paddle.assign(next_finished, finished)
+            next_sequence_lengths = paddle.add(
+                sequence_lengths,
+                paddle.cast(
+                    paddle.logical_not(finished), sequence_lengths.dtype
+                ),
+            )
+            if impute_finished:
+                next_states = paddle.utils.map_structure(
+                    lambda x, y: _maybe_copy(x, y, finished),
+                    states,
+                    next_states,
+                )
+        else:
+            next_sequence_lengths = getattr(
+                next_states, "lengths", sequence_lengths
+            )
+
+        if outputs is None:
+            outputs = paddle.utils.map_structure(
+                lambda x: paddle.zeros(
+                    [max_step_num + 1, batch_size] + x.shape[1:], x.dtype
+                ),
+                step_outputs,
+            )
+        paddle.utils.map_structure(_write, step_outputs, outputs)
+        inputs, states, finished, sequence_lengths = (
+            next_inputs,
+            next_states,
+            next_finished,
+            next_sequence_lengths,
+        )
+        step_idx_tensor = paddle.increment(x=step_idx_tensor, value=1.0)
+
+    if outputs is None:
+        raise ValueError(
+            "All sequences are finished before the first decoding step."
+        )
+    if active_idx is not None:
+        states = paddle.utils.map_structure(
+            lambda full, x: _restore(full, active_idx, x),
+            full_states,
+            states,
+        )
+        sequence_lengths = _scatter_rows(
+            full_lengths, active_idx, sequence_lengths
+        )
+
+    num_steps = num_steps.item()
+    final_outputs = paddle.utils.map_structure(lambda x: x[:num_steps], outputs)
+    for step, rows, step_outputs in removed:
+        if step < num_steps:
+            final_outputs = paddle.utils.map_structure(
+                lambda x, y: _fill_rows(x, step, rows, y),
+                final_outputs,
+                step_outputs,
+            )
+    final_states = states
+
+    try:
+        final_outputs, final_states = decoder.finalize(
+            final_outputs, final_states, sequence_lengths
+        )
+    except NotImplementedError:
+        pass
+
+    if not output_time_major:
+        final_outputs = paddle.utils.map_structure(
+            lambda x: paddle.transpose(
+                x, [1, 0] + list(range(2, len(x.shape)))
+            ),
+            final_outputs,
+        )
+
+    return (
+        (final_outputs, final_states, sequence_lengths)
+        if return_length
+        else (final_outputs, final_states)
+    )
+
+
 def _dynamic_decode_declarative(
     decoder,
     inits=None,
@@ -801,7 +1110,7 @@ def _dynamic_decode_declarative(
     impute_finished=False,
     is_test=False,
     return_length=False,
-    **kwargs
+    **kwargs,
 ):
     initial_inputs, initial_states, initial_finished = decoder.initialize(inits)
     global_inputs, global_states, global_finished = (
@@ -999,7 +1308,9 @@ def dynamic_decode(
     impute_finished=False,
     is_test=False,
     return_length=False,
-    **kwargs
+    check_interval=None,
+    compact_finished=False,
+    **kwargs,
 ):
     r"""
     Dynamic decoding performs :code:`decoder.step()` repeatedly until the returned
@@ -1035,6 +1346,28 @@ def dynamic_decode(
         return_length(bool, optional):  A flag indicating whether to return an
             extra Tensor variable in the output tuple, which stores the actual
             lengths of all decoded sequences. Default `False`.
+        check_interval(int, optional): Only used in dynamic graph mode. If set,
+            whether all sequences are finished is only checked on host every
+            `check_interval` steps instead of every step, which avoids a device
+            to host synchronization per step. The outputs are written into
+            buffers preallocated with :attr:`max_step_num`, which is required
+            then, and are trimmed to the steps that were actually needed, while
+            `final_states` may include up to `check_interval - 1` extra steps.
+            Default `None`, checking every step.
+        compact_finished(bool, optional): Only used together with `check_interval`,
+            and with `BeamSearchDecoder` or decoders whose `tracks_own_finished`
+            is False. If `True`, finished entries are removed from the batch fed
+            to :code:`decoder.step()` at every check, so that later steps only
+            compute the unfinished ones. For `BeamSearchDecoder`, an entry is
+            removed once all of its beams are finished. Tensors in `**kwargs`
+            whose first dimension is the batch size, or the batch size times
+            `beam_size`, are compacted as well, and so are caches updated in
+            place such as `MultiHeadAttention.PreallocatedCache`, which only
+            keep the rows of the unfinished entries in `final_states`. Other
+            states of removed entries are kept as when they were removed. Their
+            later outputs are zeros, or for `BeamSearchDecoder` the end token
+            with the scores and parents the decoding step gives finished beams.
+            Default `False`.
         **kwargs: Additional keyword arguments. Arguments passed to `decoder.step`.
 
     Returns:
@@ -1073,7 +1406,20 @@ def dynamic_decode(
             >>> print(outputs[0].shape)
             [4, 11, 4]
     """
-    if in_dynamic_mode():
+    if in_dynamic_mode() and check_interval is not None:
+        return _dynamic_decode_imperative_sync_free(
+            decoder,
+            inits,
+            max_step_num,
+            output_time_major,
+            impute_finished,
+            is_test,
+            return_length,
+            check_interval,
+            compact_finished,
+            **kwargs,
+        )
+    elif in_dynamic_mode():
         return _dynamic_decode_imperative(
             decoder,
             inits,
@@ -1082,7 +1428,7 @@ def dynamic_decode(
             impute_finished,
             is_test,
             return_length,
-            **kwargs
+            **kwargs,
         )
     else:
         return _dynamic_decode_declarative(
@@ -1093,5 +1439,5 @@ def dynamic_decode(
             impute_finished,
             is_test,
             return_length,
-            **kwargs
+            **kwargs,
         )
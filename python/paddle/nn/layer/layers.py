@@ -1505,6 +1505,9 @@ class Layer:
                 self.__class__.__name__, profiler.TracerEventType.Forward
             ):
                 outputs = self.forward(*inputs, **kwargs)
+        elif in_dygraph_mode():
+            # name_struct is a no-op in dygraph, skip the context manager
+            outputs = self.forward(*inputs, **kwargs)
         else:
             with name_struct(self.__class__.__name__):
                 outputs = self.forward(*inputs, **kwargs)
@@ -1517,15 +1520,20 @@ class Layer:
         return outputs
 
     def __call__(self, *inputs: Any, **kwargs: Any) -> Any:
+        # NOTE: Hook-free layers in dygraph call forward directly, whether or
+        # not they are built. Hooks and modes are read live on every call
+        # rather than cached, since hook dicts are also mutated in place by
+        # e.g. weight_norm and quantization fuse utils.
         if (
-            (not in_to_static_mode())
-            and (not self._forward_pre_hooks)
+            (not self._forward_pre_hooks)
             and (not self._forward_post_hooks)
-            and (not self._built)
             and in_dygraph_mode()
+            and (not in_to_static_mode())
             and (not in_profiler_mode())
         ):
-            self._build_once(*inputs, **kwargs)
+            if not self._built:
+                self._build_once(*inputs, **kwargs)
+                self._built = True
             return self.forward(*inputs, **kwargs)
         else:
             return self._dygraph_call_func(*inputs, **kwargs)
@@ -2120,14 +2128,22 @@ class Layer:
         self,
         state_dict: _StateDict,
         use_structured_name: bool = True,
+        zero_copy: bool = False,
     ) -> tuple[list[str], list[str]]:
         '''
         Set parameters and persistable buffers from state_dict. All the parameters and buffers will be reset by the tensor in the state_dict
 
+        Parameters created under ``paddle.LazyGuard`` are loaded directly from state_dict without running their
+        initializers, and parameters are set one at a time, so that loading a state_dict from ``paddle.load(path, mmap=True)``
+        holds about a single copy of the parameters in memory.
+
         Parameters:
             state_dict(dict) : Dict contains all the parameters and persistable buffers.
             use_structured_name(bool, optional) : If true, use structured name as key, otherwise, use parameter or buffer name as key.
                                                   Default: True.
+            zero_copy(bool, optional) : If true, in dynamic graph mode, parameters and buffers share the memory of the tensors in
+                                        state_dict which are on the same place instead of copying them, e.g. the pages of a
+                                        checkpoint loaded by ``paddle.load(path, mmap=True)`` for CPU inference. Default: False.
         Returns:
             missing_keys(list):A list of str containing the missing keys
             unexpected_keys(list):A list of str containing the unexpected keys
@@ -2144,6 +2160,12 @@ class Layer:
                 >>> para_state_dict = paddle.load("paddle_dy.pdparams")
                 >>> emb.set_state_dict(para_state_dict)
 
+                >>> # load without initializing parameters, sharing the memory of the mapped file
+                >>> with paddle.LazyGuard():
+                ...     emb = paddle.nn.Embedding(10, 10)
+                >>> para_state_dict = paddle.load("paddle_dy.pdparams", mmap=True)
+                >>> emb.set_state_dict(para_state_dict, zero_copy=True)
+
         '''
         missing_keys = []
         match_keys = set()
@@ -2179,11 +2201,26 @@ class Layer:
                 match_keys.add(key)
                 return param, state
 
+        def _can_share(param, state):
+            if not isinstance(state, paddle.Tensor) or not state.is_dense():
+                return False
+            if param.is_dist() or not state._is_initialized():
+                return False
+            if state.dtype != param.dtype:
+                return False
+            place = param.place if param._is_initialized() else _get_device()
+            return state.place._equals(place)
+
         matched_param_state = []
         for key, param in self._state_dict_impl(use_hook=False).items():
-            if isinstance(param, paddle.Tensor) and not param._is_initialized():
-                continue
             key_name = key if use_structured_name else param.name
+            if isinstance(param, paddle.Tensor) and not param._is_initialized():
+                # parameters of LazyGuard are loaded instead of initialized
+                if (
+                    getattr(param, "_init_func", None) is None
+                    or key_name not in state_dict
+                ):
+                    continue
             try:
                 match_res = _check_match(key_name, param)
                 matched_param_state.append(match_res)
@@ -2194,7 +2231,12 @@ class Layer:
                 unexpected_keys.append(key)
         if in_dygraph_mode():
             for param, state in matched_param_state:
-                param.set_value(state)
+                if zero_copy and _can_share(param, state):
+                    state._share_buffer_to(param)
+                else:
+                    param.set_value(state)
+                if getattr(param, "_init_func", None) is not None:
+                    param._init_func = None
         else:
 
             def _set_var(var, ndarray):
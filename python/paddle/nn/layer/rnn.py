@@ -89,7 +89,8 @@ def rnn(
             or int32. The valid lengths of input sequences. Defaults to None.
             If `sequence_length` is not None, the inputs are treated as
             padded sequences. In each input sequence, elements whose time step
-            index are not less than the valid length are treated as paddings.
+            index are not less than the valid length are treated as paddings,
+            and the outputs at them are zeros.
         time_major (bool, optional): Whether the first dimension of the input means the
             time steps. Defaults to False.
         is_reverse (bool, optional): Indicate whether to calculate in the reverse
@@ -168,6 +169,11 @@ def _maybe_copy(state: Tensor, new_state: Tensor, step_mask: Tensor) -> Tensor:
     return new_state
 
 
+def _mask_output(output: Tensor, step_mask: Tensor) -> Tensor:
+    """zero the output at padded time steps, as the fused rnn kernel does"""
+    return paddle.tensor.math._multiply_with_axis(output, step_mask, axis=0)
+
+
 def _transpose_batch_time(x: Tensor) -> Tensor:
     perm = [1, 0] + list(range(2, len(x.shape)))
     return paddle.transpose(x, perm)
@@ -191,6 +197,21 @@ def _rnn_dynamic_graph(
             batch_ref=inputs, batch_dim_idx=1 if time_major else 0
         )
 
+    # Reversing the batch moves the paddings to the front of each sequence,
+    # which the length mask of the kernel can not express.
+    mode = _fused_rnn_mode([cell], inputs, kwargs)
+    if mode is not None and (sequence_length is None or not is_reverse):
+        final_outputs, final_states = _rnn_fused_dynamic_graph(
+            [cell],
+            mode,
+            inputs,
+            [initial_states],
+            sequence_length,
+            time_major,
+            is_reverse,
+        )
+        return final_outputs, final_states[0]
+
     if not time_major:
         inputs = paddle.utils.map_structure(_transpose_batch_time, inputs)
 
@@ -219,6 +240,9 @@ def _rnn_dynamic_graph(
             new_states = paddle.utils.map_structure(
                 partial(_maybe_copy, step_mask=mask[i]), states, new_states
             )
+            step_outputs = paddle.utils.map_structure(
+                partial(_mask_output, step_mask=mask[i]), step_outputs
+            )
         states = new_states
         outputs = (
             paddle.utils.map_structure(lambda x: ArrayWrapper(x), step_outputs)
@@ -241,6 +265,108 @@ def _rnn_dynamic_graph(
     return final_outputs, final_states
 
 
+def _fused_rnn_mode(cells, inputs, kwargs):
+    """
+    Returns the mode of the `rnn` op computing the recurrence of `cells` over
+    the whole sequence in a single call, or None if the cells have to be
+    stepped through one time step at a time.
+    """
+    # The fused kernel takes the weights as separate tensors, only the CPU
+    # kernel runs them without copying into a continuous buffer first.
+    if kwargs or not isinstance(inputs, paddle.Tensor):
+        return None
+    if not inputs.place.is_cpu_place() or inputs.dtype not in (
+        paddle.float32,
+        paddle.float64,
+    ):
+        return None
+
+    signatures = set()
+    for cell in cells:
+        # subclasses may override the step function, only exact built-in
+        # cells are known to compute what the kernel computes
+        cell_type = type(cell)
+        if cell_type is LSTMCell and cell.proj_size == 0:
+            mode = "LSTM"
+        elif cell_type is GRUCell:
+            mode = "GRU"
+        elif cell_type is SimpleRNNCell:
+            mode = "RNN_TANH" if cell.activation == "tanh" else "RNN_RELU"
+        else:
+            return None
+        if cell._forward_pre_hooks or cell._forward_post_hooks:
+            return None
+        if cell.bias_ih is None or cell.bias_hh is None:
+            return None
+        if cell.weight_ih.dtype != inputs.dtype:
+            return None
+        signatures.add((mode, cell.input_size, cell.hidden_size))
+    if len(signatures) != 1:
+        return None
+    return signatures.pop()[0]
+
+
+def _rnn_fused_dynamic_graph(
+    cells,
+    mode,
+    inputs,
+    initial_states,
+    sequence_length=None,
+    time_major=False,
+    is_reverse=False,
+):
+    """
+    Runs the whole sequence through the `rnn` op instead of calling the cells
+    step by step. `cells` holds a single cell, or the forward and backward
+    cells of a bidirectional rnn, and `initial_states` the states of each
+    cell. The outputs at padded time steps are zeros.
+    """
+    cell = cells[0]
+    if not time_major:
+        inputs = _transpose_batch_time(inputs)
+    if is_reverse:
+        inputs = paddle.reverse(inputs, axis=[0])
+
+    # [num_directions, batch_size, hidden_size] for each state component
+    flat_states = [paddle.utils.flatten(states) for states in initial_states]
+    pre_state = [
+        paddle.stack(list(components), axis=0)
+        for components in zip(*flat_states)
+    ]
+    # all the weights go first, followed by all the biases
+    weight_list = [w for c in cells for w in (c.weight_ih, c.weight_hh)]
+    weight_list += [b for c in cells for b in (c.bias_ih, c.bias_hh)]
+    dropout_state = paddle.empty([0], dtype="uint8")
+
+    outputs, _, final_state = _C_ops.rnn(
+        inputs,
+        pre_state,
+        weight_list,
+        sequence_length,
+        dropout_state,
+        0.0,
+        len(cells) == 2,
+        cell.input_size,
+        cell.hidden_size,
+        1,
+        mode,
+        0,
+        not cell.training,
+    )
+
+    if is_reverse:
+        outputs = paddle.reverse(outputs, axis=[0])
+    if not time_major:
+        outputs = _transpose_batch_time(outputs)
+    final_states = [
+        paddle.utils.pack_sequence_as(
+            states, [component[i] for component in final_state]
+        )
+        for i, states in enumerate(initial_states)
+    ]
+    return outputs, final_states
+
+
 def _rnn_static_graph(
     cell,
     inputs,
@@ -347,6 +473,7 @@ def _rnn_static_graph(
                 new_states,
                 pre_state,
             )
+            outputs = _mask_output(outputs, mask[start_i])
 
         paddle.tensor.array_write(outputs, start_i, out_array)
 
@@ -415,7 +542,8 @@ def birnn(
             or int32. The valid lengths of input sequences. Defaults to None.
             If `sequence_length` is not None, the inputs are treated as
             padded sequences. In each input sequence, elements whose time step
-            index are not less than the valid length are treated as paddings.
+            index are not less than the valid length are treated as paddings,
+            and the outputs at them are zeros.
         time_major (bool): Whether the first dimension of the input means the
             time steps. Defaults to False.
         **kwargs: Additional keyword arguments to pass to `forward` of each cell.
@@ -457,6 +585,20 @@ def birnn(
         )
     else:
         states_fw, states_bw = initial_states
+
+    if in_dynamic_mode():
+        mode = _fused_rnn_mode([cell_fw, cell_bw], inputs, kwargs)
+        if mode is not None:
+            outputs, final_states = _rnn_fused_dynamic_graph(
+                [cell_fw, cell_bw],
+                mode,
+                inputs,
+                [states_fw, states_bw],
+                sequence_length,
+                time_major,
+            )
+            return outputs, tuple(final_states)
+
     outputs_fw, states_fw = rnn(
         cell_fw,
         inputs,
@@ -1352,7 +1494,7 @@ class RNN(Layer):
     Inputs:
         - **inputs** (Tensor): A (possibly nested structure of) tensor[s]. The input sequences. If time_major is False, the shape is `[batch_size, time_steps, input_size]`. If time_major is True, the shape is `[time_steps, batch_size, input_size]` where `input_size` is the input size of the cell.
         - **initial_states** (Tensor|list|tuple, optional): Tensor of a possibly nested structure of tensors, representing the initial state for the rnn cell. If not provided, `cell.get_initial_states` would be called to produce the initial states. Defaults to None.
-        - **sequence_length** (Tensor, optional): shape `[batch_size]`, dtype: int64 or int32. The valid lengths of input sequences. Defaults to None.If `sequence_length` is not None, the inputs are treated as padded sequences. In each input sequence, elements whose time step index are not less than the valid length are treated as paddings.
+        - **sequence_length** (Tensor, optional): shape `[batch_size]`, dtype: int64 or int32. The valid lengths of input sequences. Defaults to None.If `sequence_length` is not None, the inputs are treated as padded sequences. In each input sequence, elements whose time step index are not less than the valid length are treated as paddings, and the outputs at them are zeros.
         - **kwargs**: Additional keyword arguments to pass to `forward` of the cell.
 
     Outputs:
@@ -1434,7 +1576,7 @@ class BiRNN(Layer):
     Inputs:
         - **inputs** (Tensor): the input sequences of both RNN. If time_major is True, the shape of is `[time_steps, batch_size, input_size]`, else the shape is `[batch_size, time_steps, input_size]`, where input_size is the input size of both cells.
         - **initial_states** (list|tuple|None, optional): A tuple/list of the initial states of the forward cell and backward cell. Defaults to None. If not provided, `cell.get_initial_states` would be called to produce the initial states for each cell. Defaults to None.
-        - **sequence_length** (Tensor|None, optional): shape `[batch_size]`, dtype: int64 or int32. The valid lengths of input sequences. Defaults to None. If `sequence_length` is not None, the inputs are treated as padded sequences. In each input sequence, elements whose time step index are not less than the valid length are treated as paddings.
+        - **sequence_length** (Tensor|None, optional): shape `[batch_size]`, dtype: int64 or int32. The valid lengths of input sequences. Defaults to None. If `sequence_length` is not None, the inputs are treated as padded sequences. In each input sequence, elements whose time step index are not less than the valid length are treated as paddings, and the outputs at them are zeros.
         - **kwargs**: Additional keyword arguments. Arguments passed to `forward` for each cell.
 
     Outputs:
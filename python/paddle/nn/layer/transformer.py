@@ -129,6 +129,242 @@ def _convert_attention_mask(attn_mask: Tensor, dtype: DTypeLike) -> Tensor:
     return attn_mask
 
 
+class _PreallocatedKVCache:
+    """
+    Incremental cache for decoder self attention, which preallocates keys and
+    values for `max_length` positions and writes the new positions of every
+    decoding step in place, instead of concatenating to a growing tensor.
+
+    `k` and `v` are tensors shaped `[batch_size, num_heads, max_length, head_dim]`,
+    of which only the first `length` positions are valid. It is only used in
+    dynamic graph mode for inference.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        num_heads: int,
+        head_dim: int,
+        max_length: int,
+        dtype: DTypeLike = 'float32',
+    ) -> None:
+        shape = [batch_size, num_heads, max_length, head_dim]
+        self.k = paddle.zeros(shape, dtype)
+        self.v = paddle.zeros(shape, dtype)
+        self.max_length = max_length
+        self.length = 0
+
+    @property
+    def batch_size(self) -> int:
+        return self.k.shape[0]
+
+    def _check_capacity(self, num_new: int) -> None:
+        if self.length + num_new > self.max_length:
+            raise ValueError(
+                f"The cache can hold {self.max_length} positions, but "
+                f"{self.length + num_new} positions are required."
+            )
+
+    def update(self, k: Tensor, v: Tensor) -> tuple[Tensor, Tensor]:
+        """
+        Writes `k` and `v` shaped `[batch_size, num_heads, seq_len, head_dim]`
+        at the current position, and returns keys and values of all the valid
+        positions.
+        """
+        start = self.length
+        end = start + k.shape[2]
+        self._check_capacity(k.shape[2])
+        self.k[:, :, start:end] = k
+        self.v[:, :, start:end] = v
+        self.length = end
+        return self.k[:, :, :end], self.v[:, :, :end]
+
+    def reorder(self, index: Tensor) -> None:
+        """
+        Reorders the batch in place, the i-th row taking the content of the
+        `index[i]`-th row. All the valid positions are copied, so the cost
+        grows with `length`.
+        """
+        if self.length == 0:
+            return
+        end = self.length
+        self.k[:, :, :end] = paddle.index_select(
+            self.k[:, :, :end], index, axis=0
+        )
+        self.v[:, :, :end] = paddle.index_select(
+            self.v[:, :, :end], index, axis=0
+        )
+
+    def select_batch(self, index: Tensor) -> _PreallocatedKVCache:
+        """
+        Returns a cache of the rows at `index` only, such as the rows of the
+        unfinished entries when finished ones are removed from the batch.
+        """
+        cache = copy.copy(self)
+        cache.k = paddle.index_select(self.k, index, axis=0)
+        cache.v = paddle.index_select(self.v, index, axis=0)
+        return cache
+
+    def tile_batch(self, times: int) -> _PreallocatedKVCache:
+        """
+        Returns a cache where every row is repeated `times` times, such as
+        `[r0, r0, r1, r1]` for `times=2`, which is the layout of beam search.
+        """
+        cache = copy.copy(self)
+        cache.k = paddle.repeat_interleave(self.k, times, axis=0)
+        cache.v = paddle.repeat_interleave(self.v, times, axis=0)
+        return cache
+
+
+class _PagedKVCache(_PreallocatedKVCache):
+    """
+    Incremental cache for decoder self attention which stores keys and values
+    in fixed size blocks of a preallocated pool, addressed through a per-row
+    block table shaped `[batch_size, max_length // block_size]`.
+
+    Filled blocks are never written again, so rows can share them: reordering
+    the batch, as beam search does at every step, only gathers the block
+    table and copies the last partially filled block of every row, instead
+    of all the cached positions.
+
+    Attention still takes the keys and values of each row as contiguous
+    tensors, so `update` gathers all the valid positions out of the pool at
+    every step, and the copying per step grows with `length` as it does for
+    the concat based cache. The paged layout saves the reallocation of the
+    concat based cache and the in place rewrite of all the valid positions
+    by `_PreallocatedKVCache.reorder`, not the per step gather. It is only
+    used in dynamic graph mode for inference.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        num_heads: int,
+        head_dim: int,
+        max_length: int,
+        dtype: DTypeLike = 'float32',
+        block_size: int = 16,
+    ) -> None:
+        self.max_length = max_length
+        self.length = 0
+        self.block_size = block_size
+        self.num_heads = num_heads
+        self.head_dim = head_dim
+        max_blocks = (max_length + block_size - 1) // block_size
+        # every row allocates each of its blocks once, blocks given up by a
+        # reorder are not reused, so `batch_size * max_blocks` always suffice
+        num_slots = batch_size * max_blocks * block_size
+        self.k_pool = paddle.zeros([num_slots, num_heads, head_dim], dtype)
+        self.v_pool = paddle.zeros([num_slots, num_heads, head_dim], dtype)
+        self.block_table = paddle.zeros([batch_size, max_blocks], 'int64')
+        self._num_allocated = 0
+
+    @property
+    def batch_size(self) -> int:
+        return self.block_table.shape[0]
+
+    def _allocate_blocks(self, block_idx: int) -> None:
+        block_ids = paddle.arange(
+            self._num_allocated,
+            self._num_allocated + self.batch_size,
+            dtype='int64',
+        )
+        self._num_allocated += self.batch_size
+        self.block_table[:, block_idx] = block_ids
+
+    def _block_slots(self, block_ids: Tensor, offset: int, num: int) -> Tensor:
+        # slot indices of positions [offset, offset + num) in each block
+        slots = paddle.unsqueeze(block_ids * self.block_size + offset, [1])
+        return (slots + paddle.arange(num, dtype='int64')).flatten()
+
+    def update(self, k: Tensor, v: Tensor) -> tuple[Tensor, Tensor]:
+        seq_len = k.shape[2]
+        self._check_capacity(seq_len)
+        # [batch_size, seq_len, num_heads, head_dim], the layout of the pool
+        k = paddle.transpose(k, [0, 2, 1, 3])
+        v = paddle.transpose(v, [0, 2, 1, 3])
+        written = 0
+        while written < seq_len:
+            block_idx, offset = divmod(self.length, self.block_size)
+            if offset == 0:
+                self._allocate_blocks(block_idx)
+            num = min(self.block_size - offset, seq_len - written)
+            slots = self._block_slots(
+                self.block_table[:, block_idx], offset, num
+            )
+            paddle.scatter_(
+                self.k_pool,
+                slots,
+                k[:, written : written + num].reshape(
+                    [-1, self.num_heads, self.head_dim]
+                ),
+            )
+            paddle.scatter_(
+                self.v_pool,
+                slots,
+                v[:, written : written + num].reshape(
+                    [-1, self.num_heads, self.head_dim]
+                ),
+            )
+            written += num
+            self.length += num
+        return self._gather_valid(self.k_pool), self._gather_valid(self.v_pool)
+
+    def _gather_valid(self, pool: Tensor) -> Tensor:
+        num_blocks = (self.length + self.block_size - 1) // self.block_size
+        blocks = paddle.reshape(
+            pool, [-1, self.block_size, self.num_heads, self.head_dim]
+        )
+        out = paddle.gather(
+            blocks, self.block_table[:, :num_blocks].flatten(), axis=0
+        )
+        out = paddle.reshape(
+            out, [self.batch_size, -1, self.num_heads, self.head_dim]
+        )
+        out = out[:, : self.length]
+        return paddle.transpose(out, [0, 2, 1, 3])
+
+    def reorder(self, index: Tensor) -> None:
+        if self.length == 0:
+            return
+        block_table = paddle.index_select(self.block_table, index, axis=0)
+        block_idx, offset = divmod(self.length, self.block_size)
+        if offset != 0:
+            # the partially filled block is still written by its own row, so
+            # copy it into the block owned by the new row rather than share it
+            own_blocks = self.block_table[:, block_idx]
+            src_slots = self._block_slots(block_table[:, block_idx], 0, offset)
+            dst_slots = self._block_slots(own_blocks, 0, offset)
+            for pool in (self.k_pool, self.v_pool):
+                paddle.scatter_(
+                    pool, dst_slots, paddle.gather(pool, src_slots, axis=0)
+                )
+            block_table[:, block_idx] = own_blocks
+        self.block_table = block_table
+
+    def select_batch(self, index: Tensor) -> _PagedKVCache:
+        # the rows at distinct indices own distinct partially filled blocks,
+        # so only the block table is selected, sharing the pool
+        cache = copy.copy(self)
+        cache.block_table = paddle.index_select(self.block_table, index, axis=0)
+        return cache
+
+    def tile_batch(self, times: int) -> _PagedKVCache:
+        if self.length != 0:
+            raise ValueError(
+                "Only an empty PagedCache can be tiled, generate the cache "
+                "with the tiled batch size instead."
+            )
+        return _PagedKVCache(
+            self.batch_size * times,
+            self.num_heads,
+            self.head_dim,
+            self.max_length,
+            self.k_pool.dtype,
+            self.block_size,
+        )
+
+
 class MultiHeadAttention(Layer):
     """
     Attention mapps queries and a set of key-value pairs to outputs, and
@@ -175,6 +411,8 @@ class MultiHeadAttention(Layer):
 
     Cache = collections.namedtuple("Cache", ["k", "v"])
     StaticCache = collections.namedtuple("StaticCache", ["k", "v"])
+    PreallocatedCache = _PreallocatedKVCache
+    PagedCache = _PagedKVCache
 
     embed_dim: int
     kdim: int
@@ -298,7 +536,10 @@ class MultiHeadAttention(Layer):
         else:
             k, v = self.compute_kv(key, value)
 
-        if isinstance(cache, self.Cache):
+        if isinstance(cache, self.PreallocatedCache):
+            # for decoder self-attention in inference, written in place
+            k, v = cache.update(k, v)
+        elif isinstance(cache, self.Cache):
             # for decoder self-attention in inference
             k = tensor.concat([cache.k, k], axis=2)
             v = tensor.concat([cache.v, v], axis=2)
@@ -353,7 +594,20 @@ class MultiHeadAttention(Layer):
     ) -> StaticCache:
         ...
 
-    def gen_cache(self, key, value=None, type=Cache):
+    @overload
+    def gen_cache(
+        self,
+        key: Tensor,
+        value: Tensor | None = ...,
+        type: type[PreallocatedCache] = ...,
+        max_length: int = ...,
+        block_size: int = ...,
+    ) -> PreallocatedCache:
+        ...
+
+    def gen_cache(
+        self, key, value=None, type=Cache, max_length=None, block_size=16
+    ):
         """
         Generates cache for `forward` usage in inference according to arguments.
         The generated cache is an instance of `MultiHeadAttention.Cache` or an
@@ -387,6 +641,16 @@ class MultiHeadAttention(Layer):
         3. If `type` is `Cache` and `value` is not None, use `key`, `value` to create
         an instance of `Cache`.
 
+        4. If `type` is `PreallocatedCache` or `PagedCache`, allocate room for
+        `max_length` positions for the batch size of `key`, and if `value` is not
+        None, write `key`, `value` as the first positions. Instead of growing by
+        concatenation, these caches are updated in place at the current position,
+        and `PagedCache` stores positions in blocks of `block_size` so that beam
+        search can reorder the batch without copying the whole cache. Both
+        still read all the cached positions into contiguous keys and values at
+        every step, so the cost of a step grows with the cached length, and
+        `PagedCache` gathers them from its blocks to do so.
+
         Parameters:
             key (Tensor): The keys for multi-head attention. It is
                 a tensor with shape `[batch_size, key_length, kdim]`. The
@@ -396,15 +660,48 @@ class MultiHeadAttention(Layer):
                 is a tensor with shape `[batch_size, value_length, vdim]`.
                 The data type should be float32 or float64. If None, `key` is only
                 for batch size reference. Default None.
-            type (type): It should be `MultiHeadAttention.StaticCache` or
-                `MultiHeadAttention.Cache` to indicate the cache type to generate.
+            type (type): It should be `MultiHeadAttention.StaticCache`,
+                `MultiHeadAttention.Cache`, `MultiHeadAttention.PreallocatedCache`
+                or `MultiHeadAttention.PagedCache` to indicate the cache type to
+                generate.
+            max_length (int, optional): The maximum number of positions held by
+                `PreallocatedCache` and `PagedCache`. It is required for them and
+                ignored by the others. Default None.
+            block_size (int, optional): The number of positions of a block in
+                `PagedCache`. Default 16.
 
         Returns:
-            namedtuple: an instance of `Cache` or `StaticCache` accordingly.
+            namedtuple|PreallocatedCache|PagedCache: an instance of the cache type accordingly.
         """
         if type == MultiHeadAttention.StaticCache:  # static_kv
             k, v = self.compute_kv(key, value)
             return self.StaticCache(k, v)
+        elif type in (
+            MultiHeadAttention.PreallocatedCache,
+            MultiHeadAttention.PagedCache,
+        ):
+            if max_length is None:
+                raise ValueError(
+                    "max_length is required to generate PreallocatedCache or "
+                    "PagedCache."
+                )
+            batch_size = paddle.shape(key)[0].item()
+            kwargs = (
+                {'block_size': block_size}
+                if type == MultiHeadAttention.PagedCache
+                else {}
+            )
+            cache = type(
+                batch_size,
+                self.num_heads,
+                self.head_dim,
+                max_length,
+                key.dtype,
+                **kwargs,
+            )
+            if value is not None:
+                cache.update(key, value)
+            return cache
         elif value is None:  # incremental_state
             fill_shape = [-1, self.num_heads, 0, self.head_dim]
             fill_shape[0] = paddle.shape(key)[0].item()
@@ -518,6 +815,8 @@ class MultiHeadAttention(Layer):
                 `StaticCache`, `key` and `value` args would be ignored, `k` and
                 `v` fields would be used as calculated results on `key` and
                 `value`, which mostly used for decoder-encoder cross attention.
+                `PreallocatedCache` and `PagedCache` are used like `Cache` but
+                updated in place, see `gen_cache` for more details.
                 It is only used for inference and should be None for training.
                 Default None.
 
@@ -1194,7 +1493,10 @@ class TransformerDecoderLayer(Layer):
         )
 
     def gen_cache(
-        self, memory: Tensor
+        self,
+        memory: Tensor,
+        max_length: int | None = None,
+        block_size: int | None = None,
     ) -> tuple[MultiHeadAttention.Cache, MultiHeadAttention.StaticCache]:
         r"""
         Generates cache for `forward` usage. The generated cache is a tuple
@@ -1205,6 +1507,12 @@ class TransformerDecoderLayer(Layer):
             memory (Tensor): The output of Transformer encoder. It is a tensor
                 with shape `[batch_size, source_length, d_model]`. The data type
                 should be float32 or float64.
+            max_length (int|None, optional): If not None, `incremental_cache`
+                is a `MultiHeadAttention.PreallocatedCache` holding up to
+                `max_length` target positions, or a `MultiHeadAttention.PagedCache`
+                if `block_size` is also given. Default None.
+            block_size (int|None, optional): The block size of `PagedCache`.
+                Default None.
 
         Returns:
             tuple: It is a tuple( :code:`(incremental_cache, static_cache)` ). \
@@ -1217,9 +1525,23 @@ class TransformerDecoderLayer(Layer):
                 See `MultiHeadAttention.gen_cache` and `MultiHeadAttention.forward` \
                 for more details.
         """
-        incremental_cache = self.self_attn.gen_cache(
-            memory, type=self.self_attn.Cache
-        )
+        if max_length is None:
+            incremental_cache = self.self_attn.gen_cache(
+                memory, type=self.self_attn.Cache
+            )
+        elif block_size is None:
+            incremental_cache = self.self_attn.gen_cache(
+                memory,
+                type=self.self_attn.PreallocatedCache,
+                max_length=max_length,
+            )
+        else:
+            incremental_cache = self.self_attn.gen_cache(
+                memory,
+                type=self.self_attn.PagedCache,
+                max_length=max_length,
+                block_size=block_size,
+            )
         static_cache = self.cross_attn.gen_cache(
             memory, memory, type=self.cross_attn.StaticCache
         )
@@ -1391,7 +1713,11 @@ class TransformerDecoder(Layer):
 
     @overload
     def gen_cache(
-        self, memory: Tensor, do_zip: Literal[False] = ...
+        self,
+        memory: Tensor,
+        do_zip: Literal[False] = ...,
+        max_length: int | None = ...,
+        block_size: int | None = ...,
     ) -> (
         list[tuple[MultiHeadAttention.Cache, MultiHeadAttention.StaticCache]]
         | list[
@@ -1403,7 +1729,11 @@ class TransformerDecoder(Layer):
 
     @overload
     def gen_cache(
-        self, memory: Tensor, do_zip: Literal[True] = ...
+        self,
+        memory: Tensor,
+        do_zip: Literal[True] = ...,
+        max_length: int | None = ...,
+        block_size: int | None = ...,
     ) -> list[
         tuple[MultiHeadAttention.Cache, ...]
         | tuple[MultiHeadAttention.StaticCache, ...]
@@ -1412,7 +1742,11 @@ class TransformerDecoder(Layer):
 
     @overload
     def gen_cache(
-        self, memory: Tensor, do_zip: bool = ...
+        self,
+        memory: Tensor,
+        do_zip: bool = ...,
+        max_length: int | None = ...,
+        block_size: int | None = ...,
     ) -> (
         list[tuple[MultiHeadAttention.Cache, MultiHeadAttention.StaticCache]]
         | list[
@@ -1422,7 +1756,7 @@ class TransformerDecoder(Layer):
     ):
         ...
 
-    def gen_cache(self, memory, do_zip=False):
+    def gen_cache(self, memory, do_zip=False, max_length=None, block_size=None):
         r"""
         Generates cache for `forward` usage. The generated cache is a list, and
         each element in it is a tuple( :code:`(incremental_cache, static_cache)` )
@@ -1437,6 +1771,10 @@ class TransformerDecoder(Layer):
                 should be float32 or float64.
             do_zip (bool, optional): Indicate whether to apply `zip` on the tuples.
                 If True, return a list with two elements. Default False
+            max_length (int|None, optional): Passed to `TransformerDecoderLayer.gen_cache`
+                to preallocate incremental caches. Default None.
+            block_size (int|None, optional): Passed to `TransformerDecoderLayer.gen_cache`
+                to use paged incremental caches. Default None.
 
         Returns:
             list: It is a list, and each element in the list is a tuple produced \
@@ -1444,7 +1782,10 @@ class TransformerDecoder(Layer):
                 for more details. If `do_zip` is True, apply `zip` on these tuples \
                 and return a list with two elements.
         """
-        cache = [layer.gen_cache(memory) for layer in self.layers]
+        cache = [
+            layer.gen_cache(memory, max_length, block_size)
+            for layer in self.layers
+        ]
         if do_zip:
             cache = list(zip(*cache))
         return cache
@@ -20,11 +20,36 @@ import numpy as np
 import paddle
 
 from ...static.quantization.cal_kl_threshold import cal_kl_threshold
+from ..observers.utils import abs_max, channel_abs_max
 from . import utils
 
 
 def abs_max_value(tensor):
-    return float(paddle.max(paddle.abs(tensor)))
+    return float(abs_max(tensor))
+
+
+def abs_max_values(tensors):
+    """
+    The abs max values of all the tensors, copied to host all together.
+    """
+    return (
+        paddle.stack([abs_max(t).astype("float32") for t in tensors]).tolist()
+        if tensors
+        else []
+    )
+
+
+def abs_histogram(tensor, max_value, bins):
+    """
+    The histogram of the absolute values of tensor in the range of
+    [0, max_value], computed on the device of tensor, so that only the
+    histogram is copied to host.
+    """
+    # the range of paddle.histogram is integral, so scale the values to the
+    # bin indices instead
+    scaled = paddle.abs(tensor).astype("float32") * (bins / max_value)
+    hist = paddle.histogram(scaled, bins=bins, min=0, max=bins)
+    return hist.numpy().astype(np.float32)
 
 
 def merge_max_value(old, new):
@@ -53,16 +78,10 @@ def combine_abs_max_and_hist(
     if new_max == 0.0:
         return origin_max, origin_hist
     elif origin_max == 0.0:
-        new_hist, _ = np.histogram(
-            paddle.abs(tensor).numpy(False), range=(0, new_max), bins=bins
-        )
-        new_hist = new_hist.astype(np.float32)
+        new_hist = abs_histogram(tensor, new_max, bins)
         return new_max, new_hist
     elif new_max <= origin_max:
-        new_hist, _ = np.histogram(
-            paddle.abs(tensor).numpy(False), range=(0, origin_max), bins=bins
-        )
-        new_hist = new_hist.astype(np.float32)
+        new_hist = abs_histogram(tensor, origin_max, bins)
         new_hist += origin_hist
         return origin_max, new_hist
     else:
@@ -83,10 +102,7 @@ def combine_abs_max_and_hist(
         sampled_hist = (cumsumed_hist - shift_cumsumed_hist) / upsample_bins
         sampled_hist = sampled_hist.astype(np.float32)
 
-        new_hist, _ = np.histogram(
-            paddle.abs(tensor).numpy(False), range=(0, new_max), bins=bins
-        )
-        new_hist = new_hist.astype(np.float32)
+        new_hist = abs_histogram(tensor, new_max, bins)
         new_hist += sampled_hist
 
         return new_max, new_hist
@@ -127,7 +143,7 @@ class AbsmaxQuantizer(BaseQuantizer):
     def sample_data(self, layer, tensors):
         assert isinstance(tensors, tuple)
 
-        abs_max_vals = [abs_max_value(t) for t in tensors]
+        abs_max_vals = abs_max_values(tensors)
         self.abs_max_vals = merge_max_value(self.abs_max_vals, abs_max_vals)
 
     def cal_thresholds(self):
@@ -146,18 +162,14 @@ class PerChannelAbsmaxQuantizer(BaseQuantizer):
         assert isinstance(layer, paddle.nn.Layer)
         assert isinstance(tensors, tuple)
 
-        abs_max_vals_list = []
-        for idx, tensor in enumerate(tensors):
-            if isinstance(layer, tuple(utils.spec_channel_axis_layers)):
-                abs_max_vals = [
-                    abs_max_value(tensor[:, i]) for i in range(tensor.shape[1])
-                ]
-                abs_max_vals_list.append(abs_max_vals)
-            else:
-                abs_max_vals = [
-                    abs_max_value(tensor[i]) for i in range(tensor.shape[0])
-                ]
-                abs_max_vals_list.append(abs_max_vals)
+        channel_axis = (
+            1 if isinstance(layer, tuple(utils.spec_channel_axis_layers)) else 0
+        )
+        # reduce all the channels at once and copy them to host together
+        abs_max_vals_list = [
+            channel_abs_max(tensor, channel_axis).astype("float32").tolist()
+            for tensor in tensors
+        ]
 
         self.abs_max_vals = merge_max_value(
             self.abs_max_vals, abs_max_vals_list
@@ -181,19 +193,14 @@ class BaseHistQuantizer(BaseQuantizer, metaclass=abc.ABCMeta):
         assert isinstance(tensors, tuple)
 
         if self.abs_max_vals == []:
-            abs_max_vals = [abs_max_value(t) for t in tensors]
+            abs_max_vals = abs_max_values(tensors)
             self.abs_max_vals = abs_max_vals
 
             for idx, tensor in enumerate(tensors):
                 if abs_max_vals[idx] == 0.0:
                     self.hists.append(None)
                 else:
-                    hist, _ = np.histogram(
-                        paddle.abs(tensor).numpy(False),
-                        range=(0.0, abs_max_vals[idx]),
-                        bins=self.bins,
-                    )
-                    hist = hist.astype(np.float32)
+                    hist = abs_histogram(tensor, abs_max_vals[idx], self.bins)
                     self.hists.append(hist)
         else:
             assert len(self.abs_max_vals) == len(tensors)
@@ -14,9 +14,11 @@
 
 
 import paddle
+from paddle.framework import in_dynamic_mode
 
 from ..base_observer import BaseObserver
 from ..factory import ObserverFactory
+from .utils import abs_max
 
 
 class AbsmaxObserver(ObserverFactory):
@@ -48,9 +50,15 @@ class AbsmaxObserver(ObserverFactory):
 class AbsmaxObserverLayer(BaseObserver):
     """
     Per-tensor abs max quantizer.
+
+    In dynamic mode, each forward only reduces its input to a scalar, and
+    the scalars are merged into the running abs max at most every
+    ``MAX_PENDING`` forwards, or when the scales are needed. The observers
+    of a model can be merged all together by :meth:`merge_pending`.
     """
 
     INIT_ABS_MAX = 1e-7
+    MAX_PENDING = 64
 
     def __init__(self, layer, quant_bits=8):
         super().__init__()
@@ -59,19 +67,72 @@ class AbsmaxObserverLayer(BaseObserver):
         self._max = None
         self._scale = None
         self._zero_point = None
+        self._pending = []
 
     def forward(self, input):
-        self._min, self._max = self.cal_min_max(input)
+        if in_dynamic_mode():
+            self._min = 0
+            self._pending.append(abs_max(input))
+            if len(self._pending) >= AbsmaxObserverLayer.MAX_PENDING:
+                self._merge_pending()
+        else:
+            self._min, self._max = self.cal_min_max(input)
         return input
 
     def cal_min_max(self, inputs):
-        abs_max_val = paddle.max(paddle.abs(inputs))
+        abs_max_val = abs_max(inputs)
         if self._max is not None:
             abs_max_val = paddle.maximum(
                 abs_max_val, self._max.cast(inputs.dtype)
             )
         return 0, abs_max_val
 
+    def _merge_pending(self):
+        if not self._pending:
+            return
+        values = self._pending
+        if self._max is not None:
+            values = [*values, self._max.cast(values[0].dtype)]
+        self._max = paddle.max(paddle.stack(values))
+        self._pending = []
+
+    @staticmethod
+    def merge_pending(observers):
+        """
+        Merge the pending abs max values of all the observers into their
+        running abs max with a few kernels in total, instead of a few kernels
+        for each of the observers.
+
+        Args:
+            observers(list[AbsmaxObserverLayer]): The observers to merge.
+        """
+        groups = {}
+        for observer in observers:
+            if observer._pending:
+                dtype = observer._pending[0].dtype
+                groups.setdefault(dtype, []).append(observer)
+        for dtype, group in groups.items():
+            if len(group) == 1 or dtype not in (
+                paddle.float32,
+                paddle.float64,
+            ):
+                for observer in group:
+                    observer._merge_pending()
+                continue
+            values, segment_ids = [], []
+            for i, observer in enumerate(group):
+                observer_values = list(observer._pending)
+                if observer._max is not None:
+                    observer_values.append(observer._max.cast(dtype))
+                values.extend(observer_values)
+                segment_ids.extend([i] * len(observer_values))
+            merged = paddle.geometric.segment_max(
+                paddle.stack(values), paddle.to_tensor(segment_ids)
+            )
+            for observer, value in zip(group, paddle.unbind(merged)):
+                observer._max = value
+                observer._pending = []
+
     def bit_length(self):
         return self._quant_bits
 
@@ -80,6 +141,7 @@ class AbsmaxObserverLayer(BaseObserver):
 
     def cal_thresholds(self):
         """Compute thresholds for MAX function."""
+        self._merge_pending()
         if self._scale is None:
             self._scale = self._max
         self._zero_point = paddle.zeros_like(self._scale)
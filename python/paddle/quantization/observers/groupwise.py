@@ -18,6 +18,7 @@ import paddle
 
 from ..base_observer import BaseObserver
 from ..factory import ObserverFactory
+from .utils import abs_max
 
 
 class GroupWiseWeightObserver(ObserverFactory):
@@ -69,17 +70,19 @@ class GroupWiseWeightObserverLayer(BaseObserver):
             inputs.shape[0] % self.group_size == 0
         ), "group_size must be a factor of input channels"
         assert len(inputs.shape) == 2, "Currently only support 2D tensor"
-        input_processed = inputs.transpose([1, 0]).reshape(
-            [input_shape[1], input_shape[0] // self.group_size, self.group_size]
-        )
-
-        abs_max_values = paddle.max(paddle.abs(input_processed), axis=2).cast(
-            "float32"
-        )
+        abs_max_values = abs_max(
+            inputs.reshape(
+                [
+                    input_shape[0] // self.group_size,
+                    self.group_size,
+                    input_shape[1],
+                ]
+            ),
+            axis=1,
+        ).cast("float32")
         abs_max_values = paddle.where(
             abs_max_values == np.float32(0), np.float32(1e-8), abs_max_values
         )
-        abs_max_values = abs_max_values.transpose([1, 0])
         return abs_max_values
 
     def min_value(self) -> float:
@@ -0,0 +1,63 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+
+import paddle
+from paddle import _C_ops
+from paddle.framework import in_dynamic_mode
+
+# p_norm is registered for float32 and float64 on all the devices, and for
+# float16 and bfloat16 on GPU too.
+_P_NORM_DTYPES = (paddle.float32, paddle.float64)
+_P_NORM_GPU_DTYPES = _P_NORM_DTYPES + (paddle.float16, paddle.bfloat16)
+
+
+def abs_max(x, axis=None):
+    """
+    The max absolute value of all the elements of x, or along an axis of x.
+    In dynamic mode, it runs a single fused reduction, without materializing
+    the absolute values of x.
+    """
+    if (
+        in_dynamic_mode()
+        and x.ndim > 0
+        and x.size > 0
+        and (
+            x.dtype in _P_NORM_DTYPES
+            or (x.place.is_gpu_place() and x.dtype in _P_NORM_GPU_DTYPES)
+        )
+    ):
+        return _C_ops.p_norm(
+            x,
+            float("inf"),
+            -1 if axis is None else axis,
+            1e-12,
+            False,
+            axis is None,
+        )
+    return paddle.max(paddle.abs(x), axis=axis)
+
+
+def channel_abs_max(x, axis):
+    """
+    The max absolute values of x for each channel along axis, in at most two
+    reductions whatever the rank of x.
+    """
+    axis = axis % x.ndim
+    channels = x.shape[axis]
+    if axis == 0:
+        return abs_max(x.reshape([channels, -1]), axis=1)
+    x = x.reshape([math.prod(x.shape[:axis]), channels, -1])
+    return paddle.max(abs_max(x, axis=2), axis=0)
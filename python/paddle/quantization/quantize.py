@@ -23,6 +23,7 @@ from paddle.nn.quant.format import (
 
 from .base_quanter import BaseQuanter
 from .config import QuantConfig
+from .observers.abs_max import AbsmaxObserverLayer
 
 
 class Quantization(metaclass=abc.ABCMeta):
@@ -68,6 +69,13 @@ class Quantization(metaclass=abc.ABCMeta):
                 >>> paddle.jit.save(converted_model, "./quant_deploy", [dummy_data])
         """
         _model = model if inplace else copy.deepcopy(model)
+        AbsmaxObserverLayer.merge_pending(
+            [
+                layer
+                for layer in _model.sublayers(include_self=True)
+                if isinstance(layer, AbsmaxObserverLayer)
+            ]
+        )
         replaced = {}
         for name, child in _model.named_children():
             quant_dequant = None
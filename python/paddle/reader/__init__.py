@@ -72,6 +72,9 @@ from paddle.reader.decorator import (  # noqa: F401
     firstn,
     map_readers,
     multiprocess_reader,
+    process_buffered,
+    process_xmap_readers,
+    reservoir_shuffle,
     shuffle,
     xmap_readers,
 )
@@ -17,8 +17,11 @@ from __future__ import annotations
 import itertools
 import logging
 import multiprocessing
+import pickle
+import queue
 import random
 import sys
+import threading
 import warnings
 from itertools import zip_longest
 from queue import Queue
@@ -768,3 +771,354 @@ def multiprocess_reader(
         return pipe_reader
     else:
         return queue_reader
+
+
+def reservoir_shuffle(reader: _Reader[_T], buf_size: int) -> _Reader[_T]:
+    """
+    This API creates a decorated reader that outputs the data shuffled by a
+    fixed size reservoir.
+
+    Different from :code:`shuffle`, which collects ``buf_size`` samples before
+    yielding any of them, every new sample replaces a randomly chosen sample of
+    the reservoir and the replaced one is yielded immediately, so the memory
+    is bounded by ``buf_size`` samples and the output is streamed.
+
+    Args:
+        reader(callable): the original reader whose data will be shuffled.
+        buf_size(int): the size of the reservoir.
+
+    Returns:
+        callable: a decorated reader.
+
+    Examples:
+        .. code-block:: python
+
+            >>> # doctest: +SKIP('outputs are 0~4 unordered arrangement')
+            >>> def reader():
+            ...     for i in range(5):
+            ...         yield i
+            >>> shuffled_reader = paddle.reader.reservoir_shuffle(reader, 3)
+            >>> for e in shuffled_reader():
+            ...     print(e)
+            >>> # outputs are 0~4 unordered arrangement
+    """
+    assert buf_size > 0, "buf_size should be greater than 0."
+
+    def data_reader() -> Generator[_T, None, None]:
+        buf = []
+        for e in reader():
+            if len(buf) < buf_size:
+                buf.append(e)
+                continue
+            idx = random.randrange(buf_size)
+            yield buf[idx]
+            buf[idx] = e
+
+        random.shuffle(buf)
+        yield from buf
+
+    return data_reader
+
+
+class _SharedMemoryRing:
+    """
+    A ring of fixed size slots in one shared memory segment.
+
+    Samples are pickled into a free slot by the producer process and only the
+    slot index goes through the queue, so the consumer does not pay for piping
+    the whole sample. Samples larger than a slot are sent inline instead.
+    """
+
+    def __init__(self, slot_num: int, slot_size: int) -> None:
+        from multiprocessing import shared_memory
+
+        self.slot_num = slot_num
+        self.slot_size = slot_size
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=slot_num * slot_size
+        )
+        self._free_slots = fork_context.Queue(slot_num)
+        for slot in range(slot_num):
+            self._free_slots.put(slot)
+
+    def write(self, sample: Any) -> tuple[Any, ...]:
+        data = pickle.dumps(sample, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.slot_size:
+            return ("inline", data)
+        slot = self._free_slots.get()
+        offset = slot * self.slot_size
+        self._shm.buf[offset : offset + len(data)] = data
+        return ("slot", slot, len(data))
+
+    def read(self, message: tuple[Any, ...]) -> Any:
+        if message[0] == "inline":
+            return pickle.loads(message[1])
+        _, slot, length = message
+        offset = slot * self.slot_size
+        sample = pickle.loads(self._shm.buf[offset : offset + length])
+        self._free_slots.put(slot)
+        return sample
+
+    def release(self) -> None:
+        self._free_slots.cancel_join_thread()
+        self._free_slots.close()
+        self._shm.close()
+        self._shm.unlink()
+
+
+class _ProcessEndSignal:
+    pass
+
+
+def _put_sample(ring, out_queue, idx, sample):
+    out_queue.put((idx, ring.write(sample)))
+
+
+def _put_error(out_queue, idx):
+    import traceback
+
+    out_queue.put((idx, ("error", traceback.format_exc())))
+
+
+def _check_platform(api_name):
+    if sys.platform == 'win32':
+        raise NotImplementedError(
+            f"The {api_name} method is not supported on windows."
+        )
+
+
+def _get_from_ring(ring, out_queue, workers):
+    while True:
+        try:
+            idx, message = out_queue.get(timeout=QUEUE_GET_TIMEOUT)
+        except queue.Empty:
+            if any(not w.is_alive() and w.exitcode for w in workers):
+                raise RuntimeError(
+                    "A reader worker process exited unexpectedly."
+                )
+            continue
+        if message[0] == "error":
+            raise RuntimeError(
+                f"A reader worker process failed with:\n{message[1]}"
+            )
+        if message[0] == "end":
+            return idx, _ProcessEndSignal()
+        return idx, ring.read(message)
+
+
+def _shutdown(workers, queues, ring):
+    for w in workers:
+        if w.is_alive():
+            w.terminate()
+    for w in workers:
+        w.join()
+    for q in queues:
+        q.cancel_join_thread()
+        q.close()
+    ring.release()
+
+
+def process_buffered(
+    reader: _Reader[_T], size: int, slot_size: int = 1 << 20
+) -> _Reader[_T]:
+    """
+    Creates a buffered data reader whose producer runs in a separate process.
+
+    Unlike :code:`buffered`, which reads in a thread and therefore shares the
+    GIL with the training loop, the original reader runs in a child process
+    and the samples are passed back through a shared memory ring, so reading
+    and decoding overlap with the consumer on another core.
+
+    Samples must be picklable. Samples larger than ``slot_size`` bytes after
+    pickling are still supported but go through the queue instead of the
+    ring. The shared memory occupied is ``size * slot_size`` bytes.
+
+    Args:
+        reader(callable): the data reader to read from.
+        size(int): max buffer size, i.e. the number of slots of the ring.
+        slot_size(int, optional): the size in bytes of each slot. Default: 1MB.
+
+    Returns:
+        callable: the buffered data reader.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import paddle
+
+            >>> def reader():
+            ...     for i in range(3):
+            ...         yield i
+            ...
+            >>> buffered_reader = paddle.reader.process_buffered(reader, 2)
+
+            >>> # Output: 0 1 2
+            >>> for i in buffered_reader():
+            ...     print(i)
+            0
+            1
+            2
+    """
+    _check_platform("process_buffered")
+    assert size > 0, "size should be greater than 0."
+
+    def read_worker(ring, out_queue):
+        idx = -1
+        try:
+            for idx, sample in enumerate(reader()):
+                _put_sample(ring, out_queue, idx, sample)
+            out_queue.put((idx + 1, ("end",)))
+        except Exception:
+            _put_error(out_queue, idx + 1)
+
+    def data_reader():
+        ring = _SharedMemoryRing(size, slot_size)
+        out_queue = fork_context.Queue(size)
+        worker = fork_context.Process(
+            target=read_worker, args=(ring, out_queue)
+        )
+        worker.daemon = True
+        worker.start()
+        try:
+            while True:
+                _, sample = _get_from_ring(ring, out_queue, [worker])
+                if isinstance(sample, _ProcessEndSignal):
+                    break
+                yield sample
+        finally:
+            _shutdown([worker], [out_queue], ring)
+
+    return data_reader
+
+
+def process_xmap_readers(
+    mapper: Callable[[_T], _U],
+    reader: _Reader[_T],
+    process_num: int,
+    buffer_size: int,
+    order: bool = False,
+    slot_size: int = 1 << 20,
+) -> _Reader[_U]:
+    """
+    Use a pool of processes to map samples from reader by a mapper defined by user.
+
+    It has the same semantics as :code:`xmap_readers`, but the mapper runs in
+    ``process_num`` worker processes instead of threads, so CPU bound mappers
+    (decoding, augmentation, tokenization) scale with the number of cores.
+    The original reader is iterated in the main process and only the mapped
+    samples come back, through a shared memory ring.
+
+    Samples and mapped samples must be picklable, and the mapper must be
+    importable by the workers when the start method is not fork.
+
+    Args:
+        mapper (callable): a function to map the data from reader.
+        reader (callable): a data reader which yields the data.
+        process_num (int): the number of worker processes.
+        buffer_size (int): the max number of samples being mapped at the same time.
+        order (bool, optional): whether to keep the data order from original reader.
+            Default False.
+        slot_size (int, optional): the size in bytes of each slot of the ring. Default: 1MB.
+
+    Returns:
+        callable: a decorated reader with data mapping.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import paddle
+
+            >>> def reader():
+            ...     for i in range(5):
+            ...         yield i
+            ...
+            >>> def square(x):
+            ...     return x * x
+            ...
+            >>> xreader = paddle.reader.process_xmap_readers(
+            ...     square, reader, process_num=2, buffer_size=4, order=True)
+            >>> print(list(xreader()))
+            [0, 1, 4, 9, 16]
+    """
+    _check_platform("process_xmap_readers")
+    assert process_num > 0, "process_num should be greater than 0."
+    assert buffer_size > 0, "buffer_size should be greater than 0."
+
+    def handle_worker(ring, in_queue, out_queue):
+        while True:
+            task = in_queue.get()
+            if task is None:
+                break
+            idx, sample = task
+            try:
+                _put_sample(ring, out_queue, idx, mapper(sample))
+            except Exception:
+                _put_error(out_queue, idx)
+                break
+
+    def feed_worker(in_queue, out_queue, in_flight, stop_event):
+        count = 0
+        try:
+            for sample in reader():
+                if stop_event.is_set():
+                    return
+                while not in_flight.acquire(timeout=0.1):
+                    if stop_event.is_set():
+                        return
+                in_queue.put((count, sample))
+                count += 1
+        except Exception:
+            _put_error(out_queue, count)
+            return
+        for _ in range(process_num):
+            in_queue.put(None)
+        out_queue.put((count, ("end",)))
+
+    def xreader():
+        ring = _SharedMemoryRing(max(2 * process_num, 2), slot_size)
+        in_queue = fork_context.Queue(buffer_size + process_num)
+        out_queue = fork_context.Queue()
+        workers = []
+        for _ in range(process_num):
+            worker = fork_context.Process(
+                target=handle_worker, args=(ring, in_queue, out_queue)
+            )
+            worker.daemon = True
+            worker.start()
+            workers.append(worker)
+
+        in_flight = threading.Semaphore(buffer_size)
+        stop_event = threading.Event()
+        feeder = Thread(
+            target=feed_worker,
+            args=(in_queue, out_queue, in_flight, stop_event),
+        )
+        feeder.daemon = True
+        feeder.start()
+
+        total = None
+        yielded = 0
+        pending = {}
+        try:
+            while total is None or yielded < total:
+                idx, sample = _get_from_ring(ring, out_queue, workers)
+                if isinstance(sample, _ProcessEndSignal):
+                    total = idx
+                    continue
+                if not order:
+                    in_flight.release()
+                    yielded += 1
+                    yield sample
+                    continue
+                pending[idx] = sample
+                while yielded in pending:
+                    in_flight.release()
+                    sample = pending.pop(yielded)
+                    yielded += 1
+                    yield sample
+        finally:
+            stop_event.set()
+            feeder.join()
+            _shutdown(workers, [in_queue, out_queue], ring)
+
+    return xreader
@@ -78,6 +78,45 @@ def safe_entropy(reference_distr_P, P_sum, candidate_distr_Q, Q_sum):
     return (tmp_sum1 - tmp_sum2) / P_sum
 
 
+def _kl_divergence(hist, hist_cumsum, hist_sum, i, quant_range):
+    '''
+    The KL-divergence between hist[0:i], with the outliers merged into the
+    last bin, and its quantization into quant_range bins.
+    '''
+    reference_distr_P = hist[0:i].copy()
+    reference_distr_P[i - 1] += hist_cumsum[-1] - hist_cumsum[i]
+
+    # the bins merged into each quantized bin, the last one takes the rest
+    num_merged_bins = i // quant_range
+    j_starts = np.arange(quant_range) * num_merged_bins
+    j_ends = j_starts + num_merged_bins
+    j_ends[-1] = i
+    candidate_distr_Q_quantized = hist_cumsum[j_ends] - hist_cumsum[j_starts]
+
+    # expand the quantized bins over the nonzero reference bins
+    nonzero = reference_distr_P != 0
+    nonzero_cumsum = np.concatenate([[0], np.cumsum(nonzero)])
+    nonzero_count = nonzero_cumsum[j_ends] - nonzero_cumsum[j_starts]
+    avg_bin_ele = np.divide(
+        candidate_distr_Q_quantized,
+        nonzero_count,
+        out=np.zeros(quant_range),
+        where=nonzero_count > 0,
+    )
+    if num_merged_bins > 0:
+        bin_index = np.minimum(np.arange(i) // num_merged_bins, quant_range - 1)
+    else:
+        bin_index = np.full(i, quant_range - 1)
+    candidate_distr_Q = np.where(nonzero, avg_bin_ele[bin_index], 0.0)
+    Q_sum = np.sum(candidate_distr_Q)
+
+    p = reference_distr_P[nonzero]
+    q = candidate_distr_Q[nonzero]
+    tmp_sum1 = np.sum(p * np.log(Q_sum * p))
+    tmp_sum2 = np.sum(p * np.log(hist_sum * q))
+    return (tmp_sum1 - tmp_sum2) / hist_sum
+
+
 def cal_kl_threshold(hist, bin_width, bits):
     '''
     Using the KL-divergence method to get the more precise threshold.
@@ -92,38 +131,17 @@ def cal_kl_threshold(hist, bin_width, bits):
     starting_iter = int((hist_bins - 1) * 0.5)
     quant_range = 2 ** (bits - 1) - 1
 
-    P_sum = np.sum(np.array(hist).ravel())
+    hist = np.asarray(hist, dtype=np.float64)
+    hist_cumsum = np.concatenate([[0.0], np.cumsum(hist)])
+    P_sum = hist_cumsum[-1]
     min_kl_divergence = 0
     min_kl_index = 0
     kl_inited = False
 
     for i in range(starting_iter, hist_bins):
-        reference_distr_P = hist[0:i].tolist()
-        outliers_count = sum(hist[i:])
-        if reference_distr_P[i - 1] == 0:
+        if hist[i - 1] == 0:
             continue
-        reference_distr_P[i - 1] += outliers_count
-        reference_distr_bins = reference_distr_P[:]
-        candidate_distr_Q = hist[0:i].tolist()
-        num_merged_bins = int(i / quant_range)
-        candidate_distr_Q_quantized = [0] * quant_range
-        j_start = 0
-        j_end = num_merged_bins
-        for idx in range(quant_range):
-            candidate_distr_Q_quantized[idx] = sum(
-                candidate_distr_Q[j_start:j_end]
-            )
-            j_start += num_merged_bins
-            j_end += num_merged_bins
-            if (idx + 1) == quant_range - 1:
-                j_end = i
-        candidate_distr_Q = expand_quantized_bins(
-            candidate_distr_Q_quantized, reference_distr_bins
-        )
-        Q_sum = sum(candidate_distr_Q)
-        kl_divergence = safe_entropy(
-            reference_distr_P, P_sum, candidate_distr_Q, Q_sum
-        )
+        kl_divergence = _kl_divergence(hist, hist_cumsum, P_sum, i, quant_range)
         if not kl_inited:
             min_kl_divergence = kl_divergence
             min_kl_index = i
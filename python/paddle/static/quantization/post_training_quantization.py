@@ -15,6 +15,7 @@
 import logging
 import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 
@@ -53,6 +54,95 @@ _logger = get_logger(
     __name__, logging.INFO, fmt='%(asctime)s-%(levelname)s: %(message)s'
 )
 
+# The max number of elements quantized at once when searching the scale of
+# an activation, which bounds the memory of the search.
+_SCALE_SEARCH_CHUNK_SIZE = 1 << 22
+
+
+def _get_hist_scaling_factor(hist, hist_edges, threshold_rate):
+    '''
+    Using the hist method to get the scaling factor.
+    '''
+    hist_cumsum = np.cumsum(hist / float(np.sum(hist)))
+    reached = hist_cumsum >= threshold_rate
+    hist_index = int(np.argmax(reached)) + 1 if reached.any() else 0
+    bin_width = hist_edges[1] - hist_edges[0]
+    return (hist_index - 0.5) * bin_width
+
+
+def _cal_hist_threshold(algo, hist, hist_edges, bits, hist_percent):
+    '''
+    Calculate the KL or hist threshold of an activation from its histogram.
+    '''
+    if algo == "KL":
+        bin_width = hist_edges[1] - hist_edges[0]
+        return cal_kl_threshold(hist, bin_width, bits)
+    return _get_hist_scaling_factor(hist, hist_edges, hist_percent)
+
+
+def _update_streaming_histogram(histogram, var_tensor_abs, bins):
+    '''
+    Accumulate var_tensor_abs into the histogram over [0, max], which keeps
+    its bins and doubles its range, merging pairs of bins, until it covers
+    the new max.
+    '''
+    max_value = float(np.max(var_tensor_abs))
+    if histogram is None:
+        hist_range = max_value if max_value > 0 else 1e-8
+        histogram = [np.zeros(bins, dtype=np.int64), None]
+    else:
+        hist, hist_edges = histogram
+        hist_range = hist_edges[-1]
+        factor = 1
+        while hist_range * factor < max_value:
+            factor *= 2
+        if factor > 1:
+            if factor < bins:
+                merged = hist.reshape(-1, factor).sum(axis=1)
+            else:
+                merged = hist.sum(keepdims=True)
+            hist = np.zeros(bins, dtype=np.int64)
+            hist[: merged.shape[0]] = merged
+            hist_range *= factor
+            histogram[0] = hist
+    histogram[1] = np.linspace(0, hist_range, bins + 1)
+    hist, _ = np.histogram(var_tensor_abs, bins=bins, range=(0, hist_range))
+    histogram[0] += hist
+    return histogram
+
+
+def _quant_dequant_losses(var_tensor, scales, bits, onnx_format, loss_type):
+    '''
+    The mse or emd loss of quantizing var_tensor with each of the scales,
+    computed for as many scales at once as _SCALE_SEARCH_CHUNK_SIZE allows.
+    '''
+    bins = 2 ** (bits - 1) - 1
+    chunk = max(1, _SCALE_SEARCH_CHUNK_SIZE // var_tensor.size)
+    losses = []
+    for start in range(0, len(scales), chunk):
+        scale = np.asarray(
+            scales[start : start + chunk], dtype=var_tensor.dtype
+        )[:, None]
+        if onnx_format:
+            quant_var = np.clip(
+                np.round(var_tensor / scale * bins), -bins - 1, bins
+            )
+            quant_dequant_var = quant_var / bins * scale
+        else:
+            quant_dequant_var = (
+                np.round(np.clip(var_tensor, 0.0, scale) / scale * bins)
+                / bins
+                * scale
+            )
+        if loss_type == "mse":
+            losses.extend(((var_tensor - quant_dequant_var) ** 2).mean(axis=1))
+        else:
+            losses.extend(
+                np.abs(np.mean(var_tensor) - np.mean(quant_dequant_var, axis=1))
+                + np.abs(np.std(var_tensor) - np.std(quant_dequant_var, axis=1))
+            )
+    return losses
+
 
 def _all_persistable_var_names(program):
     persistable_var_names = []
@@ -150,6 +240,8 @@ class PostTrainingQuantization:
         scale_dict=None,
         return_graph=False,
         deploy_backend=None,
+        streaming_hist=False,
+        threshold_workers=0,
     ):
         """
         Constructor.
@@ -243,6 +335,14 @@ class PostTrainingQuantization:
             deploy_backend(str, optional): Deploy backend, it can be None, `TensorRT`,
                 `MKLDNN`, `ARM`. And it will extend the new backend. Default is None,
                 which means to use the default general quantization configuration.
+            streaming_hist(bool, optional): If algo='KL' or 'hist', whether to
+                accumulate the histograms of activations in a single pass over the
+                calibrate data, growing their range with the max value seen so far,
+                instead of running a first pass to get the range. Default is False.
+            threshold_workers(int, optional): If algo='KL' or 'hist', the number of
+                processes calculating the thresholds of activations from their
+                histograms. If it is 0, calculate them in the current process.
+                Default is 0.
         Returns:
             None
 
@@ -336,6 +436,8 @@ class PostTrainingQuantization:
         self._batch_nums = batch_nums
         self._algo = algo
         self._hist_percent = hist_percent
+        self._streaming_hist = streaming_hist
+        self._threshold_workers = threshold_workers
         self._activation_bits = activation_bits
         self._weight_bits = weight_bits
         self._activation_quantize_type = activation_quantize_type
@@ -434,7 +536,7 @@ class PostTrainingQuantization:
         self._collect_target_varnames()
         self._set_activation_persistable()
 
-        if self._algo in ["KL", "hist"]:
+        if self._algo in ["KL", "hist"] and not self._streaming_hist:
             batch_id = 0
             with tqdm(
                 total=self._batch_nums,
@@ -784,22 +886,18 @@ class PostTrainingQuantization:
             s = 0.3
             if var_name not in self._best_calibration_loss:
                 self._best_calibration_loss[var_name] = float('inf')
+            scales = []
             while s <= 1.0:
-                scale = s * abs_max_value
+                scales.append(s * abs_max_value)
                 s += 0.02
-                bins = 2 ** (self._activation_bits - 1) - 1
-                if self._onnx_format:
-                    quant_var = np.clip(
-                        np.round(var_tensor / scale * bins), -bins - 1, bins
-                    )
-                    quant_dequant_var = quant_var / bins * scale
-                else:
-                    quant_dequant_var = (
-                        np.round(np.clip(var_tensor, 0.0, scale) / scale * bins)
-                        / bins
-                        * scale
-                    )
-                mse_loss = ((var_tensor - quant_dequant_var) ** 2).mean()
+            mse_losses = _quant_dequant_losses(
+                var_tensor,
+                scales,
+                self._activation_bits,
+                self._onnx_format,
+                "mse",
+            )
+            for scale, mse_loss in zip(scales, mse_losses):
                 if mse_loss <= self._best_calibration_loss[var_name]:
                     self._best_calibration_loss[var_name] = mse_loss
                     self._quantized_threshold[var_name] = scale
@@ -838,24 +936,18 @@ class PostTrainingQuantization:
             s = 0.3
             if var_name not in self._best_calibration_loss:
                 self._best_calibration_loss[var_name] = float('inf')
+            scales = []
             while s <= 1.0:
-                scale = s * abs_max_value
+                scales.append(s * abs_max_value)
                 s += 0.02
-                bins = 2 ** (self._activation_bits - 1) - 1
-                if self._onnx_format:
-                    quant_var = np.clip(
-                        np.round(var_tensor / scale * bins), -bins - 1, bins
-                    )
-                    quant_dequant_var = quant_var / bins * scale
-                else:
-                    quant_dequant_var = (
-                        np.round(np.clip(var_tensor, 0.0, scale) / scale * bins)
-                        / bins
-                        * scale
-                    )
-                emd_loss = np.abs(
-                    np.mean(var_tensor) - np.mean(quant_dequant_var)
-                ) + np.abs(np.std(var_tensor) - np.std(quant_dequant_var))
+            emd_losses = _quant_dequant_losses(
+                var_tensor,
+                scales,
+                self._activation_bits,
+                self._onnx_format,
+                "emd",
+            )
+            for scale, emd_loss in zip(scales, emd_losses):
                 if emd_loss <= self._best_calibration_loss[var_name]:
                     self._best_calibration_loss[var_name] = emd_loss
                     self._quantized_threshold[var_name] = scale
@@ -978,6 +1070,15 @@ class PostTrainingQuantization:
     def _sample_histogram(self):
         for var_name in self._quantized_act_var_name:
             var_tensor = utils.load_variable_data(self._scope, var_name)
+            if self._streaming_hist and var_tensor.size > 0:
+                self._sampling_act_histogram[
+                    var_name
+                ] = _update_streaming_histogram(
+                    self._sampling_act_histogram.get(var_name),
+                    np.abs(var_tensor),
+                    self._histogram_bins,
+                )
+                continue
             if (var_tensor.size == 0) or (
                 var_name not in self._sampling_act_histogram
             ):
@@ -985,7 +1086,10 @@ class PostTrainingQuantization:
                 continue
             var_tensor_abs = np.abs(var_tensor)
             bins = self._sampling_act_histogram[var_name][1]
-            hist, _ = np.histogram(var_tensor_abs, bins=bins)
+            # the edges are uniform, which numpy bins without searching them
+            hist, _ = np.histogram(
+                var_tensor_abs, bins=len(bins) - 1, range=(bins[0], bins[-1])
+            )
             self._sampling_act_histogram[var_name][0] += hist
 
     def _sample_ptf(self):
@@ -1143,21 +1247,33 @@ class PostTrainingQuantization:
                         )
             self._quantized_var_threshold[var_name] = weight_threshold
 
-        for var_name in self._quantized_act_var_name:
-            if (var_name in self._zero_size_var_names) and (
-                var_name not in self._sampling_act_histogram
-            ):
-                continue
-            hist, hist_edges = self._sampling_act_histogram[var_name]
-            if self._algo == "KL":
-                bin_width = hist_edges[1] - hist_edges[0]
-                self._quantized_var_threshold[var_name] = cal_kl_threshold(
-                    hist, bin_width, self._activation_bits
+        var_names = [
+            var_name
+            for var_name in self._quantized_act_var_name
+            if (var_name not in self._zero_size_var_names)
+            or (var_name in self._sampling_act_histogram)
+        ]
+        args = (
+            [self._algo] * len(var_names),
+            [self._sampling_act_histogram[name][0] for name in var_names],
+            [self._sampling_act_histogram[name][1] for name in var_names],
+            [self._activation_bits] * len(var_names),
+            [self._hist_percent] * len(var_names),
+        )
+        if self._threshold_workers > 0 and len(var_names) > 1:
+            with ProcessPoolExecutor(self._threshold_workers) as pool:
+                thresholds = list(
+                    pool.map(
+                        _cal_hist_threshold,
+                        *args,
+                        chunksize=max(
+                            1, len(var_names) // (4 * self._threshold_workers)
+                        ),
+                    )
                 )
-            elif self._algo == "hist":
-                self._quantized_var_threshold[
-                    var_name
-                ] = self._get_hist_scaling_factor(hist, hist_edges)
+        else:
+            thresholds = list(map(_cal_hist_threshold, *args))
+        self._quantized_var_threshold.update(zip(var_names, thresholds))
 
     def _update_program(self):
         '''
@@ -1463,17 +1579,7 @@ class PostTrainingQuantization:
         '''
         Using the hist method to get the scaling factor.
         '''
-        threshold_rate = self._hist_percent
-        hist = hist / float(sum(hist))
-        hist_sum = 0
-        hist_index = 0
-        for i in range(len(hist)):
-            hist_sum += hist[i]
-            if hist_sum >= threshold_rate:
-                hist_index = i + 1
-                break
-        bin_width = hist_edges[1] - hist_edges[0]
-        return (hist_index - 0.5) * bin_width
+        return _get_hist_scaling_factor(hist, hist_edges, self._hist_percent)
 
 
 class PostTrainingQuantizationProgram(PostTrainingQuantization):
@@ -1509,6 +1615,8 @@ class PostTrainingQuantizationProgram(PostTrainingQuantization):
         cache_dir=None,
         scale_dict=None,
         return_graph=True,
+        streaming_hist=False,
+        threshold_workers=0,
     ):
         super().__init__(
             executor,
@@ -1541,6 +1649,8 @@ class PostTrainingQuantizationProgram(PostTrainingQuantization):
             cache_dir,
             scale_dict,
             return_graph,
+            streaming_hist=streaming_hist,
+            threshold_workers=threshold_workers,
         )
         self.FLAG = False
         self._program = program
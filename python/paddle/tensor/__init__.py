@@ -60,7 +60,7 @@ from .creation import (  # noqa: F401
     zeros,
     zeros_like,
 )
-from .einsum import einsum  # noqa: F401
+from .einsum import einsum, einsum_expression  # noqa: F401
 from .linalg import (  # noqa: F401
     bincount,
     bmm,
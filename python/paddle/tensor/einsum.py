@@ -14,6 +14,7 @@
 from __future__ import annotations
 
 import collections
+import functools
 import itertools
 import re
 import string
@@ -740,15 +741,16 @@ def plan_einsum(
     return plan
 
 
-def replace_ellipsis(
-    left_equation: str, rhs: str, *operands: Tensor
-) -> tuple[str, str, list[Tensor]]:
+def plan_ellipsis(
+    left_equation: str, rhs: str, operands: Sequence[Tensor]
+) -> tuple[str, str, list[list[int]]]:
     """
-    we replace ... as unused variables to simplify the EinsumOp implementation.
+    plan the replacement of ... as unused variables by the shapes of operands,
+    return the new equation and the axes to unsqueeze each operand at.
     """
     ellipsis_strings = None
     max_ndim = 0
-    new_operands: list[Tensor] = []
+    unsqueeze_axes: list[list[int]] = []
     unused_variables = {chr(c) for c in range(ord('a'), ord('z'))}
     for equ, operand in zip(left_equation.split(','), operands):
         ndims = len(operand.shape) - len(equ.replace("...", ""))
@@ -757,28 +759,42 @@ def replace_ellipsis(
             unused_variables.discard(c)
 
     for equ, operand in zip(left_equation.split(','), operands):
+        axes = []
         if '...' in equ:
             start_unsqueeze_idx = equ.index('...')
             to_squeeze_num = max_ndim - (
                 len(operand.shape) - len(equ.replace("...", ""))
             )
-            operand = unsqueeze(
-                operand,
-                axis=[i + start_unsqueeze_idx for i in range(to_squeeze_num)],
-            )
-        new_operands.append(operand)
+            axes = [i + start_unsqueeze_idx for i in range(to_squeeze_num)]
+        unsqueeze_axes.append(axes)
 
     ellipsis_strings = ''.join(unused_variables.pop() for _ in range(max_ndim))
 
     if ellipsis_strings is not None:
         left_equation = left_equation.replace('...', ellipsis_strings)
         rhs = rhs.replace('...', ellipsis_strings)
+    return left_equation, rhs, unsqueeze_axes
+
+
+def replace_ellipsis(
+    left_equation: str, rhs: str, *operands: Tensor
+) -> tuple[str, str, list[Tensor]]:
+    """
+    we replace ... as unused variables to simplify the EinsumOp implementation.
+    """
+    left_equation, rhs, unsqueeze_axes = plan_ellipsis(
+        left_equation, rhs, operands
+    )
+    new_operands = [
+        unsqueeze(operand, axis=axes) if axes else operand
+        for operand, axes in zip(operands, unsqueeze_axes)
+    ]
     return left_equation, rhs, new_operands
 
 
-def preprocess(
-    equation: str, *operands: Tensor
-) -> tuple[str, str, list[str], list[Tensor]]:
+def parse_equation(
+    equation: str, operands: Sequence[Tensor]
+) -> tuple[str, str, list[str]]:
     """
     check equation / raise error, default right labels generation
     """
@@ -806,7 +822,16 @@ def preprocess(
     assert not (
         '...' in lhs and '...' not in rhs
     ), 'Invalid equation: missing ellipsis in output labels.'
+    return lhs, rhs, labels
+
 
+def preprocess(
+    equation: str, *operands: Tensor
+) -> tuple[str, str, list[str], list[Tensor]]:
+    """
+    check equation / raise error, default right labels generation
+    """
+    lhs, rhs, labels = parse_equation(equation, operands)
     lhs, rhs, new_operands = replace_ellipsis(lhs, rhs, *operands)
     return lhs, rhs, labels, new_operands
 
@@ -884,35 +909,177 @@ def gen_equation_for_opteinsum(lhs: str, rhs: str | None) -> tuple[str, str]:
     return lhs + "->" + rhs, broadcast_label
 
 
+class EinsumExpression:
+    """
+    A compiled einsum contraction for operands of fixed shapes. The equation
+    is parsed and the contraction path is searched once when it is created,
+    calling it only runs the pairwise contractions. See
+    :func:`einsum_expression`.
+    """
+
+    def __init__(
+        self,
+        equation: str,
+        shapes: Sequence[Sequence[int]],
+        optimize: str = "auto",
+        memory_limit: int | str | None = None,
+    ) -> None:
+        self.equation = equation
+        self.shapes = [
+            [-1 if dim is None else dim for dim in shape] for shape in shapes
+        ]
+        operands = [Shaped(shape) for shape in self.shapes]
+        lhs, rhs, labels = parse_equation(equation, operands)
+        lhs, rhs, self._unsqueeze_axes = plan_ellipsis(lhs, rhs, operands)
+        if len(operands) <= 2:
+            # a single einsum op, no path to search
+            self.path = [tuple(range(len(operands)))]
+            self._contractions = None
+            self._equation = lhs + '->' + rhs
+            return
+
+        operands = [
+            Shaped(unsqueeze_shape(shape.shape, axes))
+            for shape, axes in zip(operands, self._unsqueeze_axes)
+        ]
+        shapes = parse_fake_shape(lhs, operands, labels)
+        opt_equation, broadcast_label = gen_equation_for_opteinsum(lhs, rhs)
+        self.path, cons = opt_einsum.contract_path(
+            opt_equation,
+            *shapes,
+            einsum_call=True,
+            optimize=optimize,
+            memory_limit=memory_limit,
+        )
+        self._contractions = []
+        for path in cons:
+            (a, b), _, eq, *__ = path
+            assert (
+                a > b
+            ), "Assume the first var_idx is smaller than the second_idx. opt_einsum can guarantee it."
+            self._contractions.append(
+                ((a, b), eq.replace(broadcast_label, "..."))
+            )
+
+    def __repr__(self) -> str:
+        return f"EinsumExpression('{self.equation}', shapes={self.shapes}, path={self.path})"
+
+    def contract(self, operands: Sequence[Tensor]) -> Tensor:
+        var_list = [
+            unsqueeze(operand, axis=axes) if axes else operand
+            for operand, axes in zip(operands, self._unsqueeze_axes)
+        ]
+        if self._contractions is None:
+            return gen_einsum_op(self._equation, *var_list)
+        for (a, b), eq in self._contractions:
+            var_s = [var_list.pop(a), var_list.pop(b)]
+            var_list.append(gen_einsum_op(eq, *var_s))
+        assert (
+            len(var_list) == 1
+        ), "There must be one elements in list, but received %d." % len(
+            var_list
+        )
+        return var_list[0]
+
+    def __call__(self, *operands: Tensor) -> Tensor:
+        if len(operands) != len(self.shapes):
+            raise ValueError(
+                f"The expression '{self.equation}' takes {len(self.shapes)} operands, but received {len(operands)}."
+            )
+        for i, (operand, shape) in enumerate(zip(operands, self.shapes)):
+            if len(operand.shape) != len(shape) or any(
+                dim >= 0 and size >= 0 and dim != size
+                for dim, size in zip(shape, operand.shape)
+            ):
+                raise ValueError(
+                    f"The shape of operand {i} of the expression '{self.equation}' should be {shape}, but received {list(operand.shape)}."
+                )
+        return self.contract(operands)
+
+
+def unsqueeze_shape(shape: Sequence[int], axes: Sequence[int]) -> list[int]:
+    shape = list(shape)
+    for axis in axes:
+        shape.insert(axis, 1)
+    return shape
+
+
+# The expressions of the latest equations and shapes einsum was called with,
+# so that repeated calls skip parsing the equation and the path search.
+EINSUM_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=EINSUM_CACHE_SIZE)
+def cached_einsum_expression(
+    equation: str, shapes: tuple[tuple[int, ...], ...]
+) -> EinsumExpression:
+    return EinsumExpression(equation, shapes)
+
+
 def einsum_v2(equation: str, *operands: Tensor) -> Tensor:
     """
     einsum v2 implementation.
     1. Implement C++ EinsumOp.
     2. V2 create the EinsumOp to calculate, so just a little verify work in python.
     3. V2 use opt_einsum.contract_path to optimize the multivariable einsum.
+    4. The plans are cached by the equation and the shapes of the operands.
     """
-    n_op = len(operands)
-    lhs, rhs, labels, new_operands = preprocess(equation, *operands)
-
-    if n_op <= 2:
-        return gen_einsum_op(lhs + '->' + rhs, *new_operands)
-
-    shapes = parse_fake_shape(lhs, new_operands, labels)
-    opt_equation, broadcast_label = gen_equation_for_opteinsum(lhs, rhs)
-    _, cons = opt_einsum.contract_path(opt_equation, *shapes, einsum_call=True)
-    var_list = new_operands
-    for path in cons:
-        (a, b), _, eq, *__ = path
-        assert (
-            a > b
-        ), "Assume the first var_idx is smaller than the second_idx. opt_einsum can guarantee it."
-        var_s = [var_list.pop(a), var_list.pop(b)]
-        eq = eq.replace(broadcast_label, "...")
-        var_list.append(gen_einsum_op(eq, *var_s))
-    assert (
-        len(var_list) == 1
-    ), "There must be one elements in list, but received %d." % len(var_list)
-    return var_list[0]
+    expression = cached_einsum_expression(
+        equation, tuple(tuple(operand.shape) for operand in operands)
+    )
+    return expression.contract(operands)
+
+
+def einsum_expression(
+    equation: str,
+    *shapes: Sequence[int],
+    optimize: str = "auto",
+    memory_limit: int | str | None = None,
+) -> EinsumExpression:
+    r"""
+
+    Compile an einsum contraction for operands of the given shapes, to be run
+    many times. The equation is parsed and the contraction path of three or
+    more operands is searched by opt_einsum only once, instead of on each call
+    of :func:`paddle.einsum`.
+
+    Args:
+        equation (`str`):
+            The summation terms using the Einstein summation notation, see
+            :func:`paddle.einsum`.
+        shapes (`list[int]`):
+            The shapes of the operands. A dimension of -1 or None matches any
+            size and is planned as 1.
+        optimize (`str`, optional):
+            The path search of opt_einsum, such as "auto", "greedy", "optimal",
+            "dp" or "branch-2". Default: "auto".
+        memory_limit (`int|str|None`, optional):
+            The max number of elements of an intermediate result in the path,
+            or "max_input" for the size of the largest operand. None for no
+            limit. Default: None.
+
+    Returns:
+        EinsumExpression, called with the operands like
+        ``expression(*operands)`` to compute the einsum. It raises ValueError
+        if the operands do not have the given shapes.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import paddle
+            >>> expr = paddle.einsum_expression(
+            ...     'ij,jk,kl->il', [8, 16], [16, 32], [32, 4]
+            ... )
+            >>> x = paddle.rand([8, 16])
+            >>> y = paddle.rand([16, 32])
+            >>> z = paddle.rand([32, 4])
+            >>> print(expr(x, y, z).shape)
+            [8, 4]
+
+    """
+    return EinsumExpression(
+        equation, shapes, optimize=optimize, memory_limit=memory_limit
+    )
 
 
 def gen_einsum_op(equation: str, *operands: Tensor) -> Tensor:
@@ -122,6 +122,49 @@ def _to_summary(var):
             return np.stack([_to_summary(x) for x in var])
 
 
+def _slice_summary(tensor):
+    """
+    The same as _to_summary(tensor.numpy()), but the edge items are sliced on
+    the device of tensor, and only they are copied to host.
+    """
+    edgeitems = DEFAULT_PRINT_OPTIONS.edgeitems
+    shape = list(tensor.shape)
+    axes = list(range(len(shape)))
+    # the [start, end) ranges kept of each dimension
+    ranges = [
+        (
+            [(0, edgeitems), (dim - edgeitems, dim)]
+            if dim > 2 * edgeitems
+            else [(0, dim)]
+        )
+        for dim in shape
+    ]
+
+    def slice_edges(starts, ends):
+        axis = len(starts)
+        if axis == len(shape):
+            return _to_numpy(paddle.slice(tensor, axes, starts, ends))
+        return np.concatenate(
+            [
+                slice_edges([*starts, start], [*ends, end])
+                for start, end in ranges[axis]
+            ],
+            axis=axis,
+        )
+
+    return slice_edges([], [])
+
+
+def _to_numpy(tensor):
+    if (
+        tensor.dtype == paddle.bfloat16
+        or tensor.dtype == core.VarDesc.VarType.BF16
+    ):
+        tensor = tensor.astype('float32')
+    # TODO(zhouwei): will remove 0-D Tensor.numpy() hack
+    return tensor.numpy(False)
+
+
 def _format_item(np_var, max_width=0, signed=False):
     if (
         np_var.dtype == np.float32
@@ -162,7 +205,9 @@ def _get_max_width(var):
     return max_width, signed
 
 
-def _format_tensor(var, summary, indent=0, max_width=0, signed=False):
+def _format_tensor(
+    var, summary, indent=0, max_width=0, signed=False, shape=None
+):
     """
     Format a tensor
 
@@ -172,9 +217,12 @@ def _format_tensor(var, summary, indent=0, max_width=0, signed=False):
         indent(int): The indent of each line.
         max_width(int): The max width of each elements in var.
         signed(bool): Print +/- or not.
+        shape(list|None): The shape of the tensor of which var is the summary, or None if var is the tensor itself.
     """
     edgeitems = DEFAULT_PRINT_OPTIONS.edgeitems
     linewidth = DEFAULT_PRINT_OPTIONS.linewidth
+    if shape is None:
+        shape = var.shape
 
     if len(var.shape) == 0:
         # 0-D Tensor, whose shape = [], should be formatted like this.
@@ -184,7 +232,7 @@ def _format_tensor(var, summary, indent=0, max_width=0, signed=False):
         items_per_line = (linewidth - indent) // item_length
         items_per_line = max(1, items_per_line)
 
-        if summary and var.shape[0] > 2 * edgeitems:
+        if summary and shape[0] > 2 * edgeitems:
             items = (
                 [
                     _format_item(item, max_width, signed)
@@ -210,21 +258,27 @@ def _format_tensor(var, summary, indent=0, max_width=0, signed=False):
         return '[' + s + ']'
     else:
         # recursively handle all dimensions
-        if summary and var.shape[0] > 2 * edgeitems:
+        if summary and shape[0] > 2 * edgeitems:
             vars = (
                 [
-                    _format_tensor(x, summary, indent + 1, max_width, signed)
+                    _format_tensor(
+                        x, summary, indent + 1, max_width, signed, shape[1:]
+                    )
                     for x in var[:edgeitems]
                 ]
                 + ['...']
                 + [
-                    _format_tensor(x, summary, indent + 1, max_width, signed)
+                    _format_tensor(
+                        x, summary, indent + 1, max_width, signed, shape[1:]
+                    )
                     for x in var[(-1 * edgeitems) :]
                 ]
             )
         else:
             vars = [
-                _format_tensor(x, summary, indent + 1, max_width, signed)
+                _format_tensor(
+                    x, summary, indent + 1, max_width, signed, shape[1:]
+                )
                 for x in var
             ]
 
@@ -250,26 +304,7 @@ def to_string(var, prefix='Tensor'):
     if not tensor._is_initialized():
         return "Tensor(Not initialized)"
 
-    if var.dtype == paddle.bfloat16:
-        var = var.astype('float32')
-    np_var = var.numpy(False)
-
-    if len(var.shape) == 0:
-        size = 0
-    else:
-        size = 1
-        for dim in var.shape:
-            size *= dim
-
-    summary = False
-    if size > DEFAULT_PRINT_OPTIONS.threshold:
-        summary = True
-
-    max_width, signed = _get_max_width(_to_summary(np_var))
-
-    data = _format_tensor(
-        np_var, summary, indent=indent, max_width=max_width, signed=signed
-    )
+    data = _format_dense_tensor(var, indent)
 
     return _template.format(
         prefix=prefix,
@@ -284,16 +319,12 @@ def to_string(var, prefix='Tensor'):
 
 def _format_dense_tensor(tensor, indent):
     if (
-        tensor.dtype == paddle.bfloat16
-        or tensor.dtype == core.VarDesc.VarType.BF16
-        or tensor.dtype == core.VarDesc.VarType.FP8_E4M3FN
+        tensor.dtype == core.VarDesc.VarType.FP8_E4M3FN
         or tensor.dtype == core.VarDesc.VarType.FP8_E5M2
     ):
+        # float8 can not be sliced, but only cast
         tensor = tensor.astype('float32')
 
-    # TODO(zhouwei): will remove 0-D Tensor.numpy() hack
-    np_tensor = tensor.numpy(False)
-
     if len(tensor.shape) == 0:
         size = 0
     else:
@@ -305,10 +336,21 @@ def _format_dense_tensor(tensor, indent):
     if size > DEFAULT_PRINT_OPTIONS.threshold:
         summary = True
 
-    max_width, signed = _get_max_width(_to_summary(np_tensor))
+    if summary:
+        # only the summary is copied to host, however large the tensor is
+        np_tensor = _slice_summary(tensor)
+        max_width, signed = _get_max_width(np_tensor)
+    else:
+        np_tensor = _to_numpy(tensor)
+        max_width, signed = _get_max_width(_to_summary(np_tensor))
 
     data = _format_tensor(
-        np_tensor, summary, indent=indent, max_width=max_width, signed=signed
+        np_tensor,
+        summary,
+        indent=indent,
+        max_width=max_width,
+        signed=signed,
+        shape=tensor.shape,
     )
     return data
 
@@ -0,0 +1,157 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+The on-disk cache of the token ids of the text datasets, so that they are
+tokenized once instead of every time a dataset is constructed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+import numpy as np
+
+import paddle
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+__all__ = []
+
+# bump it when the preprocessing of any dataset changes
+CACHE_VERSION = 1
+
+MAX_WORKERS = 8
+
+
+def cache_dir(module_name: str, data_file: str, *keys: Any) -> str:
+    """
+    The cache directory of data_file preprocessed with the keys, which
+    changes with the path, size and modification time of data_file.
+    """
+    stat = os.stat(data_file)
+    key = repr(
+        (
+            CACHE_VERSION,
+            os.path.abspath(data_file),
+            stat.st_size,
+            stat.st_mtime_ns,
+            *keys,
+        )
+    )
+    return os.path.join(
+        paddle.dataset.common.DATA_HOME,
+        module_name,
+        'cache',
+        hashlib.md5(key.encode()).hexdigest(),
+    )
+
+
+def build_cache(path: str, build: Callable[[str], None]) -> str:
+    """
+    Build the cache at path by build(tmp_dir) if it does not exist. It is
+    built in a temporary directory renamed to path at last, so that the
+    processes building the same cache at once do not see a partial one.
+    """
+    if os.path.isdir(path):
+        return path
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent)
+    try:
+        build(tmp_dir)
+        try:
+            os.rename(tmp_dir, path)
+        except OSError:
+            # built by another process meanwhile
+            if not os.path.isdir(path):
+                raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return path
+
+
+def map_chunks(func: Callable, items: list, chunk_size: int) -> list:
+    """
+    Map func over the chunks of items with a pool of processes, return the
+    results in order.
+    """
+    chunks = [
+        items[i : i + chunk_size] for i in range(0, len(items), chunk_size)
+    ]
+    num_workers = min(len(chunks), os.cpu_count() or 1, MAX_WORKERS)
+    if num_workers <= 1:
+        return [func(chunk) for chunk in chunks]
+    with ProcessPoolExecutor(num_workers) as pool:
+        return list(pool.map(func, chunks))
+
+
+class Sequences:
+    """
+    Sequences of ids stored as a flat array of the ids of all of them and
+    the offsets where each of them starts, both memory mapped when loaded.
+    """
+
+    def __init__(
+        self, values: npt.NDArray[np.int64], offsets: npt.NDArray[np.int64]
+    ) -> None:
+        self.values = values
+        self.offsets = offsets
+
+    @classmethod
+    def from_chunks(
+        cls, chunks: Iterable[tuple[npt.NDArray, npt.NDArray]]
+    ) -> Sequences:
+        """
+        Concatenate chunks of (values, lengths of the sequences).
+        """
+        values = [np.zeros([0], np.int64)]
+        lengths = [np.zeros([0], np.int64)]
+        for chunk_values, chunk_lengths in chunks:
+            values.append(chunk_values)
+            lengths.append(chunk_lengths)
+        lengths = np.concatenate(lengths)
+        offsets = np.zeros(len(lengths) + 1, np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(np.concatenate(values).astype(np.int64), offsets)
+
+    def save(self, path: str, name: str) -> None:
+        np.save(os.path.join(path, f'{name}_values.npy'), self.values)
+        np.save(os.path.join(path, f'{name}_offsets.npy'), self.offsets)
+
+    @classmethod
+    def load(cls, path: str, name: str) -> Sequences:
+        return cls(
+            np.load(os.path.join(path, f'{name}_values.npy'), mmap_mode='r'),
+            np.load(os.path.join(path, f'{name}_offsets.npy'), mmap_mode='r'),
+        )
+
+    def __getitem__(self, idx: int) -> npt.NDArray[np.int64]:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(f"index {idx} is out of range")
+        return self.values[self.offsets[idx] : self.offsets[idx + 1]]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
@@ -14,6 +14,9 @@
 from __future__ import annotations
 
 import collections
+import functools
+import itertools
+import os
 import re
 import string
 import tarfile
@@ -24,8 +27,10 @@ import numpy as np
 from paddle.dataset.common import _check_exists_and_download
 from paddle.io import Dataset
 
+from . import _cache
+
 if TYPE_CHECKING:
-    from re import Pattern
+    from collections.abc import Sequence
 
     import numpy.typing as npt
 
@@ -35,11 +40,44 @@ __all__ = []
 URL = 'https://dataset.bj.bcebos.com/imdb%2FaclImdb_v1.tar.gz'
 MD5 = '7c2ac02c03563afcf9b574c7e56c153a'
 
+# documents tokenized by a worker at once when building the cache
+_CHUNK_SIZE = 1000
+
+_PUNCTUATION = string.punctuation.encode('latin-1')
+
+
+def _tokenize(doc: bytes) -> list[bytes]:
+    # newline and punctuations removal and ad-hoc tokenization.
+    return doc.rstrip(b'\n\r').translate(None, _PUNCTUATION).lower().split()
+
+
+def _count_words(docs: list[bytes]) -> collections.Counter[bytes]:
+    word_freq = collections.Counter()
+    for doc in docs:
+        word_freq.update(_tokenize(doc))
+    return word_freq
+
+
+def _doc_ids(
+    word_idx: dict[bytes, int], unk: int, docs: list[bytes]
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    docs = [_tokenize(doc) for doc in docs]
+    words = list(itertools.chain.from_iterable(docs))
+    ids = np.fromiter(
+        map(word_idx.get, words, itertools.repeat(unk)), np.int64, len(words)
+    )
+    return ids, np.array([len(doc) for doc in docs], np.int64)
+
 
 class Imdb(Dataset):
     """
     Implementation of `IMDB <https://www.imdb.com/interfaces/>`_ dataset.
 
+    The word dictionary and the token ids of the documents are built once by
+    a pool of processes, and cached under ``paddle.dataset.common.DATA_HOME``
+    for the same data file and cutoff, so that constructing the dataset again
+    only maps the cached arrays.
+
     Args:
         data_file(str|None): path to data tar file, can be set None if
             :attr:`download` is True. Default None.
@@ -92,9 +130,9 @@ class Imdb(Dataset):
 
     data_file: str | None
     mode: _ImdbDataSetMode
-    word_idx: dict[str, int]
-    docs: list
-    labels: list
+    word_idx: dict[bytes | str, int]
+    docs: Sequence[npt.NDArray[np.int64]]
+    labels: npt.NDArray[np.int64]
 
     def __init__(
         self,
@@ -118,61 +156,68 @@ class Imdb(Dataset):
                 data_file, URL, MD5, 'imdb', download
             )
 
-        # Build a word dictionary from the corpus
-        self.word_idx = self._build_work_dict(cutoff)
-
-        # read dataset into memory
-        self._load_anno()
-
-    def _build_work_dict(self, cutoff: int) -> dict[str, int]:
-        word_freq = collections.defaultdict(int)
-        pattern = re.compile(r"aclImdb/((train)|(test))/((pos)|(neg))/.*\.txt$")
-        for doc in self._tokenize(pattern):
-            for word in doc:
-                word_freq[word] += 1
-
-        # Not sure if we should prune less-frequent words here.
-        word_freq = [x for x in word_freq.items() if x[1] > cutoff]
-
-        dictionary = sorted(word_freq, key=lambda x: (-x[1], x[0]))
-        words, _ = list(zip(*dictionary))
-        word_idx = dict(list(zip(words, range(len(words)))))
-        word_idx['<unk>'] = len(words)
-        return word_idx
-
-    def _tokenize(self, pattern: Pattern[str]) -> list[list[str]]:
-        data = []
+        # Build the word dictionary and the token ids of the corpus once,
+        # and load them from the cache later
+        path = _cache.cache_dir('imdb', self.data_file, cutoff)
+        _cache.build_cache(path, functools.partial(self._build_cache, cutoff))
+        self._load_cache(path)
+
+    def _read_docs(self) -> dict[tuple[str, str], list[bytes]]:
+        pattern = re.compile(r"aclImdb/(train|test)/(pos|neg)/.*\.txt$")
+        docs = {
+            (mode, label): []
+            for mode in ['train', 'test']
+            for label in ['pos', 'neg']
+        }
         with tarfile.open(self.data_file) as tarf:
             tf = tarf.next()
             while tf is not None:
-                if bool(pattern.match(tf.name)):
-                    # newline and punctuations removal and ad-hoc tokenization.
-                    data.append(
-                        tarf.extractfile(tf)
-                        .read()
-                        .rstrip(b'\n\r')
-                        .translate(None, string.punctuation.encode('latin-1'))
-                        .lower()
-                        .split()
-                    )
+                match = pattern.match(tf.name)
+                if match:
+                    docs[match.groups()].append(tarf.extractfile(tf).read())
                 tf = tarf.next()
+        return docs
 
-        return data
-
-    def _load_anno(self) -> None:
-        pos_pattern = re.compile(fr"aclImdb/{self.mode}/pos/.*\.txt$")
-        neg_pattern = re.compile(fr"aclImdb/{self.mode}/neg/.*\.txt$")
+    def _build_cache(self, cutoff: int, path: str) -> None:
+        docs = self._read_docs()
+        all_docs = [doc for group in docs.values() for doc in group]
 
-        UNK = self.word_idx['<unk>']
-
-        self.docs = []
-        self.labels = []
-        for doc in self._tokenize(pos_pattern):
-            self.docs.append([self.word_idx.get(w, UNK) for w in doc])
-            self.labels.append(0)
-        for doc in self._tokenize(neg_pattern):
-            self.docs.append([self.word_idx.get(w, UNK) for w in doc])
-            self.labels.append(1)
+        # Build a word dictionary from the corpus
+        word_freq = collections.Counter()
+        for chunk_freq in _cache.map_chunks(
+            _count_words, all_docs, _CHUNK_SIZE
+        ):
+            word_freq.update(chunk_freq)
+        # Not sure if we should prune less-frequent words here.
+        word_freq = [x for x in word_freq.items() if x[1] > cutoff]
+        dictionary = sorted(word_freq, key=lambda x: (-x[1], x[0]))
+        words = [word for word, _ in dictionary]
+        with open(os.path.join(path, 'vocab.txt'), 'wb') as f:
+            f.write(b'\n'.join(words))
+
+        word_idx = dict(zip(words, range(len(words))))
+        to_ids = functools.partial(_doc_ids, word_idx, len(words))
+        for mode in ['train', 'test']:
+            mode_docs = docs[(mode, 'pos')] + docs[(mode, 'neg')]
+            _cache.Sequences.from_chunks(
+                _cache.map_chunks(to_ids, mode_docs, _CHUNK_SIZE)
+            ).save(path, mode)
+            labels = np.repeat(
+                np.array([0, 1], np.int64),
+                [len(docs[(mode, 'pos')]), len(docs[(mode, 'neg')])],
+            )
+            np.save(os.path.join(path, f'{mode}_labels.npy'), labels)
+
+    def _load_cache(self, path: str) -> None:
+        with open(os.path.join(path, 'vocab.txt'), 'rb') as f:
+            words = f.read().split()
+        self.word_idx = dict(zip(words, range(len(words))))
+        self.word_idx['<unk>'] = len(words)
+
+        self.docs = _cache.Sequences.load(path, self.mode)
+        self.labels = np.load(
+            os.path.join(path, f'{self.mode}_labels.npy'), mmap_mode='r'
+        )
 
     def __getitem__(
         self, idx: int
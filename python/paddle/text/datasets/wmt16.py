@@ -14,6 +14,9 @@
 
 from __future__ import annotations
 
+import functools
+import itertools
+import json
 import os
 import tarfile
 from collections import defaultdict
@@ -25,7 +28,11 @@ import paddle
 from paddle.dataset.common import _check_exists_and_download
 from paddle.io import Dataset
 
+from . import _cache
+
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     import numpy.typing as npt
 
     _Wmt16DataSetMode = Literal["train", "test", "val"]
@@ -42,6 +49,57 @@ START_MARK = "<s>"
 END_MARK = "<e>"
 UNK_MARK = "<unk>"
 
+# lines tokenized by a worker at once when building the cache
+_CHUNK_SIZE = 5000
+
+
+def _sentence_ids(
+    src_dict: dict[str, int],
+    trg_dict: dict[str, int],
+    src_col: int,
+    lines: list[bytes],
+) -> tuple[tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]], ...]:
+    """
+    The ids of the source, target and next target sentences in lines, each
+    as the flat ids and the length of each sentence.
+    """
+    # the index for start mark, end mark, and unk are the same in source
+    # language and target language. Here uses the source language
+    # dictionary to determine their indices.
+    start_id = src_dict[START_MARK]
+    end_id = src_dict[END_MARK]
+    unk_id = src_dict[UNK_MARK]
+
+    src_ids = []
+    src_lengths = []
+    trg_ids = []
+    trg_ids_next = []
+    trg_lengths = []
+    for line in lines:
+        line_split = line.decode().strip().split("\t")
+        if len(line_split) != 2:
+            continue
+        src_words = line_split[src_col].split()
+        src_ids.append(start_id)
+        src_ids.extend(map(src_dict.get, src_words, itertools.repeat(unk_id)))
+        src_ids.append(end_id)
+        src_lengths.append(len(src_words) + 2)
+
+        trg_words = line_split[1 - src_col].split()
+        ids = list(map(trg_dict.get, trg_words, itertools.repeat(unk_id)))
+        trg_ids.append(start_id)
+        trg_ids.extend(ids)
+        trg_ids_next.extend(ids)
+        trg_ids_next.append(end_id)
+        trg_lengths.append(len(trg_words) + 1)
+
+    trg_lengths = np.array(trg_lengths, np.int64)
+    return (
+        (np.array(src_ids, np.int64), np.array(src_lengths, np.int64)),
+        (np.array(trg_ids, np.int64), trg_lengths),
+        (np.array(trg_ids_next, np.int64), trg_lengths),
+    )
+
 
 class WMT16(Dataset):
     """
@@ -49,6 +107,11 @@ class WMT16(Dataset):
     ACL2016 Multimodal Machine Translation. Please see this website for more
     details: http://www.statmt.org/wmt16/multimodal-task.html#task1
 
+    The token ids of all the modes are built once by a pool of processes, and
+    cached under ``paddle.dataset.common.DATA_HOME`` for the same data file,
+    language and dictionary sizes, so that constructing the dataset again
+    only maps the cached arrays.
+
     If you use the dataset created for your task, please cite the following paper:
     Multi30K: Multilingual English-German Image Descriptions.
 
@@ -123,9 +186,9 @@ class WMT16(Dataset):
     trg_dict_size: int
     src_dict: dict[str, int]
     trg_dict: dict[str, int]
-    src_ids: list[list[int]]
-    trg_ids: list[list[int]]
-    trg_ids_next: list[list[int]]
+    src_ids: Sequence[npt.NDArray[np.int64]]
+    trg_ids: Sequence[npt.NDArray[np.int64]]
+    trg_ids_next: Sequence[npt.NDArray[np.int64]]
 
     def __init__(
         self,
@@ -162,14 +225,16 @@ class WMT16(Dataset):
             trg_dict_size, (TOTAL_DE_WORDS if lang == "en" else TOTAL_EN_WORDS)
         )
 
-        # load source and target word dict
-        self.src_dict = self._load_dict(lang, src_dict_size)
-        self.trg_dict = self._load_dict(
-            "de" if lang == "en" else "en", trg_dict_size
+        # Load the word dicts and the token ids of all the modes once, and
+        # load them from the cache later
+        path = _cache.cache_dir(
+            'wmt16', self.data_file, lang, src_dict_size, trg_dict_size
         )
-
-        # load data
-        self.data = self._load_data()
+        _cache.build_cache(
+            path,
+            functools.partial(self._build_cache, src_dict_size, trg_dict_size),
+        )
+        self._load_cache(path)
 
     @overload
     def _load_dict(
@@ -237,42 +302,38 @@ class WMT16(Dataset):
                 fout.write(word[0].encode())
                 fout.write(b'\n')
 
-    def _load_data(self) -> None:
-        # the index for start mark, end mark, and unk are the same in source
-        # language and target language. Here uses the source language
-        # dictionary to determine their indices.
-        start_id = self.src_dict[START_MARK]
-        end_id = self.src_dict[END_MARK]
-        unk_id = self.src_dict[UNK_MARK]
+    def _build_cache(
+        self, src_dict_size: int, trg_dict_size: int, path: str
+    ) -> None:
+        # load source and target word dict
+        src_dict = self._load_dict(self.lang, src_dict_size)
+        trg_dict = self._load_dict(
+            "de" if self.lang == "en" else "en", trg_dict_size
+        )
+        for name, word_dict in [("src", src_dict), ("trg", trg_dict)]:
+            with open(os.path.join(path, f"{name}_dict.json"), "w") as fout:
+                json.dump(word_dict, fout)
 
         src_col = 0 if self.lang == "en" else 1
-        trg_col = 1 - src_col
-
-        self.src_ids = []
-        self.trg_ids = []
-        self.trg_ids_next = []
+        to_ids = functools.partial(_sentence_ids, src_dict, trg_dict, src_col)
         with tarfile.open(self.data_file, mode="r") as f:
-            for line in f.extractfile(f"wmt16/{self.mode}"):
-                line = line.decode()
-                line_split = line.strip().split("\t")
-                if len(line_split) != 2:
-                    continue
-                src_words = line_split[src_col].split()
-                src_ids = (
-                    [start_id]
-                    + [self.src_dict.get(w, unk_id) for w in src_words]
-                    + [end_id]
-                )
-
-                trg_words = line_split[trg_col].split()
-                trg_ids = [self.trg_dict.get(w, unk_id) for w in trg_words]
-
-                trg_ids_next = trg_ids + [end_id]
-                trg_ids = [start_id] + trg_ids
-
-                self.src_ids.append(src_ids)
-                self.trg_ids.append(trg_ids)
-                self.trg_ids_next.append(trg_ids_next)
+            for mode in ["train", "test", "val"]:
+                lines = f.extractfile(f"wmt16/{mode}").readlines()
+                chunks = _cache.map_chunks(to_ids, lines, _CHUNK_SIZE)
+                for i, name in enumerate(["src", "trg", "trg_next"]):
+                    _cache.Sequences.from_chunks(
+                        chunk[i] for chunk in chunks
+                    ).save(path, f"{mode}_{name}")
+
+    def _load_cache(self, path: str) -> None:
+        with open(os.path.join(path, "src_dict.json")) as fdict:
+            self.src_dict = json.load(fdict)
+        with open(os.path.join(path, "trg_dict.json")) as fdict:
+            self.trg_dict = json.load(fdict)
+
+        self.src_ids = _cache.Sequences.load(path, f"{self.mode}_src")
+        self.trg_ids = _cache.Sequences.load(path, f"{self.mode}_trg")
+        self.trg_ids_next = _cache.Sequences.load(path, f"{self.mode}_trg_next")
 
     def __getitem__(
         self, idx: int
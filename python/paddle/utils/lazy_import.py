@@ -16,9 +16,10 @@
 from __future__ import annotations
 
 import importlib
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
     from types import ModuleType
 
 
@@ -46,3 +47,31 @@ def try_import(module_name: str, err_msg: str | None = None) -> ModuleType:
                 f"manually installed (usually with `pip install {install_name}`). "
             )
         raise ImportError(err_msg)
+
+
+def lazy_submodules(
+    package_name: str, package_globals: dict[str, Any], submodules: list[str]
+) -> tuple[Callable[[str], ModuleType], Callable[[], list[str]]]:
+    """
+    Defer importing ``submodules`` of ``package_name`` until first access.
+
+    Returns a ``(__getattr__, __dir__)`` pair to be bound at module level of
+    the package (PEP 562). ``import pkg.sub`` and ``from pkg import sub``
+    keep working unchanged, and the imported module is cached into
+    ``package_globals`` so that ``__getattr__`` is hit only once per name.
+    """
+    lazy_names = frozenset(submodules)
+
+    def __getattr__(name: str) -> ModuleType:
+        if name in lazy_names:
+            module = importlib.import_module(f"{package_name}.{name}")
+            package_globals[name] = module
+            return module
+        raise AttributeError(
+            f"module '{package_name}' has no attribute '{name}'"
+        )
+
+    def __dir__() -> list[str]:
+        return sorted(lazy_names.union(package_globals))
+
+    return __getattr__, __dir__
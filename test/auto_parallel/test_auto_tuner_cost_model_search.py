@@ -0,0 +1,137 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import csv
+import itertools
+import os
+import tempfile
+import unittest
+
+from paddle.distributed.auto_tuner.cost_model import (
+    GaussianProcessSurrogate,
+    analytic_mem_proxy,
+)
+from paddle.distributed.auto_tuner.search import (
+    GridSearch,
+    replay_search,
+)
+
+METRIC = "step/s"
+
+
+def _synthetic_history(path):
+    """Throughput peaks at mp=2, pp=2, mbs=4 and large mbs runs OOM."""
+    keys = [
+        "job_id",
+        "dp_degree",
+        "mp_degree",
+        "pp_degree",
+        "sharding_degree",
+        "sharding_stage",
+        "micro_batch_size",
+        "use_recompute",
+        METRIC,
+        "max_mem_usage",
+    ]
+    rows = []
+    for job_id, (mp, pp, mbs, recompute) in enumerate(
+        itertools.product([1, 2, 4], [1, 2, 4], [1, 2, 4, 8], [False, True])
+    ):
+        dp = 16 // (mp * pp)
+        cfg = {
+            "mp_degree": mp,
+            "pp_degree": pp,
+            "sharding_degree": 1,
+            "sharding_stage": 1,
+            "micro_batch_size": mbs,
+            "use_recompute": recompute,
+        }
+        mem = 5000 * analytic_mem_proxy(cfg)
+        if mem > 60000:
+            metric, mem = None, "OOM"
+        else:
+            metric = (
+                10.0
+                - abs(mp - 2)
+                - abs(pp - 2)
+                - 0.5 * abs(mbs - 4)
+                - (1.5 if recompute else 0.0)
+            )
+        rows.append([job_id + 1, dp, mp, pp, 1, 1, mbs, recompute, metric, mem])
+    with open(path, "w") as f:
+        writer = csv.writer(f)
+        writer.writerow(keys)
+        writer.writerows(rows)
+    return rows
+
+
+class TestGaussianProcessSurrogate(unittest.TestCase):
+    def test_interpolation(self):
+        x = [[0.0], [1.0], [2.0], [3.0]]
+        y = [0.0, 1.0, 4.0, 9.0]
+        surrogate = GaussianProcessSurrogate(noise=1e-6).fit(x, y)
+        mean, std = surrogate.predict(x)
+        for pred, target in zip(mean, y):
+            self.assertAlmostEqual(pred, target, places=2)
+        self.assertTrue(all(s < 1e-1 for s in std))
+        _, far_std = surrogate.predict([[10.0]])
+        self.assertGreater(far_std[0], std.max())
+
+
+class TestCostModelSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp_dir.name, "history.csv")
+        self.rows = _synthetic_history(self.csv_path)
+        self.tuner_cfg = {
+            "search_algo": {"name": "cost_model", "num_initial": 3},
+            "metric_cfg": {"name": METRIC, "OptimizationDirection": "Maximize"},
+            "model_cfg": {},
+            "candidates": {},
+            "max_mem_usage": 60000,
+        }
+        self.best = max(row[8] for row in self.rows if row[8] is not None)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _trials_to_best(self, trials):
+        for idx, trial in enumerate(trials):
+            if trial[METRIC] == self.best:
+                return idx + 1
+        return len(self.rows) + 1
+
+    def test_fewer_trials_than_grid(self):
+        cost_model_trials = replay_search(self.tuner_cfg, self.csv_path)
+        grid_trials = replay_search(
+            self.tuner_cfg, self.csv_path, algo_cls=GridSearch
+        )
+        self.assertLess(
+            self._trials_to_best(cost_model_trials),
+            self._trials_to_best(grid_trials),
+        )
+        self.assertLessEqual(
+            self._trials_to_best(cost_model_trials), len(self.rows) // 3
+        )
+
+    def test_avoid_predicted_oom(self):
+        trials = replay_search(self.tuner_cfg, self.csv_path)
+        # predicted OOM configs are only tried after the feasible ones
+        first = trials[: len(self.rows) // 4]
+        ooms = [trial for trial in first if trial["max_mem_usage"] == "OOM"]
+        self.assertLessEqual(len(ooms), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Throughput and latency of paddle.inference.BatchingServer on CPU under a
+# local load generator, with clients sending requests of a single row and
+# random sequence length, compared with serving every request alone.
+#
+#   python benchmark_batching_server.py --clients 32 --buckets 16 32 64
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+import paddle
+from paddle.inference import BatchingServer, Config, create_predictor
+
+
+class Encoder(paddle.nn.Layer):
+    def __init__(self, hidden_size):
+        super().__init__()
+        self.fc1 = paddle.nn.Linear(hidden_size, 4 * hidden_size)
+        self.fc2 = paddle.nn.Linear(4 * hidden_size, hidden_size)
+
+    def forward(self, x):
+        return paddle.mean(self.fc2(paddle.nn.functional.gelu(self.fc1(x))), 1)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-delay-ms", type=float, default=5.0)
+    parser.add_argument("--buckets", type=int, nargs="*", default=[16, 32, 64])
+    parser.add_argument("--max-len", type=int, default=64)
+    parser.add_argument("--hidden-size", type=int, default=256)
+    parser.add_argument("--threads", type=int, default=1)
+    return parser.parse_args()
+
+
+def create_cpu_predictor(path, threads):
+    config = Config(path + ".json", path + ".pdiparams")
+    config.disable_gpu()
+    config.set_cpu_math_library_num_threads(threads)
+    config.enable_new_executor()
+    config.enable_new_ir()
+    return create_predictor(config)
+
+
+def load(server, args):
+    def client(seed):
+        rng = np.random.default_rng(seed)
+        for _ in range(args.requests):
+            length = int(rng.integers(1, args.max_len + 1))
+            x = rng.random((1, length, args.hidden_size), dtype=np.float32)
+            server.predict([x])
+
+    threads = [
+        threading.Thread(target=client, args=(i,)) for i in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "inference")
+        model = paddle.jit.to_static(
+            Encoder(args.hidden_size),
+            input_spec=[
+                paddle.static.InputSpec(
+                    shape=[None, None, args.hidden_size], dtype="float32"
+                )
+            ],
+            full_graph=True,
+        )
+        paddle.jit.save(model, path)
+
+        num_requests = args.clients * args.requests
+        print(
+            f"clients={args.clients} requests={num_requests} "
+            f"workers={args.workers} max_batch_size={args.max_batch_size} "
+            f"max_delay_ms={args.max_delay_ms} buckets={args.buckets}"
+        )
+        for name, kwargs in [
+            ("unbatched", {"max_batch_size": 1, "max_delay_ms": 0}),
+            (
+                "batched",
+                {
+                    "max_batch_size": args.max_batch_size,
+                    "max_delay_ms": args.max_delay_ms,
+                    "buckets": args.buckets,
+                },
+            ),
+        ]:
+            with BatchingServer(
+                create_cpu_predictor(path, args.threads),
+                num_workers=args.workers,
+                **kwargs,
+            ) as server:
+                elapsed = load(server, args)
+                stats = server.stats()
+            latency = stats["latency_ms"]
+            print(
+                f"{name:9s}: {num_requests / elapsed:8.1f} req/s, "
+                f"avg batch {stats['avg_batch_size']:5.1f}, "
+                f"latency p50 {latency['p50']:7.2f} ms "
+                f"p99 {latency['p99']:7.2f} ms, "
+                f"queue p50 {stats['queue_ms']['p50']:7.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
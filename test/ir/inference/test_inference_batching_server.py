@@ -0,0 +1,159 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.inference import BatchingServer, Config, create_predictor
+
+
+class TestNet(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.fc = paddle.nn.Linear(4, 4)
+
+    def forward(self, x):
+        # padding with zeros along the sequence leaves the sum unchanged
+        return self.fc(paddle.sum(x, axis=1))
+
+
+def save_model(path):
+    model = paddle.jit.to_static(
+        TestNet(),
+        input_spec=[
+            paddle.static.InputSpec(shape=[None, None, 4], dtype='float32')
+        ],
+        full_graph=True,
+    )
+    paddle.jit.save(model, path)
+
+
+def create_cpu_predictor(path):
+    config = Config(path + '.json', path + '.pdiparams')
+    config.disable_gpu()
+    config.enable_new_executor()
+    config.enable_new_ir()
+    return create_predictor(config)
+
+
+def run_alone(predictor, x):
+    handle = predictor.get_input_handle(predictor.get_input_names()[0])
+    handle.reshape(x.shape)
+    handle.copy_from_cpu(x)
+    predictor.run()
+    return predictor.get_output_handle(
+        predictor.get_output_names()[0]
+    ).copy_to_cpu()
+
+
+class TestBatchingServer(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        paddle.seed(2024)
+        np.random.seed(2024)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'batching/inference')
+        save_model(self.path)
+        self.reference = create_cpu_predictor(self.path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_clients(self, server, lengths, num_clients=4):
+        results = {}
+
+        def client(i):
+            for j, length in enumerate(lengths):
+                x = np.random.rand(1, length, 4).astype('float32')
+                results[(i, j)] = (x, server.submit([x]))
+
+        threads = [
+            threading.Thread(target=client, args=(i,))
+            for i in range(num_clients)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for x, future in results.values():
+            np.testing.assert_allclose(
+                future.result()[0],
+                run_alone(self.reference, x),
+                rtol=1e-5,
+                atol=1e-6,
+            )
+        return len(results)
+
+    def test_batching(self):
+        with BatchingServer(
+            create_cpu_predictor(self.path),
+            num_workers=2,
+            max_batch_size=8,
+            max_delay_ms=20,
+        ) as server:
+            num_requests = self.run_clients(server, [3] * 16)
+            stats = server.stats()
+        self.assertEqual(stats["requests"], num_requests)
+        self.assertEqual(stats["errors"], 0)
+        self.assertEqual(stats["queue_size"], 0)
+        self.assertLess(stats["batches"], num_requests)
+        self.assertLessEqual(stats["avg_batch_size"], 8)
+        self.assertGreaterEqual(
+            stats["latency_ms"]["p99"], stats["queue_ms"]["p50"]
+        )
+
+    def test_buckets(self):
+        with BatchingServer(
+            create_cpu_predictor(self.path),
+            max_batch_size=8,
+            max_delay_ms=20,
+            buckets=[4, 8],
+        ) as server:
+            num_requests = self.run_clients(server, [1, 3, 4, 6, 8, 10])
+            stats = server.stats()
+        self.assertEqual(stats["requests"], num_requests)
+        # lengths longer than all the buckets are batched as they are
+        self.assertGreaterEqual(stats["batches"], 3)
+
+    def test_multiple_rows(self):
+        with BatchingServer(
+            create_cpu_predictor(self.path), max_batch_size=8
+        ) as server:
+            x = np.random.rand(5, 2, 4).astype('float32')
+            (y,) = server.predict({server._input_names[0]: x})
+        np.testing.assert_allclose(
+            y, run_alone(self.reference, x), rtol=1e-5, atol=1e-6
+        )
+
+    def test_invalid_request(self):
+        server = BatchingServer(
+            create_cpu_predictor(self.path), max_batch_size=2
+        )
+        x = np.random.rand(3, 2, 4).astype('float32')
+        with self.assertRaises(ValueError):
+            server.submit([x])
+        with self.assertRaises(ValueError):
+            server.submit([x[:1], x[:1]])
+        server.close()
+        with self.assertRaises(RuntimeError):
+            server.submit([x[:1]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.base.executor import _ExecutorCache, _LRUCache
+
+paddle.enable_static()
+
+
+def build_program(scale):
+    main_program = paddle.static.Program()
+    with paddle.static.program_guard(main_program):
+        x = paddle.static.data('x', [4, 4], dtype='float32')
+        out = paddle.sum(x * scale)
+    return main_program, out
+
+
+class TestProgramFingerprint(unittest.TestCase):
+    def test_stable_and_structural(self):
+        main_program, out = build_program(2.0)
+        fingerprint = main_program.fingerprint()
+        self.assertEqual(fingerprint, main_program.fingerprint())
+
+        with paddle.static.program_guard(main_program):
+            paddle.mean(out)
+        self.assertNotEqual(fingerprint, main_program.fingerprint())
+
+    def test_distinct_programs(self):
+        program_a, _ = build_program(2.0)
+        program_b, _ = build_program(3.0)
+        self.assertNotEqual(program_a.fingerprint(), program_b.fingerprint())
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_hit_miss_and_resize(self):
+        calls = []
+
+        def func(key):
+            calls.append(key)
+            return key * 10
+
+        cache = _LRUCache(func, maxsize=2)
+        self.assertEqual(cache(1), 10)
+        self.assertEqual(cache(1), 10)
+        cache(2)
+        cache(3)  # evicts 1
+        cache(1)
+        self.assertEqual(calls, [1, 2, 3, 1])
+        info = cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 4, 2))
+
+        cache.maxsize = 1
+        self.assertEqual(cache.cache_info().currsize, 1)
+        cache.cache_clear()
+        self.assertEqual(tuple(cache.cache_info()), (0, 0, 1, 0))
+
+
+class TestExecutorCache(unittest.TestCase):
+    def setUp(self):
+        self.x = np.ones([4, 4], dtype='float32')
+        self.programs = [build_program(scale) for scale in (1.0, 2.0, 3.0)]
+
+    def run_round_robin(self, exe, rounds):
+        for _ in range(rounds):
+            for scale, (program, out) in zip((1.0, 2.0, 3.0), self.programs):
+                (res,) = exe.run(program, feed={'x': self.x}, fetch_list=[out])
+                np.testing.assert_allclose(res, 16 * scale)
+
+    def test_hit_counters(self):
+        exe = paddle.static.Executor(paddle.CPUPlace())
+        self.run_round_robin(exe, rounds=3)
+        info = exe._executor_cache.cache_info(pir_mode=True)
+        self.assertEqual(info.misses, 3)
+        self.assertEqual(info.hits, 6)
+
+    def test_small_capacity_thrashes(self):
+        exe = paddle.static.Executor(paddle.CPUPlace())
+        exe._executor_cache.capacity = 2
+        self.run_round_robin(exe, rounds=3)
+        info = exe._executor_cache.cache_info(pir_mode=True)
+        self.assertEqual(info.hits, 0)
+        self.assertEqual(info.currsize, 2)
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            _ExecutorCache().capacity = 0
+
+    def test_capacity_flag(self):
+        self.assertEqual(
+            paddle.get_flags('FLAGS_executor_cache_capacity')[
+                'FLAGS_executor_cache_capacity'
+            ],
+            8,
+        )
+        paddle.set_flags({'FLAGS_executor_cache_capacity': 3})
+        try:
+            self.assertEqual(_ExecutorCache().capacity, 3)
+        finally:
+            paddle.set_flags({'FLAGS_executor_cache_capacity': 8})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Throughput of MultiSlotDataGenerator writing CTR-like samples, sparse id
+# slots and a dense float slot, in the text and the binary output formats,
+# for feasigns given as lists and as numpy arrays.
+#
+#   python benchmark_data_generator.py --samples 100000 --slots 26
+
+import argparse
+import io
+import sys
+import time
+
+import numpy as np
+
+from paddle.distributed import fleet
+
+
+class CTRDataGenerator(fleet.MultiSlotDataGenerator):
+    def __init__(self, samples, use_numpy):
+        super().__init__()
+        self.samples = samples
+        self.use_numpy = use_numpy
+
+    def generate_sample(self, line):
+        def data_iter():
+            for ids, dense, label in self.samples:
+                if self.use_numpy:
+                    yield [
+                        *(
+                            (f"slot{i}", slot_ids)
+                            for i, slot_ids in enumerate(ids)
+                        ),
+                        ("dense", dense),
+                        ("label", label),
+                    ]
+                else:
+                    yield [
+                        *(
+                            (f"slot{i}", slot_ids.tolist())
+                            for i, slot_ids in enumerate(ids)
+                        ),
+                        ("dense", dense.tolist()),
+                        ("label", label.tolist()),
+                    ]
+
+        return data_iter
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=100000)
+    parser.add_argument("--slots", type=int, default=26)
+    parser.add_argument("--batch_size", type=int, default=256)
+    return parser.parse_args()
+
+
+def run(generator, output_format, batch_size):
+    generator.set_batch(batch_size)
+    generator.set_output_format(output_format)
+    stdout = sys.stdout
+    sys.stdout = io.TextIOWrapper(io.BytesIO())
+    try:
+        start = time.perf_counter()
+        generator.run_from_memory()
+        elapsed = time.perf_counter() - start
+        size = len(sys.stdout.buffer.getvalue())
+    finally:
+        sys.stdout = stdout
+    return elapsed, size
+
+
+def main():
+    args = parse_args()
+    rng = np.random.default_rng(2024)
+    samples = [
+        (
+            [
+                rng.integers(1, 2**63, size=rng.integers(1, 5))
+                for _ in range(args.slots)
+            ],
+            rng.random(13, dtype="float32"),
+            rng.integers(0, 2, size=1),
+        )
+        for _ in range(args.samples)
+    ]
+
+    baseline = None
+    for output_format, use_numpy in [
+        ("text", False),
+        ("binary", False),
+        ("binary", True),
+    ]:
+        generator = CTRDataGenerator(samples, use_numpy)
+        elapsed, size = run(generator, output_format, args.batch_size)
+        baseline = baseline or elapsed
+        inputs = "numpy" if use_numpy else "lists"
+        print(
+            f"{output_format:6s} {inputs:5s}: "
+            f"{args.samples / elapsed:10.0f} samples/s, "
+            f"{size / elapsed / 2**20:7.1f} MB/s, "
+            f"{size / args.samples:6.1f} bytes/sample, "
+            f"{baseline / elapsed:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
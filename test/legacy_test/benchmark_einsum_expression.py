@@ -0,0 +1,75 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Time per call of small multi-operand einsums, where planning dominates the
+# contraction: planning on every call (the cache disabled), paddle.einsum with
+# the plan cache, and a compiled paddle.einsum_expression.
+#
+#   python benchmark_einsum_expression.py --size 8 --repeat 2000
+
+import argparse
+import time
+
+import paddle
+from paddle.tensor.einsum import cached_einsum_expression
+
+EQUATIONS = {
+    "chain": "ij,jk,kl,lm->im",
+    "attention": "bhqd,bhkd,bhkv->bhqv",
+    "tensor network": "abc,cde,efa,bdf->",
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=2000)
+    return parser.parse_args()
+
+
+def time_per_call(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    args = parse_args()
+    paddle.disable_static()
+    for name, equation in EQUATIONS.items():
+        terms = equation.split("->")[0].split(",")
+        shapes = [[args.size] * len(term) for term in terms]
+        operands = [paddle.rand(shape) for shape in shapes]
+
+        def uncached():
+            cached_einsum_expression.cache_clear()
+            paddle.einsum(equation, *operands)
+
+        expression = paddle.einsum_expression(equation, *shapes)
+        uncached_us = time_per_call(uncached, args.repeat)
+        cached_us = time_per_call(
+            lambda: paddle.einsum(equation, *operands), args.repeat
+        )
+        compiled_us = time_per_call(lambda: expression(*operands), args.repeat)
+        print(f"{name}: {equation}, size={args.size}")
+        print(f"  plan every call : {uncached_us:.1f} us")
+        print(f"  plan cache      : {cached_us:.1f} us")
+        print(f"  compiled        : {compiled_us:.1f} us")
+        print(f"  speedup         : {uncached_us / cached_us:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Wall time of `import paddle`, broken down per top level subpackage with
+# `python -X importtime`, plus the cost of first touching each lazily
+# imported subpackage.
+#
+#   python benchmark_import_paddle.py --repeat 5
+#   python benchmark_import_paddle.py --max_seconds 3.0   # regression gate
+
+import argparse
+import collections
+import re
+import subprocess
+import sys
+
+_IMPORTTIME_LINE = re.compile(
+    r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)([\w.]+)'
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument(
+        "--max_seconds",
+        type=float,
+        default=None,
+        help="exit non-zero if the best `import paddle` time exceeds this",
+    )
+    return parser.parse_args()
+
+
+def time_statement(statement, setup="import paddle"):
+    code = (
+        f"import time\n{setup}\n"
+        f"start = time.perf_counter()\n{statement}\n"
+        "print(time.perf_counter() - start)"
+    )
+    out = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, check=True
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def importtime_breakdown():
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import paddle'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # self time attributed to `paddle.<sub>` for every module under it
+    per_subpackage = collections.Counter()
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, name = int(match.group(1)), match.group(4)
+        parts = name.split('.')
+        if parts[0] != 'paddle':
+            key = '<third party>'
+        elif len(parts) == 1:
+            key = 'paddle'
+        else:
+            key = 'paddle.' + parts[1]
+        per_subpackage[key] += self_us
+    return per_subpackage
+
+
+def main():
+    args = parse_args()
+
+    totals = [
+        time_statement("import paddle", setup="") for _ in range(args.repeat)
+    ]
+    best = min(totals)
+    print(f"import paddle: best {best:.3f}s of {args.repeat} runs")
+
+    print(f"\nself time per subpackage (top {args.top}):")
+    for name, us in importtime_breakdown().most_common(args.top):
+        print(f"  {name:<32}{us / 1e6:8.3f}s")
+
+    import paddle
+
+    print("\nfirst access of lazy subpackages:")
+    for name in paddle._LAZY_SUBMODULES:
+        cost = time_statement(f"paddle.{name}")
+        print(f"  paddle.{name:<25}{cost:8.3f}s")
+
+    if args.max_seconds is not None and best > args.max_seconds:
+        sys.exit(
+            f"import paddle took {best:.3f}s, over the {args.max_seconds}s budget"
+        )
+
+
+if __name__ == '__main__':
+    main()
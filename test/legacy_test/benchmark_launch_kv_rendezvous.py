@@ -0,0 +1,108 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Time of the rendezvous of simulated pods, threads each with a KVClient, on
+# the launch KVServer: polling put and get_prefix as sync_peers did, and a
+# single wait request putting the value and waiting for all the peers.
+#
+#   python benchmark_launch_kv_rendezvous.py --pods 1000
+
+import argparse
+import socket
+import threading
+import time
+
+from paddle.distributed.launch.utils.kv_client import KVClient
+from paddle.distributed.launch.utils.kv_server import KVServer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pods", type=int, default=1000)
+    parser.add_argument("--poll_interval", type=float, default=0.5)
+    return parser.parse_args()
+
+
+def get_free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('', 0))
+        return s.getsockname()[1]
+
+
+def poll(client, prefix, key, value, size, interval):
+    requests = 0
+    while True:
+        client.put(key, value)
+        peers = client.get_prefix(prefix)
+        requests += 2
+        if peers and len(peers) == size:
+            return requests
+        time.sleep(interval)
+
+
+def wait(client, prefix, key, value, size, interval):
+    requests = 0
+    while True:
+        peers = client.wait(prefix, size, timeout=5, put={key: value})
+        requests += 1
+        if peers and len(peers) == size:
+            return requests
+
+
+def run(sync, args):
+    port = get_free_port()
+    server = KVServer(port)
+    server.start()
+    requests = [0] * args.pods
+
+    def pod(rank):
+        client = KVClient(f"127.0.0.1:{port}")
+        requests[rank] = sync(
+            client,
+            "/peers",
+            f"/peers/{rank}",
+            f"10.0.0.{rank}:8000",
+            args.pods,
+            args.poll_interval,
+        )
+        client.close()
+
+    threads = [
+        threading.Thread(target=pod, args=(rank,)) for rank in range(args.pods)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    server.stop()
+    return elapsed, sum(requests)
+
+
+def main():
+    args = parse_args()
+    baseline = None
+    for name, sync in [("poll", poll), ("wait", wait)]:
+        elapsed, requests = run(sync, args)
+        baseline = baseline or elapsed
+        print(
+            f"{name}: {args.pods} pods in {elapsed:6.2f} s, "
+            f"{requests / args.pods:5.1f} requests/pod, "
+            f"{baseline / elapsed:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
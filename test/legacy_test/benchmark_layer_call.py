@@ -0,0 +1,86 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Python overhead of Layer.__call__ over a deep Sequential of trivial layers,
+# compared with calling forward directly, for built layers with and without
+# hooks.
+#
+#   python benchmark_layer_call.py --depth 10000 --repeat 20
+
+import argparse
+import time
+
+import paddle
+from paddle import nn
+
+
+class Passthrough(nn.Layer):
+    def forward(self, x):
+        return x
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depth", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    return parser.parse_args()
+
+
+def best_time(fn, repeat):
+    fn()
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    args = parse_args()
+    paddle.disable_static()
+    x = paddle.zeros([1])
+    layers = [Passthrough() for _ in range(args.depth)]
+    model = nn.Sequential(*layers)
+
+    def call_forward():
+        out = x
+        for layer in layers:
+            out = layer.forward(out)
+
+    baseline = best_time(call_forward, args.repeat)
+    hook_free = best_time(lambda: model(x), args.repeat)
+    handles = [
+        layer.register_forward_post_hook(lambda layer, inputs, outputs: None)
+        for layer in layers
+    ]
+    hooked = best_time(lambda: model(x), args.repeat)
+    for handle in handles:
+        handle.remove()
+
+    def per_layer_us(seconds):
+        return seconds / args.depth * 1e6
+
+    print(f"depth={args.depth}")
+    print(f"forward only     : {per_layer_us(baseline):.3f} us/layer")
+    print(f"__call__ no hooks: {per_layer_us(hook_free):.3f} us/layer")
+    print(f"__call__ w/ hooks: {per_layer_us(hooked):.3f} us/layer")
+    print(
+        "dispatch overhead: "
+        f"{per_layer_us(hook_free - baseline):.3f} us/layer without hooks"
+    )
+
+
+if __name__ == '__main__':
+    main()
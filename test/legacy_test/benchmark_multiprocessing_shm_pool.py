@@ -0,0 +1,82 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Throughput of CPU tensors sent from a producer to a consumer process over
+# paddle.incubate.multiprocessing.Queue, with a shared memory file for each
+# tensor and with the pool of shared memory arenas.
+#
+#   python benchmark_multiprocessing_shm_pool.py --tensors 5000 --numel 65536
+
+import argparse
+import time
+
+import paddle
+import paddle.incubate.multiprocessing as mp
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tensors", type=int, default=5000)
+    parser.add_argument("--numel", type=int, default=65536)
+    parser.add_argument("--arena_size", type=int, default=64 << 20)
+    return parser.parse_args()
+
+
+def consume(queue, done, num):
+    for _ in range(num):
+        tensor = queue.get()
+        del tensor
+    done.set()
+
+
+def run(args, use_pool):
+    if use_pool:
+        mp.enable_shared_memory_pool(args.arena_size)
+    else:
+        mp.disable_shared_memory_pool()
+    tensors = [paddle.full([args.numel], i, dtype="float32") for i in range(64)]
+    # bounded, so that the blocks released by the consumer are reused
+    queue = mp.Queue(64)
+    done = mp.Event()
+    consumer = mp.Process(target=consume, args=(queue, done, args.tensors))
+    consumer.start()
+    start = time.perf_counter()
+    for i in range(args.tensors):
+        # a fresh tensor each time, as a producer of new batches does
+        queue.put(tensors[i % len(tensors)].clone())
+    done.wait()
+    elapsed = time.perf_counter() - start
+    consumer.join()
+    mp.disable_shared_memory_pool()
+    return elapsed
+
+
+def main():
+    args = parse_args()
+    paddle.set_device("cpu")
+    nbytes = args.numel * 4
+    baseline = None
+    for use_pool in [False, True]:
+        elapsed = run(args, use_pool)
+        baseline = baseline or elapsed
+        name = "pool" if use_pool else "file per tensor"
+        print(
+            f"{name:15s}: {args.tensors / elapsed:8.0f} tensors/s, "
+            f"{args.tensors * nbytes / elapsed / 2**20:8.1f} MB/s, "
+            f"{baseline / elapsed:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
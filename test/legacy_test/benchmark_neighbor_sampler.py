@@ -0,0 +1,105 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Batches per second of multi-hop neighbor sampling on a synthetic power-law
+# graph on the CPU: sample_neighbors and reindex_graph hop by hop, the
+# NeighborSampler, and the NeighborSampler in DataLoader workers.
+#
+#   python benchmark_neighbor_sampler.py --nodes 1000000 --edges 20000000
+
+import argparse
+import time
+
+import numpy as np
+
+import paddle
+from paddle.geometric import NeighborSampler, NeighborSamplerDataset
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=1000000)
+    parser.add_argument("--edges", type=int, default=20000000)
+    parser.add_argument("--sample_sizes", type=str, default="25,10")
+    parser.add_argument("--batch_size", type=int, default=1024)
+    parser.add_argument("--batches", type=int, default=50)
+    parser.add_argument("--num_workers", type=int, default=4)
+    return parser.parse_args()
+
+
+def per_hop(row, colptr, input_nodes, sample_sizes):
+    nodes = paddle.to_tensor(input_nodes)
+    blocks = []
+    for sample_size in sample_sizes:
+        neighbors, count = paddle.geometric.sample_neighbors(
+            row, colptr, nodes, sample_size=sample_size
+        )
+        src, dst, out_nodes = paddle.geometric.reindex_graph(
+            nodes, neighbors, count
+        )
+        blocks.append((src.numpy(), dst.numpy(), len(nodes)))
+        nodes = out_nodes
+    return nodes.numpy(), blocks[::-1]
+
+
+def main():
+    args = parse_args()
+    paddle.set_device("cpu")
+    sample_sizes = [int(size) for size in args.sample_sizes.split(",")]
+    rng = np.random.default_rng(2024)
+    dst = rng.integers(0, args.nodes, args.edges)
+    src = (rng.pareto(1.5, args.edges) * 1000).astype(np.int64) % args.nodes
+
+    start = time.perf_counter()
+    sampler = NeighborSampler.from_edges(src, dst, args.nodes, sample_sizes)
+    print(f"build CSC     : {time.perf_counter() - start:.2f} s")
+    row = paddle.to_tensor(sampler.row)
+    colptr = paddle.to_tensor(sampler.colptr)
+    batches = [
+        rng.choice(args.nodes, args.batch_size, replace=False)
+        for _ in range(args.batches)
+    ]
+
+    start = time.perf_counter()
+    for batch in batches:
+        per_hop(row, colptr, batch, sample_sizes)
+    baseline = args.batches / (time.perf_counter() - start)
+    print(f"per hop       : {baseline:8.1f} batches/s")
+
+    start = time.perf_counter()
+    for batch in batches:
+        sampler.sample(batch)
+    fused = args.batches / (time.perf_counter() - start)
+    print(f"sampler       : {fused:8.1f} batches/s, {fused / baseline:.2f}x")
+
+    dataset = NeighborSamplerDataset(
+        sampler,
+        np.concatenate(batches),
+        batch_size=args.batch_size,
+    )
+    loader = paddle.io.DataLoader(
+        dataset, batch_size=None, num_workers=args.num_workers
+    )
+    start = time.perf_counter()
+    for _ in loader:
+        pass
+    loaded = args.batches / (time.perf_counter() - start)
+    print(
+        f"data loader x{args.num_workers}: {loaded:8.1f} batches/s, "
+        f"{loaded / baseline:.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
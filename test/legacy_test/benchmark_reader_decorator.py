@@ -0,0 +1,92 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Throughput of the process based reader decorators against the thread based
+# ones, with a CPU bound mapper standing in for decoding and augmentation.
+#
+#   python benchmark_reader_decorator.py --num_samples 2000 --process_num 8
+
+import argparse
+import time
+
+import numpy as np
+
+import paddle.reader
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_samples", type=int, default=2000)
+    parser.add_argument("--process_num", type=int, default=4)
+    parser.add_argument("--buffer_size", type=int, default=64)
+    parser.add_argument("--image_size", type=int, default=64)
+    return parser.parse_args()
+
+
+def make_reader(num_samples, image_size):
+    def reader():
+        for i in range(num_samples):
+            yield np.full([image_size, image_size, 3], i % 255, dtype='uint8')
+
+    return reader
+
+
+def augment(image):
+    # pure python work holds the GIL, like most user augmentations
+    acc = 0
+    for v in image[:8].reshape(-1).tolist():
+        acc = (acc * 31 + v) % 1000003
+    return image.astype('float32') / 255.0, acc
+
+
+def timeit(name, reader, num_samples):
+    start = time.time()
+    count = sum(1 for _ in reader())
+    elapsed = time.time() - start
+    assert count == num_samples
+    print(f"{name:<32} {num_samples / elapsed:>10.1f} samples/s")
+
+
+def main():
+    args = parse_args()
+    reader = make_reader(args.num_samples, args.image_size)
+    timeit(
+        "xmap_readers (threads)",
+        paddle.reader.xmap_readers(
+            augment, reader, args.process_num, args.buffer_size, True
+        ),
+        args.num_samples,
+    )
+    timeit(
+        "process_xmap_readers",
+        paddle.reader.process_xmap_readers(
+            augment, reader, args.process_num, args.buffer_size, True
+        ),
+        args.num_samples,
+    )
+    mapped = paddle.reader.map_readers(augment, reader)
+    timeit(
+        "buffered (thread)",
+        paddle.reader.buffered(mapped, args.buffer_size),
+        args.num_samples,
+    )
+    timeit(
+        "process_buffered",
+        paddle.reader.process_buffered(mapped, args.buffer_size),
+        args.num_samples,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Incremental decoding of MultiHeadAttention with the concat based Cache,
+# PreallocatedCache and PagedCache at increasing sequence lengths, optionally
+# reordering the batch every step like beam search does. The time of the last
+# steps of a decode, relative to the shortest length, shows how the cost of a
+# step grows with the cached length: all three read every cached position at
+# every step, PagedCache gathers them from its blocks.
+#
+#   python benchmark_transformer_kv_cache.py --lengths 256 1024 4096 --reorder
+
+import argparse
+import time
+
+import paddle
+from paddle.nn import MultiHeadAttention
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch_size", type=int, default=8)
+    parser.add_argument("--embed_dim", type=int, default=512)
+    parser.add_argument("--num_heads", type=int, default=8)
+    parser.add_argument("--block_size", type=int, default=16)
+    parser.add_argument(
+        "--lengths", type=int, nargs="+", default=[256, 1024, 4096]
+    )
+    parser.add_argument(
+        "--tail_steps",
+        type=int,
+        default=32,
+        help="the number of last steps timed for the cost of a step",
+    )
+    parser.add_argument(
+        "--reorder",
+        action="store_true",
+        help="reorder the batch after every step, as beam search does",
+    )
+    return parser.parse_args()
+
+
+def gen_cache(attn, query, cache_type, length, block_size):
+    if cache_type is MultiHeadAttention.Cache:
+        return attn.gen_cache(query, type=cache_type)
+    if cache_type is MultiHeadAttention.PagedCache:
+        return attn.gen_cache(
+            query, type=cache_type, max_length=length, block_size=block_size
+        )
+    return attn.gen_cache(query, type=cache_type, max_length=length)
+
+
+def reorder(cache, index):
+    if isinstance(cache, MultiHeadAttention.Cache):
+        return MultiHeadAttention.Cache(
+            paddle.index_select(cache.k, index),
+            paddle.index_select(cache.v, index),
+        )
+    cache.reorder(index)
+    return cache
+
+
+@paddle.no_grad()
+def decode(attn, cache_type, args, length):
+    query = paddle.rand([args.batch_size, 1, args.embed_dim])
+    # a fixed permutation stands in for the beam indices
+    index = paddle.to_tensor(
+        [(i + 1) % args.batch_size for i in range(args.batch_size)],
+        dtype='int64',
+    )
+    cache = gen_cache(attn, query, cache_type, length, args.block_size)
+    tail_steps = min(args.tail_steps, length)
+    paddle.device.synchronize()
+    start = time.perf_counter()
+    for i in range(length):
+        if i == length - tail_steps:
+            paddle.device.synchronize()
+            tail_start = time.perf_counter()
+        _, cache = attn(query, cache=cache)
+        if args.reorder:
+            cache = reorder(cache, index)
+    paddle.device.synchronize()
+    end = time.perf_counter()
+    tokens_per_second = args.batch_size * length / (end - start)
+    step_time = (end - tail_start) / tail_steps
+    return tokens_per_second, step_time
+
+
+def main():
+    args = parse_args()
+    paddle.disable_static()
+    attn = MultiHeadAttention(args.embed_dim, args.num_heads)
+    attn.eval()
+    cache_types = [
+        MultiHeadAttention.Cache,
+        MultiHeadAttention.PreallocatedCache,
+        MultiHeadAttention.PagedCache,
+    ]
+    print(
+        f"{'length':>8}"
+        + "".join(f"{t.__name__.strip('_'):>36}" for t in cache_types)
+    )
+    print(
+        f"{'':>8}"
+        + f"{'tokens/s':>12}{'us/step':>12}{'growth':>12}" * len(cache_types)
+    )
+    first_step_times = None
+    for length in args.lengths:
+        row = [decode(attn, t, args, length) for t in cache_types]
+        if first_step_times is None:
+            first_step_times = [step_time for _, step_time in row]
+        print(
+            f"{length:>8}"
+            + "".join(
+                f"{tokens:>12.1f}{step_time * 1e6:>12.1f}"
+                f"{step_time / first:>11.2f}x"
+                for (tokens, step_time), first in zip(row, first_step_times)
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
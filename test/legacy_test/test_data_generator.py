@@ -10,8 +10,13 @@
 # distributed under the License is distributed on an "AS IS" BASIS,
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
+import io
+import struct
+import sys
 import unittest
 
+import numpy as np
+
 from paddle.distributed import fleet
 
 
@@ -186,5 +191,101 @@ class TestMultiSlotDataGeneratorZip(unittest.TestCase):
         my_ms_dg.run_from_memory()
 
 
+def decode_binary_samples(data):
+    samples = []
+    pos = 0
+    while pos < len(data):
+        (size,) = struct.unpack_from("<I", data, pos)
+        pos += 4
+        end = pos + size
+        sample = []
+        while pos < end:
+            slot_type, num = struct.unpack_from("<cI", data, pos)
+            pos += 5
+            fmt = "f" if slot_type == b"f" else "Q"
+            sample.append(
+                (slot_type, list(struct.unpack_from(f"<{num}{fmt}", data, pos)))
+            )
+            pos += num * struct.calcsize(fmt)
+        samples.append(sample)
+    return samples
+
+
+class MyNumpyDataGenerator(fleet.MultiSlotDataGenerator):
+    def generate_sample(self, line):
+        def data_iter():
+            rng = np.random.default_rng(2024)
+            for i in range(10):
+                yield ("ids", rng.integers(0, 2**63, size=i % 3 + 1)), (
+                    "dense",
+                    rng.random(2, dtype="float32"),
+                )
+
+        return data_iter
+
+
+class TestBinaryOutputFormat(unittest.TestCase):
+    def run_binary(self, generator, batch_size):
+        generator.set_batch(batch_size)
+        generator.set_output_format("binary")
+        stdout = sys.stdout
+        sys.stdout = io.TextIOWrapper(io.BytesIO())
+        try:
+            generator.run_from_memory()
+            return sys.stdout.buffer.getvalue()
+        finally:
+            sys.stdout = stdout
+
+    def test_lists(self):
+        generator = fleet.MultiSlotDataGenerator()
+        data = generator._gen_batch_bytes(
+            [
+                [("ids", [1, -1, 2**64 - 1]), ("label", [1])],
+                [("ids", [3]), ("label", [0.5, 2])],
+            ]
+        )
+        self.assertEqual(
+            decode_binary_samples(data),
+            [
+                [(b"u", [1, 2**64 - 1, 2**64 - 1]), (b"f", [1.0])],
+                [(b"u", [3]), (b"f", [0.5, 2.0])],
+            ],
+        )
+        self.assertEqual(
+            generator._proto_info, [("ids", "uint64"), ("label", "float")]
+        )
+
+    def test_numpy_batch(self):
+        batched = self.run_binary(MyNumpyDataGenerator(), 4)
+        expected = list(MyNumpyDataGenerator().generate_sample(None)())
+        # the numpy batch is encoded at once, the same as sample by sample
+        generator = MyNumpyDataGenerator()
+        self.assertEqual(batched, b"".join(map(generator._gen_bytes, expected)))
+        samples = decode_binary_samples(batched)
+        self.assertEqual(len(samples), len(expected))
+        for sample, (ids, dense) in zip(samples, expected):
+            self.assertEqual(sample[0], (b"u", ids[1].tolist()))
+            self.assertEqual(sample[1], (b"f", dense[1].tolist()))
+
+    def test_string_generator(self):
+        generator = fleet.MultiSlotStringDataGenerator()
+        data = generator._gen_bytes([("words", ["1", "2"]), ("label", ["0.5"])])
+        self.assertEqual(
+            decode_binary_samples(data),
+            [[(b"u", [1, 2]), (b"f", [0.5])]],
+        )
+
+    def test_text_unchanged(self):
+        generator = fleet.MultiSlotDataGenerator()
+        self.assertEqual(
+            generator._gen_str([("words", [1, 2, 3]), ("label", [0.5])]),
+            "3 1 2 3 1 0.5\n",
+        )
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            fleet.MultiSlotDataGenerator().set_output_format("csv")
+
+
 if __name__ == '__main__':
     unittest.main()
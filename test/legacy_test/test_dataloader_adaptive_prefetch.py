@@ -0,0 +1,123 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+import time
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset
+from paddle.io.dataloader.dataloader_iter import _AdaptivePrefetchController
+
+
+class SlowDataset(Dataset):
+    def __init__(self, sample_num, cost):
+        self.sample_num = sample_num
+        self.cost = cost
+
+    def __getitem__(self, idx):
+        time.sleep(self.cost)
+        return np.array([idx]).astype('int64')
+
+    def __len__(self):
+        return self.sample_num
+
+
+class TestAdaptivePrefetchController(unittest.TestCase):
+    def run_steps(self, controller, steps, wait, interval, produce):
+        changed = False
+        for _ in range(steps):
+            controller.record_produce(produce)
+            controller._last_output = time.perf_counter() - interval
+            controller.record_output(wait)
+            changed = controller.adjust() or changed
+        return changed
+
+    def test_grow_when_starving(self):
+        controller = _AdaptivePrefetchController(2, 8, interval=10)
+        controller.active_workers = 2
+        # consumer waits half of every step, a batch takes 4 steps to load
+        self.assertTrue(self.run_steps(controller, 10, 0.05, 0.1, 0.4))
+        self.assertEqual(controller.prefetch_factor, 3)
+        self.assertEqual(controller.active_workers, 8)
+        self.assertEqual(len(controller.decisions), 1)
+
+    def test_shrink_when_idle(self):
+        controller = _AdaptivePrefetchController(4, 8, interval=10)
+        self.assertTrue(self.run_steps(controller, 10, 0.0, 0.1, 0.05))
+        self.assertEqual(controller.prefetch_factor, 3)
+        self.assertEqual(controller.active_workers, 7)
+        for _ in range(20):
+            self.run_steps(controller, 10, 0.0, 0.1, 0.05)
+        self.assertEqual(controller.prefetch_factor, 1)
+        self.assertEqual(controller.active_workers, 1)
+
+    def test_bounds(self):
+        controller = _AdaptivePrefetchController(
+            2, 4, max_prefetch_factor=3, interval=5
+        )
+        for _ in range(10):
+            self.run_steps(controller, 5, 0.09, 0.1, 10.0)
+        self.assertEqual(controller.prefetch_factor, 3)
+        self.assertEqual(controller.active_workers, 4)
+
+    def test_no_worker_scaling(self):
+        controller = _AdaptivePrefetchController(
+            2, 4, scale_workers=False, interval=5
+        )
+        self.run_steps(controller, 5, 0.0, 0.1, 0.01)
+        self.assertEqual(controller.active_workers, 4)
+        self.assertEqual(controller.prefetch_factor, 1)
+
+    def test_stable(self):
+        controller = _AdaptivePrefetchController(2, 4, interval=5)
+        # waits between the shrink and grow thresholds change nothing
+        self.assertFalse(self.run_steps(controller, 20, 0.003, 0.1, 0.1))
+        self.assertEqual(controller.stats()["steps"], 20)
+
+
+class TestDataLoaderAdaptivePrefetch(unittest.TestCase):
+    def test_order_and_stats(self):
+        paddle.disable_static()
+        loader = DataLoader(
+            SlowDataset(200, 0.002),
+            batch_size=2,
+            num_workers=4,
+            adaptive_prefetch=True,
+        )
+        for _ in range(2):
+            data = np.concatenate([d.numpy() for d in loader]).flatten()
+            np.testing.assert_array_equal(data, np.arange(200))
+            # the stats are kept after the iterator is released
+            gc.collect()
+            stats = loader.prefetch_stats()
+            self.assertIsNotNone(stats)
+            self.assertEqual(stats["steps"], 100)
+            self.assertGreaterEqual(stats["active_workers"], 1)
+            self.assertLessEqual(stats["active_workers"], 4)
+            self.assertGreaterEqual(stats["prefetch_factor"], 1)
+            self.assertEqual(stats["batches_outstanding"], 0)
+
+    def test_disabled(self):
+        paddle.disable_static()
+        loader = DataLoader(SlowDataset(8, 0.0), batch_size=2, num_workers=2)
+        for _ in loader:
+            pass
+        self.assertIsNone(loader.prefetch_stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
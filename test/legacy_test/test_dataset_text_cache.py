@@ -0,0 +1,131 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import os
+import tarfile
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import paddle
+from paddle.text.datasets import WMT16, Imdb
+
+IMDB_DOCS = {
+    'aclImdb/train/pos/0_9.txt': b'A great movie, a GREAT cast!\n',
+    'aclImdb/train/pos/1_8.txt': b'great fun\n',
+    'aclImdb/train/neg/0_2.txt': b'A bad movie.\r\n',
+    'aclImdb/test/pos/0_10.txt': b'Great, great, great.',
+    'aclImdb/test/neg/0_1.txt': b'bad bad plot; a bad cast',
+    'aclImdb/train/unsup/0_0.txt': b'not counted at all',
+}
+
+WMT16_LINES = {
+    'wmt16/train': 'a man runs\tein mann rennt\nthe man\tder mann\n'
+    'a dog runs\tein hund rennt\nbroken line\n',
+    'wmt16/test': 'a cat\teine katze\n',
+    'wmt16/val': 'the dog\tder hund\n',
+}
+
+
+def write_tar(path, files):
+    with tarfile.open(path, 'w:gz') as tar:
+        for name, data in files.items():
+            if isinstance(data, str):
+                data = data.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+class TestTextDatasetCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_home = paddle.dataset.common.DATA_HOME
+        paddle.dataset.common.DATA_HOME = self.temp_dir.name
+
+    def tearDown(self):
+        paddle.dataset.common.DATA_HOME = self.data_home
+        self.temp_dir.cleanup()
+
+    def test_imdb(self):
+        data_file = os.path.join(self.temp_dir.name, 'imdb.tar.gz')
+        write_tar(data_file, IMDB_DOCS)
+        imdb = Imdb(data_file=data_file, mode='train', cutoff=1)
+        self.assertEqual(
+            imdb.word_idx,
+            {
+                b'great': 0,
+                b'a': 1,
+                b'bad': 2,
+                b'cast': 3,
+                b'movie': 4,
+                '<unk>': 5,
+            },
+        )
+        self.assertEqual(len(imdb), 3)
+        for idx, (doc, label) in enumerate(
+            [([1, 0, 4, 1, 0, 3], 0), ([0, 5], 0), ([1, 2, 4], 1)]
+        ):
+            np.testing.assert_array_equal(imdb[idx][0], doc)
+            np.testing.assert_array_equal(imdb[idx][1], [label])
+
+        # loaded from the cache without reading the data file
+        with mock.patch.object(tarfile, 'open', side_effect=AssertionError):
+            imdb = Imdb(data_file=data_file, mode='test', cutoff=1)
+        self.assertEqual(len(imdb), 2)
+        np.testing.assert_array_equal(imdb[0][0], [0, 0, 0])
+        np.testing.assert_array_equal(imdb[1][0], [2, 2, 5, 1, 2, 3])
+        np.testing.assert_array_equal(imdb[1][1], [1])
+
+    def test_wmt16(self):
+        data_file = os.path.join(self.temp_dir.name, 'wmt16.tar.gz')
+        write_tar(data_file, WMT16_LINES)
+        os.makedirs(os.path.join(self.temp_dir.name, 'wmt16'))
+        wmt16 = WMT16(
+            data_file=data_file,
+            mode='train',
+            src_dict_size=10,
+            trg_dict_size=10,
+        )
+        src_dict = wmt16.src_dict
+        self.assertEqual(len(src_dict), 8)
+        self.assertEqual(src_dict['<s>'], 0)
+        self.assertEqual(len(wmt16), 3)
+        src_ids, trg_ids, trg_ids_next = wmt16[1]
+        np.testing.assert_array_equal(
+            src_ids, [0, src_dict['the'], src_dict['man'], 1]
+        )
+        np.testing.assert_array_equal(trg_ids[1:], trg_ids_next[:-1])
+        self.assertEqual(trg_ids[0], 0)
+        self.assertEqual(trg_ids_next[-1], 1)
+
+        with mock.patch.object(tarfile, 'open', side_effect=AssertionError):
+            wmt16 = WMT16(
+                data_file=data_file,
+                mode='val',
+                src_dict_size=10,
+                trg_dict_size=10,
+            )
+        self.assertEqual(wmt16.src_dict, src_dict)
+        self.assertEqual(len(wmt16), 1)
+        np.testing.assert_array_equal(
+            wmt16[0][0], [0, src_dict['the'], src_dict['dog'], 1]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -183,5 +183,68 @@ class TestMultiProcessReader(unittest.TestCase):
             self.reader_test(use_pipe=True)
 
 
+class TestReservoirShuffle(unittest.TestCase):
+    def test_reservoir_shuffle(self):
+        for size in [1, 3, 10, 100]:
+            s = paddle.reader.reservoir_shuffle(reader_creator_10(0), size)
+            self.assertEqual(sorted(s()), list(range(10)))
+
+
+@unittest.skipIf(sys.platform == 'win32', "not supported on windows")
+class TestProcessBuffered(unittest.TestCase):
+    def test_read(self):
+        for size in [1, 2, 8]:
+            b = paddle.reader.process_buffered(reader_creator_10(0), size)
+            self.assertEqual(list(b()), list(range(10)))
+
+    def test_large_sample(self):
+        def reader():
+            for i in range(4):
+                yield [i] * 1000
+
+        b = paddle.reader.process_buffered(reader, 2, slot_size=128)
+        self.assertEqual(list(b()), [[i] * 1000 for i in range(4)])
+
+
+@unittest.skipIf(sys.platform == 'win32', "not supported on windows")
+class TestProcessXmap(unittest.TestCase):
+    def test_xmap(self):
+        def mapper(x):
+            return x + 1
+
+        for order in (True, False):
+            for process_num in (1, 2, 4):
+                for size in (1, 4, 16):
+                    reader = paddle.reader.process_xmap_readers(
+                        mapper, reader_creator_10(0), process_num, size, order
+                    )
+                    for n in range(2):
+                        result = list(reader())
+                        if not order:
+                            result.sort()
+                        self.assertEqual(result, list(range(1, 11)))
+
+    def test_mapper_exception(self):
+        def mapper(x):
+            if x == 5:
+                raise ValueError("invalid sample")
+            return x
+
+        reader = paddle.reader.process_xmap_readers(
+            mapper, reader_creator_10(0), 2, 4
+        )
+        with self.assertRaises(RuntimeError):
+            list(reader())
+
+    def test_early_exit(self):
+        reader = paddle.reader.process_xmap_readers(
+            lambda x: x, reader_creator_10(0), 2, 4, True
+        )
+        for i, e in enumerate(reader()):
+            if i == 3:
+                break
+        self.assertEqual(e, 3)
+
+
 if __name__ == '__main__':
     unittest.main()
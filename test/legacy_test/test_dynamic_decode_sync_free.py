@@ -0,0 +1,216 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.nn import BeamSearchDecoder, Embedding, GRUCell, Linear
+from paddle.nn.decode import Decoder, dynamic_decode
+
+
+class CountdownDecoder(Decoder):
+    """The i-th entry emits `100 * step + row_id` and finishes after
+    `lengths[i]` steps."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def initialize(self, lengths):
+        finished = paddle.full(lengths.shape, False, dtype='bool')
+        return lengths, paddle.zeros_like(lengths), finished
+
+    def step(self, time, inputs, states, row_id):
+        self.batch_sizes.append(inputs.shape[0])
+        counter = states + 1
+        outputs = counter * 100 + row_id
+        return outputs, counter, inputs, counter >= inputs
+
+    @property
+    def tracks_own_finished(self):
+        return False
+
+
+class CountdownCell(paddle.nn.Layer):
+    """Its state counts the steps from a value given for each entry, and the
+    end token takes over once the count is positive, so that the entries
+    finish at different steps."""
+
+    def __init__(self, vocab_size, end_token):
+        super().__init__()
+        self.embedding = Embedding(vocab_size, 8)
+        self.linear = Linear(8, vocab_size)
+        self.end_mask = paddle.nn.functional.one_hot(
+            paddle.to_tensor(end_token), vocab_size
+        )
+        self.batch_sizes = []
+
+    def forward(self, inputs, states):
+        self.batch_sizes.append(inputs.shape[0])
+        states = states + 1
+        logits = self.linear(self.embedding(inputs))
+        end = paddle.cast(states > 0, logits.dtype) * self.end_mask
+        return logits + 50 * end, states
+
+
+class OwnFinishedDecoder(CountdownDecoder):
+    @property
+    def tracks_own_finished(self):
+        return True
+
+
+class TestSyncFreeDynamicDecode(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.lengths = [3, 9, 1, 5, 9, 2]
+        self.max_step_num = 12
+
+    def decode(self, **kwargs):
+        decoder = CountdownDecoder()
+        outputs, states, lengths = dynamic_decode(
+            decoder,
+            inits=paddle.to_tensor(self.lengths, dtype='int64'),
+            max_step_num=self.max_step_num,
+            impute_finished=True,
+            return_length=True,
+            row_id=paddle.arange(len(self.lengths), dtype='int64'),
+            **kwargs,
+        )
+        return decoder, outputs.numpy(), states.numpy(), lengths.numpy()
+
+    def assert_valid_outputs_equal(self, outputs, expected):
+        self.assertEqual(outputs.shape, expected.shape)
+        for row, length in enumerate(self.lengths):
+            np.testing.assert_array_equal(
+                outputs[row, :length], expected[row, :length]
+            )
+
+    def test_check_interval(self):
+        _, expected, expected_states, expected_lengths = self.decode()
+        for check_interval in (1, 2, 4, 20):
+            _, outputs, states, lengths = self.decode(
+                check_interval=check_interval
+            )
+            np.testing.assert_array_equal(outputs, expected)
+            np.testing.assert_array_equal(states, expected_states)
+            np.testing.assert_array_equal(lengths, expected_lengths)
+
+    def test_compact_finished(self):
+        _, expected, expected_states, expected_lengths = self.decode()
+        decoder, outputs, states, lengths = self.decode(
+            check_interval=2, compact_finished=True
+        )
+        self.assert_valid_outputs_equal(outputs, expected)
+        np.testing.assert_array_equal(states, expected_states)
+        np.testing.assert_array_equal(lengths, expected_lengths)
+        self.assertLess(decoder.batch_sizes[-1], len(self.lengths))
+        self.assertEqual(decoder.batch_sizes[-1], 2)
+
+    def test_invalid_args(self):
+        with self.assertRaises(ValueError):
+            dynamic_decode(
+                CountdownDecoder(),
+                inits=paddle.to_tensor(self.lengths, dtype='int64'),
+                check_interval=4,
+                row_id=paddle.arange(len(self.lengths), dtype='int64'),
+            )
+
+
+class TestSyncFreeBeamSearch(unittest.TestCase):
+    def test_same_as_per_step_check(self):
+        paddle.disable_static()
+        paddle.seed(2024)
+        embedding = Embedding(30, 16)
+        cell = GRUCell(16, 16)
+        output_layer = Linear(16, 30)
+        decoder = BeamSearchDecoder(
+            cell,
+            start_token=0,
+            end_token=1,
+            beam_size=4,
+            embedding_fn=embedding,
+            output_fn=output_layer,
+        )
+        inits = cell.get_initial_states(paddle.rand([3, 16]))
+        expected = dynamic_decode(
+            decoder, inits=inits, max_step_num=15, return_length=True
+        )
+        for check_interval in (1, 3, 8):
+            outputs = dynamic_decode(
+                decoder,
+                inits=inits,
+                max_step_num=15,
+                return_length=True,
+                check_interval=check_interval,
+            )
+            np.testing.assert_array_equal(
+                outputs[0].numpy(), expected[0].numpy()
+            )
+            np.testing.assert_array_equal(
+                outputs[2].numpy(), expected[2].numpy()
+            )
+
+    def test_compact_finished(self):
+        paddle.disable_static()
+        paddle.seed(2024)
+        cell = CountdownCell(30, end_token=1)
+        decoder = BeamSearchDecoder(
+            cell, start_token=0, end_token=1, beam_size=3
+        )
+        # the entries finish after 2, 9, 4 and 6 steps
+        inits = paddle.to_tensor([[-1.0], [-8.0], [-3.0], [-5.0]])
+
+        def decode(**kwargs):
+            cell.batch_sizes = []
+            outputs, states, lengths = dynamic_decode(
+                decoder,
+                inits=inits,
+                max_step_num=15,
+                return_length=True,
+                check_interval=2,
+                **kwargs,
+            )
+            return outputs.numpy(), states, lengths.numpy()
+
+        expected, expected_states, expected_lengths = decode()
+        self.assertEqual(set(cell.batch_sizes), {12})
+        outputs, states, lengths = decode(compact_finished=True)
+        np.testing.assert_array_equal(outputs, expected)
+        np.testing.assert_array_equal(lengths, expected_lengths)
+        for name in ("log_probs", "finished", "lengths"):
+            np.testing.assert_array_equal(
+                getattr(states, name).numpy(),
+                getattr(expected_states, name).numpy(),
+            )
+        # entries are removed with all their beams
+        self.assertEqual(cell.batch_sizes[0], 12)
+        self.assertEqual(cell.batch_sizes[-1], 3)
+        self.assertTrue(all(size % 3 == 0 for size in cell.batch_sizes))
+
+    def test_compact_not_supported(self):
+        paddle.disable_static()
+        with self.assertRaises(ValueError):
+            dynamic_decode(
+                OwnFinishedDecoder(),
+                inits=paddle.to_tensor([3, 9], dtype='int64'),
+                max_step_num=4,
+                check_interval=2,
+                compact_finished=True,
+                row_id=paddle.arange(2, dtype='int64'),
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1115,6 +1115,22 @@ class TestEagerTensor(unittest.TestCase):
 
         self.assertEqual(a_str, expected)
 
+    def test_tensor_str_summary(self):
+        paddle.disable_static(paddle.CPUPlace())
+        x = paddle.arange(1000000).reshape([1000, 1000])
+        paddle.set_printoptions(threshold=1000, edgeitems=2)
+        a_str = str(x)
+        paddle.set_printoptions(threshold=1000, edgeitems=3)
+
+        expected = """Tensor(shape=[1000, 1000], dtype=int64, place=Place(cpu), stop_gradient=True,
+       [[0     , 1     , ..., 998   , 999   ],
+        [1000  , 1001  , ..., 1998  , 1999  ],
+        ...,
+        [998000, 998001, ..., 998998, 998999],
+        [999000, 999001, ..., 999998, 999999]])"""
+
+        self.assertEqual(a_str, expected)
+
     def test_tensor_str_linewidth(self):
         paddle.disable_static(paddle.CPUPlace())
         paddle.seed(2021)
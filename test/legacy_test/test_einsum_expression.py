@@ -0,0 +1,95 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.tensor.einsum import cached_einsum_expression
+
+
+class TestEinsumExpression(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        np.random.seed(2024)
+
+    def check(self, equation, *shapes, **kwargs):
+        inputs = [np.random.rand(*shape).astype('float64') for shape in shapes]
+        expr = paddle.einsum_expression(equation, *shapes, **kwargs)
+        for _ in range(2):
+            out = expr(*[paddle.to_tensor(x) for x in inputs])
+            np.testing.assert_allclose(
+                out.numpy(), np.einsum(equation, *inputs), rtol=1e-10
+            )
+        return expr
+
+    def test_two_operands(self):
+        expr = self.check('ij,jk->ik', [3, 4], [4, 5])
+        self.assertEqual(expr.path, [(0, 1)])
+
+    def test_chain(self):
+        expr = self.check('ij,jk,kl,lm->im', [2, 30], [30, 40], [40, 3], [3, 2])
+        self.assertEqual(len(expr.path), 3)
+
+    def test_ellipsis(self):
+        self.check('...ij,...jk,...kl->...il', [2, 3, 4], [2, 4, 5], [2, 5, 3])
+        self.check('i...,i...->...', [3, 2, 4], [3, 2, 4])
+
+    def test_memory_limit(self):
+        shapes = [[8, 8], [8, 8], [8, 8]]
+        for optimize in ['greedy', 'optimal']:
+            self.check('ij,jk,kl->il', *shapes, optimize=optimize)
+        self.check('ij,jk,kl->il', *shapes, memory_limit='max_input')
+
+    def test_dynamic_dims(self):
+        expr = paddle.einsum_expression('ij,jk,kl->il', [-1, 4], [4, 5], [5, 6])
+        for batch in [1, 3]:
+            x = np.random.rand(batch, 4)
+            y = np.random.rand(4, 5)
+            z = np.random.rand(5, 6)
+            out = expr(*map(paddle.to_tensor, [x, y, z]))
+            np.testing.assert_allclose(out.numpy(), x @ y @ z, rtol=1e-10)
+
+    def test_errors(self):
+        expr = paddle.einsum_expression('ij,jk->ik', [3, 4], [4, 5])
+        x = paddle.rand([3, 4])
+        with self.assertRaises(ValueError):
+            expr(x)
+        with self.assertRaises(ValueError):
+            expr(x, paddle.rand([5, 5]))
+        with self.assertRaises(AssertionError):
+            paddle.einsum_expression('ij,jk->ik', [3, 4])
+
+
+class TestEinsumCache(unittest.TestCase):
+    def test_cache_hit(self):
+        paddle.disable_static()
+        cached_einsum_expression.cache_clear()
+        x = paddle.rand([2, 3])
+        y = paddle.rand([3, 4])
+        z = paddle.rand([4, 5])
+        expected = paddle.einsum('ij,jk,kl->il', x, y, z)
+        for _ in range(3):
+            out = paddle.einsum('ij,jk,kl->il', x, y, z)
+            np.testing.assert_allclose(out.numpy(), expected.numpy())
+        info = cached_einsum_expression.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 3)
+        paddle.einsum('ij,jk,kl->il', x, y, paddle.rand([4, 6]))
+        self.assertEqual(cached_einsum_expression.cache_info().misses, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
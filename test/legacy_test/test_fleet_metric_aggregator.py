@@ -0,0 +1,177 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import unittest
+
+import numpy as np
+
+from paddle.distributed.fleet.base.util_factory import UtilBase
+from paddle.distributed.fleet.metrics import metric
+
+
+class LocalUtil(UtilBase):
+    """All reduce among workers which all have the same input."""
+
+    def __init__(self, worker_num):
+        super().__init__()
+        self.worker_num = worker_num
+        self.calls = []
+
+    def all_reduce(self, input, mode="sum", comm_world="worker"):
+        self.calls.append(mode)
+        input = np.array(input)
+        if mode == "sum":
+            return input * self.worker_num
+        return input
+
+
+def auc_loop(global_pos, global_neg):
+    # the auc bucket by bucket, as the reference
+    num_bucket = len(global_pos)
+    area = 0.0
+    pos = 0.0
+    neg = 0.0
+    for i in range(num_bucket):
+        index = num_bucket - 1 - i
+        new_pos = pos + global_pos[index]
+        new_neg = neg + global_neg[index]
+        area += (new_neg - neg) * (pos + new_pos) / 2
+        pos = new_pos
+        neg = new_neg
+    if pos * neg == 0:
+        return 0.5
+    return area / (pos * neg)
+
+
+def bucket_error_loop(global_pos, global_neg):
+    # the bucket error of FleetUtil.get_global_metrics, as the reference
+    num_bucket = len(global_pos)
+    last_ctr = -1.0
+    impression_sum = 0.0
+    ctr_sum = 0.0
+    click_sum = 0.0
+    error_sum = 0.0
+    error_count = 0.0
+    for i in range(num_bucket):
+        click = global_pos[i]
+        show = global_pos[i] + global_neg[i]
+        ctr = float(i) / num_bucket
+        if abs(ctr - last_ctr) > 0.01:
+            last_ctr = ctr
+            impression_sum = 0.0
+            ctr_sum = 0.0
+            click_sum = 0.0
+        impression_sum += show
+        ctr_sum += ctr * show
+        click_sum += click
+        if impression_sum == 0:
+            continue
+        adjust_ctr = ctr_sum / impression_sum
+        if adjust_ctr == 0:
+            continue
+        relative_error = math.sqrt(
+            (1 - adjust_ctr) / (adjust_ctr * impression_sum)
+        )
+        if relative_error < 0.05:
+            actual_ctr = click_sum / impression_sum
+            relative_ctr_error = abs(actual_ctr / adjust_ctr - 1)
+            error_sum += relative_ctr_error * impression_sum
+            error_count += impression_sum
+            last_ctr = -1
+    return error_sum / error_count if error_count > 0 else 0.0
+
+
+class TestFleetMetricAggregator(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(2024)
+
+    def random_buckets(self, num_bucket=4096, scale=50):
+        # sparse buckets with a predicted ctr close to the actual one
+        ctr = np.arange(num_bucket) / num_bucket
+        show = self.rng.poisson(
+            scale * np.exp(-ctr * 8), size=num_bucket
+        ) * self.rng.integers(0, 2, size=num_bucket)
+        pos = self.rng.binomial(show, np.clip(ctr * 1.1, 0, 1))
+        return pos.astype("int64"), (show - pos).astype("int64")
+
+    def test_auc(self):
+        for scale in [1, 50, 5000]:
+            pos, neg = self.random_buckets(scale=scale)
+            np.testing.assert_allclose(
+                metric._auc_from_buckets(pos, neg), auc_loop(pos, neg)
+            )
+        self.assertEqual(metric._auc_from_buckets([0, 3], [0, 0]), 0.5)
+
+    def test_bucket_error(self):
+        for num_bucket, scale in [(4096, 1), (4096, 50), (1000, 5000)]:
+            pos, neg = self.random_buckets(num_bucket, scale)
+            np.testing.assert_allclose(
+                metric._bucket_error(pos, neg), bucket_error_loop(pos, neg)
+            )
+        self.assertEqual(metric._bucket_error(np.zeros(8), np.zeros(8)), 0.0)
+
+    def test_all_reduce_packed(self):
+        util = LocalUtil(3)
+        arrays = [
+            np.arange(6, dtype="int64").reshape([2, 3]),
+            np.array([1.5], dtype="float32"),
+        ]
+        outputs = metric._all_reduce_packed(util, arrays)
+        self.assertEqual(util.calls, ["sum"])
+        for array, output in zip(arrays, outputs):
+            self.assertEqual(output.dtype, array.dtype)
+            np.testing.assert_array_equal(output, array * 3)
+
+    def test_compute(self):
+        util = LocalUtil(2)
+        pos, neg = self.random_buckets()
+        stat_pos, stat_neg = pos.reshape([1, -1]), neg.reshape([1, -1])
+        sqrerr = np.array([12.0])
+        abserr = np.array([6.0])
+        prob = np.array([40.0])
+        ins_pos = np.array([44.0])
+        total = np.array([100], dtype="int64")
+        ins_max = np.array([3.0, 7.0])
+
+        aggregator = metric.MetricAggregator(scope=object(), util=util)
+        aggregator.add_auc("auc", stat_pos, stat_neg)
+        aggregator.add_bucket_error("bucket_error", stat_pos, stat_neg)
+        aggregator.add_mae("mae", abserr, total)
+        aggregator.add_rmse("rmse", sqrerr, total)
+        aggregator.add_mse("mse", sqrerr, total)
+        aggregator.add_copc("copc", ins_pos, prob)
+        aggregator.add_acc("acc", ins_pos, total)
+        aggregator.add_sum("total", total)
+        aggregator.add_max("max", ins_max)
+        with self.assertRaises(ValueError):
+            aggregator.add_mae("mae", abserr, total)
+
+        values = aggregator.compute()
+        self.assertEqual(sorted(util.calls), ["max", "sum"])
+        np.testing.assert_allclose(values["auc"], auc_loop(pos, neg))
+        np.testing.assert_allclose(
+            values["bucket_error"], bucket_error_loop(pos * 2, neg * 2)
+        )
+        self.assertAlmostEqual(values["mae"], 0.06)
+        self.assertAlmostEqual(values["rmse"], math.sqrt(0.12))
+        self.assertAlmostEqual(values["mse"], 0.12)
+        self.assertAlmostEqual(values["copc"], 1.1)
+        self.assertAlmostEqual(values["acc"], 0.44)
+        np.testing.assert_array_equal(values["total"], [200])
+        np.testing.assert_array_equal(values["max"], ins_max)
+
+
+if __name__ == '__main__':
+    unittest.main()
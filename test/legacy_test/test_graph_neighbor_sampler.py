@@ -0,0 +1,140 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.geometric import NeighborSampler, NeighborSamplerDataset
+
+
+def random_graph(num_nodes, num_edges, seed=2024):
+    rng = np.random.default_rng(seed)
+    src = rng.integers(0, num_nodes, num_edges)
+    dst = rng.integers(0, num_nodes, num_edges)
+    return src, dst
+
+
+class TestNeighborSampler(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.num_nodes = 100
+        self.src, self.dst = random_graph(self.num_nodes, 1000)
+        self.sampler = NeighborSampler.from_edges(
+            self.src, self.dst, self.num_nodes, [-1, -1]
+        )
+        self.input_nodes = np.array([3, 50, 7, 99])
+
+    def test_same_as_per_hop(self):
+        row = paddle.to_tensor(self.sampler.row)
+        colptr = paddle.to_tensor(self.sampler.colptr)
+        nodes = paddle.to_tensor(self.input_nodes)
+        expected = []
+        for _ in range(2):
+            neighbors, count = paddle.geometric.sample_neighbors(
+                row, colptr, nodes
+            )
+            src, dst, out_nodes = paddle.geometric.reindex_graph(
+                nodes, neighbors, count
+            )
+            expected.append((src.numpy(), dst.numpy(), len(nodes)))
+            nodes = out_nodes
+
+        out_nodes, blocks = self.sampler.sample(self.input_nodes)
+        np.testing.assert_array_equal(out_nodes, nodes.numpy())
+        for block, (src, dst, num_dst_nodes) in zip(blocks, expected[::-1]):
+            np.testing.assert_array_equal(block.src_index, src)
+            np.testing.assert_array_equal(block.dst_index, dst)
+            self.assertEqual(block.num_dst_nodes, num_dst_nodes)
+
+    def test_sample_size(self):
+        sampler = NeighborSampler.from_edges(
+            self.src, self.dst, self.num_nodes, [5, 3]
+        )
+        nodes, blocks = sampler.sample(
+            self.input_nodes, rng=np.random.default_rng(0)
+        )
+        edges = set(zip(self.src.tolist(), self.dst.tolist()))
+        degrees = np.bincount(self.dst, minlength=self.num_nodes)
+        for block, sample_size in zip(blocks, [3, 5]):
+            dst_nodes = nodes[: block.num_dst_nodes]
+            count = np.bincount(block.dst_index, minlength=len(dst_nodes))
+            np.testing.assert_array_equal(
+                count, np.minimum(degrees[dst_nodes], sample_size)
+            )
+            src, dst = nodes[block.src_index], nodes[block.dst_index]
+            for u, v, eid in zip(src, dst, block.eids):
+                self.assertIn((u, v), edges)
+                self.assertEqual((self.src[eid], self.dst[eid]), (u, v))
+            # sampled without replacement
+            self.assertEqual(len(set(block.eids.tolist())), len(block.eids))
+        # the index is reset for the next batch
+        self.assertTrue((sampler._index == -1).all())
+
+    def test_uniform(self):
+        sampler = NeighborSampler.from_edges(np.arange(5), np.zeros(5), 5, [2])
+        rng = np.random.default_rng(0)
+        counts = np.zeros(5)
+        for _ in range(2000):
+            nodes, _ = sampler.sample([0], rng=rng)
+            counts[nodes[1:]] += 1
+        np.testing.assert_allclose(counts / 2000, 0.4, atol=0.05)
+
+    def test_message_passing(self):
+        sampler = NeighborSampler.from_edges(
+            self.src, self.dst, self.num_nodes, [4, 4]
+        )
+        nodes, blocks = sampler.sample(self.input_nodes)
+        x = paddle.rand([len(nodes), 8])
+        for block in blocks:
+            x = paddle.geometric.send_u_recv(
+                x,
+                paddle.to_tensor(block.src_index),
+                paddle.to_tensor(block.dst_index),
+                out_size=block.num_dst_nodes,
+            )
+        self.assertEqual(x.shape, [len(self.input_nodes), 8])
+
+
+class TestNeighborSamplerDataset(unittest.TestCase):
+    def test_data_loader(self):
+        src, dst = random_graph(200, 2000)
+        sampler = NeighborSampler.from_edges(src, dst, 200, [5, 5])
+        dataset = NeighborSamplerDataset(
+            sampler, np.arange(200), batch_size=32, shuffle=True, seed=1
+        )
+        self.assertEqual(len(dataset), 7)
+        for num_workers in [0, 2]:
+            loader = paddle.io.DataLoader(
+                dataset, batch_size=None, num_workers=num_workers
+            )
+            input_nodes = []
+            for i, (nodes, blocks) in enumerate(loader):
+                expected_nodes, expected_blocks = dataset[i]
+                np.testing.assert_array_equal(nodes.numpy(), expected_nodes)
+                self.assertEqual(len(blocks), 2)
+                src_index, dst_index, num_dst_nodes, eids = blocks[-1]
+                self.assertEqual(int(num_dst_nodes), min(32, 200 - 32 * i))
+                np.testing.assert_array_equal(
+                    src_index.numpy(), expected_blocks[-1][0]
+                )
+                input_nodes.append(nodes.numpy()[: int(num_dst_nodes)])
+            np.testing.assert_array_equal(
+                np.sort(np.concatenate(input_nodes)), np.arange(200)
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
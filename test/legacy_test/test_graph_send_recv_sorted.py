@@ -0,0 +1,99 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+
+
+def reference(messages, dst_index, num_nodes, reduce_op):
+    out = np.zeros([num_nodes, *messages.shape[1:]], messages.dtype)
+    for node in range(num_nodes):
+        rows = messages[dst_index == node]
+        if len(rows) == 0:
+            continue
+        if reduce_op == 'sum':
+            out[node] = rows.sum(0)
+        elif reduce_op == 'mean':
+            out[node] = rows.mean(0)
+        elif reduce_op == 'max':
+            out[node] = rows.max(0)
+        else:
+            out[node] = rows.min(0)
+    return out
+
+
+class TestSendRecvSortedDstIndex(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        paddle.set_device('cpu')
+        rng = np.random.default_rng(2024)
+        self.num_nodes = 20
+        self.x = rng.random([self.num_nodes, 3, 4])
+        self.e = rng.random([120, 4])
+        self.src_index = rng.integers(0, self.num_nodes, 120)
+        # leave some nodes without any edge
+        self.dst_index = rng.integers(0, self.num_nodes - 3, 120)
+        order = np.argsort(self.dst_index, kind='stable')
+        self.orders = {'sorted': order, 'unsorted': rng.permutation(order)}
+
+    def test_send_u_recv(self):
+        for reduce_op in ['sum', 'mean', 'max', 'min']:
+            expected = reference(
+                self.x[self.src_index],
+                self.dst_index,
+                self.num_nodes,
+                reduce_op,
+            )
+            for name, order in self.orders.items():
+                with self.subTest(reduce_op=reduce_op, order=name):
+                    out = paddle.geometric.send_u_recv(
+                        paddle.to_tensor(self.x),
+                        paddle.to_tensor(self.src_index[order]),
+                        paddle.to_tensor(self.dst_index[order]),
+                        reduce_op=reduce_op,
+                        out_size=self.num_nodes,
+                    )
+                    np.testing.assert_allclose(out.numpy(), expected)
+
+    def test_send_ue_recv(self):
+        for message_op in ['add', 'mul']:
+            for reduce_op in ['sum', 'mean', 'max', 'min']:
+                if message_op == 'add':
+                    messages = self.x[self.src_index] + self.e[:, None]
+                else:
+                    messages = self.x[self.src_index] * self.e[:, None]
+                expected = reference(
+                    messages, self.dst_index, self.num_nodes, reduce_op
+                )
+                for name, order in self.orders.items():
+                    with self.subTest(
+                        message_op=message_op, reduce_op=reduce_op, order=name
+                    ):
+                        out = paddle.geometric.send_ue_recv(
+                            paddle.to_tensor(self.x),
+                            paddle.to_tensor(self.e[order][:, None]),
+                            paddle.to_tensor(self.src_index[order]),
+                            paddle.to_tensor(self.dst_index[order]),
+                            message_op=message_op,
+                            reduce_op=reduce_op,
+                            out_size=self.num_nodes,
+                        )
+                        np.testing.assert_allclose(out.numpy(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import socket
+import threading
+import unittest
+
+from paddle.distributed.launch.utils.kv_client import KVClient
+from paddle.distributed.launch.utils.kv_server import KVServer
+
+
+def get_free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('', 0))
+        return s.getsockname()[1]
+
+
+class TestKVServer(unittest.TestCase):
+    def setUp(self):
+        port = get_free_port()
+        self.server = KVServer(port)
+        self.server.start()
+        self.endpoint = f"127.0.0.1:{port}"
+        self.client = KVClient(self.endpoint)
+        self.assertTrue(self.client.wait_server_ready())
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_put_get(self):
+        self.assertTrue(self.client.put("/workers/1", "rank1"))
+        self.assertTrue(self.client.put("workers/2", "rank2"))
+        self.assertEqual(self.client.get("workers/1"), "rank1")
+        self.assertEqual(
+            self.client.get_prefix("/workers"),
+            {"/workers/1": "rank1", "/workers/2": "rank2"},
+        )
+        self.assertTrue(self.client.delete("/workers/1"))
+        self.assertFalse(self.client.delete("/workers/1"))
+        self.assertEqual(self.client.get("/workers/1"), "error")
+
+    def test_many(self):
+        self.assertTrue(self.client.put_many({"/a/1": "x", "a/2": "y"}))
+        self.assertEqual(
+            self.client.get_many(["/a/1", "/a/2", "/a/3"]),
+            {"/a/1": "x", "/a/2": "y"},
+        )
+
+    def test_wait_timeout(self):
+        self.client.put("/peers/0", "0")
+        self.assertIsNone(self.client.wait("/peers", 2, timeout=0.1))
+        self.assertEqual(
+            self.client.wait("/peers", 1, timeout=0.1), {"/peers/0": "0"}
+        )
+        self.assertEqual(self.server.watches, {})
+
+    def test_rendezvous(self):
+        size = 64
+        results = [None] * size
+
+        def pod(rank):
+            client = KVClient(self.endpoint)
+            results[rank] = client.wait(
+                "/peers", size, timeout=30, put={f"/peers/{rank}": str(rank)}
+            )
+            client.close()
+
+        threads = [
+            threading.Thread(target=pod, args=(rank,)) for rank in range(size)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        expected = {f"/peers/{rank}": str(rank) for rank in range(size)}
+        for result in results:
+            self.assertEqual(result, expected)
+        self.assertEqual(self.server.watches, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
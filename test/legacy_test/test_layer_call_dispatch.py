@@ -0,0 +1,99 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+import paddle
+from paddle import nn
+
+
+class CountingLayer(nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.build_count = 0
+
+    def _build_once(self, *args, **kwargs):
+        self.build_count += 1
+
+    def forward(self, x):
+        return x + 1
+
+
+class TestLayerCallDispatch(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.x = paddle.zeros([2])
+
+    def test_build_once(self):
+        layer = CountingLayer()
+        for _ in range(3):
+            layer(self.x)
+        self.assertTrue(layer._built)
+        self.assertEqual(layer.build_count, 1)
+
+    def test_built_layer_skips_slow_path(self):
+        layer = CountingLayer()
+        layer.register_forward_pre_hook(lambda layer, inputs: None).remove()
+        layer(self.x)
+        with mock.patch.object(
+            nn.Layer, '_dygraph_call_func', side_effect=AssertionError
+        ):
+            out = layer(self.x)
+        self.assertEqual(out.tolist(), [1.0, 1.0])
+
+    def test_hooks_added_and_removed_after_build(self):
+        layer = CountingLayer()
+        layer(self.x)
+
+        pre = layer.register_forward_pre_hook(
+            lambda layer, inputs: (inputs[0] * 10,)
+        )
+        post = layer.register_forward_post_hook(
+            lambda layer, inputs, outputs: outputs * 2
+        )
+        self.assertEqual(layer(self.x + 1).tolist(), [22.0, 22.0])
+
+        pre.remove()
+        self.assertEqual(layer(self.x + 1).tolist(), [4.0, 4.0])
+        post.remove()
+        self.assertEqual(layer(self.x + 1).tolist(), [2.0, 2.0])
+
+    def test_hook_dict_mutated_in_place(self):
+        layer = CountingLayer()
+        layer(self.x)
+        layer._forward_post_hooks[-1] = lambda layer, inputs, outputs: (
+            outputs * 3
+        )
+        self.assertEqual(layer(self.x).tolist(), [3.0, 3.0])
+        del layer._forward_post_hooks[-1]
+        self.assertEqual(layer(self.x).tolist(), [1.0, 1.0])
+
+    def test_profiler_mode_uses_slow_path(self):
+        layer = CountingLayer()
+        layer(self.x)
+        with mock.patch(
+            'paddle.nn.layer.layers.in_profiler_mode', return_value=True
+        ), mock.patch.object(
+            nn.Layer,
+            '_dygraph_call_func',
+            autospec=True,
+            side_effect=lambda self, *inputs: self.forward(*inputs),
+        ) as slow_path:
+            layer(self.x)
+        slow_path.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+import sys
+import textwrap
+import types
+import unittest
+
+import paddle
+from paddle.utils.lazy_import import lazy_submodules
+
+
+def run_in_subprocess(code):
+    proc = subprocess.run(
+        [sys.executable, '-c', textwrap.dedent(code)],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise AssertionError(proc.stderr)
+    return proc.stdout.strip().splitlines()
+
+
+class TestLazySubmodules(unittest.TestCase):
+    def test_getattr_and_dir(self):
+        package_globals = {'__name__': 'paddle'}
+        getattr_fn, dir_fn = lazy_submodules(
+            'paddle', package_globals, ['callbacks']
+        )
+        self.assertIn('callbacks', dir_fn())
+        module = getattr_fn('callbacks')
+        self.assertIsInstance(module, types.ModuleType)
+        self.assertIs(package_globals['callbacks'], module)
+        with self.assertRaises(AttributeError):
+            getattr_fn('not_a_submodule')
+
+    def test_public_api_unchanged(self):
+        for name in paddle._LAZY_SUBMODULES:
+            self.assertIn(name, dir(paddle))
+            self.assertIsInstance(getattr(paddle, name), types.ModuleType)
+        self.assertIs(paddle.vision, sys.modules['paddle.vision'])
+        self.assertTrue(hasattr(paddle.vision.models, 'resnet18'))
+        self.assertTrue(hasattr(paddle.sparse, 'sparse_coo_tensor'))
+        with self.assertRaises(AttributeError):
+            paddle.not_a_submodule  # noqa: B018
+
+
+class TestImportPaddleIsLazy(unittest.TestCase):
+    def test_not_imported_eagerly(self):
+        loaded = run_in_subprocess(
+            """
+            import sys
+            import paddle
+            for name in paddle._LAZY_SUBMODULES:
+                if 'paddle.' + name in sys.modules:
+                    print(name)
+            """
+        )
+        self.assertEqual(loaded, [])
+
+    def test_import_forms(self):
+        out = run_in_subprocess(
+            """
+            import sys
+            import paddle
+            from paddle import text
+            import paddle.audio
+            from paddle.vision.transforms import ToTensor
+            print(text is paddle.text)
+            print(paddle.audio is sys.modules['paddle.audio'])
+            print('paddle.vision' in sys.modules)
+            """
+        )
+        self.assertEqual(out, ['True', 'True', 'True'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import paddle
+from paddle import nn
+from paddle.hapi.meta_flops import meta_flops
+from paddle.static import InputSpec
+from paddle.vision.models import LeNet, mobilenet_v2
+
+
+class TestMetaFlops(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def test_same_as_dynamic(self):
+        for build, input_size in [
+            (LeNet, [1, 1, 28, 28]),
+            (mobilenet_v2, [1, 3, 224, 224]),
+        ]:
+            net = build()
+            expected = paddle.flops(net, input_size)
+            self.assertEqual(paddle.flops(net, input_size, meta=True), expected)
+            self.assertTrue(net.training)
+
+    def test_memory(self):
+        report = meta_flops(LeNet(), [[1, 1, 28, 28]], print_detail=True)
+        self.assertEqual(report["flops"], 347560)
+        self.assertEqual(report["params"], 61610)
+        self.assertEqual(report["param_bytes"], 61610 * 4)
+        self.assertEqual(len(report["layers"]), 9)
+        conv = report["layers"][0]
+        self.assertEqual(conv["output_shape"], [1, 6, 28, 28])
+        self.assertEqual(conv["activation_bytes"], 6 * 28 * 28 * 4)
+        self.assertEqual(
+            report["activation_bytes"],
+            sum(layer["activation_bytes"] for layer in report["layers"]),
+        )
+        # the first relu keeps both its input and output alive
+        self.assertEqual(report["peak_bytes"], 61610 * 4 + 2 * 6 * 28 * 28 * 4)
+
+    def test_lazy_init(self):
+        with paddle.LazyGuard():
+            net = LeNet()
+        expected = paddle.flops(LeNet(), [1, 1, 28, 28])
+        spec = InputSpec([None, 1, 28, 28], "float32")
+        self.assertEqual(paddle.flops(net, spec, meta=True), expected)
+        for param in net.parameters():
+            self.assertFalse(param._is_initialized())
+
+    def test_custom_ops(self):
+        def count_max_pool(m, input_shapes, output_shapes):
+            return 1
+
+        net = nn.Sequential(nn.MaxPool2D(2), nn.MaxPool2D(2))
+        report = meta_flops(
+            net, [[1, 2, 32, 32]], custom_ops={nn.MaxPool2D: count_max_pool}
+        )
+        self.assertEqual(report["flops"], 2)
+        self.assertEqual(report["layers"][1]["input_shape"], [1, 2, 16, 16])
+
+    def test_single_layer(self):
+        report = meta_flops(nn.Conv2D(1, 2, 3), [[1, 1, 8, 8]])
+        self.assertEqual(len(report["layers"]), 1)
+        self.assertEqual(report["flops"], 2 * 6 * 6 * (9 + 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+import os
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import (
+    DataLoader,
+    Dataset,
+    IterableDataset,
+    WorkerPool,
+    get_worker_info,
+    get_worker_pool,
+)
+
+
+class IndexDataset(Dataset):
+    def __init__(self, sample_num, offset=0):
+        self.sample_num = sample_num
+        self.offset = offset
+
+    def __getitem__(self, idx):
+        return np.array([idx + self.offset]).astype('int64')
+
+    def __len__(self):
+        return self.sample_num
+
+
+class PidDataset(IndexDataset):
+    def __getitem__(self, idx):
+        info = get_worker_info()
+        return np.array([os.getpid(), info.id, info.num_workers]).astype(
+            'int64'
+        )
+
+
+class ErrorDataset(IndexDataset):
+    def __getitem__(self, idx):
+        if idx == 3:
+            raise ValueError("invalid sample")
+        return super().__getitem__(idx)
+
+
+class RangeIterableDataset(IterableDataset):
+    def __iter__(self):
+        yield from range(10)
+
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.pool = WorkerPool(num_workers=2, name="test_pool")
+
+    def tearDown(self):
+        self.pool.shutdown()
+        self.assertIsNone(get_worker_pool("test_pool"))
+
+    def _collect(self, loader):
+        return np.concatenate([data.numpy() for data in loader]).flatten()
+
+    def test_order_and_epochs(self):
+        loader = DataLoader(
+            IndexDataset(40), batch_size=4, worker_pool=self.pool
+        )
+        for _ in range(3):
+            np.testing.assert_array_equal(self._collect(loader), np.arange(40))
+        stats = self.pool.stats()
+        self.assertEqual(stats["registered_datasets"], 1)
+        self.assertEqual(stats["total_registrations"], 1)
+        self.assertEqual(stats["completed"], 30)
+        self.assertEqual(len(stats["loaders"]), 0)
+
+    def test_workers_reused(self):
+        loader = DataLoader(PidDataset(8), batch_size=2, worker_pool=self.pool)
+        pids = set()
+        for _ in range(2):
+            for data in loader:
+                pids.update(data.numpy()[:, 0].tolist())
+                self.assertTrue(np.all(data.numpy()[:, 2] == 2))
+        self.assertEqual(pids, {w.pid for w in self.pool._workers})
+
+    def test_shared_by_name(self):
+        self.assertIs(get_worker_pool("test_pool"), self.pool)
+        train_loader = DataLoader(
+            IndexDataset(20), batch_size=5, worker_pool="test_pool"
+        )
+        eval_loader = DataLoader(
+            IndexDataset(10, offset=100),
+            batch_size=5,
+            worker_pool="test_pool",
+        )
+        train_iter, eval_iter = iter(train_loader), iter(eval_loader)
+        self.assertEqual(len(self.pool.stats()["loaders"]), 2)
+        train_data = self._collect(train_iter)
+        eval_data = self._collect(eval_iter)
+        np.testing.assert_array_equal(train_data, np.arange(20))
+        np.testing.assert_array_equal(eval_data, np.arange(100, 110))
+        self.assertEqual(self.pool.stats()["registered_datasets"], 2)
+
+    def test_release_dataset(self):
+        loader = DataLoader(
+            IndexDataset(8), batch_size=4, worker_pool=self.pool
+        )
+        self._collect(loader)
+        self.assertEqual(self.pool.stats()["registered_datasets"], 1)
+        del loader
+        gc.collect()
+        self.assertEqual(self.pool.stats()["registered_datasets"], 0)
+
+    def test_worker_exception(self):
+        loader = DataLoader(
+            ErrorDataset(8), batch_size=2, worker_pool=self.pool
+        )
+        with self.assertRaisesRegex(ValueError, "invalid sample"):
+            self._collect(loader)
+        # the pool is still usable by other loaders
+        loader = DataLoader(
+            IndexDataset(8), batch_size=2, worker_pool=self.pool
+        )
+        np.testing.assert_array_equal(self._collect(loader), np.arange(8))
+
+    def test_inline_loader(self):
+        # the loader is only referenced by its iterator, and must not be
+        # released from the pool while iterating
+        data = []
+        for d in DataLoader(
+            IndexDataset(40), batch_size=4, worker_pool=self.pool
+        ):
+            gc.collect()
+            self.assertEqual(self.pool.stats()["registered_datasets"], 1)
+            data.append(d.numpy())
+        np.testing.assert_array_equal(
+            np.concatenate(data).flatten(), np.arange(40)
+        )
+        gc.collect()
+        self.assertEqual(self.pool.stats()["registered_datasets"], 0)
+
+    def test_break_iteration(self):
+        loader = DataLoader(
+            IndexDataset(100), batch_size=2, worker_pool=self.pool
+        )
+        for i, data in enumerate(loader):
+            if i == 2:
+                break
+        np.testing.assert_array_equal(self._collect(loader), np.arange(100))
+
+    def test_iterable_dataset(self):
+        with self.assertRaises(ValueError):
+            DataLoader(
+                RangeIterableDataset(), batch_size=2, worker_pool=self.pool
+            )
+
+    def test_duplicated_name(self):
+        with self.assertRaises(ValueError):
+            WorkerPool(num_workers=1, name="test_pool")
+
+
+class TestWorkerPoolCreateByName(unittest.TestCase):
+    def test_create(self):
+        paddle.disable_static()
+        loader = DataLoader(
+            IndexDataset(8),
+            batch_size=2,
+            num_workers=2,
+            worker_pool="created_by_loader",
+        )
+        pool = get_worker_pool("created_by_loader")
+        self.assertIsNotNone(pool)
+        self.assertEqual(pool.num_workers, 2)
+        data = np.concatenate([d.numpy() for d in loader]).flatten()
+        np.testing.assert_array_equal(data, np.arange(8))
+        pool.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mmap
+import os
+import pickle
+import tempfile
+import unittest
+from io import BytesIO
+
+import numpy as np
+
+import paddle
+from paddle import nn
+from paddle.framework.io_utils import _pickle_load_mmap
+
+
+class Net(nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.emb = nn.Embedding(1000, 64)
+        self.fc = nn.Linear(64, 300)
+        self.norm = nn.BatchNorm1D(300)
+
+    def forward(self, x):
+        return self.norm(self.fc(self.emb(x)))
+
+
+def is_mapped(array):
+    while array is not None:
+        if isinstance(array, mmap.mmap):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+class TestPaddleLoadMmap(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        paddle.set_device("cpu")
+        paddle.seed(2024)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "net.pdparams")
+        self.net = Net()
+        self.state_dict = {
+            k: v.numpy() for k, v in self.net.state_dict().items()
+        }
+        paddle.save(self.net.state_dict(), self.path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def assert_state_equal(self, state_dict):
+        self.assertEqual(set(state_dict), set(self.state_dict))
+        for key, value in state_dict.items():
+            np.testing.assert_array_equal(np.array(value), self.state_dict[key])
+
+    def test_load_numpy(self):
+        state_dict = paddle.load(self.path, mmap=True, return_numpy=True)
+        self.assert_state_equal(state_dict)
+        weight = state_dict["emb.weight"]
+        self.assertTrue(is_mapped(weight))
+
+        # copy-on-write, the file is left untouched
+        weight[:] = 0
+        with open(self.path, "rb") as f:
+            saved = pickle.load(f)
+        np.testing.assert_array_equal(
+            saved["emb.weight"], self.state_dict["emb.weight"]
+        )
+
+    def test_load_tensor(self):
+        state_dict = paddle.load(self.path, mmap=True)
+        self.assert_state_equal(state_dict)
+        for key, value in state_dict.items():
+            self.assertIsInstance(value, paddle.Tensor)
+            self.assertTrue(value.place.is_cpu_place())
+            self.assertEqual(value.name, self.net.state_dict()[key].name)
+
+    def test_load_protocol_2(self):
+        path = os.path.join(self.temp_dir.name, "net_protocol_2.pdparams")
+        paddle.save(self.net.state_dict(), path, protocol=2)
+        self.assert_state_equal(paddle.load(path, mmap=True))
+
+    def test_load_nested(self):
+        obj = {
+            "model": self.net.state_dict(),
+            "tensors": [self.net.fc.weight, self.net.fc.weight],
+            "epoch": 3,
+        }
+        path = os.path.join(self.temp_dir.name, "nested.pdparams")
+        paddle.save(obj, path)
+        loaded = paddle.load(path, mmap=True)
+        self.assertEqual(loaded["epoch"], 3)
+        self.assert_state_equal(loaded["model"])
+        for tensor in loaded["tensors"]:
+            np.testing.assert_array_equal(
+                tensor.numpy(), self.state_dict["fc.weight"]
+            )
+
+    def test_bytes_payload(self):
+        # only the raw data of arrays is left in the file
+        obj = {"blob": b"x" * (1 << 17), "state": (1, b"y" * (1 << 17))}
+        path = os.path.join(self.temp_dir.name, "bytes.pkl")
+        with open(path, "wb") as f:
+            pickle.dump(obj, f, protocol=4)
+        with open(path, "rb") as f:
+            self.assertEqual(_pickle_load_mmap(f), obj)
+
+    def test_memory_buffer(self):
+        buffer = BytesIO()
+        paddle.save(self.net.state_dict(), buffer)
+        buffer.seek(0)
+        with self.assertRaises(ValueError):
+            paddle.load(buffer, mmap=True)
+
+    def test_set_state_dict(self):
+        net = Net()
+        missing, unexpected = net.set_state_dict(
+            paddle.load(self.path, mmap=True)
+        )
+        self.assertEqual(missing, [])
+        self.assertEqual(unexpected, [])
+        self.assert_state_equal(net.state_dict())
+
+    def test_set_state_dict_lazy(self):
+        with paddle.LazyGuard():
+            net = Net()
+        for param in net.parameters():
+            self.assertFalse(param._is_initialized())
+
+        net.set_state_dict(paddle.load(self.path, mmap=True))
+        for param in net.parameters():
+            self.assertTrue(param._is_initialized())
+            self.assertIsNone(param._init_func)
+        self.assert_state_equal(net.state_dict())
+
+        x = paddle.to_tensor([1, 2, 3, 4])
+        net.eval()
+        np.testing.assert_allclose(
+            net(x).numpy(), self.net.eval()(x).numpy(), rtol=1e-6
+        )
+
+    def test_set_state_dict_lazy_partial(self):
+        state_dict = paddle.load(self.path, mmap=True)
+        state_dict.pop("fc.bias")
+        with paddle.LazyGuard():
+            net = Net()
+        net.set_state_dict(state_dict)
+        self.assertTrue(net.fc.weight._is_initialized())
+        self.assertFalse(net.fc.bias._is_initialized())
+        net.fc.bias.initialize()
+        self.assertTrue(net.fc.bias._is_initialized())
+
+    def test_set_state_dict_zero_copy(self):
+        state_dict = paddle.load(self.path, mmap=True)
+        with paddle.LazyGuard():
+            net = Net()
+        net.set_state_dict(state_dict, zero_copy=True)
+        self.assert_state_equal(net.state_dict())
+
+        # data not aligned in the file is copied when loaded
+        arrays = paddle.load(self.path, mmap=True, return_numpy=True)
+        for key, value in net.state_dict().items():
+            self.assertEqual(
+                value._is_shared_buffer_with(state_dict[key]),
+                arrays[key].flags.aligned,
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -51,6 +51,13 @@ def send_parambase(queue, event, device, dtype):
     event.wait()
 
 
+def receive_tensors(queue, result_queue, num):
+    total = 0.0
+    for _ in range(num):
+        total += float(queue.get().sum())
+    result_queue.put(total)
+
+
 class leak_checker:
     def __init__(self, test_case):
         self.checked_pids = [os.getpid()]
@@ -196,6 +203,83 @@ class TestMultiprocessingCpu(TestMultiprocessingBase):
         self.func_test_pass_empty()
 
 
+class TestMultiprocessingSharedMemoryPool(TestMultiprocessingBase):
+    def setUp(self):
+        paddle.set_device("cpu")
+        mp.enable_shared_memory_pool(arena_size=1 << 20)
+
+    def tearDown(self):
+        mp.disable_shared_memory_pool()
+
+    def test_pass_tensor(self):
+        with leak_checker(self) as lc:
+            data = [self.get_tensor(), paddle.zeros([3], dtype="int64")]
+            queue = mp.Queue()
+            event = mp.Event()
+            queue.put(data)
+            process = mp.Process(target=fill_tensor, args=(queue, event))
+            process.daemon = True
+            process.start()
+            lc.check_pid(process.pid)
+            event.wait(30)
+            self.assertTrue(event.is_set())
+            self.assertTrue(data[0].equal(5).all())
+            self.assertTrue(data[1].equal(5).all())
+            process.join(1)
+            self.assertFalse(process.is_alive())
+            del data
+            mp.disable_shared_memory_pool()
+
+    def test_pass_many_tensors(self):
+        num = 200
+        with leak_checker(self) as lc:
+            queue = mp.Queue()
+            result_queue = mp.Queue()
+            process = mp.Process(
+                target=receive_tensors, args=(queue, result_queue, num)
+            )
+            process.daemon = True
+            process.start()
+            lc.check_pid(process.pid)
+            for i in range(num):
+                queue.put(paddle.full([64, 64], i, dtype="float32"))
+            self.assertEqual(
+                result_queue.get(timeout=30), 64 * 64 * sum(range(num))
+            )
+            process.join(10)
+            self.assertFalse(process.is_alive())
+            mp.disable_shared_memory_pool()
+
+    def test_reuse_released_space(self):
+        # smaller blocks carved out of the space of a released larger one,
+        # the headers of which lie in its stale data
+        with leak_checker(self):
+            queue = mp.Queue()
+            queue.put(paddle.full([128], -1, dtype="int64"))
+            out = queue.get(timeout=10)
+            del out
+            gc.collect()
+            outs = []
+            for i in range(4):
+                queue.put(paddle.full([8], i, dtype="int64"))
+                outs.append(queue.get(timeout=10))
+            for i, out in enumerate(outs):
+                self.assertTrue(out.equal(i).all())
+            del out, outs
+            mp.disable_shared_memory_pool()
+
+    def test_large_tensor(self):
+        # larger than a block, passed through a file of its own
+        with leak_checker(self):
+            queue = mp.Queue()
+            tensor = paddle.ones([1 << 18], dtype="float32")
+            queue.put(tensor)
+            out = queue.get(timeout=10)
+            self.assertTrue(out.equal(1).all())
+            del out
+            mp.disable_shared_memory_pool()
+
+
 class TestMultiprocessingGpu(TestMultiprocessingBase):
     @unittest.skipIf(
         not paddle.base.core.is_compiled_with_cuda(),
@@ -0,0 +1,154 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle import nn
+from paddle.nn import BeamSearchDecoder, MultiHeadAttention, dynamic_decode
+
+
+def decode_steps(attn, cache, inputs, prefill_len):
+    outs = []
+    out, cache = attn(inputs[:, :prefill_len], cache=cache)
+    outs.append(out)
+    for t in range(prefill_len, inputs.shape[1]):
+        out, cache = attn(inputs[:, t : t + 1], cache=cache)
+        outs.append(out)
+    return paddle.concat(outs, axis=1).numpy(), cache
+
+
+class TestKVCache(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        paddle.seed(2024)
+        self.batch_size, self.seq_len, self.embed_dim = 3, 11, 16
+        self.attn = MultiHeadAttention(self.embed_dim, num_heads=4)
+        self.attn.eval()
+        self.inputs = paddle.rand(
+            [self.batch_size, self.seq_len, self.embed_dim]
+        )
+
+    def gen_caches(self):
+        ref = self.attn.gen_cache(self.inputs, type=MultiHeadAttention.Cache)
+        prealloc = self.attn.gen_cache(
+            self.inputs,
+            type=MultiHeadAttention.PreallocatedCache,
+            max_length=self.seq_len,
+        )
+        paged = self.attn.gen_cache(
+            self.inputs,
+            type=MultiHeadAttention.PagedCache,
+            max_length=self.seq_len,
+            block_size=4,
+        )
+        return ref, prealloc, paged
+
+    def test_same_outputs_as_concat_cache(self):
+        ref, prealloc, paged = self.gen_caches()
+        expected, ref = decode_steps(self.attn, ref, self.inputs, 5)
+        for cache in (prealloc, paged):
+            out, cache = decode_steps(self.attn, cache, self.inputs, 5)
+            np.testing.assert_allclose(out, expected, rtol=1e-5, atol=1e-6)
+            self.assertEqual(cache.length, self.seq_len)
+
+    def test_reorder(self):
+        index = paddle.to_tensor([2, 0, 0], dtype='int64')
+        for num_steps in (6, 8):
+            ref, prealloc, paged = self.gen_caches()
+            inputs = self.inputs[:, :num_steps]
+            _, ref = decode_steps(self.attn, ref, inputs, 3)
+            ref = MultiHeadAttention.Cache(
+                paddle.index_select(ref.k, index),
+                paddle.index_select(ref.v, index),
+            )
+            expected, _ = decode_steps(
+                self.attn, ref, self.inputs[:, num_steps:], 1
+            )
+            for cache in (prealloc, paged):
+                _, cache = decode_steps(self.attn, cache, inputs, 3)
+                cache.reorder(index)
+                out, _ = decode_steps(
+                    self.attn, cache, self.inputs[:, num_steps:], 1
+                )
+                np.testing.assert_allclose(out, expected, rtol=1e-5, atol=1e-6)
+
+    def test_overflow(self):
+        _, prealloc, paged = self.gen_caches()
+        for cache in (prealloc, paged):
+            decode_steps(self.attn, cache, self.inputs, self.seq_len)
+            with self.assertRaises(ValueError):
+                self.attn(self.inputs[:, :1], cache=cache)
+
+    def test_max_length_required(self):
+        with self.assertRaises(ValueError):
+            self.attn.gen_cache(
+                self.inputs, type=MultiHeadAttention.PreallocatedCache
+            )
+
+
+class DecoderCell(nn.Layer):
+    def __init__(self, vocab_size, d_model):
+        super().__init__()
+        self.embedding = nn.Embedding(vocab_size, d_model)
+        self.decoder = nn.TransformerDecoder(
+            nn.TransformerDecoderLayer(d_model, 2, 32, dropout=0.0), 2
+        )
+        self.output = nn.Linear(d_model, vocab_size)
+
+    def forward(self, inputs, states, memory):
+        tgt = self.embedding(inputs).unsqueeze(1)
+        out, new_states = self.decoder(tgt, memory, None, None, states)
+        return self.output(out.squeeze(1)), new_states
+
+
+class TestBeamSearchWithKVCache(unittest.TestCase):
+    def test_same_predictions(self):
+        paddle.disable_static()
+        paddle.seed(2024)
+        vocab_size, d_model, beam_size, max_step = 20, 16, 3, 9
+        cell = DecoderCell(vocab_size, d_model)
+        cell.eval()
+        memory = paddle.rand([2, 5, d_model])
+        tiled_memory = BeamSearchDecoder.tile_beam_merge_with_batch(
+            memory, beam_size
+        )
+
+        # dynamic_decode may run one step past max_step_num
+        cache_kwargs = [
+            {},
+            {'max_length': max_step + 1},
+            {'max_length': max_step + 1, 'block_size': 2},
+        ]
+        results = []
+        for kwargs in cache_kwargs:
+            decoder = BeamSearchDecoder(
+                cell, start_token=0, end_token=1, beam_size=beam_size
+            )
+            states = cell.decoder.gen_cache(memory, **kwargs)
+            outputs, _ = dynamic_decode(
+                decoder,
+                inits=states,
+                max_step_num=max_step,
+                memory=tiled_memory,
+            )
+            results.append(outputs.numpy())
+        np.testing.assert_array_equal(results[1], results[0])
+        np.testing.assert_array_equal(results[2], results[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
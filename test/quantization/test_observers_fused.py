@@ -0,0 +1,128 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.nn import Linear
+from paddle.quantization.imperative.ptq_quantizer import (
+    PerChannelAbsmaxQuantizer,
+    abs_histogram,
+)
+from paddle.quantization.observers import GroupWiseWeightObserver
+from paddle.quantization.observers.abs_max import AbsmaxObserverLayer
+from paddle.quantization.observers.utils import abs_max, channel_abs_max
+
+
+class TestAbsMax(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.x = np.random.randn(3, 4, 5, 6).astype("float32")
+
+    def test_abs_max(self):
+        x = paddle.to_tensor(self.x)
+        self.assertEqual(float(abs_max(x)), np.abs(self.x).max())
+        np.testing.assert_array_equal(
+            abs_max(x, axis=1).numpy(), np.abs(self.x).max(axis=1)
+        )
+        # 0-D tensors fall back to max of abs
+        self.assertEqual(float(abs_max(paddle.to_tensor(-2.0))), 2.0)
+
+    def test_channel_abs_max(self):
+        x = paddle.to_tensor(self.x)
+        for axis in [0, 1, 3, -1]:
+            reduce_axes = tuple(i for i in range(4) if i != axis % 4)
+            np.testing.assert_array_equal(
+                channel_abs_max(x, axis).numpy(),
+                np.abs(self.x).max(axis=reduce_axes),
+            )
+
+    def test_per_channel_quantizer(self):
+        quantizer = PerChannelAbsmaxQuantizer()
+        weight = paddle.to_tensor(self.x)
+        quantizer.sample_data(paddle.nn.Conv2D(4, 3, [5, 6]), (weight,))
+        np.testing.assert_allclose(
+            quantizer.abs_max_vals[0], np.abs(self.x).max(axis=(1, 2, 3))
+        )
+
+    def test_abs_histogram(self):
+        hist = abs_histogram(paddle.to_tensor(self.x), 4.0, 16)
+        expected, _ = np.histogram(np.abs(self.x), range=(0, 4.0), bins=16)
+        self.assertEqual(hist.dtype, np.float32)
+        self.assertEqual(hist.sum(), expected.sum())
+        # values on the edges of the bins may round to either of them
+        self.assertLessEqual(np.abs(hist - expected).sum(), 2)
+
+
+class TestAbsmaxObserverLayer(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def test_pending(self):
+        layer = Linear(4, 4)
+        observer = AbsmaxObserverLayer(layer)
+        inputs = [
+            np.random.randn(2, 4).astype("float32")
+            for _ in range(AbsmaxObserverLayer.MAX_PENDING + 3)
+        ]
+        for x in inputs:
+            observer(paddle.to_tensor(x))
+        self.assertEqual(len(observer._pending), 3)
+        self.assertEqual(
+            float(observer.scales()),
+            max(np.abs(x).max() for x in inputs),
+        )
+
+    def test_merge_pending(self):
+        observers = [AbsmaxObserverLayer(Linear(4, 4)) for _ in range(4)]
+        expected = []
+        for i, observer in enumerate(observers):
+            inputs = [
+                np.random.randn(2, 4).astype("float32") * (i + 1)
+                for _ in range(i + 1)
+            ]
+            for x in inputs:
+                observer(paddle.to_tensor(x))
+            expected.append(max(np.abs(x).max() for x in inputs))
+        # observers already merged once keep their running abs max
+        observers[0]._merge_pending()
+        observers[0](paddle.to_tensor(np.zeros([2, 4], "float32")))
+        AbsmaxObserverLayer.merge_pending(observers)
+        for observer, value in zip(observers, expected):
+            self.assertEqual(observer._pending, [])
+            self.assertEqual(float(observer.scales()), value)
+
+
+class TestGroupWiseAbsMax(unittest.TestCase):
+    def test_same_as_transposed(self):
+        paddle.disable_static()
+        x = paddle.randn([256, 8])
+        observer = GroupWiseWeightObserver(quant_bits=4, group_size=64)
+        observer_layer = observer._instance(Linear(256, 8))
+        expected = (
+            paddle.max(
+                paddle.abs(x.transpose([1, 0]).reshape([8, 4, 64])), axis=2
+            )
+            .transpose([1, 0])
+            .numpy()
+        )
+        np.testing.assert_array_equal(
+            observer_layer._cal_abs_max(x).numpy(), expected
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
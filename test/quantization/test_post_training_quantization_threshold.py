@@ -0,0 +1,181 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from paddle.static.quantization import post_training_quantization as ptq
+from paddle.static.quantization.cal_kl_threshold import (
+    cal_kl_threshold,
+    expand_quantized_bins,
+    safe_entropy,
+)
+
+
+def cal_kl_threshold_loop(hist, bin_width, bits):
+    # the threshold search bin by bin, as the reference
+    hist_bins = hist.shape[0]
+    starting_iter = int((hist_bins - 1) * 0.5)
+    quant_range = 2 ** (bits - 1) - 1
+    P_sum = np.sum(hist)
+    min_kl_divergence = None
+    min_kl_index = 0
+    for i in range(starting_iter, hist_bins):
+        reference_distr_P = hist[0:i].tolist()
+        if reference_distr_P[i - 1] == 0:
+            continue
+        reference_distr_P[i - 1] += sum(hist[i:])
+        num_merged_bins = int(i / quant_range)
+        candidate_distr_Q_quantized = []
+        for idx in range(quant_range):
+            j_start = idx * num_merged_bins
+            j_end = i if idx == quant_range - 1 else j_start + num_merged_bins
+            candidate_distr_Q_quantized.append(sum(hist[j_start:j_end]))
+        candidate_distr_Q = expand_quantized_bins(
+            candidate_distr_Q_quantized, reference_distr_P
+        )
+        kl_divergence = safe_entropy(
+            reference_distr_P, P_sum, candidate_distr_Q, sum(candidate_distr_Q)
+        )
+        if min_kl_divergence is None or kl_divergence < min_kl_divergence:
+            min_kl_divergence = kl_divergence
+            min_kl_index = i
+    return (min_kl_index + 0.5) * bin_width
+
+
+class TestHistThreshold(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(2024)
+
+    def random_hist(self, size=20000):
+        x = np.abs(self.rng.standard_normal(size)) ** self.rng.uniform(0.5, 2)
+        x = np.concatenate([x, self.rng.uniform(0, 10 * x.max(), 5)])
+        return np.histogram(x, bins=2048, range=(0, x.max()))
+
+    def test_kl_threshold(self):
+        for bits in [4, 8]:
+            hist, hist_edges = self.random_hist()
+            bin_width = hist_edges[1] - hist_edges[0]
+            self.assertAlmostEqual(
+                cal_kl_threshold(hist, bin_width, bits),
+                cal_kl_threshold_loop(hist, bin_width, bits),
+            )
+
+    def test_hist_scaling_factor(self):
+        hist = np.array([4, 4, 0, 8])
+        hist_edges = np.arange(5, dtype=np.float64)
+        for rate, expected in [
+            (0.25, 0.5),
+            (0.5, 1.5),
+            (0.6, 3.5),
+            (1.1, -0.5),
+        ]:
+            self.assertEqual(
+                ptq._get_hist_scaling_factor(hist, hist_edges, rate), expected
+            )
+
+    def test_process_pool(self):
+        hists = [self.random_hist(2000) for _ in range(4)]
+        args = (
+            ["KL", "hist"] * 2,
+            [hist for hist, _ in hists],
+            [hist_edges for _, hist_edges in hists],
+            [8] * 4,
+            [0.999] * 4,
+        )
+        with ProcessPoolExecutor(2) as pool:
+            thresholds = list(pool.map(ptq._cal_hist_threshold, *args))
+        self.assertEqual(thresholds, list(map(ptq._cal_hist_threshold, *args)))
+
+
+class TestStreamingHistogram(unittest.TestCase):
+    def test_growing_range(self):
+        rng = np.random.default_rng(2024)
+        batches = [
+            np.abs(rng.standard_normal(1000)) * scale for scale in [1, 3, 1, 40]
+        ]
+        histogram = None
+        for batch in batches:
+            histogram = ptq._update_streaming_histogram(histogram, batch, 2048)
+        hist, hist_edges = histogram
+        data = np.concatenate(batches)
+        self.assertEqual(hist.shape, (2048,))
+        self.assertEqual(hist.sum(), data.size)
+        self.assertGreaterEqual(hist_edges[-1], data.max())
+        self.assertLess(hist_edges[-1], 2 * data.max())
+        # merging bins keeps the counts but for the values on their edges
+        expected, _ = np.histogram(data, bins=hist_edges)
+        np.testing.assert_array_less(
+            np.abs(np.cumsum(hist) - np.cumsum(expected)), data.size * 1e-3
+        )
+
+    def test_zeros(self):
+        histogram = ptq._update_streaming_histogram(None, np.zeros(8), 16)
+        histogram = ptq._update_streaming_histogram(
+            histogram, np.full(8, 3.0), 16
+        )
+        hist, hist_edges = histogram
+        self.assertEqual(hist[0], 8)
+        self.assertEqual(hist.sum(), 16)
+        self.assertGreaterEqual(hist_edges[-1], 3.0)
+
+
+class TestScaleSearch(unittest.TestCase):
+    def test_losses(self):
+        rng = np.random.default_rng(2024)
+        var_tensor = rng.standard_normal(3000).astype("float32")
+        scales = [float(s) * 3.0 for s in np.arange(0.3, 1.0, 0.02)]
+        bins = 127
+        for onnx_format in [False, True]:
+            expected_mse = []
+            expected_emd = []
+            for scale in scales:
+                if onnx_format:
+                    quant_dequant_var = (
+                        np.clip(
+                            np.round(var_tensor / scale * bins), -bins - 1, bins
+                        )
+                        / bins
+                        * scale
+                    )
+                else:
+                    quant_dequant_var = (
+                        np.round(np.clip(var_tensor, 0.0, scale) / scale * bins)
+                        / bins
+                        * scale
+                    )
+                expected_mse.append(
+                    ((var_tensor - quant_dequant_var) ** 2).mean()
+                )
+                expected_emd.append(
+                    np.abs(np.mean(var_tensor) - np.mean(quant_dequant_var))
+                    + np.abs(np.std(var_tensor) - np.std(quant_dequant_var))
+                )
+            for loss_type, expected in [
+                ("mse", expected_mse),
+                ("emd", expected_emd),
+            ]:
+                np.testing.assert_allclose(
+                    ptq._quant_dequant_losses(
+                        var_tensor, scales, 8, onnx_format, loss_type
+                    ),
+                    expected,
+                    rtol=1e-6,
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# CPU time of paddle.nn.RNN / paddle.nn.BiRNN wrapping built-in cells, which
+# run the whole sequence in the fused rnn kernel, compared with the step by
+# step loop used for custom cells.
+#
+#   python benchmark_rnn_wrappers.py --batch-size 32 --seq-len 128 --padded
+
+import argparse
+import time
+
+import paddle
+from paddle import nn
+
+
+class LoopSimpleRNNCell(nn.SimpleRNNCell):
+    pass
+
+
+class LoopLSTMCell(nn.LSTMCell):
+    pass
+
+
+class LoopGRUCell(nn.GRUCell):
+    pass
+
+
+CELLS = {
+    "rnn": (nn.SimpleRNNCell, LoopSimpleRNNCell),
+    "lstm": (nn.LSTMCell, LoopLSTMCell),
+    "gru": (nn.GRUCell, LoopGRUCell),
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--seq-len", type=int, default=128)
+    parser.add_argument("--input-size", type=int, default=128)
+    parser.add_argument("--hidden-size", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument(
+        "--padded",
+        action="store_true",
+        help="pass random sequence lengths to exercise the masked kernel",
+    )
+    parser.add_argument(
+        "--backward", action="store_true", help="include the backward pass"
+    )
+    return parser.parse_args()
+
+
+def best_time(fn, repeat):
+    fn()
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    args = parse_args()
+    paddle.set_device("cpu")
+    x = paddle.randn([args.batch_size, args.seq_len, args.input_size])
+    x.stop_gradient = not args.backward
+    sequence_length = None
+    if args.padded:
+        sequence_length = paddle.randint(
+            1, args.seq_len + 1, [args.batch_size], dtype="int64"
+        )
+
+    def run(model):
+        def step():
+            y, _ = model(x, sequence_length=sequence_length)
+            if args.backward:
+                y.sum().backward()
+            else:
+                y.numpy()
+
+        if args.backward:
+            return best_time(step, args.repeat)
+        with paddle.no_grad():
+            return best_time(step, args.repeat)
+
+    print(
+        f"batch_size={args.batch_size} seq_len={args.seq_len} "
+        f"input_size={args.input_size} hidden_size={args.hidden_size} "
+        f"padded={args.padded} backward={args.backward}"
+    )
+    for name, (fused_cls, loop_cls) in CELLS.items():
+        for bidirectional in [False, True]:
+
+            def build(cell_cls):
+                cells = [
+                    cell_cls(args.input_size, args.hidden_size)
+                    for _ in range(2 if bidirectional else 1)
+                ]
+                return nn.BiRNN(*cells) if bidirectional else nn.RNN(*cells)
+
+            fused = run(build(fused_cls))
+            loop = run(build(loop_cls))
+            label = f"{'bi' if bidirectional else ''}{name}"
+            print(
+                f"{label:7s}: fused {fused * 1e3:9.2f} ms, "
+                f"loop {loop * 1e3:9.2f} ms, speedup {loop / fused:.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import paddle
+from paddle.nn.layer import rnn as rnn_module
+
+
+# Subclasses are not dispatched to the fused kernel, which gives the step by
+# step reference sharing the parameters of the built-in cells.
+class LoopSimpleRNNCell(paddle.nn.SimpleRNNCell):
+    pass
+
+
+class LoopLSTMCell(paddle.nn.LSTMCell):
+    pass
+
+
+class LoopGRUCell(paddle.nn.GRUCell):
+    pass
+
+
+CELLS = [
+    (paddle.nn.SimpleRNNCell, LoopSimpleRNNCell, {"activation": "tanh"}),
+    (paddle.nn.SimpleRNNCell, LoopSimpleRNNCell, {"activation": "relu"}),
+    (paddle.nn.LSTMCell, LoopLSTMCell, {}),
+    (paddle.nn.GRUCell, LoopGRUCell, {}),
+]
+
+
+def make_cells(fused_cls, loop_cls, kwargs):
+    fused = fused_cls(16, 32, **kwargs)
+    loop = loop_cls(16, 32, **kwargs)
+    loop.set_state_dict(fused.state_dict())
+    return fused, loop
+
+
+class TestFusedRNNWrapper(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static(paddle.CPUPlace())
+        paddle.seed(2024)
+        np.random.seed(2024)
+
+    def assert_states_close(self, fused, loop):
+        fused = paddle.utils.flatten(fused)
+        loop = paddle.utils.flatten(loop)
+        self.assertEqual(len(fused), len(loop))
+        for fused_state, loop_state in zip(fused, loop):
+            np.testing.assert_allclose(
+                fused_state.numpy(), loop_state.numpy(), rtol=1e-5, atol=1e-6
+            )
+
+    def check(self, fused_rnn, loop_rnn, time_major, sequence_length):
+        shape = [12, 4, 16] if time_major else [4, 12, 16]
+        x_np = np.random.randn(*shape).astype("float32")
+        x_fused = paddle.to_tensor(x_np, stop_gradient=False)
+        x_loop = paddle.to_tensor(x_np, stop_gradient=False)
+
+        with mock.patch.object(
+            rnn_module,
+            "_rnn_fused_dynamic_graph",
+            wraps=rnn_module._rnn_fused_dynamic_graph,
+        ) as fused_impl:
+            y_fused, states_fused = fused_rnn(
+                x_fused, sequence_length=sequence_length
+            )
+        self.assertEqual(fused_impl.call_count, 1)
+        y_loop, states_loop = loop_rnn(x_loop, sequence_length=sequence_length)
+
+        np.testing.assert_allclose(
+            y_fused.numpy(), y_loop.numpy(), rtol=1e-5, atol=1e-6
+        )
+        self.assert_states_close(states_fused, states_loop)
+
+        y_fused.sum().backward()
+        y_loop.sum().backward()
+        np.testing.assert_allclose(
+            x_fused.grad.numpy(), x_loop.grad.numpy(), rtol=1e-4, atol=1e-5
+        )
+        for (name, p_fused), p_loop in zip(
+            fused_rnn.named_parameters(), loop_rnn.parameters()
+        ):
+            np.testing.assert_allclose(
+                p_fused.grad.numpy(),
+                p_loop.grad.numpy(),
+                rtol=1e-4,
+                atol=1e-5,
+                err_msg=name,
+            )
+
+    def test_rnn(self):
+        sequence_length = paddle.to_tensor([12, 10, 9, 8], dtype="int64")
+        for fused_cls, loop_cls, kwargs in CELLS:
+            for time_major in [False, True]:
+                for seq_len in [None, sequence_length]:
+                    fused, loop = make_cells(fused_cls, loop_cls, kwargs)
+                    self.check(
+                        paddle.nn.RNN(fused, time_major=time_major),
+                        paddle.nn.RNN(loop, time_major=time_major),
+                        time_major,
+                        seq_len,
+                    )
+
+    def test_reverse_rnn(self):
+        for fused_cls, loop_cls, kwargs in CELLS:
+            fused, loop = make_cells(fused_cls, loop_cls, kwargs)
+            self.check(
+                paddle.nn.RNN(fused, is_reverse=True),
+                paddle.nn.RNN(loop, is_reverse=True),
+                False,
+                None,
+            )
+
+    def test_birnn(self):
+        sequence_length = paddle.to_tensor([12, 10, 9, 8], dtype="int32")
+        for fused_cls, loop_cls, kwargs in CELLS:
+            for time_major in [False, True]:
+                for seq_len in [None, sequence_length]:
+                    fused_fw, loop_fw = make_cells(fused_cls, loop_cls, kwargs)
+                    fused_bw, loop_bw = make_cells(fused_cls, loop_cls, kwargs)
+                    self.check(
+                        paddle.nn.BiRNN(
+                            fused_fw, fused_bw, time_major=time_major
+                        ),
+                        paddle.nn.BiRNN(
+                            loop_fw, loop_bw, time_major=time_major
+                        ),
+                        time_major,
+                        seq_len,
+                    )
+
+    def test_padded_outputs(self):
+        # the step loop zeros the outputs at padded time steps as the fused
+        # kernel does, also when running in reverse
+        x = paddle.randn([4, 12, 16])
+        sequence_length = paddle.to_tensor([12, 10, 9, 8])
+        for is_reverse in [False, True]:
+            for cell in [LoopGRUCell(16, 32), paddle.nn.GRUCell(16, 32)]:
+                y, _ = paddle.nn.RNN(cell, is_reverse=is_reverse)(
+                    x, sequence_length=sequence_length
+                )
+                y = y.numpy()
+                for i, length in enumerate([12, 10, 9, 8]):
+                    np.testing.assert_array_equal(y[i, length:], 0.0)
+                    self.assertTrue(np.all(y[i, :length] != 0.0))
+
+    def test_initial_states(self):
+        fused, loop = make_cells(paddle.nn.LSTMCell, LoopLSTMCell, {})
+        x = paddle.randn([4, 12, 16])
+        states = (paddle.randn([4, 32]), paddle.randn([4, 32]))
+        y_fused, (h_fused, c_fused) = paddle.nn.RNN(fused)(x, states)
+        y_loop, (h_loop, c_loop) = paddle.nn.RNN(loop)(x, states)
+        np.testing.assert_allclose(
+            y_fused.numpy(), y_loop.numpy(), rtol=1e-5, atol=1e-6
+        )
+        self.assert_states_close((h_fused, c_fused), (h_loop, c_loop))
+
+    def test_fallback(self):
+        x = paddle.randn([4, 12, 16])
+        sequence_length = paddle.to_tensor([12, 10, 9, 8])
+        cell = paddle.nn.GRUCell(16, 32)
+        hooked = paddle.nn.GRUCell(16, 32)
+        hooked.register_forward_post_hook(lambda layer, inputs, outputs: None)
+        cases = [
+            (paddle.nn.RNN(LoopGRUCell(16, 32)), {}),
+            (paddle.nn.RNN(paddle.nn.LSTMCell(16, 32, proj_size=8)), {}),
+            (paddle.nn.RNN(hooked), {}),
+            (
+                paddle.nn.RNN(cell, is_reverse=True),
+                {"sequence_length": sequence_length},
+            ),
+            (paddle.nn.BiRNN(cell, LoopGRUCell(16, 32)), {}),
+        ]
+        with mock.patch.object(
+            rnn_module,
+            "_rnn_fused_dynamic_graph",
+            wraps=rnn_module._rnn_fused_dynamic_graph,
+        ) as fused_impl:
+            for rnn, kwargs in cases:
+                rnn(x, **kwargs)
+        self.assertEqual(fused_impl.call_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import tempfile
+import unittest
+
+from test_case_base import (
+    TestCaseBase,
+    test_instruction_translator_cache_context,
+)
+
+import paddle
+from paddle.jit.sot.profiler import get_telemetry, telemetry_guard
+
+
+def print_break_graph(x):
+    y = x + 1
+    print(y)
+    return y * 2
+
+
+def tensor_if(x):
+    if x > 0:
+        return x + 1
+    return x - 1
+
+
+class TestSotTelemetry(TestCaseBase):
+    def test_break_graph(self):
+        x = paddle.to_tensor([1.0])
+        with telemetry_guard() as telemetry:
+            with test_instruction_translator_cache_context():
+                self.assert_results(print_break_graph, x)
+                self.assert_results(print_break_graph, x)
+        stats = telemetry.codes[print_break_graph.__code__]
+        self.assertEqual(stats.translate_count, 1)
+        self.assertEqual(stats.guard_hit, 1)
+        self.assertEqual(stats.guard_miss, 0)
+        self.assertEqual(sum(stats.break_reasons.values()), 1)
+        self.assertIn("print_break_graph", telemetry.to_table())
+
+    def test_guard_miss(self):
+        with telemetry_guard() as telemetry:
+            with test_instruction_translator_cache_context():
+                self.assert_results(tensor_if, paddle.to_tensor(1.0))
+                self.assert_results(tensor_if, paddle.to_tensor(2))
+        stats = telemetry.codes[tensor_if.__code__]
+        self.assertEqual(stats.translate_count, 2)
+        self.assertEqual(stats.guard_miss, 1)
+        self.assertEqual(dict(stats.break_reasons), {"if jump tensor": 2})
+
+    def test_export(self):
+        with telemetry_guard() as telemetry:
+            with test_instruction_translator_cache_context():
+                self.assert_results(tensor_if, paddle.to_tensor(1.0))
+            with tempfile.TemporaryDirectory() as temp_dir:
+                path = os.path.join(temp_dir, "telemetry.json")
+                telemetry.export(path)
+                with open(path) as f:
+                    report = json.load(f)
+        self.assertEqual(report, telemetry.to_dict())
+        (stats,) = (s for s in report if s["name"].startswith("tensor_if "))
+        self.assertEqual(stats["translate_count"], 1)
+        self.assertEqual(stats["break_reasons"], {"if jump tensor": 1})
+
+    def test_disabled(self):
+        with telemetry_guard():
+            pass
+        if not os.environ.get("SOT_TELEMETRY"):
+            self.assertIsNone(get_telemetry())
+
+
+if __name__ == "__main__":
+    unittest.main()